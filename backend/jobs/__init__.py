@@ -0,0 +1 @@
+"""Resumable maintenance jobs run with the service role client."""
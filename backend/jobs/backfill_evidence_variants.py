@@ -0,0 +1,136 @@
+"""
+Generate resized WebP/AVIF variants for evidence uploaded before variants existed
+
+Evidence without variants is read in id order, one keyset page at a time. Each page's
+originals are encoded in parallel in the variant process pool and the variants are
+recorded on every row sharing the storage object. Progress is checkpointed after every
+page. Files that fail to download or upload keep no variants and are retried by the
+next run.
+
+Run from the repository root:
+    python -m backend.jobs.backfill_evidence_variants --dry-run
+    python -m backend.jobs.backfill_evidence_variants --batch-size 20
+"""
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Optional
+from supabase import Client
+from backend.db.client import get_service_client
+from backend.jobs.checkpoints import load_checkpoint, save_checkpoint, clear_checkpoint
+from backend.services.evidence_variant_service import EvidenceVariantService
+
+JOB_NAME = "backfill_evidence_variants"
+DEFAULT_BATCH_SIZE = 20
+
+
+def _fetch_pending_batch(client: Client, after_id: Optional[str], batch_size: int) -> List[Dict[str, Any]]:
+    """Fetch the next page of evidence without variants after after_id, in id order"""
+    query = client.table("project_evidence")\
+        .select("id, file_path, mime_type")\
+        .is_("variants", "null")
+    if after_id:
+        query = query.gt("id", after_id)
+    result = query.order("id").limit(batch_size).execute()
+    return result.data or []
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {"last_id": None, "scanned": 0, "processed": 0, "skipped": 0, "failed": 0}
+
+
+def run(
+    client: Client,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    limit: Optional[int] = None,
+    reset: bool = False,
+) -> Dict[str, Any]:
+    """
+    Generate variants for evidence in batches
+
+    Args:
+        client: Service role Supabase client
+        batch_size: Evidence rows read per batch
+        dry_run: Count pending evidence without generating anything or saving checkpoints
+        limit: Stop after scanning this many rows (the checkpoint keeps the position)
+        reset: Ignore any saved checkpoint and start from the first pending row
+
+    Returns:
+        Report with totals; processed counts files that got variants, skipped counts
+        files that can't have any (unsupported or undecodable), failed counts files
+        left for the next run
+    """
+    state = _initial_state()
+    if not dry_run:
+        if reset:
+            clear_checkpoint(client, JOB_NAME)
+        checkpoint = load_checkpoint(client, JOB_NAME)
+        # A finished run starts over to retry failures and pick up missed uploads
+        if checkpoint and not checkpoint.get("completed_at"):
+            state = {**state, **(checkpoint.get("state") or {})}
+    resumed_from = state["last_id"]
+
+    scanned_this_run = 0
+    completed = False
+
+    while True:
+        page_size = batch_size if limit is None else min(batch_size, limit - scanned_this_run)
+        if page_size <= 0:
+            break
+        rows = _fetch_pending_batch(client, state["last_id"], page_size)
+        if not rows:
+            completed = True
+            break
+
+        # Clones share an object; each object is processed once
+        files = list({row["file_path"]: row for row in rows}.values())
+        processed = skipped = failed = 0
+        if not dry_run:
+            results = EvidenceVariantService.process_files(client, files)
+            processed = sum(1 for variants in results.values() if variants)
+            skipped = sum(1 for variants in results.values() if variants == [])
+            failed = sum(1 for variants in results.values() if variants is None)
+
+        state = {
+            "last_id": rows[-1]["id"],
+            "scanned": state["scanned"] + len(rows),
+            "processed": state["processed"] + processed,
+            "skipped": state["skipped"] + skipped,
+            "failed": state["failed"] + failed,
+        }
+        scanned_this_run += len(rows)
+        if len(rows) < page_size:
+            completed = True
+        if not dry_run:
+            save_checkpoint(client, JOB_NAME, state, completed=completed)
+        if completed:
+            break
+
+    return {"dry_run": dry_run, "completed": completed, "resumed_from": resumed_from, **state}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate image variants for existing evidence")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Count pending evidence without writing")
+    parser.add_argument("--limit", type=int, help="Stop after scanning this many rows")
+    parser.add_argument("--reset", action="store_true", help="Ignore the saved checkpoint")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run(
+            get_service_client(),
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            limit=args.limit,
+            reset=args.reset,
+        )
+    finally:
+        EvidenceVariantService.shutdown_executor()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Progress checkpoints for resumable jobs, stored in the job_checkpoints table
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from supabase import Client
+
+CHECKPOINTS_TABLE = "job_checkpoints"
+
+
+def load_checkpoint(client: Client, job_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a job's checkpoint
+
+    Returns:
+        The checkpoint row (job_name, state, updated_at, completed_at), or None if the
+        job has never run
+    """
+    result = client.table(CHECKPOINTS_TABLE)\
+        .select("*")\
+        .eq("job_name", job_name)\
+        .limit(1)\
+        .execute()
+    return result.data[0] if result.data else None
+
+
+def save_checkpoint(client: Client, job_name: str, state: Dict[str, Any], completed: bool = False) -> None:
+    """Record a job's progress, marking it complete if requested"""
+    now = datetime.now(timezone.utc).isoformat()
+    client.table(CHECKPOINTS_TABLE).upsert({
+        "job_name": job_name,
+        "state": state,
+        "updated_at": now,
+        "completed_at": now if completed else None,
+    }).execute()
+
+
+def clear_checkpoint(client: Client, job_name: str) -> None:
+    """Forget a job's progress so the next run starts from the beginning"""
+    client.table(CHECKPOINTS_TABLE).delete().eq("job_name", job_name).execute()
@@ -0,0 +1,185 @@
+"""
+Convert legacy metrics (free-text primary_value/label/detail) into standardized metrics
+
+Legacy rows are read in id order, one keyset page at a time, parsed with the
+deterministic parser in utils.legacy_metrics and written back with one
+apply_legacy_metric_conversions call per page. Progress is checkpointed after every
+page, so an interrupted run picks up where it stopped. Rows the parser can't read
+are left as they are and listed in the report.
+
+Run from the repository root:
+    python -m backend.jobs.migrate_legacy_metrics --dry-run --report report.json
+    python -m backend.jobs.migrate_legacy_metrics --batch-size 500
+"""
+import sys
+import json
+import argparse
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from supabase import Client
+from backend.db.client import get_service_client
+from backend.jobs.checkpoints import load_checkpoint, save_checkpoint, clear_checkpoint
+from backend.utils.legacy_metrics import parse_legacy_metric
+
+JOB_NAME = "migrate_legacy_metrics"
+DEFAULT_BATCH_SIZE = 500
+REPORT_SAMPLE_SIZE = 20
+CONFLICT_REASON = "changed during migration"
+
+
+def _fetch_legacy_batch(client: Client, after_id: Optional[str], batch_size: int) -> List[Dict[str, Any]]:
+    """Fetch the next page of legacy metrics after after_id, in id order"""
+    query = client.table("project_metrics")\
+        .select("id, primary_value, label, detail")\
+        .is_("metric_data", "null")
+    if after_id:
+        query = query.gt("id", after_id)
+    result = query.order("id").limit(batch_size).execute()
+    return result.data or []
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {"last_id": None, "scanned": 0, "converted": 0, "skipped": {}}
+
+
+def run(
+    client: Client,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    limit: Optional[int] = None,
+    reset: bool = False,
+) -> Dict[str, Any]:
+    """
+    Convert legacy metrics in batches
+
+    Args:
+        client: Service role Supabase client
+        batch_size: Rows read and written per batch
+        dry_run: Parse and report without writing metrics or checkpoints
+        limit: Stop after scanning this many rows (the checkpoint keeps the position)
+        reset: Ignore any saved checkpoint and start from the first legacy metric
+
+    Returns:
+        Report with totals, conversions by type and unit, and sample rows
+    """
+    state = _initial_state()
+    if not dry_run:
+        if reset:
+            clear_checkpoint(client, JOB_NAME)
+        checkpoint = load_checkpoint(client, JOB_NAME)
+        # A finished run starts over to pick up legacy metrics written since
+        if checkpoint and not checkpoint.get("completed_at"):
+            state = {**state, **(checkpoint.get("state") or {})}
+    resumed_from = state["last_id"]
+
+    by_type: Counter = Counter()
+    by_unit: Counter = Counter()
+    converted_samples: List[Dict[str, Any]] = []
+    unparsed_samples: List[Dict[str, Any]] = []
+    scanned_this_run = 0
+    completed = False
+
+    while True:
+        page_size = batch_size if limit is None else min(batch_size, limit - scanned_this_run)
+        if page_size <= 0:
+            break
+        rows = _fetch_legacy_batch(client, state["last_id"], page_size)
+        if not rows:
+            completed = True
+            break
+
+        conversions = []
+        skipped = Counter(state["skipped"])
+        for row in rows:
+            metric_data, reason = parse_legacy_metric(row.get("primary_value"), row.get("label"), row.get("detail"))
+            if metric_data is None:
+                skipped[reason] += 1
+                if len(unparsed_samples) < REPORT_SAMPLE_SIZE:
+                    unparsed_samples.append({
+                        "id": row["id"],
+                        "primary": row.get("primary_value"),
+                        "label": row.get("label"),
+                        "reason": reason,
+                    })
+                continue
+
+            conversions.append({
+                "id": row["id"],
+                "primary_value": row.get("primary_value"),
+                "metric_type": metric_data["type"],
+                "metric_data": metric_data,
+            })
+            by_type[metric_data["type"]] += 1
+            by_unit[metric_data["primary"]["unit"]] += 1
+            if len(converted_samples) < REPORT_SAMPLE_SIZE:
+                converted_samples.append({
+                    "id": row["id"],
+                    "primary": row.get("primary_value"),
+                    "label": row.get("label"),
+                    "metric_data": metric_data,
+                })
+
+        converted = len(conversions)
+        if conversions and not dry_run:
+            result = client.rpc("apply_legacy_metric_conversions", {"conversions": conversions}).execute()
+            converted = result.data or 0
+            # Rows edited or deleted since they were read are left alone
+            if converted < len(conversions):
+                skipped[CONFLICT_REASON] += len(conversions) - converted
+
+        state = {
+            "last_id": rows[-1]["id"],
+            "scanned": state["scanned"] + len(rows),
+            "converted": state["converted"] + converted,
+            "skipped": dict(skipped),
+        }
+        scanned_this_run += len(rows)
+        if len(rows) < page_size:
+            completed = True
+        if not dry_run:
+            save_checkpoint(client, JOB_NAME, state, completed=completed)
+        if completed:
+            break
+
+    return {
+        "dry_run": dry_run,
+        "completed": completed,
+        "resumed_from": resumed_from,
+        "last_id": state["last_id"],
+        "scanned": state["scanned"],
+        "converted": state["converted"],
+        "skipped": state["skipped"],
+        "by_type": dict(by_type),
+        "by_unit": dict(by_unit),
+        "converted_samples": converted_samples,
+        "unparsed_samples": unparsed_samples,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert legacy metrics into standardized metrics")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and report without writing")
+    parser.add_argument("--limit", type=int, help="Stop after scanning this many rows")
+    parser.add_argument("--reset", action="store_true", help="Ignore the saved checkpoint")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = run(
+        get_service_client(),
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        limit=args.limit,
+        reset=args.reset,
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
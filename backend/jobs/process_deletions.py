@@ -0,0 +1,79 @@
+"""
+Resume deletion jobs that failed or were interrupted
+
+Deletion jobs normally run as a background task right after the delete request. Jobs
+whose run failed, or whose process died mid-run, are left unfinished; this job runs
+every unfinished job that hasn't been updated for a while, continuing from the
+progress each one checkpointed. Jobs that have failed DELETION_MAX_ATTEMPTS times are
+left blocked for manual inspection, with the failing step in last_error.
+
+Run from the repository root (e.g. from cron):
+    python -m backend.jobs.process_deletions --dry-run
+    python -m backend.jobs.process_deletions --stale-minutes 15
+"""
+import sys
+import json
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from supabase import Client
+from backend.db.client import get_service_client
+from backend.services.deletion_service import DeletionService, DELETION_MAX_ATTEMPTS
+from backend.services.stripe_service import StripeService
+
+DEFAULT_STALE_MINUTES = 15
+
+
+async def run(
+    client: Client,
+    dry_run: bool = False,
+    stale_minutes: int = DEFAULT_STALE_MINUTES,
+    max_attempts: int = DELETION_MAX_ATTEMPTS,
+) -> Dict[str, Any]:
+    """
+    Run unfinished deletion jobs not updated in the last stale_minutes
+
+    Args:
+        client: Service role Supabase client
+        dry_run: List the jobs without running them
+        stale_minutes: Leave jobs updated more recently alone (they may still be running)
+        max_attempts: Skip jobs that have already run this many times
+
+    Returns:
+        Report with the jobs found and how each one ended
+    """
+    updated_before = (datetime.now(timezone.utc) - timedelta(minutes=stale_minutes)).isoformat()
+    job_ids = DeletionService.list_resumable_jobs(client, updated_before, max_attempts)
+
+    report: Dict[str, Any] = {"dry_run": dry_run, "found": len(job_ids), "completed": [], "failed": []}
+    if dry_run:
+        report["jobs"] = job_ids
+        return report
+
+    for job_id in job_ids:
+        job = await DeletionService.run_job(client, job_id, StripeService)
+        if job is not None:
+            report["completed" if job.status == "completed" else "failed"].append(job_id)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resume failed or interrupted deletion jobs")
+    parser.add_argument("--dry-run", action="store_true", help="List the jobs without running them")
+    parser.add_argument("--stale-minutes", type=int, default=DEFAULT_STALE_MINUTES, help="Only jobs not updated for this long")
+    parser.add_argument("--max-attempts", type=int, default=DELETION_MAX_ATTEMPTS, help="Skip jobs that have run this many times")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(
+        get_service_client(),
+        dry_run=args.dry_run,
+        stale_minutes=args.stale_minutes,
+        max_attempts=args.max_attempts,
+    ))
+    print(json.dumps(report, indent=2))
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
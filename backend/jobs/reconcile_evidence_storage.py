@@ -0,0 +1,298 @@
+"""
+Reconcile the project-evidence bucket with project_evidence rows and delete orphans
+
+Deleting projects, portfolios or accounts cascades to project_evidence rows but leaves
+their storage objects behind, and evidence deletes continue when storage removal
+fails. This job walks the bucket one user folder at a time, listing objects in pages,
+and compares them with every path the database still references: evidence originals,
+their variants and unexpired upload reservations. Objects nobody references are
+deleted in batches. Objects written more recently than a minimum age are left alone, since an
+upload stores (or re-upserts) the object before inserting its row.
+
+Storage requests are throttled, and progress is checkpointed after every user folder.
+Evidence rows whose object is missing are reported but not changed.
+
+Run from the repository root:
+    python -m backend.jobs.reconcile_evidence_storage --dry-run --report report.json
+    python -m backend.jobs.reconcile_evidence_storage --requests-per-second 5
+"""
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from supabase import Client
+from backend.db.client import get_service_client
+from backend.jobs.checkpoints import load_checkpoint, save_checkpoint, clear_checkpoint
+
+JOB_NAME = "reconcile_evidence_storage"
+EVIDENCE_BUCKET = "project-evidence"
+LIST_PAGE_SIZE = 1000
+ROW_PAGE_SIZE = 1000
+DEFAULT_DELETE_BATCH_SIZE = 100
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+DEFAULT_MIN_AGE_MINUTES = 60
+REPORT_SAMPLE_SIZE = 20
+
+
+class RequestThrottle:
+    """Spaces storage requests at least 1 / requests_per_second seconds apart"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        now = time.monotonic()
+        if now < self._next_at:
+            time.sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + self.interval
+
+
+def _list_folder(bucket: Any, path: str, throttle: RequestThrottle) -> Iterator[Dict[str, Any]]:
+    """Entries directly inside a folder, one page per request"""
+    offset = 0
+    while True:
+        throttle.wait()
+        page = bucket.list(path, {
+            "limit": LIST_PAGE_SIZE,
+            "offset": offset,
+            "sortBy": {"column": "name", "order": "asc"},
+        }) or []
+        yield from page
+        if len(page) < LIST_PAGE_SIZE:
+            return
+        offset += LIST_PAGE_SIZE
+
+
+def _list_objects(bucket: Any, prefix: str, throttle: RequestThrottle) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(path, entry) for every object under a folder, recursively; folders have no id"""
+    for entry in _list_folder(bucket, prefix, throttle):
+        path = f"{prefix}/{entry['name']}"
+        if entry.get("id") is None:
+            yield from _list_objects(bucket, path, throttle)
+        else:
+            yield path, entry
+
+
+def _referenced_paths(client: Client, user_id: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Storage paths the database references for a user
+
+    Returns:
+        (evidence original paths, every referenced path including variants and
+        unexpired upload reservations)
+    """
+    originals: Set[str] = set()
+    referenced: Set[str] = set()
+    last_id = None
+    while True:
+        query = client.table("project_evidence")\
+            .select("id, file_path, variants, impact_projects!inner(user_id)")\
+            .eq("impact_projects.user_id", user_id)
+        if last_id:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(ROW_PAGE_SIZE).execute().data or []
+        for row in rows:
+            originals.add(row["file_path"])
+            referenced.update(v["file_path"] for v in row.get("variants") or [])
+        if len(rows) < ROW_PAGE_SIZE:
+            break
+        last_id = rows[-1]["id"]
+    referenced |= originals
+
+    reservations = client.table("evidence_upload_reservations")\
+        .select("file_path")\
+        .eq("user_id", user_id)\
+        .gt("expires_at", datetime.now(timezone.utc).isoformat())\
+        .execute()
+    referenced.update(r["file_path"] for r in reservations.data or [])
+    return originals, referenced
+
+
+def _written_before(entry: Dict[str, Any], cutoff: datetime) -> bool:
+    """
+    Whether a listed object was last written before cutoff; unknown ages count as recent
+
+    Uploads upsert, so re-uploading a content-addressed object keeps its original
+    created_at; updated_at (or last_accessed_at) shows the rewrite.
+    """
+    timestamps = [
+        datetime.fromisoformat(entry[key].replace("Z", "+00:00"))
+        for key in ("updated_at", "last_accessed_at", "created_at")
+        if entry.get(key)
+    ]
+    if not timestamps:
+        return False
+    return max(timestamps) < cutoff
+
+
+def reconcile_folder(
+    client: Client,
+    user_id: str,
+    throttle: RequestThrottle,
+    cutoff: datetime,
+    dry_run: bool = False,
+    delete_batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Reconcile one user folder of the bucket
+
+    Returns:
+        Counts for the folder plus the orphaned and missing paths
+    """
+    bucket = client.storage.from_(EVIDENCE_BUCKET)
+    stored = dict(_list_objects(bucket, user_id, throttle))
+    originals, referenced = _referenced_paths(client, user_id)
+
+    unreferenced = stored.keys() - referenced
+    orphaned = sorted(path for path in unreferenced if _written_before(stored[path], cutoff))
+    missing = sorted(originals - stored.keys())
+    orphaned_bytes = sum(int((stored[path].get("metadata") or {}).get("size") or 0) for path in orphaned)
+
+    deleted = 0
+    if not dry_run:
+        for start in range(0, len(orphaned), delete_batch_size):
+            batch = orphaned[start:start + delete_batch_size]
+            throttle.wait()
+            bucket.remove(batch)
+            deleted += len(batch)
+
+    return {
+        "objects": len(stored),
+        "orphaned": orphaned,
+        "orphaned_bytes": orphaned_bytes,
+        "too_recent": len(unreferenced) - len(orphaned),
+        "deleted": deleted,
+        "missing": missing,
+    }
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {
+        "last_prefix": None,
+        "folders": 0,
+        "objects": 0,
+        "orphaned": 0,
+        "orphaned_bytes": 0,
+        "too_recent": 0,
+        "deleted": 0,
+        "missing": 0,
+    }
+
+
+def run(
+    client: Client,
+    dry_run: bool = False,
+    prefix: Optional[str] = None,
+    delete_batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    min_age_minutes: int = DEFAULT_MIN_AGE_MINUTES,
+    reset: bool = False,
+) -> Dict[str, Any]:
+    """
+    Delete storage objects no evidence row, variant or upload reservation references
+
+    Args:
+        client: Service role Supabase client
+        dry_run: Find orphans without deleting them or saving checkpoints
+        prefix: Reconcile only this user folder (no checkpoint is used)
+        delete_batch_size: Objects removed per storage request
+        requests_per_second: Limit on storage list and remove requests
+        min_age_minutes: Leave unreferenced objects younger than this alone
+        reset: Ignore any saved checkpoint and start from the first folder
+
+    Returns:
+        Report with totals and sample orphaned and missing paths
+    """
+    use_checkpoint = not dry_run and prefix is None
+    state = _initial_state()
+    if use_checkpoint:
+        if reset:
+            clear_checkpoint(client, JOB_NAME)
+        checkpoint = load_checkpoint(client, JOB_NAME)
+        # A finished run starts over from the first folder
+        if checkpoint and not checkpoint.get("completed_at"):
+            state = {**state, **(checkpoint.get("state") or {})}
+    resumed_from = state["last_prefix"]
+
+    throttle = RequestThrottle(requests_per_second)
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=min_age_minutes)
+    bucket = client.storage.from_(EVIDENCE_BUCKET)
+    if prefix:
+        folders: Iterator[str] = iter([prefix])
+    else:
+        # Folders come back sorted by name, so a resumed run skips up to the checkpoint
+        folders = (
+            entry["name"] for entry in _list_folder(bucket, "", throttle)
+            if entry.get("id") is None and (resumed_from is None or entry["name"] > resumed_from)
+        )
+
+    orphaned_samples: List[str] = []
+    missing_samples: List[str] = []
+    for folder in folders:
+        result = reconcile_folder(
+            client, folder, throttle, cutoff,
+            dry_run=dry_run,
+            delete_batch_size=delete_batch_size,
+        )
+        orphaned_samples.extend(result["orphaned"][:REPORT_SAMPLE_SIZE - len(orphaned_samples)])
+        missing_samples.extend(result["missing"][:REPORT_SAMPLE_SIZE - len(missing_samples)])
+        state = {
+            "last_prefix": folder,
+            "folders": state["folders"] + 1,
+            "objects": state["objects"] + result["objects"],
+            "orphaned": state["orphaned"] + len(result["orphaned"]),
+            "orphaned_bytes": state["orphaned_bytes"] + result["orphaned_bytes"],
+            "too_recent": state["too_recent"] + result["too_recent"],
+            "deleted": state["deleted"] + result["deleted"],
+            "missing": state["missing"] + len(result["missing"]),
+        }
+        if use_checkpoint:
+            save_checkpoint(client, JOB_NAME, state)
+
+    if use_checkpoint:
+        save_checkpoint(client, JOB_NAME, state, completed=True)
+
+    return {
+        "dry_run": dry_run,
+        "resumed_from": resumed_from,
+        **state,
+        "orphaned_samples": orphaned_samples,
+        "missing_samples": missing_samples,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Delete evidence storage objects no longer referenced")
+    parser.add_argument("--dry-run", action="store_true", help="Report orphans without deleting")
+    parser.add_argument("--prefix", help="Only reconcile this user folder")
+    parser.add_argument("--delete-batch-size", type=int, default=DEFAULT_DELETE_BATCH_SIZE, help="Objects per delete request")
+    parser.add_argument("--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="Storage request rate limit")
+    parser.add_argument("--min-age-minutes", type=int, default=DEFAULT_MIN_AGE_MINUTES, help="Keep unreferenced objects younger than this")
+    parser.add_argument("--reset", action="store_true", help="Ignore the saved checkpoint")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = run(
+        get_service_client(),
+        dry_run=args.dry_run,
+        prefix=args.prefix,
+        delete_batch_size=args.delete_batch_size,
+        requests_per_second=args.requests_per_second,
+        min_age_minutes=args.min_age_minutes,
+        reset=args.reset,
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
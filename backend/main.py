@@ -8,8 +8,11 @@ import uvicorn
 import re
 import logging
 import threading
+from contextlib import asynccontextmanager
 from .middleware.traceloop import setup_traceloop
 from .middleware.rate_limiter import setup_rate_limiter, handle_threading_exception
+from .utils.http_client import start_http_client, close_http_client
+from .services.evidence_variant_service import EvidenceVariantService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +34,18 @@ from .routers import github_auth, auth, user, projects, portfolios, waitlist, su
 # Check if we're in production (disable API docs)
 is_production = os.getenv("ENVIRONMENT", "").lower() in ["production", "prod"]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared outbound HTTP client for the app's lifetime, and stop worker pools on shutdown"""
+    await start_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+        EvidenceVariantService.shutdown_executor()
+
+
 app = FastAPI(
     title="Dev Impact API",
     description="Backend API for Dev Impact application with GitHub OAuth",
@@ -38,6 +53,7 @@ app = FastAPI(
     docs_url=None if is_production else "/docs",
     redoc_url=None if is_production else "/redoc",
     openapi_url=None if is_production else "/openapi.json",
+    lifespan=lifespan,
 )
 
 # Add rate limiter to app state (only if initialized successfully)
@@ -18,7 +18,7 @@ from backend.schemas.auth import (
 from backend.services.auth.auth_service import AuthService
 from backend.services.auth.mfa_service import MFAService
 from backend.utils import auth_utils
-from backend.utils.dependencies import ServiceDBClient
+from backend.utils.dependencies import ServiceDBClient, HttpClient
 
 router = APIRouter(
     prefix="/api/auth",
@@ -39,7 +39,7 @@ async def sign_up(request: SignUpRequest, client: ServiceDBClient):
 
 
 @router.post("/signin", response_model=AuthResponse)
-async def sign_in(request: SignInRequest, client: ServiceDBClient):
+async def sign_in(request: SignInRequest, client: ServiceDBClient, http: HttpClient):
     """
     Sign in an existing user
     
@@ -49,6 +49,7 @@ async def sign_in(request: SignInRequest, client: ServiceDBClient):
     """
     result = await AuthService.sign_in(
         client,
+        http,
         request.email, 
         request.password,
         request.mfa_challenge_id,
@@ -103,6 +104,7 @@ async def reset_password(request: ResetPasswordRequest, client: ServiceDBClient)
 @router.post("/update-password", response_model=MessageResponse)
 async def update_password(
     request: UpdatePasswordRequest,
+    http: HttpClient,
     authorization: str = Depends(auth_utils.get_access_token)
 ):
     """
@@ -111,13 +113,14 @@ async def update_password(
     Updates the password for the currently authenticated user.
     Requires valid access token.
     """
-    result = await AuthService.update_password(authorization, request.new_password)
+    result = await AuthService.update_password(http, authorization, request.new_password)
     return result
 
 
 @router.post("/mfa/enroll", response_model=MFAEnrollResponse)
 async def mfa_enroll(
     request: MFAEnrollRequest,
+    http: HttpClient,
     authorization: str = Depends(auth_utils.get_access_token)
 ):
     """
@@ -126,13 +129,14 @@ async def mfa_enroll(
     Creates a new TOTP factor and returns QR code for setup.
     Requires valid access token.
     """
-    result = await MFAService.mfa_enroll(authorization, request.friendly_name)
+    result = await MFAService.mfa_enroll(http, authorization, request.friendly_name)
     return result
 
 
 @router.post("/mfa/verify", response_model=MessageResponse)
 async def mfa_verify_enrollment(
     request: MFAVerifyRequest,
+    http: HttpClient,
     authorization: str = Depends(auth_utils.get_access_token)
 ):
     """
@@ -141,28 +145,27 @@ async def mfa_verify_enrollment(
     Verifies the TOTP code to complete enrollment.
     Requires valid access token.
     """
-    result = await MFAService.mfa_verify_enrollment(authorization, request.factor_id, request.code)
+    result = await MFAService.mfa_verify_enrollment(http, authorization, request.factor_id, request.code)
     return result
 
 
 @router.get("/mfa/factors", response_model=MFAListResponse)
-async def mfa_list_factors(client: ServiceDBClient, authorization: str = Depends(auth_utils.get_access_token)):
+async def mfa_list_factors(principal: auth_utils.CurrentPrincipal, http: HttpClient):
     """
     List all MFA factors for the current user
     
     Returns list of enrolled MFA factors.
     Requires valid access token.
     """
-    user_id = await auth_utils.verify_token(client, authorization)
-    result = await MFAService.mfa_list_factors(user_id)
+    result = await MFAService.mfa_list_factors(http, principal.user_id)
     return result
 
 
 @router.delete("/mfa/factors/{factor_id}", response_model=MessageResponse)
 async def mfa_unenroll(
     factor_id: str,
-    client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal,
+    http: HttpClient
 ):
     """
     Unenroll (remove) an MFA factor
@@ -170,7 +173,6 @@ async def mfa_unenroll(
     Removes the specified MFA factor from the user's account.
     Requires valid access token.
     """
-    user_id = await auth_utils.verify_token(client, authorization)
-    result = await MFAService.mfa_unenroll(user_id, factor_id)
+    result = await MFAService.mfa_unenroll(http, principal.user_id, factor_id)
     return result
 
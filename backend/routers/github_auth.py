@@ -7,27 +7,28 @@ from backend.schemas.github_auth import (
     TokenResponse,
 )
 from backend.services.github_service import GitHubService
+from backend.utils.dependencies import HttpClient
 
 router = APIRouter(prefix="/api/auth/github", tags=["GitHub OAuth"])
 
 
 @router.post("/device/code", response_model=DeviceCodeResponse)
-async def initiate_device_flow():
+async def initiate_device_flow(http: HttpClient):
     """
     Initiate GitHub Device Flow authentication.
     Returns device code, user code, and verification URI for the user to authorize.
     """
-    result = await GitHubService.initiate_device_flow()
+    result = await GitHubService.initiate_device_flow(http)
     return result
 
 
 @router.post("/device/poll", response_model=TokenResponse)
-async def poll_device_token(request: PollRequest):
+async def poll_device_token(request: PollRequest, http: HttpClient):
     """
     Poll for GitHub access token.
     Returns access token if user has authorized, otherwise returns pending status.
     """
-    result = await GitHubService.poll_for_token(request.device_code)
+    result = await GitHubService.poll_for_token(http, request.device_code)
         
     if result is None:
         # Still pending authorization
@@ -37,11 +38,11 @@ async def poll_device_token(request: PollRequest):
 
 
 @router.post("/user", response_model=GitHubUser)
-async def get_user_profile(request: UserProfileRequest):
+async def get_user_profile(request: UserProfileRequest, http: HttpClient):
     """
     Get GitHub user profile using access token.
     Returns user's GitHub profile information.
     """
-    user = await GitHubService.get_user_profile(request.access_token)
+    user = await GitHubService.get_user_profile(http, request.access_token)
     return user
 
@@ -1,7 +1,7 @@
 """
 LLM Router - API endpoints for LLM operations
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException
 from backend.schemas.llm import CompletionRequest, CompletionResponse
 from backend.services.llm_service import LLMService
 from backend.utils import auth_utils
@@ -10,14 +10,14 @@ router = APIRouter(prefix="/llm", tags=["llm"])
 
 
 @router.post("/completion", response_model=CompletionResponse)
-async def generate_completion(request: CompletionRequest, authorization: str = Depends(auth_utils.get_access_token)):
+async def generate_completion(request: CompletionRequest, principal: auth_utils.CurrentPrincipal):
     """
     Generate a completion using the specified LLM provider
 
     This endpoint uses LiteLLM with Helicone observability to generate
     completions from OpenRouter or Groq providers.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     if request.provider not in ["openrouter", "groq"]:
         raise HTTPException(
@@ -2,11 +2,12 @@
 Portfolios Router - Unified router for portfolio CRUD and publishing operations
 Merges endpoints from user_profile.py and profile.py
 """
-from fastapi import APIRouter, Header, Depends, HTTPException
+from fastapi import APIRouter, Header, HTTPException, BackgroundTasks
 from typing import List, Optional
 from backend.schemas.portfolio import (
     Portfolio,
     CreatePortfolioRequest,
+    ClonePortfolioRequest,
     UpdatePortfolioRequest,
     PublishPortfolioRequest,
     PublishPortfolioResponse,
@@ -14,11 +15,15 @@ from backend.schemas.portfolio import (
     ListPortfoliosResponse,
     PortfolioStatsResponse,
 )
+from backend.schemas.project import ReorderRequest, ReorderResponse
 from backend.schemas.auth import MessageResponse
+from backend.schemas.user import DeletionJob
 from backend.services.portfolio_service import PortfolioService
 from backend.services.subscription_service import SubscriptionService
 from backend.services.user_service import UserService
 from backend.services.project_service import ProjectService
+from backend.services.impact_service import ImpactService
+from backend.services.deletion_service import DeletionService
 from backend.utils import auth_utils
 from backend.utils.dependencies import ServiceDBClient
 
@@ -36,14 +41,14 @@ router = APIRouter(
 async def create_portfolio(
     portfolio: CreatePortfolioRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Create a new portfolio
     
     Creates a portfolio that can group related projects.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     # Step 1: Check subscription limits (orchestration in router)
     subscription_info = await SubscriptionService.get_subscription_info(client, user_id)
@@ -60,15 +65,60 @@ async def create_portfolio(
     return result
 
 
+@router.post("/{portfolio_id}/clone", response_model=Portfolio)
+async def clone_portfolio(
+    portfolio_id: str,
+    request: ClonePortfolioRequest,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal
+):
+    """
+    Clone a portfolio with all of its projects
+    
+    Projects, metrics and evidence are copied server-side in one statement; evidence
+    files are shared with the original portfolio's projects rather than uploaded again.
+    """
+    user_id = principal.user_id
+    source = await PortfolioService.get_portfolio(client, portfolio_id, user_id)
+    
+    # Step 1: Check subscription limits (orchestration in router)
+    subscription_info = await SubscriptionService.get_subscription_info(client, user_id)
+    
+    # Step 2: Create the new portfolio
+    portfolio = await PortfolioService.create_portfolio(
+        client=client,
+        subscription_info=subscription_info,
+        user_id=user_id,
+        name=request.name or f"{source.name} (copy)",
+        description=request.description if request.description is not None else source.description
+    )
+    
+    # Step 3: Clone the projects into it, removing the empty portfolio if that fails
+    try:
+        await ProjectService.clone_portfolio_projects(
+            client=client,
+            subscription_info=subscription_info,
+            user_id=user_id,
+            source_portfolio_id=portfolio_id,
+            target_portfolio_id=portfolio.id
+        )
+    except HTTPException:
+        await PortfolioService.delete_portfolio(client, portfolio.id, user_id)
+        raise
+    
+    ImpactService.invalidate_user(user_id)
+    return portfolio
+
+
 @router.get("", response_model=List[Portfolio])
 async def list_portfolios(
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     List all portfolios for the authenticated user
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     portfolios = await PortfolioService.list_portfolios(client, user_id)
     return portfolios
 
@@ -76,7 +126,7 @@ async def list_portfolios(
 @router.get("/published/stats", response_model=PortfolioStatsResponse)
 async def get_published_portfolio_stats(
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Get view count statistics for all of the authenticated user's portfolios
@@ -86,7 +136,7 @@ async def get_published_portfolio_stats(
     
     NOTE: This must be defined BEFORE /published to avoid route conflicts.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     result = await PortfolioService.get_published_portfolio_stats(client, user_id)
     return result
 
@@ -113,12 +163,12 @@ async def list_published_portfolios(
 async def get_portfolio(
     portfolio_id: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Get a single portfolio by ID
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     portfolio = await PortfolioService.get_portfolio(client, portfolio_id, user_id)
     return portfolio
 
@@ -128,12 +178,12 @@ async def update_portfolio(
     portfolio_id: str,
     portfolio: UpdatePortfolioRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Update a portfolio
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     result = await PortfolioService.update_portfolio(
         client,
         portfolio_id, 
@@ -144,18 +194,47 @@ async def update_portfolio(
     return result
 
 
-@router.delete("/{portfolio_id}", response_model=MessageResponse)
+@router.put("/{portfolio_id}/order", response_model=ReorderResponse)
+async def reorder_portfolio(
+    portfolio_id: str,
+    request: ReorderRequest,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal
+):
+    """
+    Move a portfolio before and/or after the given portfolios
+    """
+    user_id = principal.user_id
+    result = await PortfolioService.reorder_portfolio(
+        client,
+        portfolio_id,
+        user_id,
+        before_id=request.before_id,
+        after_id=request.after_id
+    )
+    return result
+
+
+@router.delete("/{portfolio_id}", response_model=DeletionJob, status_code=202)
 async def delete_portfolio(
     portfolio_id: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    background_tasks: BackgroundTasks,
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Delete a portfolio
+    
+    Marks the portfolio and its projects as deleted, unpublishes it, and removes them
+    in the background. Poll GET /api/user/deletions/{job_id} for progress.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
-    result = await PortfolioService.delete_portfolio(client, portfolio_id, user_id)
-    return result
+    user_id = principal.user_id
+    job = await DeletionService.request_deletion(client, user_id, "portfolio", portfolio_id)
+    background_tasks.add_task(DeletionService.run_job, client, job.id)
+    # Deleting a portfolio deletes its projects
+    ImpactService.invalidate_user(user_id)
+    ProjectService.invalidate_evidence_access(user_id)
+    return job
 
 
 # ============================================
@@ -167,7 +246,7 @@ async def publish_portfolio(
     portfolio_id: str,
     publish_request: PublishPortfolioRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Publish a portfolio with a username
@@ -175,7 +254,7 @@ async def publish_portfolio(
     This endpoint creates or updates a published portfolio with a unique username.
     The portfolio will be accessible at {username}.{BASE_DOMAIN}/{portfolio-slug}
     """
-    user_id = auth_utils.get_user_id_from_token(authorization)
+    user_id = principal.user_id
     
     # Step 1: Fetch user profile (orchestration in router)
     user_profile = await UserService.get_profile(client, user_id)
@@ -197,6 +276,8 @@ async def publish_portfolio(
         user_profile=user_profile,
         projects=projects
     )
+    # Evidence of the portfolio's projects becomes public
+    ProjectService.invalidate_evidence_access(user_id)
     return result
 
 
@@ -205,7 +286,7 @@ async def unpublish_portfolio(
     username: str,
     portfolio_slug: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Unpublish a portfolio
@@ -213,8 +294,9 @@ async def unpublish_portfolio(
     This endpoint unpublishes the portfolio (sets is_published to false).
     Only the portfolio owner can unpublish their portfolio.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     result = await PortfolioService.unpublish_portfolio(client, username, portfolio_slug, user_id)
+    ProjectService.invalidate_evidence_access(user_id)
     return result
 
 
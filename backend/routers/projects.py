@@ -1,56 +1,159 @@
 """
 Projects Router - Handle project CRUD endpoints
 """
-from fastapi import APIRouter, Query, Depends, UploadFile, File, Header
-from typing import Optional, List
+from fastapi import APIRouter, Query, UploadFile, File, Header, HTTPException, Request, BackgroundTasks
+from fastapi.responses import Response, StreamingResponse
+from contextlib import ExitStack
+from typing import Optional, List, Union, Literal
 from backend.schemas.project import (
     Project,
     CreateProjectRequest,
     UpdateProjectRequest,
+    BulkProjectRequest,
+    BulkProjectResponse,
+    ReorderRequest,
+    ReorderResponse,
+    CloneProjectRequest,
     ProjectEvidence,
+    EvidenceUploadUrlRequest,
+    EvidenceUploadUrlResponse,
+    FinalizeEvidenceRequest,
     EvidenceStatsResponse,
+    ProjectPage,
+    ImportProjectsResponse,
+    PROJECT_LIST_ADAPTER,
 )
 from backend.services.project_service import ProjectService
 from backend.services.subscription_service import SubscriptionService
+from backend.services.import_service import ImportService
+from backend.services.impact_service import ImpactService
+from backend.services.evidence_variant_service import EvidenceVariantService
+from backend.services.deletion_service import DeletionService
+from backend.schemas.impact import ImpactSummaryResponse
 from backend.utils import auth_utils
 from backend.schemas.auth import MessageResponse
+from backend.schemas.user import DeletionJob
 from backend.utils.dependencies import ServiceDBClient
+from backend.utils.uploads import receive_multipart_files
 
 router = APIRouter(
     prefix="/api/projects",
     tags=["projects"],
 )
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+IMPORT_MAX_FILE_SIZE_MB = 20
 
-@router.get("", response_model=List[Project])
+# Evidence uploads read the request stream directly, so describe the form body for OpenAPI
+EVIDENCE_UPLOAD_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["file"],
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        }
+    },
+}
+
+EVIDENCE_BATCH_MAX_FILES = 10
+EVIDENCE_BATCH_UPLOAD_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["files"],
+                "properties": {
+                    "files": {
+                        "type": "array",
+                        "items": {"type": "string", "format": "binary"},
+                        "maxItems": EVIDENCE_BATCH_MAX_FILES,
+                    }
+                },
+            }
+        }
+    },
+}
+
+
+@router.get("", response_model=Union[List[Project], ProjectPage])
 async def list_projects(
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token),
-    portfolio_id: Optional[str] = Query(None, description="Filter projects by portfolio ID")
+    principal: auth_utils.CurrentPrincipal,
+    portfolio_id: Optional[str] = Query(None, description="Filter projects by portfolio ID"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; returns a ProjectPage when set"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    accept: Optional[str] = Header(None)
 ):
     """
     List all projects for current user
     
     Returns all projects owned by the authenticated user, optionally filtered by portfolio.
+    
+    - With `limit` (and optionally `cursor`), returns one page and a `next_cursor`.
+    - With `Accept: application/x-ndjson`, streams one project per line as pages are read.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
+    
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        pages = ProjectService.iter_project_pages(client, user_id, portfolio_id=portfolio_id)
+        # Read the first page before responding so errors still return a proper status code
+        first_page = await anext(pages, [])
+        
+        async def stream():
+            for project in first_page:
+                yield project.model_dump_json() + "\n"
+            async for page in pages:
+                for project in page:
+                    yield project.model_dump_json() + "\n"
+        
+        return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+    
+    # Projects are built from trusted DB rows, so serialize directly instead of letting
+    # FastAPI dump and re-validate every project against the response model
+    if limit or cursor:
+        page = await ProjectService.list_projects_page(
+            client, user_id, limit=limit or 50, cursor=cursor, portfolio_id=portfolio_id
+        )
+        return Response(content=page.model_dump_json(), media_type="application/json")
     
     projects = await ProjectService.list_projects(client, user_id, portfolio_id=portfolio_id)
-    return projects
+    return Response(content=PROJECT_LIST_ADAPTER.dump_json(projects), media_type="application/json")
+
+
+@router.get("/impact-summary", response_model=ImpactSummaryResponse)
+async def get_impact_summary(
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+    portfolio_id: Optional[str] = Query(None, description="Limit the summary to one portfolio")
+):
+    """
+    Get headline impact numbers across the user's projects
+    
+    Aggregates standardized metrics by type and frequency (totals, medians and
+    percentiles, with savings annualized). Cached until the user's projects change.
+    """
+    user_id = principal.user_id
+    
+    summary = await ImpactService.get_impact_summary(client, user_id, portfolio_id)
+    return summary
 
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(
     project_id: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Get a single project by ID
     
     Returns project data if owned by the authenticated user.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     project = await ProjectService.get_project(client, project_id, user_id)
     return project
@@ -60,14 +163,14 @@ async def get_project(
 async def create_project(
     request: CreateProjectRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Create a new project
     
     Creates a new project for the authenticated user.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     # Step 1: Check subscription limits (orchestration in router)
     subscription_info = await SubscriptionService.get_subscription_info(client, user_id)
@@ -80,127 +183,431 @@ async def create_project(
         user_id=user_id,
         project_data=project_data
     )
+    ImpactService.invalidate_user(user_id)
     return project
 
 
+@router.post("/bulk", response_model=BulkProjectResponse)
+async def bulk_project_operations(
+    request: BulkProjectRequest,
+    client: ServiceDBClient,
+    background_tasks: BackgroundTasks,
+    principal: auth_utils.CurrentPrincipal
+):
+    """
+    Apply several project operations in one request
+    
+    Accepts a list of create/update/delete operations (e.g. for imports or reorganizing a portfolio).
+    The subscription limit is checked once for the whole batch and each operation gets its own result,
+    so one failing operation does not fail the others. Deleted projects are removed in the
+    background like DELETE /api/projects/{id}; each delete result carries its job_id.
+    """
+    user_id = principal.user_id
+    
+    # Step 1: Check subscription limits once for the batch (orchestration in router)
+    subscription_info = await SubscriptionService.get_subscription_info(client, user_id)
+    
+    # Step 2: Apply operations
+    result = await ProjectService.bulk_project_operations(
+        client=client,
+        subscription_info=subscription_info,
+        user_id=user_id,
+        operations=request.operations,
+        request_deletion=DeletionService.request_deletion
+    )
+    
+    # Step 3: Tear down deleted projects in the background
+    for op_result in result.results:
+        if op_result.job_id:
+            background_tasks.add_task(DeletionService.run_job, client, op_result.job_id)
+    ImpactService.invalidate_user(user_id)
+    # Projects may have moved between portfolios
+    ProjectService.invalidate_evidence_access(user_id)
+    return result
+
+
+@router.post("/import", response_model=ImportProjectsResponse)
+async def import_projects(
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+    file: UploadFile = File(...),
+    format: Literal["auto", "json_resume", "csv", "export"] = Query("auto", description="Input format (detected from content by default)"),
+    portfolio_id: Optional[str] = Query(None, description="Portfolio to add the imported projects to")
+):
+    """
+    Import projects from a file
+    
+    Accepts a JSON Resume document, a CSV (same columns as the export's projects.csv)
+    or a dev-impact export (the ZIP or its projects.json). Valid projects are created in
+    batches; the response reports the outcome of every row.
+    """
+    user_id = principal.user_id
+    
+    if file.size and file.size > IMPORT_MAX_FILE_SIZE_MB * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"Import files are limited to {IMPORT_MAX_FILE_SIZE_MB} MB")
+    
+    # Step 1: Check subscription limits once (orchestration in router)
+    subscription_info = await SubscriptionService.get_subscription_info(client, user_id)
+    
+    # Step 2: Parse lazily and create projects in batches
+    import_format, rows = ImportService.parse_projects(file.file, format)
+    result = await ProjectService.import_projects(
+        client=client,
+        subscription_info=subscription_info,
+        user_id=user_id,
+        import_format=import_format,
+        rows=rows,
+        portfolio_id=portfolio_id
+    )
+    ImpactService.invalidate_user(user_id)
+    return result
+
+
 @router.put("/{project_id}", response_model=Project)
 async def update_project(
     project_id: str,
     request: UpdateProjectRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Update a project
     
     Updates project data if owned by the authenticated user.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     project_data = request.model_dump(exclude_none=True)
     project = await ProjectService.update_project(client, project_id, user_id, project_data)
+    ImpactService.invalidate_user(user_id)
+    # The project may have moved to another portfolio
+    ProjectService.invalidate_evidence_access(user_id)
     return project
 
 
-@router.delete("/{project_id}", response_model=MessageResponse)
+@router.post("/{project_id}/clone", response_model=Project)
+async def clone_project(
+    project_id: str,
+    request: CloneProjectRequest,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal
+):
+    """
+    Clone a project
+    
+    Copies the project with its metrics and evidence, optionally into another portfolio.
+    Evidence files are shared with the original rather than uploaded again.
+    """
+    user_id = principal.user_id
+    
+    # Step 1: Check subscription limits (orchestration in router)
+    subscription_info = await SubscriptionService.get_subscription_info(client, user_id)
+    
+    # Step 2: Clone project
+    project = await ProjectService.clone_project(
+        client=client,
+        subscription_info=subscription_info,
+        user_id=user_id,
+        project_id=project_id,
+        portfolio_id=request.portfolio_id
+    )
+    ImpactService.invalidate_user(user_id)
+    return project
+
+
+@router.put("/{project_id}/order", response_model=ReorderResponse)
+async def reorder_project(
+    project_id: str,
+    request: ReorderRequest,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal
+):
+    """
+    Move a project
+    
+    Places the project before and/or after the given projects of the same portfolio.
+    Only the moved project is updated.
+    """
+    user_id = principal.user_id
+    
+    result = await ProjectService.reorder_project(
+        client,
+        project_id,
+        user_id,
+        before_id=request.before_id,
+        after_id=request.after_id
+    )
+    return result
+
+
+@router.delete("/{project_id}", response_model=DeletionJob, status_code=202)
 async def delete_project(
     project_id: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    background_tasks: BackgroundTasks,
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Delete a project
     
-    Deletes project if owned by the authenticated user.
+    Marks the project as deleted if owned by the authenticated user and removes it and
+    its evidence files in the background. Poll GET /api/user/deletions/{job_id} for
+    progress.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
-    result = await ProjectService.delete_project(client, project_id, user_id)
-    return result
+    job = await DeletionService.request_deletion(client, user_id, "project", project_id)
+    background_tasks.add_task(DeletionService.run_job, client, job.id)
+    ImpactService.invalidate_user(user_id)
+    ProjectService.invalidate_evidence_access(user_id)
+    return job
 
 
 @router.get("/{project_id}/evidence", response_model=List[ProjectEvidence])
 async def list_project_evidence(
     project_id: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.OptionalPrincipal
 ):
     """
     List all evidence for a project.
     Publicly accessible for published profiles.
     Owners can always see their own evidence.
     """
-    user_id = None
-    if authorization:
-        # Try to extract user ID, but don't fail if token is invalid
-        try:
-            user_id = auth_utils.get_user_id_from_token(authorization.replace("Bearer ", ""))
-        except Exception:
-            pass  # keep user_id as None for public access
+    # Anonymous or invalid tokens get public access
+    user_id = principal.user_id if principal else None
     
     evidence = await ProjectService.list_project_evidence(client, project_id, user_id)
     return evidence
 
 
-@router.post("/{project_id}/evidence", response_model=ProjectEvidence)
+@router.post(
+    "/{project_id}/evidence",
+    response_model=ProjectEvidence,
+    openapi_extra={"requestBody": EVIDENCE_UPLOAD_REQUEST_BODY},
+)
 async def upload_project_evidence(
     project_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
     client: ServiceDBClient,
-    file: UploadFile = File(...),
-    authorization: str = Depends(auth_utils.get_access_token),
+    principal: auth_utils.CurrentPrincipal,
 ):
     """
     Upload a screenshot for a project and create an evidence record.
 
-    Accepts an image file upload, validates it, uploads to Supabase storage,
-    and creates the evidence record in a single step.
+    Accepts an image file upload (multipart field `file`), validates it, uploads to
+    Supabase storage, and creates the evidence record in a single step.
+
+    The body is read in chunks: uploads whose Content-Length exceeds the user's remaining
+    storage are rejected before any bytes are read, the limit is enforced again as bytes
+    arrive, and large files are spooled to disk and streamed to storage. Files are
+    stored by content hash, so re-uploading a file the user already has stores nothing.
+
+    Resized WebP/AVIF variants are generated after the response is sent.
+    """
+    user_id = principal.user_id
+
+    # Step 1: Check ownership and remaining storage before reading the body
+    remaining_bytes, limit_detail = await ProjectService.get_evidence_upload_allowance(
+        client, project_id, user_id, principal.subscription_tier
+    )
+
+    # Step 2: Receive the file within the allowance
+    uploads = await receive_multipart_files(
+        request,
+        field_name="file",
+        max_bytes=remaining_bytes,
+        too_large_detail=limit_detail,
+        content_type_prefix="image/",
+    )
+    upload = uploads[0]
+    try:
+        # Step 3: Stream to storage and create the record
+        with upload.open() as file_content:
+            evidence = await ProjectService.upload_evidence_file(
+                client,
+                project_id=project_id,
+                user_id=user_id,
+                file_name=upload.filename or "screenshot",
+                mime_type=upload.content_type,
+                file_size=upload.size,
+                file_content=file_content,
+                content_hash=upload.sha256,
+                subscription_type=principal.subscription_tier,
+            )
+    finally:
+        upload.close()
+
+    # Step 4: Generate variants in the background (duplicates reuse the existing ones)
+    if evidence.variants is None:
+        background_tasks.add_task(EvidenceVariantService.generate_for_evidence, client, evidence.file_path, evidence.mime_type)
+    return evidence
+
+
+@router.post(
+    "/{project_id}/evidence/batch",
+    response_model=List[ProjectEvidence],
+    openapi_extra={"requestBody": EVIDENCE_BATCH_UPLOAD_REQUEST_BODY},
+)
+async def upload_project_evidence_batch(
+    project_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+):
+    """
+    Upload several screenshots for a project at once (multipart field `files`).
+
+    Ownership, storage quota and ordering are checked once for the batch, the combined
+    size must fit the user's remaining storage, files are uploaded to storage
+    concurrently and all evidence records are created together. Records are returned
+    in upload order; if any file fails, none are created.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
 
-    file_content = await file.read()
-    file_size = len(file_content)
+    remaining_bytes, limit_detail = await ProjectService.get_evidence_upload_allowance(
+        client, project_id, user_id, principal.subscription_tier
+    )
+
+    uploads = await receive_multipart_files(
+        request,
+        field_name="files",
+        max_bytes=remaining_bytes,
+        too_large_detail=limit_detail,
+        max_files=EVIDENCE_BATCH_MAX_FILES,
+        content_type_prefix="image/",
+    )
+    try:
+        with ExitStack() as stack:
+            files = [
+                {
+                    "file_name": upload.filename or "screenshot",
+                    "mime_type": upload.content_type,
+                    "file_size": upload.size,
+                    "content": stack.enter_context(upload.open()),
+                    "content_hash": upload.sha256,
+                }
+                for upload in uploads
+            ]
+            evidence = await ProjectService.upload_evidence_files(
+                client, project_id, user_id, files, principal.subscription_tier
+            )
+    finally:
+        for upload in uploads:
+            upload.close()
 
-    evidence = await ProjectService.upload_evidence_file(
+    pending_variants = {e.file_path: e.mime_type for e in evidence if e.variants is None}
+    for file_path, mime_type in pending_variants.items():
+        background_tasks.add_task(EvidenceVariantService.generate_for_evidence, client, file_path, mime_type)
+    return evidence
+
+
+@router.post("/{project_id}/evidence/upload-url", response_model=EvidenceUploadUrlResponse)
+async def create_evidence_upload_url(
+    project_id: str,
+    request: EvidenceUploadUrlRequest,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+):
+    """
+    Get a signed URL to upload a screenshot directly to storage
+    
+    Reserves the file's size against the user's storage limit. Upload the file to the
+    returned URL, then call the finalize endpoint with the upload ID to create the
+    evidence record. Reservations that aren't finalized in time expire and release
+    their storage.
+    """
+    user_id = principal.user_id
+    
+    result = await ProjectService.create_evidence_upload_url(
         client,
-        project_id=project_id,
-        user_id=user_id,
-        file_name=file.filename or "screenshot",
-        mime_type=file.content_type or "application/octet-stream",
-        file_size=file_size,
-        file_content=file_content,
+        project_id,
+        user_id,
+        file_name=request.file_name,
+        mime_type=request.mime_type,
+        file_size=request.file_size,
+        subscription_type=principal.subscription_tier,
     )
+    return result
+
 
+@router.post("/{project_id}/evidence/finalize", response_model=ProjectEvidence)
+async def finalize_evidence_upload(
+    project_id: str,
+    request: FinalizeEvidenceRequest,
+    background_tasks: BackgroundTasks,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+):
+    """
+    Create the evidence record for a screenshot uploaded with a signed upload URL
+    
+    Verifies the uploaded file's size and type against the reservation. Resized
+    WebP/AVIF variants are generated after the response is sent.
+    """
+    user_id = principal.user_id
+    
+    evidence = await ProjectService.finalize_evidence_upload(client, project_id, user_id, request.upload_id)
+    background_tasks.add_task(EvidenceVariantService.generate_for_evidence, client, evidence.file_path, evidence.mime_type)
     return evidence
 
 
 @router.get("/evidence/stats", response_model=EvidenceStatsResponse)
 async def get_evidence_stats(
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Get user's evidence storage statistics
     
     Returns total evidence size across all projects, limit, and usage percentage.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
-    stats = await ProjectService.get_evidence_stats(client, user_id)
+    stats = await ProjectService.get_evidence_stats(client, user_id, principal.subscription_tier)
     return stats
 
 
+@router.put("/{project_id}/evidence/{evidence_id}/order", response_model=ReorderResponse)
+async def reorder_evidence(
+    project_id: str,
+    evidence_id: str,
+    request: ReorderRequest,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+):
+    """
+    Move an evidence item
+    
+    Places the evidence before and/or after the given evidence items of the same project.
+    """
+    user_id = principal.user_id
+    
+    result = await ProjectService.reorder_evidence(
+        client,
+        project_id,
+        evidence_id,
+        user_id,
+        before_id=request.before_id,
+        after_id=request.after_id
+    )
+    return result
+
+
 @router.delete("/{project_id}/evidence/{evidence_id}", response_model=MessageResponse)
 async def delete_evidence(
     evidence_id: str,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token),
+    principal: auth_utils.CurrentPrincipal,
 ):
     """
     Delete evidence record and file
     
     Deletes evidence record and associated file from storage if owned by the authenticated user.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     result = await ProjectService.delete_evidence(client, evidence_id, user_id)
     return result
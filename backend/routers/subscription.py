@@ -1,7 +1,7 @@
 """
 Subscription Router - Handle subscription and payment endpoints
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, HTTPException
 from backend.schemas.subscription import CheckoutSessionRequest, CheckoutSessionResponse, SubscriptionInfoResponse
 from backend.schemas.auth import MessageResponse
 from backend.services.stripe_service import StripeService
@@ -19,20 +19,20 @@ router = APIRouter(
 async def create_checkout_session(
     request: CheckoutSessionRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Create a Stripe Checkout session for Pro plan subscription
     
     Returns a checkout URL to redirect the user to Stripe's hosted checkout page.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
-    user_email = auth_utils.get_user_email_from_authorization(authorization)
+    if not principal.email:
+        raise HTTPException(status_code=401, detail="Email not found in token")
     
     result = await StripeService.create_checkout_session(
         client,
-        user_id=user_id,
-        user_email=user_email,
+        user_id=principal.user_id,
+        user_email=principal.email,
         success_url=request.success_url,
         cancel_url=request.cancel_url,
         billing_period=request.billing_period
@@ -48,12 +48,12 @@ async def create_checkout_session(
 @router.get("/info", response_model=SubscriptionInfoResponse)
 async def get_subscription_info(
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Get user's subscription information and profile limits
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     info = await SubscriptionService.get_subscription_info(client, user_id)
     return info
 
@@ -62,13 +62,13 @@ async def get_subscription_info(
 async def cancel_subscription(
     client: ServiceDBClient,
     stripe_service: StripeServiceDep,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Cancel subscription
     
     Cancels the user's subscription at the end of the current billing period.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     result = await SubscriptionService.cancel_subscription(client, user_id, stripe_service)
     return result
\ No newline at end of file
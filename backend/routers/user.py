@@ -1,12 +1,19 @@
 """
 User Router - Handle user profile endpoints
 """
-from fastapi import APIRouter, Depends
-from backend.schemas.user import UserProfile, UpdateProfileRequest, OnboardingRequest, CheckUsernameResponse
-from backend.schemas.auth import MessageResponse
+import re
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from backend.schemas.user import UserProfile, UpdateProfileRequest, OnboardingRequest, CheckUsernameResponse, DeletionJob
 from backend.services.user_service import UserService
+from backend.services.portfolio_service import PortfolioService
+from backend.services.project_service import ProjectService
+from backend.services.export_service import ExportService
+from backend.services.impact_service import ImpactService
+from backend.services.deletion_service import DeletionService
 from backend.utils import auth_utils
-from backend.utils.dependencies import ServiceDBClient, StripeServiceDep
+from backend.utils.dependencies import ServiceDBClient, StripeServiceDep, HttpClient
 
 router = APIRouter(
     prefix="/api/user",
@@ -17,14 +24,14 @@ router = APIRouter(
 @router.get("/profile", response_model=UserProfile)
 async def get_profile(
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Get current user's profile
     
     Returns the authenticated user's profile data.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     profile = await UserService.get_profile(client, user_id)
     return profile
@@ -34,7 +41,7 @@ async def get_profile(
 async def update_profile(
     request: UpdateProfileRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Update current user's profile
@@ -42,7 +49,7 @@ async def update_profile(
     Updates the authenticated user's profile data.
     Note: Setting a field to null will clear that field (e.g., disconnecting GitHub).
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     # Use exclude_unset=True instead of exclude_none=True
     # This allows explicitly set None values to be included (for clearing fields)
@@ -56,14 +63,14 @@ async def update_profile(
 async def complete_onboarding(
     request: OnboardingRequest,
     client: ServiceDBClient,
-    authorization: str = Depends(auth_utils.get_access_token)
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Complete user onboarding
     
     Creates or updates user profile with onboarding data.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
     profile_data = {
         "username": request.username,
@@ -89,19 +96,93 @@ async def check_username(username: str, client: ServiceDBClient):
     return result
 
 
-@router.delete("/account", response_model=MessageResponse)
+@router.delete("/account", response_model=DeletionJob, status_code=202)
 async def delete_account(
     client: ServiceDBClient,
     stripe_service: StripeServiceDep,
-    authorization: str = Depends(auth_utils.get_access_token)
+    background_tasks: BackgroundTasks,
+    principal: auth_utils.CurrentPrincipal
 ):
     """
     Delete current user's account
     
-    Permanently deletes the user's profile and authentication account.
-    This action cannot be undone.
+    Marks the account as deleted and unpublishes its portfolios, then cancels the
+    subscription and permanently deletes all data, files and the authentication
+    account in the background. This action cannot be undone.
     """
-    user_id = auth_utils.get_user_id_from_authorization(authorization)
+    user_id = principal.user_id
     
-    result = await UserService.delete_account(client, user_id, stripe_service)
-    return result
+    job = await DeletionService.request_deletion(client, user_id, "account", user_id)
+    background_tasks.add_task(DeletionService.run_job, client, job.id, stripe_service)
+    ImpactService.invalidate_user(user_id)
+    ProjectService.invalidate_evidence_access(user_id)
+    return job
+
+
+@router.get("/deletions/{job_id}", response_model=DeletionJob)
+async def get_deletion_status(
+    job_id: str,
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal
+):
+    """
+    Get the progress of an account, portfolio or project deletion
+    
+    Still readable after the account itself is deleted, while the access token is valid.
+    """
+    user_id = principal.user_id
+    
+    job = await DeletionService.get_deletion_job(client, job_id, user_id)
+    return job
+
+
+@router.get("/export")
+async def export_account(
+    client: ServiceDBClient,
+    principal: auth_utils.CurrentPrincipal,
+    http: HttpClient,
+    fresh: bool = Query(False, description="Rebuild instead of reusing a recent export"),
+    range_header: Optional[str] = Header(None, alias="Range")
+):
+    """
+    Export current user's data as a ZIP archive
+    
+    Streams profile, portfolios, projects (JSON and CSV) and evidence files.
+    The archive is cached for a while after it is built; interrupted downloads of a
+    completed archive can be resumed with `Range: bytes=<offset>-`.
+    """
+    user_id = principal.user_id
+    
+    if ExportService.needs_build(user_id, fresh=fresh):
+        profile = await UserService.get_profile(client, user_id)
+        portfolios = await PortfolioService.list_portfolios(client, user_id)
+        project_pages = ProjectService.iter_project_pages(client, user_id, include_evidence=True)
+        ExportService.start_export(
+            user_id,
+            ExportService.build_archive(http, user_id, profile, portfolios, project_pages)
+        )
+    
+    headers = {"Content-Disposition": 'attachment; filename="dev-impact-export.zip"'}
+    total_size = ExportService.get_completed_size(user_id)
+    
+    # Ranges can only be served once the archive is complete and its size is known
+    match = re.fullmatch(r"bytes=(\d+)-", range_header.strip()) if range_header and total_size is not None else None
+    if match:
+        start = int(match.group(1))
+        if start >= total_size:
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable")
+        headers.update({
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{total_size - 1}/{total_size}",
+            "Content-Length": str(total_size - start),
+        })
+        return StreamingResponse(
+            ExportService.stream_export(user_id, start=start),
+            status_code=206,
+            media_type="application/zip",
+            headers=headers
+        )
+    
+    if total_size is not None:
+        headers.update({"Accept-Ranges": "bytes", "Content-Length": str(total_size)})
+    return StreamingResponse(ExportService.stream_export(user_id), media_type="application/zip", headers=headers)
@@ -3,8 +3,9 @@ Auth Schemas - Pydantic models for authentication
 """
 from __future__ import annotations
 
-from pydantic import BaseModel, EmailStr, field_serializer
-from typing import Optional, Union
+from functools import cached_property
+from pydantic import BaseModel, EmailStr, PrivateAttr, field_serializer
+from typing import Callable, Optional, Union
 from datetime import datetime
 
 
@@ -42,16 +43,30 @@ class UserResponse(BaseModel):
     """User response schema"""
     id: str
     email: str
-    created_at: Union[str, datetime]
+    # Not in access token claims, so absent when built from a verified token
+    created_at: Optional[Union[str, datetime]] = None
     
     @field_serializer('created_at')
-    def serialize_created_at(self, value: Union[str, datetime]) -> str:
+    def serialize_created_at(self, value: Optional[Union[str, datetime]]) -> Optional[str]:
         """Convert datetime to ISO format string"""
         if isinstance(value, datetime):
             return value.isoformat()
         return value
 
 
+class Principal(BaseModel):
+    """Authenticated caller, resolved once per request from the verified access token"""
+    user_id: str
+    email: Optional[str] = None
+    aal: str
+    _tier_loader: Optional[Callable[[], Optional[str]]] = PrivateAttr(default=None)
+
+    @cached_property
+    def subscription_tier(self) -> Optional[str]:
+        """Subscription type ("free" or "pro"), looked up on first use; None if the lookup failed"""
+        return self._tier_loader() if self._tier_loader is not None else None
+
+
 class SessionResponse(BaseModel):
     """Session response schema"""
     access_token: str
@@ -0,0 +1,39 @@
+"""
+Impact Schemas - Aggregated headline numbers across a user's project metrics
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class MetricAggregate(BaseModel):
+    """Aggregates for one group of standardized metrics sharing a type and canonical unit"""
+    type: str
+    unit: str  # Canonical unit: ms for durations, MB for data sizes, otherwise the metric's unit
+    frequency: Optional[str] = None  # Set for by_frequency groups; None means no frequency given
+    count: int
+    total: float
+    annualized_total: Optional[float] = None  # Only for savings ($ and time saved)
+    median: float
+    p25: float
+    p75: float
+    p90: float
+    median_improvement: Optional[float] = None  # Median before/after improvement factor
+
+
+class ImpactHeadline(BaseModel):
+    """Portfolio headline numbers"""
+    dollars_annualized: float
+    hours_saved_annualized: float
+    users_served: float
+    median_latency_improvement: Optional[float] = None  # e.g. 2.5 means 2.5x faster
+
+
+class ImpactSummaryResponse(BaseModel):
+    """Impact summary for a user, optionally limited to one portfolio"""
+    portfolio_id: Optional[str] = None
+    metric_count: int
+    unconverted_metric_count: int  # Legacy free-text metrics that can't be aggregated
+    headline: ImpactHeadline
+    by_type: List[MetricAggregate]
+    by_frequency: List[MetricAggregate]
+    generated_at: str
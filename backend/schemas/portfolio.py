@@ -27,6 +27,12 @@ class CreatePortfolioRequest(BaseModel):
     description: Optional[str] = None
 
 
+class ClonePortfolioRequest(BaseModel):
+    """Clone portfolio request (defaults to "<name> (copy)" and the original description)"""
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+
 class UpdatePortfolioRequest(BaseModel):
     """Update portfolio request"""
     name: Optional[str] = None
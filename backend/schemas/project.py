@@ -1,8 +1,8 @@
 """
 Project Schemas - Pydantic models for project operations
 """
-from pydantic import BaseModel, field_serializer, Field
-from typing import Optional, List, Union, Literal
+from pydantic import BaseModel, field_serializer, Field, Discriminator, Tag, TypeAdapter
+from typing import Optional, List, Union, Literal, Dict, Any, Annotated
 from datetime import datetime
 
 
@@ -12,6 +12,7 @@ from datetime import datetime
 
 class ProjectMetric(BaseModel):
     """Legacy project metric schema - simple format"""
+    id: Optional[str] = None  # Stable project_metrics row ID (None for new metrics)
     primary: str
     label: str
     detail: Optional[str] = None
@@ -48,6 +49,7 @@ class MetricContext(BaseModel):
 
 class StandardizedProjectMetric(BaseModel):
     """Standardized project metric with structured data"""
+    id: Optional[str] = None  # Stable project_metrics row ID (None for new metrics)
     type: Literal["performance", "scale", "business", "quality", "time"]
     primary: PrimaryMetricValue
     comparison: Optional[MetricComparison] = None
@@ -55,6 +57,34 @@ class StandardizedProjectMetric(BaseModel):
     timeframe: Optional[str] = Field(None, description="e.g., '3 months', '6 months', '1 year', 'ongoing'")
 
 
+def _metric_format(value: Any) -> str:
+    """Pick the metric union member up front instead of trying each one"""
+    if isinstance(value, dict):
+        # Only standardized metrics have a structured primary value
+        return "standardized" if isinstance(value.get("primary"), dict) else "legacy"
+    return "standardized" if isinstance(value, StandardizedProjectMetric) else "legacy"
+
+
+# Legacy or standardized metric, discriminated by the shape of `primary`
+AnyProjectMetric = Annotated[
+    Union[
+        Annotated[ProjectMetric, Tag("legacy")],
+        Annotated[StandardizedProjectMetric, Tag("standardized")],
+    ],
+    Discriminator(_metric_format),
+]
+
+
+class EvidenceVariant(BaseModel):
+    """Resized, re-encoded copy of an evidence image"""
+    file_path: str
+    width: int
+    height: int
+    mime_type: str
+    file_size: int
+    url: Optional[str] = None
+
+
 class ProjectEvidence(BaseModel):
     """Project evidence schema (screenshots only)"""
     id: str
@@ -66,6 +96,10 @@ class ProjectEvidence(BaseModel):
     display_order: int
     created_at: Union[str, datetime]
     url: Optional[str] = None  # Full URL to the image (generated by backend)
+    width: Optional[int] = None  # Display size read from the image header; None for older uploads
+    height: Optional[int] = None
+    variants: Optional[List[EvidenceVariant]] = None  # Smallest first; None until generated
+    srcset: Optional[Dict[str, str]] = None  # Variant mime type -> srcset attribute value
     
     @field_serializer('created_at')
     def serialize_datetime(self, value: Union[str, datetime]) -> str:
@@ -85,7 +119,7 @@ class Project(BaseModel):
     problem: str
     contributions: List[str]
     techStack: List[str]
-    metrics: List[Union[ProjectMetric, StandardizedProjectMetric]]
+    metrics: List[AnyProjectMetric]
     portfolio_id: Optional[str] = None
     evidence: Optional[List[ProjectEvidence]] = None
 
@@ -105,7 +139,7 @@ class ProjectResponse(BaseModel):
     portfolio_id: Optional[str] = None
     created_at: Union[str, datetime]
     updated_at: Union[str, datetime]
-    metrics: List[Union[ProjectMetric, StandardizedProjectMetric]]
+    metrics: List[AnyProjectMetric]
     
     @field_serializer('created_at', 'updated_at')
     def serialize_datetime(self, value: Union[str, datetime]) -> str:
@@ -124,7 +158,7 @@ class CreateProjectRequest(BaseModel):
     problem: str
     contributions: List[str]
     techStack: List[str]
-    metrics: List[Union[ProjectMetric, StandardizedProjectMetric]]
+    metrics: List[AnyProjectMetric]
     portfolio_id: Optional[str] = None
 
 
@@ -137,7 +171,7 @@ class UpdateProjectRequest(BaseModel):
     problem: Optional[str] = None
     contributions: Optional[List[str]] = None
     techStack: Optional[List[str]] = None
-    metrics: Optional[List[Union[ProjectMetric, StandardizedProjectMetric]]] = None
+    metrics: Optional[List[AnyProjectMetric]] = None
     portfolio_id: Optional[str] = None
 
 
@@ -149,3 +183,99 @@ class EvidenceStatsResponse(BaseModel):
     limit_mb: int
     percentage_used: float
 
+
+class EvidenceUploadUrlRequest(BaseModel):
+    """Reserve storage for an evidence file uploaded directly to storage"""
+    file_name: str = Field(..., min_length=1, max_length=255)
+    mime_type: str = Field(..., pattern=r"^image/")
+    file_size: int = Field(..., gt=0, description="Size of the file in bytes; the uploaded object may not exceed it")
+
+
+class EvidenceUploadUrlResponse(BaseModel):
+    """Signed upload URL for one evidence file"""
+    upload_id: str = Field(..., description="Pass to the finalize endpoint once the file is uploaded")
+    file_path: str
+    signed_url: str = Field(..., description="PUT the file here with its Content-Type")
+    token: str
+    expires_at: str = Field(..., description="The upload must be finalized before this time")
+
+
+class FinalizeEvidenceRequest(BaseModel):
+    """Create the evidence record for a file uploaded with a signed upload URL"""
+    upload_id: str
+
+
+
+class BulkProjectOperation(BaseModel):
+    """Single operation in a bulk project request"""
+    action: Literal["create", "update", "delete"]
+    project_id: Optional[str] = Field(None, description="Required for update and delete")
+    data: Optional[Dict[str, Any]] = Field(None, description="CreateProjectRequest fields for create, UpdateProjectRequest fields for update")
+
+
+class BulkProjectRequest(BaseModel):
+    """Bulk project request - applies create/update/delete operations in one call"""
+    operations: List[BulkProjectOperation] = Field(..., min_length=1, max_length=100)
+
+
+class BulkProjectResult(BaseModel):
+    """Result of a single bulk operation"""
+    index: int
+    action: str
+    success: bool
+    project_id: Optional[str] = None
+    project: Optional[Project] = None
+    job_id: Optional[str] = None  # Deletion job of a deleted project
+    error: Optional[str] = None
+
+
+class BulkProjectResponse(BaseModel):
+    """Bulk project response with per-operation results"""
+    results: List[BulkProjectResult]
+    succeeded: int
+    failed: int
+
+
+class ReorderRequest(BaseModel):
+    """Move an item relative to its neighbours (give one or both)"""
+    before_id: Optional[str] = Field(None, description="ID of the item to place this item before")
+    after_id: Optional[str] = Field(None, description="ID of the item to place this item after")
+
+
+class ReorderResponse(BaseModel):
+    """Reorder response with the item's new position"""
+    id: str
+    display_order: int
+
+
+class CloneProjectRequest(BaseModel):
+    """Clone a project (evidence is shared with the original, not re-uploaded)"""
+    portfolio_id: Optional[str] = Field(None, description="Portfolio for the clone; defaults to the original's portfolio")
+
+
+class ProjectPage(BaseModel):
+    """One page of projects with a cursor for the next page"""
+    projects: List[Project]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
+
+class ImportRowResult(BaseModel):
+    """Result for one project in an import"""
+    row: int = Field(..., description="Position of the project in the file (line of its first row for CSV)")
+    success: bool
+    project_id: Optional[str] = None
+    project_name: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ImportProjectsResponse(BaseModel):
+    """Import response with a per-row report"""
+    format: Literal["json_resume", "csv", "export"]
+    imported: int
+    failed: int
+    results: List[ImportRowResult]
+
+
+# Cached adapters for validating/serializing whole lists in one call (building one is costly)
+METRIC_LIST_ADAPTER = TypeAdapter(List[AnyProjectMetric])
+PROJECT_LIST_ADAPTER = TypeAdapter(List[Project])
@@ -2,7 +2,7 @@
 User Schemas - Pydantic models for user profile operations
 """
 from pydantic import BaseModel, field_serializer
-from typing import Optional, Union
+from typing import Any, Dict, Literal, Optional, Union
 from datetime import datetime
 
 
@@ -56,4 +56,24 @@ class CheckUsernameResponse(BaseModel):
     available: bool
     valid: bool
     message: Optional[str] = None
-    
\ No newline at end of file
+    
+
+class DeletionJob(BaseModel):
+    """Background teardown of a deleted account, portfolio or project"""
+    id: str
+    entity_type: Literal["account", "portfolio", "project"]
+    entity_id: str
+    status: Literal["pending", "running", "failed", "blocked", "completed"]
+    progress: Dict[str, Any] = {}
+    attempts: int = 0
+    last_error: Optional[str] = None
+    created_at: Union[str, datetime]
+    updated_at: Union[str, datetime]
+    completed_at: Optional[Union[str, datetime]] = None
+
+    @field_serializer('created_at', 'updated_at', 'completed_at')
+    def serialize_datetime(self, value: Optional[Union[str, datetime]]) -> Optional[str]:
+        """Convert datetime to ISO format string"""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
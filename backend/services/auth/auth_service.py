@@ -7,7 +7,6 @@ from dotenv import load_dotenv
 from fastapi import HTTPException
 from supabase import create_client
 import jwt
-import httpx
 import traceback
 from backend.schemas.auth import (
     AuthResponse,
@@ -16,7 +15,8 @@ from backend.schemas.auth import (
     MessageResponse,
     MFAFactorResponse
 )
-from backend.utils.dependencies import ServiceDBClient
+from backend.utils.dependencies import ServiceDBClient, HttpClient
+from backend.utils.mfa_factors import verified_totp_factors
 
 # Load environment variables
 load_dotenv()
@@ -79,12 +79,13 @@ class AuthService:
             raise HTTPException(status_code=400, detail=f"Sign up error: {e}")
 
     @staticmethod
-    async def sign_in(client: ServiceDBClient, email: str, password: str, mfa_challenge_id: Optional[str] = None, mfa_code: Optional[str] = None, mfa_factor_id: Optional[str] = None) -> AuthResponse:
+    async def sign_in(client: ServiceDBClient, http: HttpClient, email: str, password: str, mfa_challenge_id: Optional[str] = None, mfa_code: Optional[str] = None, mfa_factor_id: Optional[str] = None) -> AuthResponse:
         """
         Sign in an existing user
         
         Args:
             client: Supabase client (injected from router)
+            http: Shared HTTP client (injected from router)
             email: User's email
             password: User's password
             mfa_challenge_id: MFA challenge ID if verifying MFA code
@@ -118,24 +119,23 @@ class AuthService:
                 
                 try:
                     # Verify using the user API endpoint with factor_id
-                    async with httpx.AsyncClient() as http_client:
-                        verify_response = await http_client.post(
-                            f"{url}/auth/v1/factors/{mfa_factor_id}/verify",
-                            headers={
-                                "apikey": anon_key,
-                                "Authorization": f"Bearer {password_response.session.access_token}",
-                                "Content-Type": "application/json"
-                            },
-                            json={
-                                "challenge_id": mfa_challenge_id,
-                                "code": mfa_code
-                            }
-                        )
-                        
-                        if verify_response.status_code != 200:
-                            error_text = verify_response.text
-                            print(f"MFA verify API error: {verify_response.status_code} - {error_text}")
-                            raise HTTPException(status_code=401, detail="Invalid MFA code")
+                    verify_response = await http.post(
+                        f"{url}/auth/v1/factors/{mfa_factor_id}/verify",
+                        headers={
+                            "apikey": anon_key,
+                            "Authorization": f"Bearer {password_response.session.access_token}",
+                            "Content-Type": "application/json"
+                        },
+                        json={
+                            "challenge_id": mfa_challenge_id,
+                            "code": mfa_code
+                        }
+                    )
+                    
+                    if verify_response.status_code != 200:
+                        error_text = verify_response.text
+                        print(f"MFA verify API error: {verify_response.status_code} - {error_text}")
+                        raise HTTPException(status_code=401, detail="Invalid MFA code")
                     
                     # After successful verification, refresh the session to get AAL2 tokens
                     # Use the original Supabase client (not the httpx client)
@@ -171,89 +171,63 @@ class AuthService:
             })
             
             # Check if user has MFA factors enrolled
-            # If they do, we need to challenge them even if a session was returned
-            user_id = response.user.id if response.user else None
+            # If they do, we need to challenge them even if a session was returned.
+            # The sign-in response lists the user's factors, so no Admin API lookup is needed
+            totp_factors = verified_totp_factors(response.user)
             
-            if user_id:
-                # Check if user has MFA factors using Admin API
+            if totp_factors:
+                # User has MFA - create challenge using user API with session token
+                factor_id = totp_factors[0].id
                 url = os.getenv("SUPABASE_URL")
-                service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+                anon_key = os.getenv("SUPABASE_ANON_KEY")
+                if not url or not anon_key or not response.session or not response.session.access_token:
+                    print("Missing configuration or session token for MFA challenge")
+                    raise HTTPException(status_code=500, detail="Failed to start MFA challenge")
                 
-                if url and service_key:
-                    try:
-                        async with httpx.AsyncClient() as client:
-                            factors_response = await client.get(
-                                f"{url}/auth/v1/admin/users/{user_id}/factors",
-                                headers={
-                                    "apikey": service_key,
-                                    "Authorization": f"Bearer {service_key}",
-                                    "Content-Type": "application/json"
-                                }
-                            )
-                            
-                            if factors_response.status_code == 200:
-                                factors_data = factors_response.json()
-                                factors = factors_data if isinstance(factors_data, list) else factors_data.get('factors', [])
-                                
-                                # Filter for verified TOTP factors
-                                verified_totp_factors = [
-                                    f for f in factors 
-                                    if f.get('factor_type') == 'totp' and f.get('status') == 'verified'
-                                ]
-                                
-                                if verified_totp_factors:
-                                    # User has MFA - create challenge using user API with session token
-                                    factor_id = verified_totp_factors[0].get('id')
-                                    if factor_id:
-                                        # Use user API to create challenge (requires user's access token from password sign-in)
-                                        anon_key = os.getenv("SUPABASE_ANON_KEY")
-                                        if anon_key and response.session and response.session.access_token:
-                                            try:
-                                                # Use user API endpoint with the session token from password sign-in
-                                                async with httpx.AsyncClient() as user_client:
-                                                    challenge_response = await user_client.post(
-                                                        f"{url}/auth/v1/factors/{factor_id}/challenge",
-                                                        headers={
-                                                            "apikey": anon_key,
-                                                            "Authorization": f"Bearer {response.session.access_token}",
-                                                            "Content-Type": "application/json"
-                                                        }
-                                                    )
-                                                    
-                                                    if challenge_response.status_code == 200:
-                                                        challenge_data = challenge_response.json()
-                                                        challenge_id = challenge_data.get("id")
-                                                        
-                                                        if challenge_id:
-                                                            return AuthResponse(
-                                                                user=UserResponse(
-                                                                    id=response.user.id,
-                                                                    email=response.user.email,
-                                                                    created_at=response.user.created_at
-                                                                ),
-                                                                session=None,  # Don't return session until MFA verified
-                                                                requires_mfa=True,
-                                                                mfa_challenge_id=challenge_id,
-                                                                mfa_factor_id=factor_id,  # Include factor_id for verification
-                                                                mfa_factors=[
-                                                                    MFAFactorResponse(
-                                                                        id=f.get("id", ""),
-                                                                        type=f.get("factor_type", f.get("type", "")),
-                                                                        friendly_name=f.get("friendly_name"),
-                                                                        status=f.get("status", "verified")
-                                                                    )
-                                                                    for f in verified_totp_factors
-                                                                ]
-                                                            )
-                                                    else:
-                                                        print(f"User API challenge error: {challenge_response.status_code} - {challenge_response.text}")
-                                            except Exception as challenge_err:
-                                                print(f"Failed to create MFA challenge: {challenge_err}")
-                                                traceback.print_exc()
-                                        else:
-                                            print("Missing anon key or session token for MFA challenge")
-                    except Exception as mfa_check_err:
-                        print(f"Error checking MFA factors: {mfa_check_err}")
+                challenge_id = None
+                try:
+                    # Use user API endpoint with the session token from password sign-in
+                    challenge_response = await http.post(
+                        f"{url}/auth/v1/factors/{factor_id}/challenge",
+                        headers={
+                            "apikey": anon_key,
+                            "Authorization": f"Bearer {response.session.access_token}",
+                            "Content-Type": "application/json"
+                        }
+                    )
+                    
+                    if challenge_response.status_code == 200:
+                        challenge_id = challenge_response.json().get("id")
+                    else:
+                        print(f"User API challenge error: {challenge_response.status_code} - {challenge_response.text}")
+                except Exception as challenge_err:
+                    print(f"Failed to create MFA challenge: {challenge_err}")
+                    traceback.print_exc()
+                
+                # Never fall back to returning a session for a user with MFA
+                if not challenge_id:
+                    raise HTTPException(status_code=500, detail="Failed to start MFA challenge")
+                
+                return AuthResponse(
+                    user=UserResponse(
+                        id=response.user.id,
+                        email=response.user.email,
+                        created_at=response.user.created_at
+                    ),
+                    session=None,  # Don't return session until MFA verified
+                    requires_mfa=True,
+                    mfa_challenge_id=challenge_id,
+                    mfa_factor_id=factor_id,  # Include factor_id for verification
+                    mfa_factors=[
+                        MFAFactorResponse(
+                            id=f.id,
+                            type=f.factor_type,
+                            friendly_name=f.friendly_name,
+                            status=f.status
+                        )
+                        for f in totp_factors
+                    ]
+                )
             
             # Check if MFA is required (user exists but no session) - fallback check
             if response.user is not None and response.session is None:
@@ -405,11 +379,12 @@ class AuthService:
             return MessageResponse(success=True, message="If an account exists, a password reset email has been sent")
 
     @staticmethod
-    async def update_password(access_token: str, new_password: str) -> MessageResponse:
+    async def update_password(http: HttpClient, access_token: str, new_password: str) -> MessageResponse:
         """
         Update user password
         
         Args:
+            http: Shared HTTP client (injected from router)
             access_token: User's access token from recovery link
             new_password: New password
             
@@ -432,20 +407,19 @@ class AuthService:
                 raise HTTPException(status_code=500, detail="Server configuration error")
             
             # Update password using Admin API
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{url}/auth/v1/admin/users/{user_id}",
-                    headers={
-                        "apikey": service_key,
-                        "Authorization": f"Bearer {service_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={"password": new_password}
-                )
-                
-                if response.status_code not in [200, 204]:
-                    print(f"Supabase update password failed: {response.text}")
-                    raise HTTPException(status_code=400, detail="Failed to update password")
+            response = await http.put(
+                f"{url}/auth/v1/admin/users/{user_id}",
+                headers={
+                    "apikey": service_key,
+                    "Authorization": f"Bearer {service_key}",
+                    "Content-Type": "application/json"
+                },
+                json={"password": new_password}
+            )
+            
+            if response.status_code not in [200, 204]:
+                print(f"Supabase update password failed: {response.text}")
+                raise HTTPException(status_code=400, detail="Failed to update password")
             
             return MessageResponse(success=True, message="Password updated successfully")
         except Exception as e:
@@ -0,0 +1,421 @@
+"""
+Deletion Service - Tear down deleted accounts, portfolios and projects in the background
+
+A delete request only marks the entity (delete_requested_at, which hides it from reads)
+and records a deletion job. The job then removes storage objects and rows in batches,
+retrying failed calls and checkpointing its progress on the job row, so a job that
+fails or is interrupted resumes where it stopped (see backend.jobs.process_deletions).
+"""
+import os
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from backend.schemas.user import DeletionJob
+from backend.services.stripe_service import StripeService
+from backend.utils.dependencies import ServiceDBClient
+from backend.utils.evidence_urls import EVIDENCE_BUCKET
+
+# Load environment variables
+load_dotenv()
+
+DELETION_JOBS_TABLE = "deletion_jobs"
+
+# Projects deleted (and storage objects removed) per request
+DELETION_BATCH_SIZE = int(os.getenv("DELETION_BATCH_SIZE", "100"))
+
+# Runs of a job before it is left blocked
+DELETION_MAX_ATTEMPTS = int(os.getenv("DELETION_MAX_ATTEMPTS", "5"))
+
+# Seconds to wait before each retry of a failed database or storage call
+DELETION_RETRY_DELAYS = (1, 4, 15)
+
+STORAGE_LIST_PAGE_SIZE = 1000
+
+# Tables marked when each kind of entity is deleted, with the 404 detail
+ENTITY_TABLES = {
+    "project": ("impact_projects", "Project not found"),
+    "portfolio": ("portfolios", "Portfolio not found"),
+    "account": ("profiles", None),
+}
+
+
+class DeletionService:
+    """Service for background deletion of accounts, portfolios and projects."""
+
+    @staticmethod
+    async def _with_retries(operation: Callable[[], Any]) -> Any:
+        """Call operation (sync or async), retrying with backoff; the last failure is raised"""
+        for attempt, delay in enumerate((*DELETION_RETRY_DELAYS, None), start=1):
+            try:
+                result = operation()
+                if asyncio.iscoroutine(result):
+                    result = await result
+                return result
+            except Exception as e:
+                if delay is None:
+                    raise
+                print(f"Deletion step failed (attempt {attempt}), retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _job_from_row(row: Dict[str, Any]) -> DeletionJob:
+        return DeletionJob(
+            id=row["id"],
+            entity_type=row["entity_type"],
+            entity_id=row["entity_id"],
+            status=row["status"],
+            progress=row.get("progress") or {},
+            attempts=row.get("attempts") or 0,
+            last_error=row.get("last_error"),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            completed_at=row.get("completed_at"),
+        )
+
+    @staticmethod
+    def _update_job(client: ServiceDBClient, job_id: str, **fields: Any) -> None:
+        client.table(DELETION_JOBS_TABLE)\
+            .update({**fields, "updated_at": datetime.now(timezone.utc).isoformat()})\
+            .eq("id", job_id)\
+            .execute()
+
+    @staticmethod
+    async def request_deletion(
+        client: ServiceDBClient,
+        user_id: str,
+        entity_type: str,
+        entity_id: str
+    ) -> DeletionJob:
+        """
+        Mark an account, portfolio or project as pending delete and record its deletion job
+
+        The entity disappears from reads immediately and is unpublished; run_job does the
+        actual teardown. Requesting a delete that is already in progress returns the
+        existing job.
+
+        Args:
+            client: Supabase client (injected from router)
+            user_id: User's ID (for authorization)
+            entity_type: "account", "portfolio" or "project"
+            entity_id: ID of the entity (the user's ID for accounts)
+
+        Returns:
+            The deletion job
+        """
+        try:
+            table, not_found = ENTITY_TABLES[entity_type]
+            now = datetime.now(timezone.utc).isoformat()
+
+            mark = client.table(table)\
+                .update({"delete_requested_at": now})\
+                .eq("id", entity_id)
+            if entity_type != "account":
+                mark = mark.eq("user_id", user_id)
+            marked = mark.execute()
+            if not_found and not marked.data:
+                raise HTTPException(status_code=404, detail=not_found)
+
+            # Mark the children too, so every lookup that filters them sees the delete
+            if entity_type == "account":
+                client.table("portfolios")\
+                    .update({"delete_requested_at": now})\
+                    .eq("user_id", user_id)\
+                    .execute()
+            if entity_type != "project":
+                children = client.table("impact_projects")\
+                    .update({"delete_requested_at": now})\
+                    .eq("user_id", user_id)
+                if entity_type == "portfolio":
+                    children = children.eq("portfolio_id", entity_id)
+                children.execute()
+            if entity_type != "project":
+                unpublish = client.table("published_profiles").delete().eq("user_id", user_id)
+                if entity_type == "portfolio":
+                    unpublish = unpublish.eq("portfolio_id", entity_id)
+                unpublish.execute()
+
+            existing = client.table(DELETION_JOBS_TABLE)\
+                .select("*")\
+                .eq("entity_type", entity_type)\
+                .eq("entity_id", entity_id)\
+                .neq("status", "completed")\
+                .limit(1)\
+                .execute()
+            if existing.data:
+                return DeletionService._job_from_row(existing.data[0])
+
+            result = client.table(DELETION_JOBS_TABLE).insert({
+                "user_id": user_id,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+            }).execute()
+            return DeletionService._job_from_row(result.data[0])
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Request deletion error: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to delete {entity_type}")
+
+    @staticmethod
+    async def get_deletion_job(client: ServiceDBClient, job_id: str, user_id: str) -> DeletionJob:
+        """
+        Get the status of one of the user's deletion jobs
+
+        Args:
+            client: Supabase client (injected from router)
+            job_id: Deletion job ID
+            user_id: User's ID (for authorization)
+
+        Returns:
+            The deletion job
+        """
+        try:
+            result = client.table(DELETION_JOBS_TABLE)\
+                .select("*")\
+                .eq("id", job_id)\
+                .eq("user_id", user_id)\
+                .limit(1)\
+                .execute()
+            if not result.data:
+                raise HTTPException(status_code=404, detail="Deletion not found")
+            return DeletionService._job_from_row(result.data[0])
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Get deletion job error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to get deletion status")
+
+    @staticmethod
+    def list_resumable_jobs(client: ServiceDBClient, updated_before: str, max_attempts: int = DELETION_MAX_ATTEMPTS) -> List[str]:
+        """IDs of unfinished jobs not updated since updated_before, oldest first"""
+        result = client.table(DELETION_JOBS_TABLE)\
+            .select("id")\
+            .neq("status", "completed")\
+            .lt("attempts", max_attempts)\
+            .lt("updated_at", updated_before)\
+            .order("updated_at")\
+            .execute()
+        return [row["id"] for row in result.data or []]
+
+    @staticmethod
+    def _list_object_paths(bucket: Any, prefix: str) -> List[str]:
+        """Every object path under a storage folder, recursively; folders have no id"""
+        paths = []
+        offset = 0
+        while True:
+            page = bucket.list(prefix, {
+                "limit": STORAGE_LIST_PAGE_SIZE,
+                "offset": offset,
+                "sortBy": {"column": "name", "order": "asc"},
+            }) or []
+            for entry in page:
+                path = f"{prefix}/{entry['name']}"
+                if entry.get("id") is None:
+                    paths.extend(DeletionService._list_object_paths(bucket, path))
+                else:
+                    paths.append(path)
+            if len(page) < STORAGE_LIST_PAGE_SIZE:
+                return paths
+            offset += STORAGE_LIST_PAGE_SIZE
+
+    @staticmethod
+    async def _remove_objects(client: ServiceDBClient, paths: List[str]) -> int:
+        """Remove storage objects in batches"""
+        bucket = client.storage.from_(EVIDENCE_BUCKET)
+        for start in range(0, len(paths), DELETION_BATCH_SIZE):
+            batch = paths[start:start + DELETION_BATCH_SIZE]
+            await DeletionService._with_retries(lambda: bucket.remove(batch))
+        return len(paths)
+
+    @staticmethod
+    async def _remove_project_objects(client: ServiceDBClient, project_ids: List[str]) -> int:
+        """
+        Remove the evidence objects of projects about to be deleted
+
+        Content-addressed (sha256) objects are left to the reconcile job, as in
+        delete_evidence: a concurrent upload of the same bytes can reuse them at any
+        moment. Other objects that cloned evidence of other projects still references
+        are kept, along with their variants.
+        """
+        evidence = await DeletionService._with_retries(
+            lambda: client.table("project_evidence")
+                .select("file_path, variants")
+                .in_("project_id", project_ids)
+                .execute()
+        )
+        rows = [row for row in evidence.data or [] if "/sha256/" not in row["file_path"]]
+        if not rows:
+            return 0
+
+        references = await DeletionService._with_retries(
+            lambda: client.table("project_evidence")
+                .select("file_path, project_id")
+                .in_("file_path", sorted({row["file_path"] for row in rows}))
+                .execute()
+        )
+        shared = {r["file_path"] for r in references.data or [] if r["project_id"] not in project_ids}
+
+        paths = set()
+        for row in rows:
+            if row["file_path"] in shared:
+                continue
+            paths.add(row["file_path"])
+            paths.update(variant["file_path"] for variant in row.get("variants") or [])
+        return await DeletionService._remove_objects(client, sorted(paths))
+
+    @staticmethod
+    async def _delete_projects(
+        client: ServiceDBClient,
+        job: Dict[str, Any],
+        progress: Dict[str, Any],
+        remove_objects: bool = True
+    ) -> None:
+        """Delete the job's projects a batch at a time, removing their evidence objects first"""
+        def next_batch() -> Any:
+            query = client.table("impact_projects").select("id").eq("user_id", job["user_id"])
+            if job["entity_type"] == "project":
+                query = query.eq("id", job["entity_id"])
+            elif job["entity_type"] == "portfolio":
+                query = query.eq("portfolio_id", job["entity_id"])
+            return query.limit(DELETION_BATCH_SIZE).execute()
+
+        while True:
+            batch = await DeletionService._with_retries(next_batch)
+            project_ids = [row["id"] for row in batch.data or []]
+            if not project_ids:
+                return
+
+            if remove_objects:
+                removed = await DeletionService._remove_project_objects(client, project_ids)
+                progress["objects_deleted"] = progress.get("objects_deleted", 0) + removed
+            # Metrics, evidence rows and upload reservations cascade
+            await DeletionService._with_retries(
+                lambda: client.table("impact_projects").delete().in_("id", project_ids).execute()
+            )
+            progress["projects_deleted"] = progress.get("projects_deleted", 0) + len(project_ids)
+            DeletionService._update_job(client, job["id"], progress=progress)
+
+    @staticmethod
+    async def _cancel_subscription(client: ServiceDBClient, user_id: str, stripe_service: StripeService) -> None:
+        """
+        Cancel a deleted account's subscription
+
+        Nothing to cancel (no customer, no active subscription, or it was already
+        cancelled or removed in Stripe) counts as done. Other errors, including missing
+        Stripe configuration, are raised so the step is retried.
+        """
+        try:
+            await stripe_service.cancel_subscription(client, user_id)
+        except HTTPException as e:
+            if e.status_code != 400:
+                raise
+
+    @staticmethod
+    def _delete_auth_user(client: ServiceDBClient, user_id: str) -> None:
+        try:
+            client.auth.admin.delete_user(user_id)
+        except Exception as e:
+            # Already deleted by an earlier run that stopped before its checkpoint
+            if "not found" not in str(e).lower():
+                raise
+
+    @staticmethod
+    def _steps(
+        client: ServiceDBClient,
+        job: Dict[str, Any],
+        progress: Dict[str, Any],
+        stripe_service: Optional[StripeService]
+    ) -> List[Tuple[str, Callable[[], Awaitable[Any]]]]:
+        """Named teardown steps of a job, in order"""
+        user_id = job["user_id"]
+        retry = DeletionService._with_retries
+
+        if job["entity_type"] == "project":
+            return [("projects", lambda: DeletionService._delete_projects(client, job, progress))]
+
+        if job["entity_type"] == "portfolio":
+            return [
+                ("projects", lambda: DeletionService._delete_projects(client, job, progress)),
+                ("portfolio", lambda: retry(
+                    lambda: client.table("portfolios").delete().eq("id", job["entity_id"]).eq("user_id", user_id).execute()
+                )),
+            ]
+
+        async def remove_storage() -> None:
+            bucket = client.storage.from_(EVIDENCE_BUCKET)
+            paths = await retry(lambda: DeletionService._list_object_paths(bucket, user_id))
+            progress["objects_deleted"] = progress.get("objects_deleted", 0) + await DeletionService._remove_objects(client, paths)
+
+        steps = []
+        if stripe_service is not None:
+            # Reads the profile, so it runs before any rows are deleted
+            steps.append(("subscription", lambda: retry(
+                lambda: DeletionService._cancel_subscription(client, user_id, stripe_service)
+            )))
+        return steps + [
+            # Every object is under the user's folder, so storage is cleared in one sweep
+            ("projects", lambda: DeletionService._delete_projects(client, job, progress, remove_objects=False)),
+            ("storage", remove_storage),
+            ("portfolios", lambda: retry(lambda: client.table("portfolios").delete().eq("user_id", user_id).execute())),
+            ("profile", lambda: retry(lambda: client.table("profiles").delete().eq("id", user_id).execute())),
+            ("auth_user", lambda: retry(lambda: DeletionService._delete_auth_user(client, user_id))),
+        ]
+
+    @staticmethod
+    async def run_job(
+        client: ServiceDBClient,
+        job_id: str,
+        stripe_service: Optional[StripeService] = None
+    ) -> Optional[DeletionJob]:
+        """
+        Run (or resume) a deletion job
+
+        Run as a background task after the delete response is sent, and by the resume
+        job for failed or interrupted jobs. Steps already recorded in the job's progress
+        are skipped. Errors are logged and leave the job failed with the step and error
+        recorded; after DELETION_MAX_ATTEMPTS runs it is left blocked instead, which the
+        resume job doesn't pick up again.
+
+        Args:
+            client: Service role Supabase client
+            job_id: Deletion job ID
+            stripe_service: Stripe service class, for cancelling a deleted account's
+                subscription
+
+        Returns:
+            The job as it ended, or None if it doesn't exist
+        """
+        result = client.table(DELETION_JOBS_TABLE).select("*").eq("id", job_id).limit(1).execute()
+        if not result.data:
+            return None
+        job = result.data[0]
+        if job["status"] == "completed":
+            return DeletionService._job_from_row(job)
+
+        progress = dict(job.get("progress") or {})
+        completed_steps = progress.setdefault("completed_steps", [])
+        attempts = (job.get("attempts") or 0) + 1
+        DeletionService._update_job(client, job_id, status="running", attempts=attempts)
+
+        name = None
+        try:
+            for name, step in DeletionService._steps(client, job, progress, stripe_service):
+                if name in completed_steps:
+                    continue
+                await step()
+                completed_steps.append(name)
+                DeletionService._update_job(client, job_id, progress=progress)
+
+            fields = {"status": "completed", "progress": progress, "last_error": None,
+                      "completed_at": datetime.now(timezone.utc).isoformat()}
+        except Exception as e:
+            print(f"Deletion job {job_id} error in step {name}: {e}")
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            status = "blocked" if attempts >= DELETION_MAX_ATTEMPTS else "failed"
+            fields = {"status": status, "progress": progress, "last_error": f"{name}: {detail}"[:500]}
+
+        DeletionService._update_job(client, job_id, **fields)
+        return DeletionService._job_from_row({**job, **fields, "attempts": attempts,
+                                              "updated_at": datetime.now(timezone.utc).isoformat()})
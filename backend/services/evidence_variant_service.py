@@ -0,0 +1,133 @@
+"""
+Evidence Variant Service - Generate resized WebP/AVIF variants of evidence images
+"""
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from supabase import Client
+from backend.utils.image_variants import SUPPORTED_MIME_TYPES, render_variants, variant_path
+from backend.utils.evidence_urls import EVIDENCE_BUCKET, EVIDENCE_CACHE_MAX_AGE_SECONDS
+
+# Load environment variables
+load_dotenv()
+
+# Worker processes encoding variants; encoding is CPU bound and would stall the event loop
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+
+# Variant URLs carry the variant's content hash, so they can be cached for a long time
+VARIANT_CACHE_CONTROL = str(EVIDENCE_CACHE_MAX_AGE_SECONDS)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class EvidenceVariantService:
+    """Service for evidence image variants."""
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        """Process pool shared by uploads and the backfill job, started on first use"""
+        global _executor
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS)
+        return _executor
+
+    @staticmethod
+    def shutdown_executor() -> None:
+        """Stop the worker processes (on app shutdown or when a job finishes)"""
+        global _executor
+        executor, _executor = _executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _store_variants(client: Client, file_path: str, rendered: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Upload rendered variants next to the original and describe them for the variants column"""
+        variants = []
+        for variant in rendered:
+            path = variant_path(file_path, variant["width"], variant["extension"])
+            client.storage.from_(EVIDENCE_BUCKET).upload(
+                path,
+                variant["content"],
+                file_options={
+                    "content-type": variant["mime_type"],
+                    "cache-control": VARIANT_CACHE_CONTROL,
+                    "upsert": "true",
+                }
+            )
+            variants.append({
+                "file_path": path,
+                "width": variant["width"],
+                "height": variant["height"],
+                "mime_type": variant["mime_type"],
+                "file_size": len(variant["content"]),
+                "sha256": hashlib.sha256(variant["content"]).hexdigest(),
+            })
+        return variants
+
+    @staticmethod
+    def process_files(client: Client, files: List[Dict[str, str]]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Generate and store variants for evidence files, recording them on every
+        project_evidence row that references each file
+
+        Originals are downloaded here and encoded in parallel in the process pool.
+        Files that can't be decoded get an empty variant list so they aren't retried;
+        files that fail to download or upload are left unprocessed.
+
+        Args:
+            client: Supabase client
+            files: [{"file_path": ..., "mime_type": ...}, ...]
+
+        Returns:
+            Dict of file_path -> variants written, or None if the file was left unprocessed
+        """
+        results: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+        pending = {}
+        for file in files:
+            file_path = file["file_path"]
+            if file.get("mime_type") not in SUPPORTED_MIME_TYPES:
+                results[file_path] = []
+                continue
+            try:
+                original = client.storage.from_(EVIDENCE_BUCKET).download(file_path)
+            except Exception as e:
+                print(f"Evidence variant download error ({file_path}): {e}")
+                results[file_path] = None
+                continue
+            pending[file_path] = EvidenceVariantService._get_executor().submit(render_variants, original)
+
+        for file_path, future in pending.items():
+            try:
+                rendered = future.result()
+            except Exception as e:
+                print(f"Evidence variant render error ({file_path}): {e}")
+                results[file_path] = []
+                continue
+            try:
+                results[file_path] = EvidenceVariantService._store_variants(client, file_path, rendered)
+            except Exception as e:
+                print(f"Evidence variant upload error ({file_path}): {e}")
+                results[file_path] = None
+
+        for file_path, variants in results.items():
+            if variants is not None:
+                client.table("project_evidence")\
+                    .update({"variants": variants})\
+                    .eq("file_path", file_path)\
+                    .execute()
+        return results
+
+    @staticmethod
+    def generate_for_evidence(client: Client, file_path: str, mime_type: str) -> None:
+        """
+        Generate variants for a newly uploaded evidence file
+
+        Run as a background task after the upload response is sent; errors are logged,
+        and files left without variants are picked up by the backfill job.
+        """
+        try:
+            EvidenceVariantService.process_files(client, [{"file_path": file_path, "mime_type": mime_type}])
+        except Exception as e:
+            print(f"Generate evidence variants error ({file_path}): {e}")
@@ -0,0 +1,335 @@
+"""
+Export Service - Build and serve full account data exports as ZIP archives
+"""
+import os
+import io
+import csv
+import json
+import time
+import asyncio
+import tempfile
+import zipfile
+from collections import deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+import httpx
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from backend.schemas.user import UserProfile
+from backend.schemas.portfolio import Portfolio
+from backend.schemas.project import Project, ProjectEvidence
+from backend.utils.project_csv import PROJECT_CSV_COLUMNS, project_to_csv_rows
+from backend.utils.export_jobs import discard_export_job, get_export_job, is_export_running, register_export_job
+
+# Load environment variables
+load_dotenv()
+
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "dev-impact-exports"))
+EXPORT_CACHE_TTL_SECONDS = int(os.getenv("EXPORT_CACHE_TTL_SECONDS", "3600"))
+EXPORT_DOWNLOAD_CONCURRENCY = int(os.getenv("EXPORT_DOWNLOAD_CONCURRENCY", "4"))
+
+# Evidence files can be large; allow more time than the shared client's default
+EXPORT_DOWNLOAD_TIMEOUT = httpx.Timeout(30.0)
+
+CHUNK_SIZE = 64 * 1024
+# Downloads and CSV rows larger than this spill from memory to a temp file
+SPOOL_MAX_SIZE = 1024 * 1024
+# How often a reader checks for new bytes while the archive is still being built
+TAIL_POLL_SECONDS = 0.1
+
+
+class _ZipSink(io.RawIOBase):
+    """
+    Write-only, non-seekable buffer for zipfile
+
+    zipfile falls back to data descriptors for non-seekable outputs, so entries can be
+    written incrementally and the bytes drained after each write.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Service for exporting a user's account data."""
+
+    @staticmethod
+    def _artifact_paths(user_id: str) -> Tuple[str, str]:
+        """Paths of the completed archive and the archive being built for a user"""
+        final_path = os.path.join(EXPORT_CACHE_DIR, f"{user_id}.zip")
+        return final_path, final_path + ".part"
+
+    @staticmethod
+    def _is_fresh(path: str) -> bool:
+        """Check whether a completed archive exists and is within the cache TTL"""
+        try:
+            return time.time() - os.path.getmtime(path) < EXPORT_CACHE_TTL_SECONDS
+        except OSError:
+            return False
+
+    @staticmethod
+    def is_building(user_id: str) -> bool:
+        """Check whether an export is currently being built for a user"""
+        return is_export_running(user_id)
+
+    @staticmethod
+    def needs_build(user_id: str, fresh: bool = False) -> bool:
+        """
+        Check whether a new archive must be built before it can be streamed
+
+        Args:
+            user_id: User's ID
+            fresh: Ignore a cached archive and rebuild
+
+        Returns:
+            False if a build is running or a cached archive can be reused
+        """
+        if ExportService.is_building(user_id):
+            return False
+        final_path, _ = ExportService._artifact_paths(user_id)
+        return fresh or not ExportService._is_fresh(final_path)
+
+    @staticmethod
+    def get_completed_size(user_id: str) -> Optional[int]:
+        """Size of the user's completed archive, or None if it is missing or still building"""
+        if ExportService.is_building(user_id):
+            return None
+        final_path, _ = ExportService._artifact_paths(user_id)
+        if not ExportService._is_fresh(final_path):
+            return None
+        return os.path.getsize(final_path)
+
+    @staticmethod
+    def start_export(user_id: str, archive: AsyncIterator[bytes]) -> None:
+        """
+        Build an archive in the background, writing it to the export cache
+
+        The build keeps running if the client disconnects, so a retried download
+        resumes from the cached artifact instead of starting over.
+
+        Args:
+            user_id: User's ID
+            archive: Archive bytes from build_archive
+        """
+        if ExportService.is_building(user_id):
+            return
+
+        final_path, partial_path = ExportService._artifact_paths(user_id)
+        os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+        # Create the file now so readers can open it before the task first runs
+        out = open(partial_path, "wb")
+
+        async def run():
+            try:
+                with out:
+                    async for chunk in archive:
+                        if chunk:
+                            out.write(chunk)
+                            out.flush()
+                os.replace(partial_path, final_path)
+                return True
+            except Exception as e:
+                print(f"Export build error: {e}")
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+                return False
+            finally:
+                discard_export_job(user_id)
+
+        register_export_job(user_id, asyncio.create_task(run()))
+
+    @staticmethod
+    async def stream_export(user_id: str, start: int = 0) -> AsyncIterator[bytes]:
+        """
+        Stream a user's archive from the export cache
+
+        While a build is running, the partially written file is tailed until the
+        build finishes.
+
+        Args:
+            user_id: User's ID
+            start: Byte offset to start from (for resumed downloads)
+        """
+        final_path, partial_path = ExportService._artifact_paths(user_id)
+        job = get_export_job(user_id)
+
+        try:
+            f = open(partial_path if job else final_path, "rb")
+        except FileNotFoundError:
+            # Build finished (or failed) between the lookup and the open
+            job = None
+            try:
+                f = open(final_path, "rb")
+            except FileNotFoundError:
+                raise HTTPException(status_code=404, detail="Export not found")
+
+        with f:
+            f.seek(start)
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if chunk:
+                    yield chunk
+                    continue
+                if job is None:
+                    return
+                if job.done():
+                    if job.cancelled() or not job.result():
+                        # Abort so the client sees a truncated transfer rather than a corrupt archive
+                        raise RuntimeError("Export build failed")
+                    # All bytes are on disk once the job is done - read what's left, then stop
+                    job = None
+                    continue
+                await asyncio.sleep(TAIL_POLL_SECONDS)
+
+    @staticmethod
+    def _evidence_archive_path(evidence: ProjectEvidence) -> str:
+        """Path of an evidence file inside the archive"""
+        file_name = os.path.basename(evidence.file_name.replace("\\", "/")) or "file"
+        return f"evidence/{evidence.project_id}/{evidence.id}-{file_name}"
+
+    @staticmethod
+    async def _download_to_spool(http: httpx.AsyncClient, url: str):
+        """Download a storage object in chunks into a spooled temp file"""
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            async with http.stream("GET", url, timeout=EXPORT_DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    spool.write(chunk)
+            spool.seek(0)
+            return spool
+        except BaseException:
+            spool.close()
+            raise
+
+    @staticmethod
+    async def build_archive(
+        http: httpx.AsyncClient,
+        user_id: str,
+        profile: UserProfile,
+        portfolios: List[Portfolio],
+        project_pages: AsyncIterator[List[Project]],
+    ) -> AsyncIterator[bytes]:
+        """
+        Generate a ZIP archive of a user's data
+
+        Archive layout:
+            profile.json, portfolios.json, projects.json, projects.csv,
+            evidence/<project_id>/<evidence_id>-<file_name>, manifest.json
+
+        Projects are consumed page by page and evidence files are downloaded with at
+        most EXPORT_DOWNLOAD_CONCURRENCY requests in flight, so memory use does not
+        grow with the size of the account.
+
+        Args:
+            http: Shared HTTP client used to download evidence files
+            user_id: User's ID
+            profile: User's profile
+            portfolios: User's portfolios
+            project_pages: Pages of projects with evidence included
+
+        Yields:
+            Chunks of the ZIP archive
+        """
+        sink = _ZipSink()
+        evidence_items: List[ProjectEvidence] = []
+        failed_evidence: List[Dict[str, str]] = []
+        project_count = 0
+
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("profile.json", profile.model_dump_json(indent=2))
+            archive.writestr(
+                "portfolios.json",
+                json.dumps([p.model_dump(mode="json") for p in portfolios], indent=2)
+            )
+            yield sink.drain()
+
+            # projects.json is written as pages arrive; CSV rows are spooled and added afterwards
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(PROJECT_CSV_COLUMNS)
+
+                with archive.open("projects.json", mode="w", force_zip64=True) as projects_json:
+                    projects_json.write(b"[")
+                    async for page in project_pages:
+                        for project in page:
+                            separator = b",\n" if project_count else b"\n"
+                            projects_json.write(separator + project.model_dump_json().encode())
+                            writer.writerows(project_to_csv_rows(project))
+                            evidence_items.extend(project.evidence or [])
+                            project_count += 1
+                        yield sink.drain()
+                    projects_json.write(b"\n]\n")
+                yield sink.drain()
+
+                csv_file.seek(0)
+                with archive.open("projects.csv", mode="w", force_zip64=True) as projects_csv:
+                    while chunk := csv_file.read(CHUNK_SIZE):
+                        projects_csv.write(chunk.encode())
+                        yield sink.drain()
+
+            # Download evidence through a bounded window, writing files in order
+            downloadable = iter(e for e in evidence_items if e.url)
+            pending: Deque[Tuple[ProjectEvidence, asyncio.Task]] = deque()
+
+            def schedule_next():
+                evidence = next(downloadable, None)
+                if evidence:
+                    pending.append((evidence, asyncio.create_task(
+                        ExportService._download_to_spool(http, evidence.url)
+                    )))
+
+            try:
+                for _ in range(max(EXPORT_DOWNLOAD_CONCURRENCY, 1)):
+                    schedule_next()
+
+                while pending:
+                    evidence, task = pending.popleft()
+                    schedule_next()
+                    try:
+                        spool = await task
+                    except Exception as e:
+                        print(f"Export evidence download error ({evidence.file_path}): {e}")
+                        failed_evidence.append({"id": evidence.id, "file_path": evidence.file_path})
+                        continue
+
+                    with spool:
+                        # Images are already compressed - store them as-is
+                        info = zipfile.ZipInfo(
+                            ExportService._evidence_archive_path(evidence),
+                            date_time=time.localtime()[:6]
+                        )
+                        info.compress_type = zipfile.ZIP_STORED
+                        with archive.open(info, mode="w", force_zip64=True) as entry:
+                            while chunk := spool.read(CHUNK_SIZE):
+                                entry.write(chunk)
+                                yield sink.drain()
+            finally:
+                for _, task in pending:
+                    task.cancel()
+
+            archive.writestr("manifest.json", json.dumps({
+                "user_id": user_id,
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+                "portfolio_count": len(portfolios),
+                "project_count": project_count,
+                "evidence_count": len(evidence_items) - len(failed_evidence),
+                "failed_evidence": failed_evidence,
+            }, indent=2))
+
+        # Closing the archive writes the central directory
+        yield sink.drain()
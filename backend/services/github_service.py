@@ -17,113 +17,110 @@ class GitHubService:
     """Service for handling GitHub OAuth Device Flow and API calls."""
 
     @staticmethod
-    async def initiate_device_flow() -> DeviceCodeResponse:
+    async def initiate_device_flow(http: httpx.AsyncClient) -> DeviceCodeResponse:
         """
         Initiate GitHub Device Flow authentication.
         Returns device code, user code, and verification URI.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    GITHUB_DEVICE_AUTH_URL,
-                    headers={
-                        "Accept": "application/json",
-                    },
-                    data={
-                        "client_id": GITHUB_CLIENT_ID,
-                        "scope": "read:user",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                return DeviceCodeResponse(
-                    device_code=data["device_code"],
-                    user_code=data["user_code"],
-                    verification_uri=data["verification_uri"],
-                    expires_in=data["expires_in"],
-                    interval=data.get("interval", 5),
-                )
+            response = await http.post(
+                GITHUB_DEVICE_AUTH_URL,
+                headers={
+                    "Accept": "application/json",
+                },
+                data={
+                    "client_id": GITHUB_CLIENT_ID,
+                    "scope": "read:user",
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            return DeviceCodeResponse(
+                device_code=data["device_code"],
+                user_code=data["user_code"],
+                verification_uri=data["verification_uri"],
+                expires_in=data["expires_in"],
+                interval=data.get("interval", 5),
+            )
         except HTTPException:
             raise
         except Exception:
             raise HTTPException(status_code=500, detail="Failed to initiate GitHub device flow")
 
     @staticmethod
-    async def poll_for_token(device_code: str) -> Optional[TokenResponse]:
+    async def poll_for_token(http: httpx.AsyncClient, device_code: str) -> Optional[TokenResponse]:
         """
         Poll GitHub for access token.
         Returns TokenResponse if authorized, None if still pending.
         Raises exception on error.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    GITHUB_TOKEN_URL,
-                    headers={
-                        "Accept": "application/json",
-                    },
-                    data={
-                        "client_id": GITHUB_CLIENT_ID,
-                        "device_code": device_code,
-                        "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
-                    },
-                )
-                
-                data = response.json()
-                
-                # Check for errors
-                if "error" in data:
-                    error = data["error"]
-                    if error == "authorization_pending":
-                        # Still waiting for user authorization
-                        return None
-                    elif error == "slow_down":
-                        # Should increase polling interval (handled by frontend)
-                        return None
-                    elif error == "expired_token":
-                        raise Exception("Device code expired")
-                    elif error == "access_denied":
-                        raise Exception("User denied authorization")
-                    else:
-                        raise Exception(f"GitHub OAuth error: {error}")
-                
-                # Success
-                return TokenResponse(
-                    status="success",
-                    access_token=data["access_token"],
-                    token_type=data["token_type"],
-                    scope=data["scope"],
-                )
+            response = await http.post(
+                GITHUB_TOKEN_URL,
+                headers={
+                    "Accept": "application/json",
+                },
+                data={
+                    "client_id": GITHUB_CLIENT_ID,
+                    "device_code": device_code,
+                    "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+                },
+            )
+            
+            data = response.json()
+            
+            # Check for errors
+            if "error" in data:
+                error = data["error"]
+                if error == "authorization_pending":
+                    # Still waiting for user authorization
+                    return None
+                elif error == "slow_down":
+                    # Should increase polling interval (handled by frontend)
+                    return None
+                elif error == "expired_token":
+                    raise Exception("Device code expired")
+                elif error == "access_denied":
+                    raise Exception("User denied authorization")
+                else:
+                    raise Exception(f"GitHub OAuth error: {error}")
+            
+            # Success
+            return TokenResponse(
+                status="success",
+                access_token=data["access_token"],
+                token_type=data["token_type"],
+                scope=data["scope"],
+            )
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to poll for GitHub token: {e}")
     
     @staticmethod
-    async def get_user_profile(access_token: str) -> GitHubUser:
+    async def get_user_profile(http: httpx.AsyncClient, access_token: str) -> GitHubUser:
         """
         Fetch GitHub user profile using access token.
         Returns user profile information.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    GITHUB_USER_API_URL,
-                    headers={
-                        "Accept": "application/json",
-                        "Authorization": f"Bearer {access_token}",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                return GitHubUser(
-                    login=data["login"],
-                    avatar_url=data["avatar_url"],
-                    name=data.get("name"),
-                    email=data.get("email"),
-                )
+            response = await http.get(
+                GITHUB_USER_API_URL,
+                headers={
+                    "Accept": "application/json",
+                    "Authorization": f"Bearer {access_token}",
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            return GitHubUser(
+                login=data["login"],
+                avatar_url=data["avatar_url"],
+                name=data.get("name"),
+                email=data.get("email"),
+            )
         except HTTPException:
             raise
         except Exception as e:
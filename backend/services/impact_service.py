@@ -0,0 +1,213 @@
+"""
+Impact Service - Aggregate a user's normalized metrics into headline numbers
+"""
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from supabase import Client
+from backend.schemas.impact import ImpactHeadline, ImpactSummaryResponse, MetricAggregate
+from backend.utils.ttl_cache import TTLCache
+
+# Load environment variables
+load_dotenv()
+
+IMPACT_SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("IMPACT_SUMMARY_CACHE_TTL_SECONDS", "300"))
+FETCH_PAGE_SIZE = 1000
+
+# Occurrences per year for metric context frequencies; one-off and unspecified count once
+FREQUENCY_PER_YEAR = {"daily": 365, "weekly": 52, "monthly": 12, "annually": 1, "one_time": 1}
+MS_PER_HOUR = 3_600_000
+TIME_UNITS = ("ms", "s", "min", "hrs")
+PERCENTILES = (50, 25, 75, 90)
+
+_summary_cache = TTLCache(IMPACT_SUMMARY_CACHE_TTL_SECONDS)
+
+
+class ImpactService:
+    """Service for aggregated impact summaries."""
+
+    @staticmethod
+    def invalidate_user(user_id: str) -> None:
+        """Drop cached summaries for a user after their projects or metrics change"""
+        _summary_cache.delete_where(lambda key, _: key[0] == user_id)
+
+    @staticmethod
+    def _fetch_metric_rows(client: Client, user_id: str, portfolio_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Load the normalized columns of every metric on the user's projects, in id pages"""
+        rows: List[Dict[str, Any]] = []
+        last_id = None
+        while True:
+            query = client.table("project_metrics")\
+                .select(
+                    "id, metric_type, canonical_value, canonical_unit, improvement_ratio, "
+                    "frequency:metric_data->context->>frequency, "
+                    "comparison_unit:metric_data->comparison->before->>unit, "
+                    "impact_projects!inner(user_id, portfolio_id)"
+                )\
+                .eq("impact_projects.user_id", user_id)\
+                .is_("impact_projects.delete_requested_at", "null")
+            if portfolio_id:
+                query = query.eq("impact_projects.portfolio_id", portfolio_id)
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(FETCH_PAGE_SIZE).execute().data or []
+            rows.extend(page)
+            if len(page) < FETCH_PAGE_SIZE:
+                return rows
+            last_id = page[-1]["id"]
+
+    @staticmethod
+    def _group_percentiles(group: np.ndarray, values: np.ndarray, group_count: int, percentiles: Sequence[float]) -> np.ndarray:
+        """
+        Linear-interpolated percentiles of values per group, without a Python loop per group
+
+        Returns:
+            Array of shape (len(percentiles), group_count); NaN for empty groups
+        """
+        result = np.full((len(percentiles), group_count), np.nan)
+        if len(values) == 0:
+            return result
+        order = np.lexsort((values, group))
+        sorted_values = values[order]
+        counts = np.bincount(group, minlength=group_count)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        present = counts > 0
+        for i, q in enumerate(percentiles):
+            position = starts[present] + (q / 100) * (counts[present] - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            result[i, present] = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+        return result
+
+    @staticmethod
+    def _aggregate(
+        keys: Sequence[np.ndarray],
+        values: np.ndarray,
+        annualized: np.ndarray,
+        is_savings: np.ndarray,
+        ratios: np.ndarray,
+    ) -> List[Dict[str, Any]]:
+        """Count, sum and percentiles of values grouped by the given key columns"""
+        if len(values) == 0:
+            return []
+        stacked = np.stack(keys, axis=1)
+        unique_keys, group = np.unique(stacked, axis=0, return_inverse=True)
+        group = group.reshape(-1)
+        group_count = len(unique_keys)
+
+        counts = np.bincount(group, minlength=group_count)
+        totals = np.bincount(group, weights=values, minlength=group_count)
+        annualized_totals = np.bincount(group, weights=annualized, minlength=group_count)
+        savings_groups = np.bincount(group, weights=is_savings, minlength=group_count) > 0
+        median, p25, p75, p90 = ImpactService._group_percentiles(group, values, group_count, PERCENTILES)
+
+        has_ratio = ~np.isnan(ratios)
+        median_ratio = ImpactService._group_percentiles(group[has_ratio], ratios[has_ratio], group_count, (50,))[0]
+
+        aggregates = []
+        for g, key in enumerate(unique_keys):
+            aggregates.append({
+                "key": tuple(key),
+                "count": int(counts[g]),
+                "total": float(totals[g]),
+                "annualized_total": float(annualized_totals[g]) if savings_groups[g] else None,
+                "median": float(median[g]),
+                "p25": float(p25[g]),
+                "p75": float(p75[g]),
+                "p90": float(p90[g]),
+                "median_improvement": None if np.isnan(median_ratio[g]) else float(median_ratio[g]),
+            })
+        return aggregates
+
+    @staticmethod
+    def summarize(rows: List[Dict[str, Any]], portfolio_id: Optional[str] = None) -> ImpactSummaryResponse:
+        """
+        Compute an impact summary from project_metrics rows
+
+        Rows are turned into columnar arrays once and every aggregate is computed on
+        the arrays. Only standardized metrics with a canonical value are aggregated.
+        """
+        normalized = [row for row in rows if row.get("canonical_value") is not None and row.get("canonical_unit")]
+
+        types = np.array([row["metric_type"] for row in normalized], dtype=object).astype(str)
+        units = np.array([row["canonical_unit"] for row in normalized], dtype=object).astype(str)
+        frequencies = np.array([row.get("frequency") or "" for row in normalized], dtype=object).astype(str)
+        comparison_units = np.array([row.get("comparison_unit") or "" for row in normalized], dtype=object).astype(str)
+        values = np.array([row["canonical_value"] for row in normalized], dtype=np.float64)
+        ratios = np.array(
+            [np.nan if row.get("improvement_ratio") is None else row["improvement_ratio"] for row in normalized],
+            dtype=np.float64,
+        )
+
+        # Savings recur with their frequency; latencies, ratios and counts don't add up over a year
+        per_year = np.ones(len(values))
+        for frequency, multiplier in FREQUENCY_PER_YEAR.items():
+            per_year[frequencies == frequency] = multiplier
+        is_savings = (units == "$") | ((types == "time") & (units == "ms"))
+        annualized = np.where(is_savings, values * per_year, values)
+
+        latency_ratios = ratios[(types == "performance") & np.isin(comparison_units, TIME_UNITS) & ~np.isnan(ratios)]
+        headline = ImpactHeadline(
+            dollars_annualized=float(annualized[units == "$"].sum()),
+            hours_saved_annualized=float(annualized[(types == "time") & (units == "ms")].sum() / MS_PER_HOUR),
+            users_served=float(values[units == "users"].sum()),
+            median_latency_improvement=float(np.median(latency_ratios)) if len(latency_ratios) else None,
+        )
+
+        by_type = [
+            MetricAggregate(type=a["key"][0], unit=a["key"][1], **{k: v for k, v in a.items() if k != "key"})
+            for a in ImpactService._aggregate((types, units), values, annualized, is_savings, ratios)
+        ]
+        by_frequency = [
+            MetricAggregate(
+                type=a["key"][0], unit=a["key"][1], frequency=a["key"][2] or None,
+                **{k: v for k, v in a.items() if k != "key"}
+            )
+            for a in ImpactService._aggregate((types, units, frequencies), values, annualized, is_savings, ratios)
+        ]
+
+        return ImpactSummaryResponse(
+            portfolio_id=portfolio_id,
+            metric_count=len(normalized),
+            unconverted_metric_count=sum(1 for row in rows if row.get("metric_type") is None),
+            headline=headline,
+            by_type=by_type,
+            by_frequency=by_frequency,
+            generated_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    @staticmethod
+    async def get_impact_summary(client: Client, user_id: str, portfolio_id: Optional[str] = None) -> ImpactSummaryResponse:
+        """
+        Get a user's impact summary, served from cache until their projects change
+
+        Args:
+            client: Supabase client
+            user_id: User ID
+            portfolio_id: Limit the summary to one portfolio
+
+        Returns:
+            ImpactSummaryResponse
+        """
+        cache_key = (user_id, portfolio_id)
+        cached = _summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            rows = ImpactService._fetch_metric_rows(client, user_id, portfolio_id)
+            summary = ImpactService.summarize(rows, portfolio_id)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Get impact summary error: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to compute impact summary"
+            )
+
+        _summary_cache.set(cache_key, summary)
+        return summary
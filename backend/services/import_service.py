@@ -0,0 +1,263 @@
+"""
+Import Service - Parse project imports from JSON Resume, CSV and dev-impact exports
+"""
+import csv
+import json
+import codecs
+import zipfile
+from typing import Any, BinaryIO, Dict, Iterator, Optional, TextIO, Tuple
+from pydantic import ValidationError
+from backend.schemas.project import CreateProjectRequest, ProjectMetric, StandardizedProjectMetric
+from backend.utils.project_csv import group_csv_projects, csv_rows_to_project
+
+READ_CHUNK_SIZE = 64 * 1024
+# JSON Resume documents are parsed whole, so keep them small
+JSON_RESUME_MAX_BYTES = 5 * 1024 * 1024
+EXPORT_PROJECTS_FILE = "projects.json"
+
+# (row, CreateProjectRequest data or None, error or None)
+ImportRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+class ImportService:
+    """Service for parsing project imports."""
+
+    @staticmethod
+    def detect_format(file: BinaryIO) -> str:
+        """
+        Detect the import format from the start of the file
+
+        Returns:
+            "export" for dev-impact export archives or project arrays,
+            "json_resume" for JSON objects, "csv" otherwise
+        """
+        head = file.read(1024)
+        file.seek(0)
+        if head.startswith(b"PK\x03\x04"):
+            return "export"
+        text = head.decode("utf-8-sig", errors="ignore").lstrip()
+        if text.startswith("["):
+            return "export"
+        if text.startswith("{"):
+            return "json_resume"
+        return "csv"
+
+    @staticmethod
+    def _format_error(e: ValidationError) -> str:
+        """Format the first validation error the same way bulk operations do"""
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return f"Invalid project data: {location}: {error['msg']}" if location else f"Invalid project data: {error['msg']}"
+
+    @staticmethod
+    def validate_project(data: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Validate one imported project against CreateProjectRequest
+
+        Metrics are validated on their own first (standardized metrics against
+        StandardizedProjectMetric) so errors point at the offending field instead of
+        listing every member of the metric union.
+
+        Returns:
+            (validated data, None) or (None, error message)
+        """
+        if not isinstance(data, dict):
+            return None, "Invalid project data: expected an object"
+
+        metrics = data.get("metrics") or []
+        if not isinstance(metrics, list):
+            return None, "Invalid project data: metrics: Input should be a valid list"
+        for idx, metric in enumerate(metrics):
+            is_standardized = isinstance(metric, dict) and isinstance(metric.get("primary"), dict)
+            try:
+                (StandardizedProjectMetric if is_standardized else ProjectMetric).model_validate(metric)
+            except ValidationError as e:
+                error = e.errors()[0]
+                location = ".".join(str(part) for part in ("metrics", idx, *error["loc"]))
+                return None, f"Invalid project data: {location}: {error['msg']}"
+
+        try:
+            project = CreateProjectRequest.model_validate({**data, "metrics": metrics})
+        except ValidationError as e:
+            return None, ImportService._format_error(e)
+
+        if not project.company.strip() or not project.projectName.strip():
+            return None, "Invalid project data: company and projectName are required"
+
+        # Imported projects go into the portfolio chosen for the import
+        return project.model_dump(exclude={"portfolio_id"}), None
+
+    @staticmethod
+    def _iter_json_array(stream: TextIO) -> Iterator[Any]:
+        """
+        Yield the elements of a top-level JSON array without loading the whole document
+
+        Raises:
+            ValueError: If the document is not a well-formed JSON array
+        """
+        decoder = json.JSONDecoder()
+        buffer, pos, eof = "", 0, False
+        state = "start"
+
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError("Unexpected end of JSON array")
+                chunk = stream.read(READ_CHUNK_SIZE)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            char = buffer[pos]
+            if state == "start":
+                if char != "[":
+                    raise ValueError("Expected a JSON array of projects")
+                pos += 1
+                state = "first"
+            elif state == "separator":
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError("Expected ',' or ']' between projects")
+                pos += 1
+                state = "value"
+            elif state == "first" and char == "]":
+                return
+            else:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    end = None
+                # A value ending at the buffer edge may be cut short - read more and retry
+                if end is None or (end == len(buffer) and not eof):
+                    if eof:
+                        raise ValueError("Invalid JSON in projects array")
+                    chunk = stream.read(READ_CHUNK_SIZE)
+                    eof = not chunk
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    continue
+                pos = end
+                state = "separator"
+                yield value
+
+    @staticmethod
+    def _parse_export_projects(stream: TextIO) -> Iterator[ImportRow]:
+        """Parse a projects.json array from a dev-impact export"""
+        row = 0
+        try:
+            for row, project in enumerate(ImportService._iter_json_array(stream), start=1):
+                if isinstance(project, dict):
+                    # IDs, portfolio and evidence refer to the source account
+                    project = {k: v for k, v in project.items() if k not in ("id", "portfolio_id", "evidence")}
+                data, error = ImportService.validate_project(project)
+                yield row, data, error
+        except ValueError as e:
+            yield row + 1, None, f"Invalid file: {e}"
+
+    @staticmethod
+    def _parse_export(file: BinaryIO) -> Iterator[ImportRow]:
+        """Parse a dev-impact export archive or a bare projects.json"""
+        if not zipfile.is_zipfile(file):
+            file.seek(0)
+            yield from ImportService._parse_export_projects(codecs.getreader("utf-8-sig")(file))
+            return
+
+        file.seek(0)
+        with zipfile.ZipFile(file) as archive:
+            if EXPORT_PROJECTS_FILE not in archive.namelist():
+                yield 1, None, f"Invalid file: archive has no {EXPORT_PROJECTS_FILE}"
+                return
+            with archive.open(EXPORT_PROJECTS_FILE) as projects_file:
+                yield from ImportService._parse_export_projects(codecs.getreader("utf-8")(projects_file))
+
+    @staticmethod
+    def _parse_csv(file: BinaryIO) -> Iterator[ImportRow]:
+        """Parse a CSV with one row per metric (the export's projects.csv layout)"""
+        reader = csv.DictReader(codecs.getreader("utf-8-sig")(file))
+        line = 1
+        try:
+            for line, rows in group_csv_projects(reader):
+                data, error = ImportService.validate_project(csv_rows_to_project(rows))
+                yield line, data, error
+        except (csv.Error, UnicodeDecodeError) as e:
+            yield line + 1, None, f"Invalid file: {e}"
+
+    @staticmethod
+    def _json_resume_projects(resume: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Map JSON Resume work and projects entries to project data"""
+        for work in resume.get("work") or []:
+            if not isinstance(work, dict):
+                yield work
+                continue
+            position = work.get("position") or ""
+            yield {
+                "company": work.get("name") or work.get("company") or "",
+                "projectName": position,
+                "role": position,
+                "teamSize": 1,
+                "problem": work.get("summary") or work.get("description") or "",
+                "contributions": work.get("highlights") or [],
+                "techStack": work.get("keywords") or [],
+                "metrics": [],
+            }
+        for project in resume.get("projects") or []:
+            if not isinstance(project, dict):
+                yield project
+                continue
+            yield {
+                "company": project.get("entity") or "Independent",
+                "projectName": project.get("name") or "",
+                "role": ", ".join(project.get("roles") or []) or "Contributor",
+                "teamSize": 1,
+                "problem": project.get("description") or project.get("summary") or "",
+                "contributions": project.get("highlights") or [],
+                "techStack": project.get("keywords") or [],
+                "metrics": [],
+            }
+
+    @staticmethod
+    def _parse_json_resume(file: BinaryIO) -> Iterator[ImportRow]:
+        """Parse a JSON Resume document (work and projects sections)"""
+        raw = file.read(JSON_RESUME_MAX_BYTES + 1)
+        if len(raw) > JSON_RESUME_MAX_BYTES:
+            yield 1, None, "Invalid file: JSON Resume documents are limited to 5 MB"
+            return
+        try:
+            resume = json.loads(raw.decode("utf-8-sig"))
+        except (ValueError, UnicodeDecodeError) as e:
+            yield 1, None, f"Invalid file: {e}"
+            return
+        if not isinstance(resume, dict):
+            yield 1, None, "Invalid file: expected a JSON Resume object"
+            return
+
+        for row, project in enumerate(ImportService._json_resume_projects(resume), start=1):
+            data, error = ImportService.validate_project(project)
+            yield row, data, error
+
+    @staticmethod
+    def parse_projects(file: BinaryIO, import_format: str = "auto") -> Tuple[str, Iterator[ImportRow]]:
+        """
+        Parse an import file into validated projects, one at a time
+
+        Rows are numbered by position in the input (for CSV, the line of the
+        project's first row). File-level errors are reported as a final failed row.
+
+        Args:
+            file: Uploaded file (must be seekable)
+            import_format: "auto", "json_resume", "csv" or "export"
+
+        Returns:
+            (detected format, iterator of (row, data, error))
+        """
+        if import_format == "auto":
+            import_format = ImportService.detect_format(file)
+
+        parsers = {
+            "export": ImportService._parse_export,
+            "csv": ImportService._parse_csv,
+            "json_resume": ImportService._parse_json_resume,
+        }
+        return import_format, parsers[import_format](file)
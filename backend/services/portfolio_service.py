@@ -21,9 +21,11 @@ from backend.schemas.portfolio import (
     PortfolioViewStats,
     PortfolioStatsResponse,
 )
+from backend.schemas.project import ReorderResponse
 from backend.schemas.auth import MessageResponse
 from backend.schemas.subscription import SubscriptionInfoResponse
 from backend.utils.dependencies import ServiceDBClient
+from backend.utils.ordering import get_max_display_order, next_display_order, move_item
 
 # Load environment variables
 load_dotenv()
@@ -125,13 +127,10 @@ class PortfolioService:
                 if counter > 1000:
                     raise HTTPException(status_code=500, detail="Failed to generate unique slug")
             
-            # Get current portfolio count for display_order
-            count_result = client.table("portfolios")\
-                .select("id", count="exact")\
-                .eq("user_id", user_id)\
-                .execute()
-            
-            display_order = len(count_result.data) if count_result.data else 0
+            # Append after the current last portfolio
+            display_order = next_display_order(
+                get_max_display_order(client, "portfolios", {"user_id": user_id})
+            )
             
             # Insert new portfolio
             result = client.table("portfolios").insert({
@@ -180,6 +179,7 @@ class PortfolioService:
             result = client.table("portfolios")\
                 .select("*")\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .order("display_order")\
                 .order("created_at")\
                 .execute()
@@ -225,6 +225,7 @@ class PortfolioService:
                 .select("*")\
                 .eq("id", portfolio_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .single()\
                 .execute()
             
@@ -273,6 +274,7 @@ class PortfolioService:
             existing = client.table("portfolios")\
                 .select("user_id, slug")\
                 .eq("id", portfolio_id)\
+                .is_("delete_requested_at", "null")\
                 .execute()
             
             if not existing.data or len(existing.data) == 0:
@@ -321,6 +323,7 @@ class PortfolioService:
                 .update(update_data)\
                 .eq("id", portfolio_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .execute()
             
             if not result.data or len(result.data) == 0:
@@ -396,6 +399,53 @@ class PortfolioService:
             print(f"Delete portfolio error: {e}")
             raise HTTPException(status_code=500, detail="Failed to delete portfolio")
 
+    @staticmethod
+    async def reorder_portfolio(
+        client: ServiceDBClient,
+        portfolio_id: str,
+        user_id: str,
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None
+    ) -> ReorderResponse:
+        """
+        Move a portfolio between two neighbouring portfolios
+        
+        Args:
+            client: Supabase client (injected from router)
+            portfolio_id: The portfolio ID to move
+            user_id: The user's ID (for authorization)
+            before_id: Portfolio to place this one before
+            after_id: Portfolio to place this one after
+            
+        Returns:
+            ReorderResponse with the portfolio's new display_order
+        """
+        try:
+            existing = client.table("portfolios")\
+                .select("id")\
+                .eq("id", portfolio_id)\
+                .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
+                .execute()
+            
+            if not existing.data or len(existing.data) == 0:
+                raise HTTPException(status_code=404, detail="Portfolio not found")
+            
+            display_order = move_item(
+                client,
+                "portfolios",
+                portfolio_id,
+                {"user_id": user_id},
+                before_id=before_id,
+                after_id=after_id
+            )
+            return ReorderResponse(id=portfolio_id, display_order=display_order)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Reorder portfolio error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to reorder portfolio")
+
     # ============================================
     # PUBLISHING OPERATIONS
     # ============================================
@@ -431,6 +481,7 @@ class PortfolioService:
                 .select("id, slug, name, description")\
                 .eq("id", portfolio_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .single()\
                 .execute()
             
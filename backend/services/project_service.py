@@ -3,23 +3,64 @@ Project Service - Handle project operations with Supabase
 """
 import os
 import json
-from typing import List, Dict, Any, Optional, Union
+import base64
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, Iterable, List, Dict, Any, Optional, Tuple, Union
 from dotenv import load_dotenv
 from fastapi import HTTPException
+from pydantic import ValidationError
 from backend.schemas.project import (
     Project,
     ProjectMetric,
     StandardizedProjectMetric,
     ProjectEvidence,
+    EvidenceVariant,
+    EvidenceUploadUrlResponse,
+    CreateProjectRequest,
+    UpdateProjectRequest,
+    BulkProjectOperation,
+    BulkProjectResult,
+    BulkProjectResponse,
+    ReorderResponse,
+    ProjectPage,
+    ImportRowResult,
+    ImportProjectsResponse,
+    METRIC_LIST_ADAPTER,
 )
 from backend.schemas.auth import MessageResponse
+from backend.schemas.user import DeletionJob
 from backend.schemas.subscription import SubscriptionInfoResponse
 from backend.utils.dependencies import ServiceDBClient
+from backend.utils.ttl_cache import TTLCache
+from backend.utils.ordering import ORDER_GAP, get_max_display_order, next_display_order, move_item
+from backend.utils.image_sniff import SNIFF_BYTES, ImageSniffError, sniff_image
+from backend.utils.image_variants import SUPPORTED_MIME_TYPES, VARIANT_WIDTHS
+from backend.utils.evidence_urls import EVIDENCE_CACHE_MAX_AGE_SECONDS, evidence_url, image_transforms_enabled
+from backend.utils.http_client import get_http_client
 import uuid
 
 # Load environment variables
 load_dotenv()
 
+# Rows fetched per request when streaming project lists
+STREAM_PAGE_SIZE = 100
+
+# Projects written per multi-row insert when importing
+IMPORT_BATCH_SIZE = 100
+
+# Evidence access decisions are cached briefly; publish, unpublish and project moves
+# invalidate them in this worker, the TTL bounds staleness in others
+EVIDENCE_ACCESS_CACHE_TTL_SECONDS = int(os.getenv("EVIDENCE_ACCESS_CACHE_TTL_SECONDS", "30"))
+_evidence_access_cache = TTLCache(EVIDENCE_ACCESS_CACHE_TTL_SECONDS, max_entries=10_000)
+
+# Evidence files uploaded to storage at the same time by one batch upload
+EVIDENCE_UPLOAD_CONCURRENCY = int(os.getenv("EVIDENCE_UPLOAD_CONCURRENCY", "4"))
+
+# Storage signed upload URLs stay valid for two hours; reservations last as long so a file
+# can't be uploaded after its reservation has expired and its object been purged
+EVIDENCE_UPLOAD_RESERVATION_TTL_SECONDS = int(os.getenv("EVIDENCE_UPLOAD_RESERVATION_TTL_SECONDS", "7200"))
+
 
 class ProjectService:
     """Service for handling project operations."""
@@ -38,11 +79,11 @@ class ProjectService:
     
     @staticmethod
     def _serialize_standardized_metric(metric: Union[StandardizedProjectMetric, Dict[str, Any]]) -> Dict[str, Any]:
-        """Convert standardized metric to JSONB-compatible dict"""
-        if isinstance(metric, StandardizedProjectMetric):
-            return metric.model_dump(exclude_none=True)
-        return metric
-    
+        """Convert standardized metric to JSONB-compatible dict (the row ID is not part of metric_data)"""
+        if not isinstance(metric, StandardizedProjectMetric):
+            metric = StandardizedProjectMetric(**metric)
+        return metric.model_dump(exclude_none=True, exclude={"id"})
+
     @staticmethod
     def _deserialize_metric(db_metric: Dict[str, Any]) -> Union[ProjectMetric, StandardizedProjectMetric]:
         """Convert database metric to Pydantic model"""
@@ -53,19 +94,331 @@ class ProjectService:
                 metric_data = db_metric["metric_data"]
                 if isinstance(metric_data, str):
                     metric_data = json.loads(metric_data)
-                return StandardizedProjectMetric(**metric_data)
+                return StandardizedProjectMetric(**{**metric_data, "id": db_metric.get("id")})
             except Exception as e:
                 print(f"Error deserializing standardized metric: {e}")
                 # Fallback to legacy if deserialization fails
                 pass
-        
+
         # Legacy format
         return ProjectMetric(
+            id=db_metric.get("id"),
             primary=db_metric["primary_value"],
             label=db_metric["label"],
             detail=db_metric.get("detail")
         )
 
+    @staticmethod
+    def _metric_from_row(db_metric: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a project_metrics row to metric input for validation"""
+        metric_data = db_metric.get("metric_data")
+        if isinstance(metric_data, str):
+            metric_data = json.loads(metric_data)
+        if metric_data and db_metric.get("metric_type"):
+            return {**metric_data, "id": db_metric.get("id")}
+        return {
+            "id": db_metric.get("id"),
+            "primary": db_metric["primary_value"],
+            "label": db_metric["label"],
+            "detail": db_metric.get("detail")
+        }
+
+    @staticmethod
+    def _deserialize_metrics(db_metrics: List[Dict[str, Any]]) -> List[Union[ProjectMetric, StandardizedProjectMetric]]:
+        """
+        Convert a project's metric rows to Pydantic models, validating the whole list in one call
+
+        Falls back to row-by-row deserialization (which tolerates bad standardized
+        data) if any row fails validation.
+        """
+        try:
+            return METRIC_LIST_ADAPTER.validate_python(
+                [ProjectService._metric_from_row(metric) for metric in db_metrics]
+            )
+        except (ValidationError, ValueError, KeyError):
+            return [ProjectService._deserialize_metric(metric) for metric in db_metrics]
+
+    @staticmethod
+    def _build_metric_row(
+        project_id: str,
+        metric: Union[Dict[str, Any], ProjectMetric, StandardizedProjectMetric],
+        display_order: int,
+        metric_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a project_metrics row for a metric (handles both legacy and standardized formats)
+
+        Every row has the same keys so a list of rows can be written in one bulk insert/upsert.
+
+        Args:
+            project_id: Project ID the metric belongs to
+            metric: Metric as a dict or Pydantic model
+            display_order: Position of the metric within the project
+            metric_id: Row ID to write (generated if not provided)
+
+        Returns:
+            Dict ready to be inserted into project_metrics
+        """
+        if isinstance(metric, (ProjectMetric, StandardizedProjectMetric)):
+            metric = metric.model_dump()
+
+        row = {
+            "id": metric_id or str(uuid.uuid4()),
+            "project_id": project_id,
+            "display_order": display_order,
+        }
+        if ProjectService._is_standardized_metric(metric):
+            # Standardized format - leave legacy fields as null
+            metric_data = ProjectService._serialize_standardized_metric(metric)
+            row.update({
+                "metric_type": metric_data["type"],
+                "metric_data": metric_data,
+                "primary_value": None,
+                "label": None,
+                "detail": None
+            })
+        else:
+            # Legacy format - leave new fields as null
+            row.update({
+                "metric_type": None,
+                "metric_data": None,
+                "primary_value": metric["primary"],
+                "label": metric["label"],
+                "detail": metric.get("detail")
+            })
+        return row
+
+    @staticmethod
+    def _metric_row_changed(existing: Dict[str, Any], row: Dict[str, Any]) -> bool:
+        """Check whether a built metric row differs from the stored project_metrics row"""
+        existing_data = existing.get("metric_data")
+        if isinstance(existing_data, str):
+            existing_data = json.loads(existing_data)
+        if existing_data:
+            try:
+                existing_data = ProjectService._serialize_standardized_metric(existing_data)
+            except Exception:
+                # Stored data no longer validates - rewrite it
+                return True
+
+        return (
+            existing_data != row["metric_data"]
+            or existing.get("metric_type") != row["metric_type"]
+            or existing.get("primary_value") != row["primary_value"]
+            or existing.get("label") != row["label"]
+            or existing.get("detail") != row["detail"]
+            or existing.get("display_order") != row["display_order"]
+        )
+
+    @staticmethod
+    def _diff_metrics(
+        project_id: str,
+        existing_rows: List[Dict[str, Any]],
+        metrics: List[Union[Dict[str, Any], ProjectMetric, StandardizedProjectMetric]]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Compute the minimal set of writes to turn the stored metrics into the requested list
+
+        Metrics carrying the ID of one of this project's rows keep that ID and are only
+        rewritten if something changed. Metrics without a known ID get a new ID, and
+        stored rows that are no longer referenced are deleted.
+
+        Args:
+            project_id: Project ID
+            existing_rows: Current project_metrics rows for the project
+            metrics: Requested metrics, in display order
+
+        Returns:
+            Tuple of (rows to upsert, metric IDs to delete)
+        """
+        existing_by_id = {row["id"]: row for row in existing_rows}
+        upserts = []
+        kept_ids = set()
+
+        for idx, metric in enumerate(metrics):
+            metric_id = metric.get("id") if isinstance(metric, dict) else metric.id
+            # Never trust IDs that don't belong to this project
+            if metric_id not in existing_by_id or metric_id in kept_ids:
+                metric_id = None
+
+            row = ProjectService._build_metric_row(project_id, metric, idx, metric_id)
+            if metric_id:
+                kept_ids.add(metric_id)
+                if not ProjectService._metric_row_changed(existing_by_id[metric_id], row):
+                    continue
+            upserts.append(row)
+
+        delete_ids = [metric_id for metric_id in existing_by_id if metric_id not in kept_ids]
+        return upserts, delete_ids
+
+    @staticmethod
+    def _build_project(
+        project: Dict[str, Any],
+        metrics: List[Union[Dict[str, Any], ProjectMetric, StandardizedProjectMetric]],
+        evidence: Optional[List[ProjectEvidence]] = None,
+        trusted: bool = False
+    ) -> Project:
+        """
+        Transform an impact_projects row to the frontend Project format
+
+        With trusted=True (rows from our own DB) the model is built without validation;
+        metrics and evidence must already be models.
+        """
+        fields = dict(
+            id=project["id"],
+            company=project["company"],
+            projectName=project["project_name"],
+            role=project["role"],
+            teamSize=project["team_size"],
+            problem=project["problem"],
+            contributions=project["contributions"] if isinstance(project["contributions"], list) else [project["contributions"]],
+            techStack=project["tech_stack"],
+            metrics=metrics,
+            portfolio_id=project["portfolio_id"] if "portfolio_id" in project else None,
+            evidence=evidence
+        )
+        return Project.model_construct(**fields) if trusted else Project(**fields)
+
+    @staticmethod
+    def _build_project_insert(user_id: str, project_data: Dict[str, Any], display_order: int) -> Dict[str, Any]:
+        """Build an impact_projects row from frontend project data"""
+        project_insert = {
+            "user_id": user_id,
+            "company": project_data["company"],
+            "project_name": project_data["projectName"],
+            "role": project_data["role"],
+            "team_size": project_data["teamSize"],
+            "problem": project_data["problem"],
+            "contributions": project_data["contributions"],
+            "tech_stack": project_data["techStack"],
+            "display_order": display_order
+        }
+        if project_data.get("portfolio_id"):
+            project_insert["portfolio_id"] = project_data["portfolio_id"]
+        return project_insert
+
+    @staticmethod
+    def _project_limit_detail(subscription_info: SubscriptionInfoResponse) -> str:
+        """Error detail for a create that would exceed the user's project limit, per plan"""
+        if subscription_info.subscription_type == "pro":
+            return f"Project limit reached. Pro users are limited to {subscription_info.max_projects} projects."
+        return f"Project limit reached. Free users are limited to {subscription_info.max_projects} projects. Upgrade to Pro for unlimited projects."
+
+    @staticmethod
+    def _project_order_scope(user_id: str, portfolio_id: Optional[str]) -> Dict[str, Any]:
+        """Rows a project is ordered against: the user's projects in the same portfolio (or in none)"""
+        return {"user_id": user_id, "portfolio_id": portfolio_id or None}
+
+    @staticmethod
+    def _encode_cursor(project_row: Dict[str, Any]) -> str:
+        """Opaque keyset cursor pointing just after a project row"""
+        raw = json.dumps([project_row["display_order"], project_row["id"]])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[int, str]:
+        """Decode a cursor from _encode_cursor into (display_order, id)"""
+        try:
+            display_order, project_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            uuid.UUID(str(project_id))
+            return int(display_order), str(project_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @staticmethod
+    def _fetch_project_rows(
+        client: ServiceDBClient,
+        user_id: str,
+        portfolio_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch project rows with embedded metrics, ordered by (display_order, id)
+
+        Args:
+            client: Supabase client (injected from router)
+            user_id: User's ID
+            portfolio_id: Optional portfolio ID to filter projects
+            limit: Maximum rows to return (all rows if None)
+            after: Keyset position (display_order, id) to continue after
+        """
+        query = client.table("impact_projects")\
+            .select("*, metrics:project_metrics(*)")\
+            .eq("user_id", user_id)\
+            .is_("delete_requested_at", "null")
+
+        if portfolio_id:
+            query = query.eq("portfolio_id", portfolio_id)
+
+        if after:
+            order, last_id = after
+            query = query.or_(f"display_order.gt.{order},and(display_order.eq.{order},id.gt.{last_id})")
+
+        query = query.order("display_order").order("id")
+        if limit:
+            query = query.limit(limit)
+
+        return query.execute().data or []
+
+    @staticmethod
+    def _rows_to_projects(client: ServiceDBClient, rows: List[Dict[str, Any]], include_evidence: bool = False) -> List[Project]:
+        """
+        Build Project models from project rows with embedded metrics
+
+        Args:
+            client: Supabase client (injected from router)
+            rows: impact_projects rows selected with metrics:project_metrics(*)
+            include_evidence: Whether to fetch and attach evidence for these projects
+        """
+        evidence_map: Dict[str, List[ProjectEvidence]] = {}
+        if include_evidence and rows:
+            project_ids = [p["id"] for p in rows]
+            evidence_result = client.table("project_evidence")\
+                .select("*")\
+                .in_("project_id", project_ids)\
+                .order("display_order")\
+                .execute()
+
+            for ev in evidence_result.data or []:
+                evidence_map.setdefault(ev["project_id"], []).append(
+                    ProjectService._evidence_from_row(ev, trusted=True)
+                )
+
+        # Validate every metric on the page in one call instead of row by row
+        metrics_by_row = [
+            sorted(project.get("metrics") or [], key=lambda m: m.get("display_order", 0))
+            for project in rows
+        ]
+        try:
+            page_metrics = METRIC_LIST_ADAPTER.validate_python([
+                ProjectService._metric_from_row(metric)
+                for project_metrics in metrics_by_row
+                for metric in project_metrics
+            ])
+        except (ValidationError, ValueError, KeyError):
+            page_metrics = None
+
+        projects = []
+        offset = 0
+        for project, project_metrics in zip(rows, metrics_by_row):
+            if page_metrics is not None:
+                metrics = page_metrics[offset:offset + len(project_metrics)]
+                offset += len(project_metrics)
+            else:
+                # Some row is malformed - fall back to per-project handling
+                metrics = ProjectService._deserialize_metrics(project_metrics)
+
+            # Rows come from our own DB, so the project itself is built without validation
+            projects.append(ProjectService._build_project(
+                project,
+                metrics,
+                evidence=evidence_map.get(project["id"]) if include_evidence else None,
+                trusted=True
+            ))
+
+        return projects
+
     @staticmethod
     async def list_projects(client: ServiceDBClient, user_id: str | None = None, portfolio_id: Optional[str] = None, include_evidence: bool = False) -> List[Project]:
         """
@@ -84,87 +437,94 @@ class ProjectService:
             raise HTTPException(status_code=400, detail="User ID is required")
         
         try:
-            query = client.table("impact_projects")\
-                .select("*, metrics:project_metrics(*)")\
-                .eq("user_id", user_id)
-            
-            # Filter by portfolio_id if provided
-            if portfolio_id:
-                query = query.eq("portfolio_id", portfolio_id)
-            
-            result = query.order("display_order").execute()
-            
-            # If including evidence, fetch all evidence for these projects
-            evidence_map = {}
-            if include_evidence and result.data:
-                project_ids = [p["id"] for p in result.data]
-                evidence_result = client.table("project_evidence")\
-                    .select("*")\
-                    .in_("project_id", project_ids)\
-                    .order("display_order")\
-                    .execute()
-                
-                if evidence_result.data:
-                    supabase_url = os.getenv("SUPABASE_URL", "")
-                    bucket_name = "project-evidence"
-                    
-                    for ev in evidence_result.data:
-                        pid = ev["project_id"]
-                        if pid not in evidence_map:
-                            evidence_map[pid] = []
-                        
-                        # Generate public URL
-                        file_path = ev["file_path"]
-                        image_url = None
-                        if supabase_url and file_path:
-                            image_url = f"{supabase_url}/storage/v1/object/public/{bucket_name}/{file_path}"
-                        
-                        evidence_map[pid].append(ProjectEvidence(
-                            id=ev["id"],
-                            project_id=ev["project_id"],
-                            file_path=ev["file_path"],
-                            file_name=ev["file_name"],
-                            file_size=ev["file_size"],
-                            mime_type=ev["mime_type"],
-                            display_order=ev["display_order"],
-                            created_at=ev["created_at"],
-                            url=image_url
-                        ))
-
-            projects = []
-            for project in result.data:
-                # Transform to frontend format
-                metrics = []
-                if project.get("metrics"):
-                    metrics = sorted(project["metrics"], key=lambda m: m.get("display_order", 0))
-                    metrics = [
-                        ProjectService._deserialize_metric(metric)
-                        for metric in metrics
-                    ]
-                
-                project_data = Project(
-                    id=project["id"],
-                    company=project["company"],
-                    projectName=project["project_name"],
-                    role=project["role"],
-                    teamSize=project["team_size"],
-                    problem=project["problem"],
-                    contributions=project["contributions"] if isinstance(project["contributions"], list) else [project["contributions"]],
-                    techStack=project["tech_stack"],
-                    metrics=metrics,
-                    portfolio_id=project["portfolio_id"] if "portfolio_id" in project else None,
-                    evidence=evidence_map.get(project["id"]) if include_evidence else None
-                )
-                
-                projects.append(project_data)
-            
-            return projects
+            rows = ProjectService._fetch_project_rows(client, user_id, portfolio_id=portfolio_id)
+            return ProjectService._rows_to_projects(client, rows, include_evidence=include_evidence)
         except HTTPException:
             raise
         except Exception as e:
             print(f"List projects error: {e}")
             raise HTTPException(status_code=500, detail="Failed to fetch projects")
 
+    @staticmethod
+    async def list_projects_page(
+        client: ServiceDBClient,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        portfolio_id: Optional[str] = None,
+        include_evidence: bool = False,
+    ) -> ProjectPage:
+        """
+        List one page of a user's projects using keyset pagination
+
+        Args:
+            client: Supabase client (injected from router)
+            user_id: User's ID
+            limit: Page size
+            cursor: Cursor returned with the previous page (None for the first page)
+            portfolio_id: Optional portfolio ID to filter projects
+            include_evidence: Whether to include evidence data
+
+        Returns:
+            ProjectPage with the projects and the cursor for the next page
+        """
+        after = ProjectService._decode_cursor(cursor) if cursor else None
+
+        try:
+            # Fetch one extra row to know whether another page exists
+            rows = ProjectService._fetch_project_rows(
+                client, user_id, portfolio_id=portfolio_id, limit=limit + 1, after=after
+            )
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            return ProjectPage(
+                projects=ProjectService._rows_to_projects(client, rows, include_evidence=include_evidence),
+                next_cursor=ProjectService._encode_cursor(rows[-1]) if has_more else None
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"List projects page error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to fetch projects")
+
+    @staticmethod
+    async def iter_project_pages(
+        client: ServiceDBClient,
+        user_id: str,
+        portfolio_id: Optional[str] = None,
+        include_evidence: bool = False,
+        page_size: int = STREAM_PAGE_SIZE,
+    ) -> AsyncIterator[List[Project]]:
+        """
+        Yield a user's projects page by page for streaming responses
+
+        Only one page of rows is held in memory at a time.
+
+        Args:
+            client: Supabase client (injected from router)
+            user_id: User's ID
+            portfolio_id: Optional portfolio ID to filter projects
+            include_evidence: Whether to include evidence data
+            page_size: Rows fetched per PostgREST request
+        """
+        after = None
+        while True:
+            try:
+                rows = ProjectService._fetch_project_rows(
+                    client, user_id, portfolio_id=portfolio_id, limit=page_size, after=after
+                )
+                projects = ProjectService._rows_to_projects(client, rows, include_evidence=include_evidence)
+            except Exception as e:
+                print(f"Stream projects error: {e}")
+                raise HTTPException(status_code=500, detail="Failed to fetch projects")
+
+            if projects:
+                yield projects
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]["display_order"], rows[-1]["id"])
+
     @staticmethod
     async def get_project(client: ServiceDBClient, project_id: str, user_id: str) -> Project:
         """
@@ -183,6 +543,7 @@ class ProjectService:
                 .select("*, metrics:project_metrics(*)")\
                 .eq("id", project_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .single()\
                 .execute()
             
@@ -195,25 +556,14 @@ class ProjectService:
             metrics = []
             if project.get("metrics"):
                 metrics = sorted(project["metrics"], key=lambda m: m.get("display_order", 0))
-                metrics = [
-                    ProjectService._deserialize_metric(metric)
-                    for metric in metrics
-                ]
+                metrics = ProjectService._deserialize_metrics(metrics)
+            
+            # Get evidence for this project (ownership was checked by the query above)
+            evidence_list = await ProjectService._fetch_evidence_list(client, project_id)
             
-            # Get evidence for this project
-            evidence_list = await ProjectService.list_project_evidence(client, project_id, user_id)
-            
-            project_data = Project(
-                id=project["id"],
-                company=project["company"],
-                projectName=project["project_name"],
-                role=project["role"],
-                teamSize=project["team_size"],
-                problem=project["problem"],
-                contributions=project["contributions"] if isinstance(project["contributions"], list) else [project["contributions"]],
-                techStack=project["tech_stack"],
-                metrics=metrics,
-                portfolio_id=project["portfolio_id"] if "portfolio_id" in project else None,
+            project_data = ProjectService._build_project(
+                project,
+                metrics,
                 evidence=evidence_list if evidence_list else None
             )
             
@@ -246,44 +596,29 @@ class ProjectService:
         if not subscription_info.can_add_project:
             raise HTTPException(
                 status_code=403,
-                detail=f"Project limit reached. Free users are limited to {subscription_info.max_projects} projects. Upgrade to Pro for unlimited projects."
+                detail=ProjectService._project_limit_detail(subscription_info)
             )
         try:
             # Extract portfolio_id if provided
             portfolio_id = project_data.pop("portfolio_id", None)
             
-            # Get current project count for display_order (within profile if specified)
-            count_query = client.table("impact_projects")\
-                .select("id", count="exact")\
-                .eq("user_id", user_id)
-            
-            if portfolio_id:
-                count_query = count_query.eq("portfolio_id", portfolio_id)
-            
-            count_result = count_query.execute()
-            
-            display_order = len(count_result.data) if count_result.data else 0
+            # Append after the current last project in the same portfolio
+            display_order = next_display_order(
+                get_max_display_order(
+                    client, "impact_projects", ProjectService._project_order_scope(user_id, portfolio_id)
+                )
+            )
             
             # Extract metrics from project data
             metrics = project_data.pop("metrics", [])
             
             # Insert project
-            project_insert = {
-                "user_id": user_id,
-                "company": project_data["company"],
-                "project_name": project_data["projectName"],
-                "role": project_data["role"],
-                "team_size": project_data["teamSize"],
-                "problem": project_data["problem"],
-                "contributions": project_data["contributions"],
-                "tech_stack": project_data["techStack"],
-                "display_order": display_order
-            }
-            
-            # Add portfolio_id if provided
-            if portfolio_id:
-                project_insert["portfolio_id"] = portfolio_id
-            
+            project_insert = ProjectService._build_project_insert(
+                user_id,
+                {**project_data, "portfolio_id": portfolio_id},
+                display_order
+            )
+
             project_result = client.table("impact_projects")\
                 .insert(project_insert)\
                 .execute()
@@ -299,53 +634,23 @@ class ProjectService:
             
             # Insert metrics (handle both legacy and standardized formats)
             if metrics:
-                metrics_insert = []
-                for idx, metric in enumerate(metrics):
-                    if ProjectService._is_standardized_metric(metric):
-                        # Standardized format
-                        metric_data = ProjectService._serialize_standardized_metric(metric)
-                        metrics_insert.append({
-                            "project_id": project_id,
-                            "metric_type": metric_data["type"],
-                            "metric_data": metric_data,
-                            "display_order": idx,
-                            # Leave legacy fields as null
-                            "primary_value": None,
-                            "label": None,
-                            "detail": None
-                        })
-                    else:
-                        # Legacy format
-                        metrics_insert.append({
-                            "project_id": project_id,
-                            "primary_value": metric["primary"],
-                            "label": metric["label"],
-                            "detail": metric.get("detail"),
-                            "display_order": idx,
-                            # Leave new fields as null
-                            "metric_type": None,
-                            "metric_data": None
-                        })
-                
+                metrics_insert = [
+                    ProjectService._build_metric_row(project_id, metric, idx)
+                    for idx, metric in enumerate(metrics)
+                ]
+
                 client.table("project_metrics")\
                     .insert(metrics_insert)\
                     .execute()
-            
+
+                # Return the stable metric IDs to the client
+                metrics = [
+                    {**metric, "id": row["id"]}
+                    for metric, row in zip(metrics, metrics_insert)
+                ]
+
             # Return in frontend format - use the actual database result which includes portfolio_id
-            project_data_result = Project(
-                id=project_id,
-                company=project["company"],
-                projectName=project["project_name"],
-                role=project["role"],
-                teamSize=project["team_size"],
-                problem=project["problem"],
-                contributions=project["contributions"] if isinstance(project["contributions"], list) else [project["contributions"]],
-                techStack=project["tech_stack"],
-                metrics=metrics,
-                portfolio_id=project["portfolio_id"] if "portfolio_id" in project else None
-            )
-            
-            return project_data_result
+            return ProjectService._build_project(project, metrics)
         except HTTPException:
             raise
         except Exception as e:
@@ -399,6 +704,7 @@ class ProjectService:
                     .update(update_data)\
                     .eq("id", project_id)\
                     .eq("user_id", user_id)\
+                    .is_("delete_requested_at", "null")\
                     .execute()
                 
                 if not project_result.data:
@@ -409,44 +715,43 @@ class ProjectService:
             
             # Update metrics if provided
             if metrics is not None:
-                # Delete old metrics
-                client.table("project_metrics")\
-                    .delete()\
+                # Verify ownership when no project fields were updated above
+                if not update_data:
+                    ownership_result = client.table("impact_projects")\
+                        .select("id")\
+                        .eq("id", project_id)\
+                        .eq("user_id", user_id)\
+                        .is_("delete_requested_at", "null")\
+                        .execute()
+
+                    if not ownership_result.data:
+                        raise HTTPException(
+                            status_code=404,
+                            detail="Project not found"
+                        )
+
+                existing_result = client.table("project_metrics")\
+                    .select("*")\
                     .eq("project_id", project_id)\
                     .execute()
-                
-                # Insert new metrics (handle both legacy and standardized formats)
-                if metrics:
-                    metrics_insert = []
-                    for idx, metric in enumerate(metrics):
-                        if ProjectService._is_standardized_metric(metric):
-                            # Standardized format
-                            metric_data = ProjectService._serialize_standardized_metric(metric)
-                            metrics_insert.append({
-                                "project_id": project_id,
-                                "metric_type": metric_data["type"],
-                                "metric_data": metric_data,
-                                "display_order": idx,
-                                # Leave legacy fields as null
-                                "primary_value": None,
-                                "label": None,
-                                "detail": None
-                            })
-                        else:
-                            # Legacy format
-                            metrics_insert.append({
-                                "project_id": project_id,
-                                "primary_value": metric["primary"],
-                                "label": metric["label"],
-                                "detail": metric.get("detail"),
-                                "display_order": idx,
-                                # Leave new fields as null
-                                "metric_type": None,
-                                "metric_data": None
-                            })
-                    
+
+                # Only write what changed so metric IDs stay stable (user_badges.source_metric_ids)
+                upserts, delete_ids = ProjectService._diff_metrics(
+                    project_id,
+                    existing_result.data or [],
+                    metrics
+                )
+
+                if upserts:
+                    client.table("project_metrics")\
+                        .upsert(upserts)\
+                        .execute()
+
+                if delete_ids:
                     client.table("project_metrics")\
-                        .insert(metrics_insert)\
+                        .delete()\
+                        .eq("project_id", project_id)\
+                        .in_("id", delete_ids)\
                         .execute()
             
             # Fetch and return updated project
@@ -458,132 +763,595 @@ class ProjectService:
             raise HTTPException(status_code=500, detail="Failed to update project")
 
     @staticmethod
-    async def delete_project(client: ServiceDBClient, project_id: str, user_id: str) -> MessageResponse:
+    async def reorder_project(
+        client: ServiceDBClient,
+        project_id: str,
+        user_id: str,
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None
+    ) -> ReorderResponse:
         """
-        Delete a project
+        Move a project between two neighbouring projects in the same portfolio
         
         Args:
             client: Supabase client (injected from router)
-            project_id: Project ID
+            project_id: Project ID to move
             user_id: User's ID (for authorization)
+            before_id: Project to place this one before
+            after_id: Project to place this one after
             
         Returns:
-            MessageResponse with success status
+            ReorderResponse with the project's new display_order
         """
         try:
-            # Delete project (metrics will be cascade deleted if FK is set up correctly)
-            result = client.table("impact_projects")\
-                .delete()\
+            project_result = client.table("impact_projects")\
+                .select("id, portfolio_id")\
                 .eq("id", project_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .execute()
             
-            if not result.data:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Project not found"
-                )
+            if not project_result.data:
+                raise HTTPException(status_code=404, detail="Project not found")
             
-            return MessageResponse(success=True, message="Project deleted successfully")
+            display_order = move_item(
+                client,
+                "impact_projects",
+                project_id,
+                ProjectService._project_order_scope(user_id, project_result.data[0].get("portfolio_id")),
+                before_id=before_id,
+                after_id=after_id
+            )
+            return ReorderResponse(id=project_id, display_order=display_order)
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Delete project error: {e}")
-            raise HTTPException(status_code=500, detail="Failed to delete project")
+            print(f"Reorder project error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to reorder project")
 
     @staticmethod
-    async def get_user_total_evidence_size(client: ServiceDBClient, user_id: str) -> int:
+    def _clone_project_rows(
+        client: ServiceDBClient,
+        subscription_info: SubscriptionInfoResponse,
+        user_id: str,
+        source_ids: List[str],
+        portfolio_id: Optional[str],
+        name_suffix: str = ""
+    ) -> List[Dict[str, Any]]:
         """
-        Get total size of all evidence for a user across all projects
-        
+        Clone projects with one clone_projects call (projects, metrics and evidence rows)
+
+        Returns:
+            (source_id, project_id) rows in source order
+        """
+        if subscription_info.project_count + len(source_ids) > subscription_info.max_projects:
+            raise HTTPException(
+                status_code=403,
+                detail=ProjectService._project_limit_detail(subscription_info)
+            )
+        if not source_ids:
+            return []
+
+        first_display_order = next_display_order(
+            get_max_display_order(
+                client, "impact_projects", ProjectService._project_order_scope(user_id, portfolio_id)
+            )
+        )
+
+        result = client.rpc("clone_projects", {
+            "source_project_ids": source_ids,
+            "owner_id": user_id,
+            "target_portfolio_id": portfolio_id,
+            "first_display_order": first_display_order,
+            "order_gap": ORDER_GAP,
+            "name_suffix": name_suffix,
+        }).execute()
+        return result.data or []
+
+    @staticmethod
+    async def clone_project(
+        client: ServiceDBClient,
+        subscription_info: SubscriptionInfoResponse,
+        user_id: str,
+        project_id: str,
+        portfolio_id: Optional[str] = None
+    ) -> Project:
+        """
+        Clone a project with its metrics and evidence
+
+        Evidence is shared with the source project instead of re-uploaded.
+
         Args:
             client: Supabase client (injected from router)
-            user_id: User's ID
-            
+            subscription_info: Subscription information
+            user_id: User's ID (for authorization)
+            project_id: Project to clone
+            portfolio_id: Portfolio for the clone (defaults to the source project's portfolio)
+
         Returns:
-            Total size in bytes
+            The cloned project
         """
         try:
-            # Get all projects for user
-            projects_result = client.table("impact_projects")\
-                .select("id")\
+            source_result = client.table("impact_projects")\
+                .select("id, portfolio_id")\
+                .eq("id", project_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .execute()
-            
-            if not projects_result.data:
-                return 0
-            
-            project_ids = [p["id"] for p in projects_result.data]
-            
-            # Get sum of file sizes for all evidence
-            evidence_result = client.table("project_evidence")\
-                .select("file_size")\
-                .in_("project_id", project_ids)\
-                .execute()
-            
-            total_size = sum(e.get("file_size", 0) for e in evidence_result.data) if evidence_result.data else 0
-            return total_size
-        except HTTPException:
-            raise
-        except Exception as e:
-            print(f"Get user total evidence size error: {e}")
-            raise HTTPException(status_code=500, detail="Failed to calculate total evidence size")
+
+            if not source_result.data:
+                raise HTTPException(status_code=404, detail="Project not found")
+
+            source_portfolio_id = source_result.data[0].get("portfolio_id")
+            if portfolio_id and portfolio_id != source_portfolio_id:
+                portfolio_result = client.table("portfolios")\
+                    .select("id")\
+                    .eq("id", portfolio_id)\
+                    .eq("user_id", user_id)\
+                    .is_("delete_requested_at", "null")\
+                    .execute()
+                if not portfolio_result.data:
+                    raise HTTPException(status_code=404, detail="Portfolio not found")
+            target_portfolio_id = portfolio_id or source_portfolio_id
+
+            # A copy next to the original gets a distinguishable name
+            name_suffix = " (copy)" if target_portfolio_id == source_portfolio_id else ""
+            cloned = ProjectService._clone_project_rows(
+                client, subscription_info, user_id, [project_id], target_portfolio_id, name_suffix
+            )
+            if not cloned:
+                raise HTTPException(status_code=500, detail="Failed to clone project")
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Clone project error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to clone project")
+
+        return await ProjectService.get_project(client, cloned[0]["project_id"], user_id)
 
     @staticmethod
-    async def list_project_evidence(client: ServiceDBClient, project_id: str, user_id: Optional[str] = None) -> List[ProjectEvidence]:
+    async def clone_portfolio_projects(
+        client: ServiceDBClient,
+        subscription_info: SubscriptionInfoResponse,
+        user_id: str,
+        source_portfolio_id: str,
+        target_portfolio_id: str
+    ) -> int:
         """
-        List all evidence for a project
+        Clone every project of a portfolio into another portfolio
+
+        Args:
+            client: Supabase client (injected from router)
+            subscription_info: Subscription information
+            user_id: User's ID (for authorization)
+            source_portfolio_id: Portfolio to copy projects from
+            target_portfolio_id: Portfolio to copy projects into (must belong to the user)
+
+        Returns:
+            Number of projects cloned
+        """
+        try:
+            source_result = client.table("impact_projects")\
+                .select("id")\
+                .eq("user_id", user_id)\
+                .eq("portfolio_id", source_portfolio_id)\
+                .is_("delete_requested_at", "null")\
+                .execute()
+            source_ids = [row["id"] for row in source_result.data or []]
+
+            cloned = ProjectService._clone_project_rows(
+                client, subscription_info, user_id, source_ids, target_portfolio_id
+            )
+            return len(cloned)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Clone portfolio projects error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to clone projects")
+
+    @staticmethod
+    async def bulk_project_operations(
+        client: ServiceDBClient,
+        subscription_info: SubscriptionInfoResponse,
+        user_id: str,
+        operations: List[BulkProjectOperation],
+        request_deletion: Optional[Callable[[ServiceDBClient, str, str, str], Awaitable[DeletionJob]]] = None
+    ) -> BulkProjectResponse:
+        """
+        Apply a batch of create/update/delete project operations
+
+        Deletes run first so they free up quota, then updates, then creates. Deleted
+        projects are marked pending and get a deletion job each (returned as job_id),
+        which the caller runs in the background. All creates are checked against the project limit once and written
+        with one multi-row insert for projects and one for their metrics. Failures
+        are reported per operation instead of failing the whole batch.
+
+        Args:
+            client: Supabase client (injected from router)
+            subscription_info: Subscription information
+            user_id: User's ID
+            operations: Operations to apply, in request order
+            request_deletion: DeletionService.request_deletion, required for delete operations
+
+        Returns:
+            BulkProjectResponse with one result per operation
+        """
+        results: Dict[int, BulkProjectResult] = {}
+
+        def fail(index: int, action: str, error: str, project_id: Optional[str] = None):
+            results[index] = BulkProjectResult(index=index, action=action, success=False, project_id=project_id, error=error)
+
+        def validation_error(e: ValidationError) -> str:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            return f"Invalid project data: {location}: {error['msg']}" if location else f"Invalid project data: {error['msg']}"
+
+        try:
+            creates: List[Tuple[int, Dict[str, Any]]] = []
+            updates: List[Tuple[int, str, Dict[str, Any]]] = []
+            deletes: List[Tuple[int, str]] = []
+
+            # Validate every operation up front
+            for idx, operation in enumerate(operations):
+                if operation.action != "create" and not operation.project_id:
+                    fail(idx, operation.action, "project_id is required")
+                    continue
+                try:
+                    if operation.action == "create":
+                        creates.append((idx, CreateProjectRequest(**(operation.data or {})).model_dump()))
+                    elif operation.action == "update":
+                        update_data = UpdateProjectRequest(**(operation.data or {})).model_dump(exclude_none=True)
+                        updates.append((idx, operation.project_id, update_data))
+                    elif request_deletion is None:
+                        fail(idx, "delete", "Deletes are not supported here", operation.project_id)
+                    else:
+                        deletes.append((idx, operation.project_id))
+                except ValidationError as e:
+                    fail(idx, operation.action, validation_error(e), operation.project_id)
+
+            # Deletes - marked pending and handed to deletion jobs, like single deletes;
+            # projects already being deleted are skipped so they don't free quota twice
+            deleted_ids = set()
+            if deletes:
+                jobs: Dict[str, Union[DeletionJob, str]] = {}
+                try:
+                    active_result = client.table("impact_projects")\
+                        .select("id")\
+                        .eq("user_id", user_id)\
+                        .in_("id", list({project_id for _, project_id in deletes}))\
+                        .is_("delete_requested_at", "null")\
+                        .execute()
+                    active_ids = [row["id"] for row in active_result.data or []]
+                except Exception as e:
+                    print(f"Bulk delete projects error: {e}")
+                    active_ids = []
+                    jobs = {project_id: "Failed to delete project" for _, project_id in deletes}
+
+                for project_id in active_ids:
+                    try:
+                        jobs[project_id] = await request_deletion(client, user_id, "project", project_id)
+                        deleted_ids.add(project_id)
+                    except HTTPException as e:
+                        jobs[project_id] = e.detail
+
+                for idx, project_id in deletes:
+                    job = jobs.get(project_id, "Project not found")
+                    if isinstance(job, DeletionJob):
+                        results[idx] = BulkProjectResult(index=idx, action="delete", success=True, project_id=project_id, job_id=job.id)
+                    else:
+                        fail(idx, "delete", job, project_id)
+
+            # Updates - each carries its own field changes
+            for idx, project_id, update_data in updates:
+                try:
+                    project = await ProjectService.update_project(client, project_id, user_id, update_data)
+                    results[idx] = BulkProjectResult(index=idx, action="update", success=True, project_id=project_id, project=project)
+                except HTTPException as e:
+                    fail(idx, "update", e.detail, project_id)
+
+            # Creates - one quota check and multi-row inserts
+            if creates:
+                remaining = subscription_info.max_projects - (subscription_info.project_count - len(deleted_ids))
+                accepted = creates[:max(remaining, 0)]
+                for idx, _ in creates[len(accepted):]:
+                    fail(idx, "create", ProjectService._project_limit_detail(subscription_info))
+
+                if accepted:
+                    await ProjectService._bulk_insert_projects(client, user_id, accepted, results)
+
+            ordered = [results[idx] for idx in sorted(results)]
+            succeeded = sum(1 for result in ordered if result.success)
+            return BulkProjectResponse(results=ordered, succeeded=succeeded, failed=len(ordered) - succeeded)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Bulk project operations error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to apply bulk project operations")
+
+    @staticmethod
+    async def import_projects(
+        client: ServiceDBClient,
+        subscription_info: SubscriptionInfoResponse,
+        user_id: str,
+        import_format: str,
+        rows: Iterable[Tuple[int, Optional[Dict[str, Any]], Optional[str]]],
+        portfolio_id: Optional[str] = None
+    ) -> ImportProjectsResponse:
+        """
+        Create projects from parsed import rows in batches
+
+        Rows are consumed lazily and written IMPORT_BATCH_SIZE at a time through
+        bulk_project_operations, so each batch is one projects insert and one metrics
+        insert. The project limit is tracked across batches.
+
+        Args:
+            client: Supabase client (injected from router)
+            subscription_info: Subscription information
+            user_id: User's ID
+            import_format: Format the rows were parsed from
+            rows: (row, validated project data or None, error or None)
+            portfolio_id: Portfolio to add the imported projects to
+
+        Returns:
+            ImportProjectsResponse with one result per row
+        """
+        results: List[ImportRowResult] = []
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+
+        async def flush():
+            nonlocal subscription_info
+            operations = [
+                BulkProjectOperation(action="create", data={**data, "portfolio_id": portfolio_id})
+                for _, data in batch
+            ]
+            bulk = await ProjectService.bulk_project_operations(client, subscription_info, user_id, operations)
+            for (row, data), result in zip(batch, bulk.results):
+                results.append(ImportRowResult(
+                    row=row,
+                    success=result.success,
+                    project_id=result.project_id,
+                    project_name=data.get("projectName"),
+                    error=result.error
+                ))
+            subscription_info = subscription_info.model_copy(
+                update={"project_count": subscription_info.project_count + bulk.succeeded}
+            )
+            batch.clear()
+
+        for row, data, error in rows:
+            if error:
+                results.append(ImportRowResult(row=row, success=False, error=error))
+                continue
+            batch.append((row, data))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+        if batch:
+            await flush()
+
+        results.sort(key=lambda result: result.row)
+        imported = sum(1 for result in results if result.success)
+        return ImportProjectsResponse(
+            format=import_format,
+            imported=imported,
+            failed=len(results) - imported,
+            results=results
+        )
+
+    @staticmethod
+    async def _bulk_insert_projects(
+        client: ServiceDBClient,
+        user_id: str,
+        creates: List[Tuple[int, Dict[str, Any]]],
+        results: Dict[int, BulkProjectResult]
+    ) -> None:
+        """
+        Insert several projects and their metrics with one multi-row insert each
+
+        Project IDs are generated up front so metric rows can reference them without
+        waiting for the project insert to return. Results are written into `results`.
+
+        Args:
+            client: Supabase client (injected from router)
+            user_id: User's ID
+            creates: (operation index, CreateProjectRequest data) pairs
+            results: Per-operation results to fill in
+        """
+        # Current max display_order per portfolio (None: projects outside any portfolio), fetched once
+        existing_result = client.table("impact_projects")\
+            .select("portfolio_id, display_order")\
+            .eq("user_id", user_id)\
+            .execute()
+        max_order: Dict[Optional[str], Optional[int]] = {None: None}
+        for row in existing_result.data or []:
+            order = row.get("display_order")
+            if order is None:
+                continue
+            scope_key = row.get("portfolio_id")
+            if max_order.get(scope_key) is None or order > max_order[scope_key]:
+                max_order[scope_key] = order
+
+        project_inserts = []
+        metrics_inserts = []
+        metrics_by_project: Dict[str, List[Dict[str, Any]]] = {}
+        for _, project_data in creates:
+            portfolio_id = project_data.get("portfolio_id") or None
+            display_order = next_display_order(max_order.get(portfolio_id))
+            max_order[portfolio_id] = display_order
+
+            project_id = str(uuid.uuid4())
+            project_inserts.append({
+                **ProjectService._build_project_insert(user_id, project_data, display_order),
+                "id": project_id,
+                # Every row needs the same keys for a multi-row insert
+                "portfolio_id": portfolio_id,
+            })
+
+            metric_rows = [
+                ProjectService._build_metric_row(project_id, metric, idx)
+                for idx, metric in enumerate(project_data.get("metrics") or [])
+            ]
+            metrics_inserts.extend(metric_rows)
+            metrics_by_project[project_id] = [
+                {**metric, "id": row["id"]}
+                for metric, row in zip(project_data.get("metrics") or [], metric_rows)
+            ]
+
+        try:
+            project_result = client.table("impact_projects")\
+                .insert(project_inserts)\
+                .execute()
+        except Exception as e:
+            print(f"Bulk insert projects error: {e}")
+            for idx, _ in creates:
+                results[idx] = BulkProjectResult(index=idx, action="create", success=False, error="Failed to create project")
+            return
+
+        if metrics_inserts:
+            try:
+                client.table("project_metrics")\
+                    .insert(metrics_inserts)\
+                    .execute()
+            except Exception as e:
+                print(f"Bulk insert project metrics error: {e}")
+                # Don't leave projects without their metrics behind
+                client.table("impact_projects")\
+                    .delete()\
+                    .eq("user_id", user_id)\
+                    .in_("id", [row["id"] for row in project_inserts])\
+                    .execute()
+                for idx, _ in creates:
+                    results[idx] = BulkProjectResult(index=idx, action="create", success=False, error="Failed to create project")
+                return
+
+        inserted = {row["id"]: row for row in project_result.data or []}
+        for (idx, _), project_insert in zip(creates, project_inserts):
+            project_id = project_insert["id"]
+            row = inserted.get(project_id, project_insert)
+            results[idx] = BulkProjectResult(
+                index=idx,
+                action="create",
+                success=True,
+                project_id=project_id,
+                project=ProjectService._build_project(row, metrics_by_project[project_id])
+            )
+
+    @staticmethod
+    async def get_user_total_evidence_size(client: ServiceDBClient, user_id: str) -> int:
+        """
+        Get total size of all evidence for a user across all projects
         
         Args:
             client: Supabase client (injected from router)
-            project_id: Project ID
-            user_id: User's ID (for authorization) or None for public access check
+            user_id: User's ID
             
         Returns:
-            List of evidence items
+            Total size in bytes
         """
         try:
-            # Fetch project details to determine access
-            proj_query = client.table("impact_projects")\
-                .select("user_id, portfolio_id")\
-                .eq("id", project_id)\
-                .single()
+            # Get all projects for user
+            projects_result = client.table("impact_projects")\
+                .select("id")\
+                .eq("user_id", user_id)\
+                .execute()
             
-            proj_result = proj_query.execute()
+            if not projects_result.data:
+                return 0
             
-            if not proj_result.data:
-                raise HTTPException(status_code=404, detail="Project not found")
+            project_ids = [p["id"] for p in projects_result.data]
             
-            project_data = proj_result.data
-            owner_id = project_data["user_id"]
-            portfolio_id = project_data.get("portfolio_id")
+            # Get sum of file sizes for all evidence; cloned evidence shares its
+            # storage object with the original and is only counted once
+            evidence_result = client.table("project_evidence")\
+                .select("file_path, file_size")\
+                .in_("project_id", project_ids)\
+                .execute()
             
-            # Determine if user has access
-            has_access = False
+            file_sizes = {e["file_path"]: e.get("file_size", 0) for e in evidence_result.data or []}
+            total_size = sum(file_sizes.values())
+            return total_size
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Get user total evidence size error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to calculate total evidence size")
+
+    @staticmethod
+    def invalidate_evidence_access(owner_id: str) -> None:
+        """Drop cached evidence access decisions for an owner's projects (publish, unpublish, moves)"""
+        _evidence_access_cache.delete_where(lambda key, access: access["owner_id"] == owner_id)
+
+    @staticmethod
+    def _get_evidence_access(client: ServiceDBClient, project_id: str, user_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Decide whether a viewer may list a project's evidence, caching the decision briefly
+        
+        Returns:
+            Dict with owner_id, portfolio_id and allowed
+        """
+        cache_key = (project_id, user_id)
+        access = _evidence_access_cache.get(cache_key)
+        if access is not None:
+            return access
+        
+        # Fetch project details to determine access
+        # Projects pending deletion are gone for every viewer, owner included
+        proj_result = client.table("impact_projects")\
+            .select("user_id, portfolio_id")\
+            .eq("id", project_id)\
+            .is_("delete_requested_at", "null")\
+            .limit(1)\
+            .execute()
+        
+        if not proj_result.data:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        project_data = proj_result.data[0]
+        owner_id = project_data["user_id"]
+        portfolio_id = project_data.get("portfolio_id")
+        
+        # 1. Access granted if user is owner
+        allowed = bool(user_id) and user_id == owner_id
+        
+        # 2. Access granted if project is published (skip if already granted)
+        if not allowed:
+            # Check published_profiles
+            pub_query = client.table("published_profiles")\
+                .select("id")\
+                .eq("is_published", True)
             
-            # 1. Access granted if user is owner
-            if user_id and user_id == owner_id:
-                has_access = True
+            if portfolio_id:
+                # Specific profile check
+                pub_query = pub_query.eq("portfolio_id", portfolio_id)
+            else:
+                # Legacy/Default fallback: check if user has ANY published profile
+                pub_query = pub_query.eq("user_id", owner_id)
             
-            # 2. Access granted if project is published (skip if already granted)
-            if not has_access:
-                # Check published_profiles
-                pub_query = client.table("published_profiles")\
-                    .select("id")\
-                    .eq("is_published", True)
-                
-                if portfolio_id:
-                    # Specific profile check
-                    pub_query = pub_query.eq("portfolio_id", portfolio_id)
-                else:
-                    # Legacy/Default fallback: check if user has ANY published profile
-                    pub_query = pub_query.eq("user_id", owner_id)
-                
-                pub_result = pub_query.limit(1).execute()
-                if pub_result.data:
-                    has_access = True
+            pub_result = pub_query.limit(1).execute()
+            allowed = bool(pub_result.data)
+        
+        access = {"owner_id": owner_id, "portfolio_id": portfolio_id, "allowed": allowed}
+        _evidence_access_cache.set(cache_key, access)
+        return access
+
+    @staticmethod
+    async def list_project_evidence(client: ServiceDBClient, project_id: str, user_id: Optional[str] = None) -> List[ProjectEvidence]:
+        """
+        List all evidence for a project
+        
+        The access decision is cached per (project, viewer) for a short time, so repeat
+        reads (e.g. from a published page) only run the evidence query.
+        
+        Args:
+            client: Supabase client (injected from router)
+            project_id: Project ID
+            user_id: User's ID (for authorization) or None for public access check
             
-            if not has_access:
+        Returns:
+            List of evidence items
+        """
+        try:
+            access = ProjectService._get_evidence_access(client, project_id, user_id)
+            if not access["allowed"]:
                 raise HTTPException(status_code=404, detail="Project not found or access denied")
             
             return await ProjectService._fetch_evidence_list(client, project_id)
@@ -613,37 +1381,212 @@ class ProjectService:
                 .order("display_order")\
                 .execute()
             
-            evidence_list = []
-            if evidence_result.data:
-                supabase_url = os.getenv("SUPABASE_URL", "")
-                bucket_name = "project-evidence"
-                
-                for evidence in evidence_result.data:
-                    # Generate public URL for the image
-                    file_path = evidence["file_path"]
-                    image_url = None
-                    if supabase_url and file_path:
-                        image_url = f"{supabase_url}/storage/v1/object/public/{bucket_name}/{file_path}"
-                    
-                    evidence_list.append(ProjectEvidence(
-                        id=evidence["id"],
-                        project_id=evidence["project_id"],
-                        file_path=evidence["file_path"],
-                        file_name=evidence["file_name"],
-                        file_size=evidence["file_size"],
-                        mime_type=evidence["mime_type"],
-                        display_order=evidence["display_order"],
-                        created_at=evidence["created_at"],
-                        url=image_url
-                    ))
-            
-            return evidence_list
+            return [ProjectService._evidence_from_row(evidence) for evidence in evidence_result.data or []]
         except HTTPException:
             raise
         except Exception as e:
             print(f"List project evidence error: {e}")
             raise HTTPException(status_code=500, detail="Failed to fetch evidence")
 
+    @staticmethod
+    def _evidence_limit_mb(client: ServiceDBClient, user_id: str, subscription_type: Optional[str]) -> Tuple[str, int]:
+        """
+        Evidence storage limit for a user's plan
+
+        Returns:
+            (subscription type, limit in MB)
+        """
+        if subscription_type is None:
+            profile_result = client.table("profiles")\
+                .select("subscription_type")\
+                .eq("id", user_id)\
+                .single()\
+                .execute()
+            subscription_type = (profile_result.data.get("subscription_type") if profile_result.data else None) or "free"
+
+        # Set limit based on subscription
+        if subscription_type == "pro":
+            return subscription_type, int(os.getenv("PRO_MAX_USER_EVIDENCE_SIZE_MB", "5120"))
+        return subscription_type, int(os.getenv("FREE_MAX_USER_EVIDENCE_SIZE_MB", "50"))
+
+    @staticmethod
+    async def _evidence_quota(
+        client: ServiceDBClient,
+        user_id: str,
+        subscription_type: Optional[str] = None
+    ) -> Tuple[int, str]:
+        """
+        Remaining evidence storage for a user's plan
+
+        Returns:
+            (remaining bytes, error detail to use when an upload doesn't fit)
+        """
+        subscription_type, max_size_mb = ProjectService._evidence_limit_mb(client, user_id, subscription_type)
+        
+        max_size_bytes = max_size_mb * 1024 * 1024
+        # Storage held by unfinished direct uploads counts until finalized or expired
+        current_total = await ProjectService.get_user_total_evidence_size(client, user_id)
+        current_total += ProjectService._reserved_evidence_bytes(client, user_id)
+        
+        used_mb = current_total / (1024 * 1024)
+        plan_name = "Pro" if subscription_type == "pro" else "free"
+        detail = f"Upload would exceed {plan_name} plan storage limit. Current: {used_mb:.2f} MB / {max_size_mb} MB across all projects"
+        return max(max_size_bytes - current_total, 0), detail
+
+    @staticmethod
+    def _reserved_evidence_bytes(client: ServiceDBClient, user_id: str) -> int:
+        """Bytes held by a user's unexpired upload reservations"""
+        reservations_result = client.table("evidence_upload_reservations")\
+            .select("reserved_bytes")\
+            .eq("user_id", user_id)\
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())\
+            .execute()
+        return sum(r["reserved_bytes"] for r in reservations_result.data or [])
+
+    @staticmethod
+    def _discard_evidence_reservations(client: ServiceDBClient, reservations: List[Dict[str, Any]]) -> None:
+        """Delete reservations along with any object uploaded for them"""
+        if not reservations:
+            return
+        try:
+            client.storage.from_("project-evidence").remove([r["file_path"] for r in reservations])
+        except Exception as storage_error:
+            print(f"Storage delete error (continuing with reservation delete): {storage_error}")
+        client.table("evidence_upload_reservations")\
+            .delete()\
+            .in_("id", [r["id"] for r in reservations])\
+            .execute()
+
+    @staticmethod
+    def _get_storage_object(client: ServiceDBClient, file_path: str) -> Optional[Dict[str, Any]]:
+        """Storage listing entry (with size and mimetype metadata) for an object, if it exists"""
+        folder, _, name = file_path.rpartition("/")
+        objects = client.storage.from_("project-evidence").list(folder, {"search": name, "limit": 100})
+        return next((o for o in objects or [] if o.get("name") == name), None)
+
+    @staticmethod
+    def _sniff_evidence_content(content: Union[bytes, BinaryIO]) -> Dict[str, Any]:
+        """Type and dimensions from the header of file bytes or an open file (rewound after)"""
+        if isinstance(content, (bytes, bytearray)):
+            head = bytes(content[:SNIFF_BYTES])
+        else:
+            head = content.read(SNIFF_BYTES)
+            content.seek(0)
+        try:
+            return sniff_image(head)
+        except ImageSniffError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    async def _read_object_head(file_path: str) -> bytes:
+        """First SNIFF_BYTES of an evidence object, fetched with a range request"""
+        # From the origin: a CDN may not have the object yet, or may ignore ranges
+        response = await get_http_client().get(
+            evidence_url(file_path, origin=True),
+            headers={"Range": f"bytes=0-{SNIFF_BYTES - 1}"},
+        )
+        response.raise_for_status()
+        return response.content[:SNIFF_BYTES]
+
+    @staticmethod
+    def _evidence_from_row(evidence: Dict[str, Any], trusted: bool = False) -> ProjectEvidence:
+        """
+        Build ProjectEvidence from a project_evidence row with public URLs for the image
+        and its variants
+
+        Args:
+            evidence: project_evidence row
+            trusted: Skip validation (rows read straight from our own DB)
+        """
+        build_variant = EvidenceVariant.model_construct if trusted else EvidenceVariant
+        build_evidence = ProjectEvidence.model_construct if trusted else ProjectEvidence
+
+        variants = None
+        srcset = None
+        if evidence.get("variants") is not None:
+            variants = [
+                build_variant(
+                    file_path=variant["file_path"],
+                    width=variant["width"],
+                    height=variant["height"],
+                    mime_type=variant["mime_type"],
+                    file_size=variant["file_size"],
+                    # Variants are overwritten when regenerated, so their URLs carry the content hash
+                    url=evidence_url(variant["file_path"], version=variant.get("sha256")),
+                )
+                for variant in sorted(evidence["variants"], key=lambda v: v["width"])
+            ]
+            candidates: Dict[str, List[str]] = {}
+            for variant in variants:
+                if variant.url:
+                    candidates.setdefault(variant.mime_type, []).append(f"{variant.url} {variant.width}w")
+            srcset = {mime_type: ", ".join(urls) for mime_type, urls in candidates.items()}
+        elif image_transforms_enabled() and evidence.get("width") and evidence["mime_type"] in SUPPORTED_MIME_TYPES:
+            # Until variants are generated, resize on the fly with the transformation endpoint
+            candidates = [
+                f"{evidence_url(evidence['file_path'], width=width, format='origin')} {width}w"
+                for width in sorted({min(width, evidence["width"]) for width in VARIANT_WIDTHS})
+                if evidence_url(evidence["file_path"])
+            ]
+            srcset = {evidence["mime_type"]: ", ".join(candidates)} if candidates else None
+
+        return build_evidence(
+            id=evidence["id"],
+            project_id=evidence["project_id"],
+            file_path=evidence["file_path"],
+            file_name=evidence["file_name"],
+            file_size=evidence["file_size"],
+            mime_type=evidence["mime_type"],
+            display_order=evidence["display_order"],
+            created_at=evidence["created_at"],
+            url=evidence_url(evidence["file_path"]),
+            width=evidence.get("width"),
+            height=evidence.get("height"),
+            variants=variants,
+            srcset=srcset or None,
+        )
+
+    @staticmethod
+    async def get_evidence_upload_allowance(
+        client: ServiceDBClient,
+        project_id: str,
+        user_id: str,
+        subscription_type: Optional[str] = None
+    ) -> Tuple[int, str]:
+        """
+        Check an upload can start and how many bytes it may use, before the body is read
+        
+        Args:
+            client: Supabase client (injected from router)
+            project_id: Project ID
+            user_id: User's ID (for authorization)
+            subscription_type: Caller's tier from the request principal (looked up if not given)
+            
+        Returns:
+            (remaining bytes under the user's plan, error detail for uploads that exceed it)
+        """
+        try:
+            project_result = client.table("impact_projects")\
+                .select("id")\
+                .eq("id", project_id)\
+                .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
+                .limit(1)\
+                .execute()
+            
+            if not project_result.data:
+                raise HTTPException(status_code=404, detail="Project not found")
+            
+            remaining_bytes, limit_detail = await ProjectService._evidence_quota(client, user_id, subscription_type)
+            if remaining_bytes <= 0:
+                raise HTTPException(status_code=400, detail=limit_detail)
+            return remaining_bytes, limit_detail
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Evidence upload allowance error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to upload evidence file")
+
     @staticmethod
     async def upload_evidence_file(
         client: ServiceDBClient,
@@ -652,7 +1595,9 @@ class ProjectService:
         file_name: str,
         mime_type: str,
         file_size: int,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
+        content_hash: str,
+        subscription_type: Optional[str] = None,
     ) -> ProjectEvidence:
         """
         Upload evidence file to Supabase storage and create evidence record.
@@ -664,129 +1609,377 @@ class ProjectService:
             file_name: Name of the file
             mime_type: MIME type of the file
             file_size: Size of the file in bytes
-            file_content: Binary content of the file
+            file_content: File bytes, or an open binary file that is streamed to storage
+            content_hash: Hex SHA-256 of the file content
+            subscription_type: Caller's tier from the request principal (looked up if not given)
             
         Returns:
             ProjectEvidence with the uploaded file details
         """
+        evidence = await ProjectService.upload_evidence_files(client, project_id, user_id, [{
+            "file_name": file_name,
+            "mime_type": mime_type,
+            "file_size": file_size,
+            "content": file_content,
+            "content_hash": content_hash,
+        }], subscription_type)
+        return evidence[0]
+
+    @staticmethod
+    async def upload_evidence_files(
+        client: ServiceDBClient,
+        project_id: str,
+        user_id: str,
+        files: List[Dict[str, Any]],
+        subscription_type: Optional[str] = None,
+    ) -> List[ProjectEvidence]:
+        """
+        Upload evidence files to Supabase storage and create their evidence records.
+        
+        Ownership, quota and display order are checked once for the whole batch, files
+        are uploaded concurrently (at most EVIDENCE_UPLOAD_CONCURRENCY at a time) and the
+        records are created with one insert. If any upload fails nothing is recorded.
+        
+        Each file's type and dimensions are read from its header before anything is
+        stored; the detected type replaces the one the client sent.
+        
+        Files are stored under their SHA-256 in the user's folder. If the user already
+        has evidence with the same content (or the batch contains it twice), the stored
+        object and its variants are reused: nothing is uploaded and no storage quota is
+        used. Objects are deleted once no evidence row references them.
+        
+        Args:
+            client: Supabase client (injected from router)
+            project_id: Project ID
+            user_id: User's ID (for authorization)
+            files: [{"file_name", "mime_type", "file_size", "content", "content_hash"}, ...]
+                where content is bytes or an open binary file and content_hash its hex SHA-256
+            subscription_type: Caller's tier from the request principal (looked up if not given)
+            
+        Returns:
+            ProjectEvidence for each file, in the given order
+        """
         try:
             # Validate mime type is image
-            if not mime_type.startswith("image/"):
+            if any(not f["mime_type"].startswith("image/") for f in files):
                 raise HTTPException(status_code=400, detail="Only image files are allowed")
 
+            # Check the content really is an acceptable image, without decoding it
+            images = [ProjectService._sniff_evidence_content(f["content"]) for f in files]
+
             # Verify project ownership
             project_result = client.table("impact_projects")\
                 .select("id")\
                 .eq("id", project_id)\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .single()\
                 .execute()
 
             if not project_result.data:
                 raise HTTPException(status_code=404, detail="Project not found")
 
-            # Check user's total size limit based on subscription
-            # Get user's subscription type
-            profile_result = client.table("profiles")\
-                .select("subscription_type")\
-                .eq("id", user_id)\
-                .single()\
+            # Content-addressed paths; objects the user's evidence already references are shared
+            file_paths = [f"{user_id}/sha256/{f['content_hash']}" for f in files]
+            existing_result = client.table("project_evidence")\
+                .select("file_path, variants")\
+                .in_("file_path", list(set(file_paths)))\
                 .execute()
-            
-            subscription_type = profile_result.data.get("subscription_type", "free") if profile_result.data else "free"
-            
-            # Set limit based on subscription
-            if subscription_type == "pro":
-                max_size_mb = int(os.getenv("PRO_MAX_USER_EVIDENCE_SIZE_MB", "5120"))
-            else:
-                max_size_mb = int(os.getenv("FREE_MAX_USER_EVIDENCE_SIZE_MB", "50"))
-            
-            max_size_bytes = max_size_mb * 1024 * 1024
+            existing = {e["file_path"]: e.get("variants") for e in existing_result.data or []}
+            new_files = {
+                path: {**f, "mime_type": image["mime_type"]}
+                for path, f, image in zip(file_paths, files, images)
+                if path not in existing
+            }
 
-            current_total = await ProjectService.get_user_total_evidence_size(client, user_id)
-            if current_total + file_size > max_size_bytes:
-                used_mb = current_total / (1024 * 1024)
-                max_mb = max_size_mb
-                plan_name = "Pro" if subscription_type == "pro" else "free"
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Upload would exceed {plan_name} plan storage limit. Current: {used_mb:.2f} MB / {max_mb} MB across all projects"
+            if new_files:
+                # Check user's total size limit against the whole batch (re-checked here since
+                # concurrent uploads may have used the allowance while these files were received)
+                remaining_bytes, limit_detail = await ProjectService._evidence_quota(client, user_id, subscription_type)
+                if sum(f["file_size"] for f in new_files.values()) > remaining_bytes:
+                    raise HTTPException(status_code=400, detail=limit_detail)
+
+                await ProjectService._upload_evidence_objects(client, new_files)
+
+            # Append after the current last evidence item for this project
+            display_order = get_max_display_order(client, "project_evidence", {"project_id": project_id})
+            evidence_inserts = []
+            for file_path, f, image in zip(file_paths, files, images):
+                display_order = next_display_order(display_order)
+                evidence_insert = {
+                    "project_id": project_id,
+                    "file_path": file_path,
+                    "file_name": f["file_name"],
+                    "file_size": f["file_size"],
+                    "mime_type": image["mime_type"],
+                    "width": image["width"],
+                    "height": image["height"],
+                    "display_order": display_order
+                }
+                if file_path in existing:
+                    evidence_insert["variants"] = existing[file_path]
+                evidence_inserts.append(evidence_insert)
+
+            evidence_result = client.table("project_evidence")\
+                .insert(evidence_inserts)\
+                .execute()
+
+            if not evidence_result.data or len(evidence_result.data) != len(evidence_inserts):
+                raise HTTPException(status_code=500, detail="Failed to create evidence record")
+
+            return [ProjectService._evidence_from_row(evidence) for evidence in evidence_result.data]
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Upload evidence file error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to upload evidence file")
+
+    @staticmethod
+    async def _upload_evidence_objects(client: ServiceDBClient, files: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Upload files (storage path -> file) concurrently, raising if any upload fails
+
+        Objects that were uploaded before a failure are left unreferenced; another upload
+        of the same content may already be using them, so they are left to the storage
+        reconciliation job.
+        """
+        bucket = client.storage.from_("project-evidence")
+        semaphore = asyncio.Semaphore(EVIDENCE_UPLOAD_CONCURRENCY)
+
+        async def upload(file_path: str, f: Dict[str, Any]) -> None:
+            async with semaphore:
+                # A concurrent upload of the same content writes identical bytes, so overwriting is safe
+                await asyncio.to_thread(
+                    bucket.upload,
+                    file_path,
+                    f["content"],
+                    file_options={
+                        "content-type": f["mime_type"],
+                        # Content-addressed paths always hold the same bytes
+                        "cache-control": str(EVIDENCE_CACHE_MAX_AGE_SECONDS),
+                        "upsert": "true"
+                    }
                 )
 
-            # Generate unique file path
+        results = await asyncio.gather(*(upload(path, f) for path, f in files.items()), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            print(f"Storage upload error: {errors[0]}")
+            raise HTTPException(status_code=500, detail="Failed to upload file to storage")
+
+    @staticmethod
+    async def create_evidence_upload_url(
+        client: ServiceDBClient,
+        project_id: str,
+        user_id: str,
+        file_name: str,
+        mime_type: str,
+        file_size: int,
+        subscription_type: Optional[str] = None,
+    ) -> EvidenceUploadUrlResponse:
+        """
+        Reserve storage for an evidence file and return a signed URL to upload it to
+        
+        The file goes straight from the client to storage. Its size counts against the
+        user's quota until finalize_evidence_upload is called or the reservation expires.
+        
+        Args:
+            client: Supabase client (injected from router)
+            project_id: Project ID
+            user_id: User's ID (for authorization)
+            file_name: Name of the file
+            mime_type: MIME type of the file
+            file_size: Size of the file in bytes
+            subscription_type: Caller's tier from the request principal (looked up if not given)
+            
+        Returns:
+            EvidenceUploadUrlResponse with the signed URL and the upload ID to finalize
+        """
+        try:
+            # Release expired reservations, removing anything uploaded for them
+            expired_result = client.table("evidence_upload_reservations")\
+                .select("id, file_path")\
+                .eq("user_id", user_id)\
+                .lte("expires_at", datetime.now(timezone.utc).isoformat())\
+                .execute()
+            ProjectService._discard_evidence_reservations(client, expired_result.data or [])
+
+            remaining_bytes, limit_detail = await ProjectService.get_evidence_upload_allowance(
+                client, project_id, user_id, subscription_type
+            )
+            if file_size > remaining_bytes:
+                raise HTTPException(status_code=400, detail=limit_detail)
+
             file_extension = file_name.split('.')[-1] if '.' in file_name else ''
             unique_file_name = f"{uuid.uuid4()}.{file_extension}" if file_extension else str(uuid.uuid4())
             file_path = f"{user_id}/{project_id}/{unique_file_name}"
 
-            # Upload file to Supabase storage
             try:
-                client.storage.from_("project-evidence").upload(
-                    file_path,
-                    file_content,
-                    file_options={
-                        "content-type": mime_type,
-                        "upsert": "false"
-                    }
-                )
+                signed = client.storage.from_("project-evidence").create_signed_upload_url(file_path)
             except Exception as e:
-                print(f"Storage upload error: {e}")
-                raise HTTPException(status_code=500, detail="Failed to upload file to storage")
+                print(f"Storage signed upload URL error: {e}")
+                raise HTTPException(status_code=500, detail="Failed to create upload URL")
+
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=EVIDENCE_UPLOAD_RESERVATION_TTL_SECONDS)
+            reservation_result = client.table("evidence_upload_reservations")\
+                .insert({
+                    "user_id": user_id,
+                    "project_id": project_id,
+                    "file_path": file_path,
+                    "file_name": file_name,
+                    "mime_type": mime_type,
+                    "reserved_bytes": file_size,
+                    "expires_at": expires_at.isoformat(),
+                })\
+                .execute()
+
+            if not reservation_result.data:
+                raise HTTPException(status_code=500, detail="Failed to create upload URL")
+
+            return EvidenceUploadUrlResponse(
+                upload_id=reservation_result.data[0]["id"],
+                file_path=file_path,
+                signed_url=signed["signed_url"],
+                token=signed["token"],
+                expires_at=expires_at.isoformat(),
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Create evidence upload URL error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to create upload URL")
+
+    @staticmethod
+    async def finalize_evidence_upload(client: ServiceDBClient, project_id: str, user_id: str, upload_id: str) -> ProjectEvidence:
+        """
+        Create the evidence record for a file uploaded with a signed upload URL
+        
+        The stored object must be no larger than the size that was reserved and its
+        header must be an acceptable image (only the first bytes are fetched); otherwise
+        it is removed and the reservation released.
+        
+        Args:
+            client: Supabase client (injected from router)
+            project_id: Project ID
+            user_id: User's ID (for authorization)
+            upload_id: ID returned by create_evidence_upload_url
+            
+        Returns:
+            ProjectEvidence with the uploaded file details
+        """
+        try:
+            try:
+                uuid.UUID(upload_id)
+            except ValueError:
+                raise HTTPException(status_code=404, detail="Upload not found")
 
-            # Get current max display_order for this project
-            existing_evidence = client.table("project_evidence")\
-                .select("display_order")\
+            reservation_result = client.table("evidence_upload_reservations")\
+                .select("id, file_path, reserved_bytes, expires_at, impact_projects!inner(id)")\
+                .eq("id", upload_id)\
                 .eq("project_id", project_id)\
-                .order("display_order", desc=True)\
+                .eq("user_id", user_id)\
+                .is_("impact_projects.delete_requested_at", "null")\
                 .limit(1)\
                 .execute()
 
-            display_order = 0
-            if existing_evidence.data:
-                max_order = existing_evidence.data[0].get("display_order", -1)
-                display_order = max_order + 1
-
-            # Create evidence record
-            evidence_insert = {
-                "project_id": project_id,
-                "file_path": file_path,
-                "file_name": file_name,
-                "file_size": file_size,
-                "mime_type": mime_type,
-                "display_order": display_order
-            }
+            if not reservation_result.data:
+                raise HTTPException(status_code=404, detail="Upload not found")
 
-            evidence_result = client.table("project_evidence")\
-                .insert(evidence_insert)\
-                .execute()
+            reservation = reservation_result.data[0]
+            if datetime.fromisoformat(reservation["expires_at"]) <= datetime.now(timezone.utc):
+                ProjectService._discard_evidence_reservations(client, [reservation])
+                raise HTTPException(status_code=400, detail="Upload has expired, request a new upload URL")
+
+            stored = ProjectService._get_storage_object(client, reservation["file_path"])
+            if stored is None:
+                raise HTTPException(status_code=400, detail="File has not been uploaded yet")
+
+            metadata = stored.get("metadata") or {}
+            object_size = int(metadata.get("size") or 0)
+            if object_size <= 0 or object_size > reservation["reserved_bytes"]:
+                ProjectService._discard_evidence_reservations(client, [reservation])
+                raise HTTPException(status_code=400, detail="Uploaded file is larger than the size that was reserved")
 
+            # Check the stored bytes really are an acceptable image, reading only the header
+            try:
+                image = sniff_image(await ProjectService._read_object_head(reservation["file_path"]))
+            except ImageSniffError as e:
+                ProjectService._discard_evidence_reservations(client, [reservation])
+                raise HTTPException(status_code=400, detail=str(e))
+
+            display_order = next_display_order(
+                get_max_display_order(client, "project_evidence", {"project_id": project_id})
+            )
+            evidence_result = client.rpc("finalize_evidence_upload", {
+                "reservation_id": upload_id,
+                "owner_id": user_id,
+                "object_size": object_size,
+                "object_mime_type": image["mime_type"],
+                "new_display_order": display_order,
+                "image_width": image["width"],
+                "image_height": image["height"],
+            }).execute()
+
+            # No row means the reservation expired or was finalized concurrently
             if not evidence_result.data:
-                raise HTTPException(status_code=500, detail="Failed to create evidence record")
+                raise HTTPException(status_code=404, detail="Upload not found")
+
+            return ProjectService._evidence_from_row(evidence_result.data[0])
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Finalize evidence upload error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to finalize evidence upload")
 
-            evidence = evidence_result.data[0]
-
-            # Generate public URL for the image
-            supabase_url = os.getenv("SUPABASE_URL", "")
-            bucket_name = "project-evidence"
-            image_url = None
-            if supabase_url and file_path:
-                image_url = f"{supabase_url}/storage/v1/object/public/{bucket_name}/{file_path}"
-
-            return ProjectEvidence(
-                id=evidence["id"],
-                project_id=evidence["project_id"],
-                file_path=evidence["file_path"],
-                file_name=evidence["file_name"],
-                file_size=evidence["file_size"],
-                mime_type=evidence["mime_type"],
-                display_order=evidence["display_order"],
-                created_at=evidence["created_at"],
-                url=image_url
+    @staticmethod
+    async def reorder_evidence(
+        client: ServiceDBClient,
+        project_id: str,
+        evidence_id: str,
+        user_id: str,
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None
+    ) -> ReorderResponse:
+        """
+        Move an evidence item between two neighbouring items of the same project
+        
+        Args:
+            client: Supabase client (injected from router)
+            project_id: Project ID the evidence belongs to
+            evidence_id: Evidence ID to move
+            user_id: User's ID (for authorization)
+            before_id: Evidence to place this one before
+            after_id: Evidence to place this one after
+            
+        Returns:
+            ReorderResponse with the evidence's new display_order
+        """
+        try:
+            evidence_result = client.table("project_evidence")\
+                .select("id, impact_projects!inner(user_id)")\
+                .eq("id", evidence_id)\
+                .eq("project_id", project_id)\
+                .eq("impact_projects.user_id", user_id)\
+                .is_("impact_projects.delete_requested_at", "null")\
+                .execute()
+            
+            if not evidence_result.data:
+                raise HTTPException(status_code=404, detail="Evidence not found")
+            
+            display_order = move_item(
+                client,
+                "project_evidence",
+                evidence_id,
+                {"project_id": project_id},
+                before_id=before_id,
+                after_id=after_id
             )
+            return ReorderResponse(id=evidence_id, display_order=display_order)
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Upload evidence file error: {e}")
-            raise HTTPException(status_code=500, detail="Failed to upload evidence file")
+            print(f"Reorder evidence error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to reorder evidence")
 
     @staticmethod
     async def delete_evidence(client: ServiceDBClient, evidence_id: str, user_id: str) -> MessageResponse:
@@ -807,6 +2000,7 @@ class ProjectService:
                 .select("*, impact_projects!inner(user_id)")\
                 .eq("id", evidence_id)\
                 .eq("impact_projects.user_id", user_id)\
+                .is_("impact_projects.delete_requested_at", "null")\
                 .single()\
                 .execute()
             
@@ -816,13 +2010,7 @@ class ProjectService:
             evidence = evidence_result.data
             file_path = evidence["file_path"]
             
-            # Delete file from storage
-            try:
-                client.storage.from_("project-evidence").remove([file_path])
-            except Exception as storage_error:
-                print(f"Storage delete error (continuing with DB delete): {storage_error}")
-            
-            # Delete evidence record
+            # Delete the record first, so no reference check below can count it
             delete_result = client.table("project_evidence")\
                 .delete()\
                 .eq("id", evidence_id)\
@@ -831,6 +2019,23 @@ class ProjectService:
             if not delete_result.data:
                 raise HTTPException(status_code=404, detail="Evidence not found")
             
+            # Content-addressed objects can be reused by a concurrent upload of the same
+            # bytes at any moment; the reconcile job deletes them once nothing references them
+            if "/sha256/" not in file_path:
+                # Delete file and its variants unless cloned evidence still references it
+                shared_result = client.table("project_evidence")\
+                    .select("id")\
+                    .eq("file_path", file_path)\
+                    .limit(1)\
+                    .execute()
+                if not shared_result.data:
+                    file_paths = [file_path] + [v["file_path"] for v in evidence.get("variants") or []]
+                    try:
+                        client.storage.from_("project-evidence").remove(file_paths)
+                    except Exception as storage_error:
+                        # The record is gone; the reconcile job removes the orphaned object
+                        print(f"Storage delete error: {storage_error}")
+            
             return MessageResponse(success=True, message="Evidence deleted successfully")
         except HTTPException:
             raise
@@ -839,13 +2044,14 @@ class ProjectService:
             raise HTTPException(status_code=500, detail="Failed to delete evidence")
 
     @staticmethod
-    async def get_evidence_stats(client: ServiceDBClient, user_id: str) -> dict:
+    async def get_evidence_stats(client: ServiceDBClient, user_id: str, subscription_type: Optional[str] = None) -> dict:
         """
         Get evidence storage statistics for a user
         
         Args:
             client: Supabase client (injected from router)
             user_id: User's ID
+            subscription_type: Caller's tier from the request principal (looked up if not given)
             
         Returns:
             Dictionary with total_size_bytes, limit_bytes, total_size_mb, limit_mb, percentage_used
@@ -854,21 +2060,7 @@ class ProjectService:
             # Get total size across all projects
             total_size_bytes = await ProjectService.get_user_total_evidence_size(client, user_id)
             
-            # Get user's subscription type
-            profile_result = client.table("profiles")\
-                .select("subscription_type")\
-                .eq("id", user_id)\
-                .single()\
-                .execute()
-            
-            subscription_type = profile_result.data.get("subscription_type", "free") if profile_result.data else "free"
-            
-            # Set limit based on subscription
-            if subscription_type == "pro":
-                limit_mb = int(os.getenv("PRO_MAX_USER_EVIDENCE_SIZE_MB", "5120"))
-            else:
-                limit_mb = int(os.getenv("FREE_MAX_USER_EVIDENCE_SIZE_MB", "50"))
-            
+            _, limit_mb = ProjectService._evidence_limit_mb(client, user_id, subscription_type)
             limit_bytes = limit_mb * 1024 * 1024
             
             # Calculate percentage
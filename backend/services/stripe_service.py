@@ -7,6 +7,7 @@ from typing import Dict, Any
 from datetime import datetime, timezone
 from fastapi import HTTPException
 from supabase import Client
+from backend.utils.subscription_tiers import invalidate_subscription_tier
 
 class StripeService:
     """Service for handling Stripe operations"""
@@ -302,6 +303,7 @@ class StripeService:
             client.table("profiles").update({
                 "subscription_type": subscription_type
             }).eq("id", user_id).execute()
+            invalidate_subscription_tier(user_id)
             
             print(f"Updated subscription type for user {user_id}")
             
@@ -349,6 +351,7 @@ class StripeService:
                          update_data["current_period_end"] = current_period_end.isoformat()
                     
                     client.table("profiles").update(update_data).eq("id", user_id).execute()
+                    invalidate_subscription_tier(user_id)
                     print(f"Updated subscription status for user {user_id}: {status}")
             else:
                 print(f"No user found for Stripe customer {customer_id}")
@@ -420,6 +423,12 @@ class StripeService:
             
         except HTTPException:
             raise
+        except stripe.InvalidRequestError as e:
+            # The customer or subscription no longer exists in Stripe
+            if e.code == "resource_missing":
+                raise HTTPException(status_code=400, detail="No active subscription found")
+            print(f"Stripe error canceling subscription: {e}")
+            raise HTTPException(status_code=500, detail="Failed to cancel subscription")
         except stripe.StripeError as e:
             print(f"Stripe error canceling subscription: {e}")
             raise HTTPException(status_code=500, detail="Failed to cancel subscription")
@@ -42,6 +42,7 @@ class SubscriptionService:
             portfolio_count_result = client.table("portfolios")\
                 .select("id", count="exact")\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .execute()
             
             portfolio_count = len(portfolio_count_result.data) if portfolio_count_result.data else 0
@@ -50,6 +51,7 @@ class SubscriptionService:
             project_count_result = client.table("impact_projects")\
                 .select("id", count="exact")\
                 .eq("user_id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .execute()
             
             project_count = len(project_count_result.data) if project_count_result.data else 0
@@ -5,8 +5,6 @@ import re
 from typing import Dict, Any
 from fastapi import HTTPException
 from backend.schemas.user import UserProfile, CheckUsernameResponse
-from backend.schemas.auth import MessageResponse
-from backend.services.stripe_service import StripeService
 from backend.utils.dependencies import ServiceDBClient
 
 class UserService:
@@ -31,6 +29,7 @@ class UserService:
             result = client.table("profiles")\
                 .select("*")\
                 .eq("id", user_id)\
+                .is_("delete_requested_at", "null")\
                 .maybe_single()\
                 .execute()
             
@@ -165,50 +164,6 @@ class UserService:
             print(f"Create/update profile error: {e}")
             raise HTTPException(status_code=500, detail="Failed to create/update profile")
 
-    @staticmethod
-    async def delete_account(
-        client: ServiceDBClient,
-        user_id: str,
-        stripe_service: StripeService
-    ) -> MessageResponse:
-        """
-        Delete user account (profile and auth user)
-        
-        Args:
-            client: Supabase client (injected from router)
-            user_id: User's ID
-            stripe_service: Stripe service class (injected from router)
-            
-        Returns:
-            MessageResponse with success message
-        """
-        try:
-            # 1. Try to cancel subscription if exists
-            try:
-                await stripe_service.cancel_subscription(client, user_id)
-            except Exception as e:
-                # Log but continue - user might not have a subscription
-                print(f"Subscription cancellation check during account delete: {e}")
-            
-            # 2. Delete profile (this will cascade delete related data if FK constraints are set)
-            client.table("profiles")\
-                .delete()\
-                .eq("id", user_id)\
-                .execute()
-            
-            # 3. Delete auth user using Admin API
-            client.auth.admin.delete_user(user_id)
-            
-            return MessageResponse(
-                success=True,
-                message="Account deleted successfully"
-            )
-        except HTTPException:
-            raise
-        except Exception as e:
-            print(f"Delete account error: {e}")
-            raise HTTPException(status_code=500, detail="Failed to delete account")
-
     @staticmethod
     def validate_username(username: str) -> bool:
         """Validate username format"""
@@ -0,0 +1,172 @@
+-- Migration: Normalized Metric Columns
+-- Description: Maintain unit-normalized value and improvement ratio columns on project_metrics
+-- so metrics can be compared and indexed without parsing metric_data JSONB row by row
+
+-- ============================================
+-- 1. ADD NORMALIZED COLUMNS
+-- ============================================
+
+-- Nullable columns without defaults: adding them does not rewrite the table
+ALTER TABLE project_metrics
+ADD COLUMN IF NOT EXISTS canonical_value DOUBLE PRECISION;
+
+ALTER TABLE project_metrics
+ADD COLUMN IF NOT EXISTS canonical_unit TEXT;
+
+ALTER TABLE project_metrics
+ADD COLUMN IF NOT EXISTS improvement_ratio DOUBLE PRECISION;
+
+-- ============================================
+-- 2. UNIT NORMALIZATION FUNCTIONS
+-- ============================================
+
+-- Canonical unit and multiplier for a metric unit
+-- Durations normalize to ms and data sizes to MB; every other unit is already canonical
+CREATE OR REPLACE FUNCTION public.metric_unit_scale(
+    unit TEXT,
+    OUT canonical_unit TEXT,
+    OUT factor DOUBLE PRECISION
+) AS $$
+    SELECT
+        CASE
+            WHEN unit IN ('ms', 's', 'min', 'hrs') THEN 'ms'
+            WHEN unit IN ('MB', 'GB') THEN 'MB'
+            ELSE unit
+        END,
+        CASE unit
+            WHEN 's' THEN 1000
+            WHEN 'min' THEN 60000
+            WHEN 'hrs' THEN 3600000
+            WHEN 'GB' THEN 1024
+            ELSE 1
+        END::DOUBLE PRECISION;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Normalized value of a {"value": ..., "unit": ...} JSONB object (NULL if malformed)
+CREATE OR REPLACE FUNCTION public.metric_canonical_value(value_json JSONB)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(value_json->'value') = 'number'
+        THEN (value_json->>'value')::DOUBLE PRECISION * (public.metric_unit_scale(value_json->>'unit')).factor
+    END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Improvement ratio for a before/after comparison (NULL if the units can't be compared)
+-- Durations and data sizes improve by going down (before / after); every other unit
+-- improves by going up (after / before). A ratio above 1 is an improvement.
+CREATE OR REPLACE FUNCTION public.metric_improvement_ratio(comparison JSONB)
+RETURNS DOUBLE PRECISION AS $$
+DECLARE
+    before_unit TEXT := (public.metric_unit_scale(comparison->'before'->>'unit')).canonical_unit;
+    after_unit TEXT := (public.metric_unit_scale(comparison->'after'->>'unit')).canonical_unit;
+    before_value DOUBLE PRECISION := public.metric_canonical_value(comparison->'before');
+    after_value DOUBLE PRECISION := public.metric_canonical_value(comparison->'after');
+BEGIN
+    IF before_unit IS NULL OR before_unit IS DISTINCT FROM after_unit
+        OR before_value IS NULL OR after_value IS NULL
+        OR before_value <= 0 OR after_value <= 0 THEN
+        RETURN NULL;
+    END IF;
+
+    IF before_unit IN ('ms', 'MB') THEN
+        RETURN before_value / after_value;
+    END IF;
+    RETURN after_value / before_value;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+-- ============================================
+-- 3. TRIGGER TO MAINTAIN NORMALIZED COLUMNS
+-- ============================================
+
+CREATE OR REPLACE FUNCTION public.normalize_project_metric()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.metric_data IS NULL THEN
+        -- Legacy metrics have free-text values and can't be normalized
+        NEW.canonical_value := NULL;
+        NEW.canonical_unit := NULL;
+        NEW.improvement_ratio := NULL;
+    ELSE
+        NEW.canonical_value := public.metric_canonical_value(NEW.metric_data->'primary');
+        NEW.canonical_unit := (public.metric_unit_scale(NEW.metric_data->'primary'->>'unit')).canonical_unit;
+        NEW.improvement_ratio := public.metric_improvement_ratio(NEW.metric_data->'comparison');
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS normalize_project_metric_trigger ON project_metrics;
+CREATE TRIGGER normalize_project_metric_trigger
+    BEFORE INSERT OR UPDATE OF metric_data ON project_metrics
+    FOR EACH ROW
+    EXECUTE FUNCTION public.normalize_project_metric();
+
+-- ============================================
+-- 4. INDEXES
+-- ============================================
+
+-- Threshold lookups, e.g. time metrics at or under 100 ms, scale metrics over 1M users
+CREATE INDEX IF NOT EXISTS idx_project_metrics_canonical
+ON project_metrics(metric_type, canonical_unit, canonical_value)
+WHERE canonical_value IS NOT NULL;
+
+-- Improvement lookups, e.g. metrics with at least a 10x improvement
+CREATE INDEX IF NOT EXISTS idx_project_metrics_improvement_ratio
+ON project_metrics(metric_type, improvement_ratio)
+WHERE improvement_ratio IS NOT NULL;
+
+-- ============================================
+-- 5. BATCHED BACKFILL FOR EXISTING ROWS
+-- ============================================
+
+-- Normalize up to batch_size existing standardized metrics; returns the number of rows updated
+-- Rows are picked in id order and touched through metric_data so the trigger does the work.
+CREATE OR REPLACE FUNCTION public.backfill_normalized_metrics(batch_size INTEGER DEFAULT 1000)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    WITH batch AS (
+        SELECT id
+        FROM project_metrics
+        WHERE metric_data IS NOT NULL
+          AND canonical_unit IS NULL
+          AND metric_data->'primary'->>'unit' IS NOT NULL
+        ORDER BY id
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE project_metrics pm
+    SET metric_data = pm.metric_data
+    FROM batch
+    WHERE pm.id = batch.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Run the backfill to completion, committing after each batch so locks stay short
+-- Usage (outside a transaction block): CALL public.run_normalized_metrics_backfill();
+CREATE OR REPLACE PROCEDURE public.run_normalized_metrics_backfill(batch_size INTEGER DEFAULT 1000)
+AS $$
+BEGIN
+    LOOP
+        EXIT WHEN public.backfill_normalized_metrics(batch_size) = 0;
+        COMMIT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill service-role access only
+REVOKE EXECUTE ON FUNCTION public.backfill_normalized_metrics(INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON PROCEDURE public.run_normalized_metrics_backfill(INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- ============================================
+-- 6. ADD COMMENTS
+-- ============================================
+
+COMMENT ON COLUMN project_metrics.canonical_value IS 'Primary metric value converted to canonical_unit (trigger-maintained from metric_data)';
+COMMENT ON COLUMN project_metrics.canonical_unit IS 'Canonical unit: ms for durations, MB for data sizes, otherwise the metric''s own unit';
+COMMENT ON COLUMN project_metrics.improvement_ratio IS 'Improvement factor from comparison.before/after (>1 is better); NULL without a comparable comparison';
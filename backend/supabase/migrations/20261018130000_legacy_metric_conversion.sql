@@ -0,0 +1,66 @@
+-- Migration: Legacy Metric Conversion
+-- Description: Checkpoint table and batch update function for the job that converts
+-- legacy free-text metrics (primary_value/label/detail) into standardized metric_data
+
+-- ============================================
+-- 1. CREATE JOB CHECKPOINTS TABLE
+-- ============================================
+
+-- Progress of resumable backend jobs, one row per job
+CREATE TABLE IF NOT EXISTS job_checkpoints (
+    job_name TEXT PRIMARY KEY,
+    state JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMPTZ
+);
+
+-- RLS with no policies: only the service role can read or write checkpoints
+ALTER TABLE job_checkpoints ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- 2. BATCH CONVERSION FUNCTION
+-- ============================================
+
+-- Apply a batch of parsed legacy metrics; returns the number of rows converted
+-- conversions: [{"id": ..., "primary_value": ..., "metric_type": ..., "metric_data": {...}}, ...]
+-- A row is only converted if it is still legacy and its primary_value is the one that
+-- was parsed, so edits made while the job runs are never overwritten. Legacy columns are
+-- left in place for auditing and rollback (metric_format_check accepts both).
+CREATE OR REPLACE FUNCTION public.apply_legacy_metric_conversions(conversions JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE project_metrics pm
+    SET metric_type = c.metric_type,
+        metric_data = c.metric_data
+    FROM jsonb_to_recordset(conversions) AS c(
+        id UUID,
+        primary_value TEXT,
+        metric_type TEXT,
+        metric_data JSONB
+    )
+    WHERE pm.id = c.id
+      AND pm.metric_data IS NULL
+      AND pm.primary_value IS NOT DISTINCT FROM c.primary_value;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Conversion service-role access only
+REVOKE EXECUTE ON FUNCTION public.apply_legacy_metric_conversions(JSONB) FROM PUBLIC, anon, authenticated;
+
+-- Keyset pages over remaining legacy metrics
+CREATE INDEX IF NOT EXISTS idx_project_metrics_legacy
+ON project_metrics(id)
+WHERE metric_data IS NULL;
+
+-- ============================================
+-- 3. ADD COMMENTS
+-- ============================================
+
+COMMENT ON TABLE job_checkpoints IS 'Progress checkpoints for resumable backend jobs (service role only)';
+COMMENT ON COLUMN job_checkpoints.state IS 'Job-specific progress, e.g. last processed id and counters';
+COMMENT ON FUNCTION public.apply_legacy_metric_conversions(JSONB) IS 'Convert parsed legacy metrics in one statement, skipping rows changed since they were read';
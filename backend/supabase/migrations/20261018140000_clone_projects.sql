@@ -0,0 +1,78 @@
+-- Migration: Clone Projects
+-- Description: Copy projects with their metrics and evidence in a single set-based statement
+
+-- ============================================
+-- 1. CLONE FUNCTION
+-- ============================================
+
+-- Clone a user's projects into a portfolio (NULL for no portfolio)
+-- Projects, metrics and evidence rows are copied with INSERT ... SELECT. Cloned evidence
+-- rows point at the same storage objects as the originals, so no file is copied; the
+-- backend only removes an object once no evidence row references it.
+-- Clones are appended in the source order starting at first_display_order, order_gap apart.
+-- Returns one (source_id, project_id) row per cloned project.
+CREATE OR REPLACE FUNCTION public.clone_projects(
+    source_project_ids UUID[],
+    owner_id UUID,
+    target_portfolio_id UUID,
+    first_display_order INTEGER,
+    order_gap INTEGER,
+    name_suffix TEXT DEFAULT ''
+)
+RETURNS TABLE (source_id UUID, project_id UUID) AS $$
+BEGIN
+    RETURN QUERY
+    WITH source AS (
+        SELECT
+            p.*,
+            gen_random_uuid() AS new_id,
+            row_number() OVER (ORDER BY p.display_order, p.id) - 1 AS position
+        FROM impact_projects p
+        WHERE p.id = ANY(source_project_ids)
+          AND p.user_id = owner_id
+    ),
+    cloned_projects AS (
+        INSERT INTO impact_projects (
+            id, user_id, portfolio_id, company, project_name, role, team_size,
+            problem, contributions, tech_stack, display_order
+        )
+        SELECT
+            s.new_id, owner_id, target_portfolio_id, s.company, s.project_name || name_suffix,
+            s.role, s.team_size, s.problem, s.contributions, s.tech_stack,
+            first_display_order + (s.position * order_gap)::INTEGER
+        FROM source s
+        RETURNING id
+    ),
+    cloned_metrics AS (
+        INSERT INTO project_metrics (
+            project_id, primary_value, label, detail, metric_type, metric_data, display_order
+        )
+        SELECT s.new_id, m.primary_value, m.label, m.detail, m.metric_type, m.metric_data, m.display_order
+        FROM project_metrics m
+        JOIN source s ON s.id = m.project_id
+    ),
+    cloned_evidence AS (
+        INSERT INTO project_evidence (
+            project_id, file_path, file_name, file_size, mime_type, display_order
+        )
+        SELECT s.new_id, e.file_path, e.file_name, e.file_size, e.mime_type, e.display_order
+        FROM project_evidence e
+        JOIN source s ON s.id = e.project_id
+    )
+    SELECT s.id, s.new_id
+    FROM source s
+    ORDER BY s.position;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- owner_id is trusted input: service-role access only
+REVOKE EXECUTE ON FUNCTION public.clone_projects(UUID[], UUID, UUID, INTEGER, INTEGER, TEXT) FROM PUBLIC, anon, authenticated;
+
+-- Reference checks before removing a storage object
+CREATE INDEX IF NOT EXISTS idx_project_evidence_file_path ON project_evidence(file_path);
+
+-- ============================================
+-- 2. ADD COMMENTS
+-- ============================================
+
+COMMENT ON FUNCTION public.clone_projects(UUID[], UUID, UUID, INTEGER, INTEGER, TEXT) IS 'Copy projects, metrics and evidence rows in one statement; evidence shares storage objects with the source';
@@ -0,0 +1,70 @@
+-- Migration: Evidence Upload Reservations
+-- Description: Quota reservations for evidence uploaded directly to storage with a signed
+-- upload URL, and the function that turns a finished upload into an evidence row
+
+-- ============================================
+-- 1. CREATE EVIDENCE_UPLOAD_RESERVATIONS TABLE
+-- ============================================
+
+-- One row per signed upload URL handed out. The reserved bytes count against the user's
+-- storage quota until the upload is finalized or the reservation expires.
+CREATE TABLE IF NOT EXISTS evidence_upload_reservations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES impact_projects(id) ON DELETE CASCADE,
+    file_path TEXT NOT NULL UNIQUE,
+    file_name TEXT NOT NULL,
+    mime_type TEXT NOT NULL,
+    reserved_bytes INTEGER NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- Constraints
+    CONSTRAINT evidence_upload_reservations_file_name_not_empty CHECK (length(trim(file_name)) > 0),
+    CONSTRAINT evidence_upload_reservations_reserved_bytes_positive CHECK (reserved_bytes > 0),
+    CONSTRAINT evidence_upload_reservations_mime_type_image CHECK (mime_type LIKE 'image/%')
+);
+
+-- Active reservations are summed per user on every quota check
+CREATE INDEX IF NOT EXISTS idx_evidence_upload_reservations_user_expires
+    ON evidence_upload_reservations(user_id, expires_at);
+
+-- RLS with no policies: only the service role can read or write reservations
+ALTER TABLE evidence_upload_reservations ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- 2. FINALIZE FUNCTION
+-- ============================================
+
+-- Consume an unexpired reservation and create its evidence row in one transaction
+-- Deleting the reservation first means a reservation can only be finalized once, even
+-- if two finalize requests race. Returns no row if the reservation is missing, expired
+-- or belongs to another user.
+CREATE OR REPLACE FUNCTION public.finalize_evidence_upload(
+    reservation_id UUID,
+    owner_id UUID,
+    object_size INTEGER,
+    object_mime_type TEXT,
+    new_display_order INTEGER
+)
+RETURNS SETOF project_evidence AS $$
+BEGIN
+    RETURN QUERY
+    WITH claimed AS (
+        DELETE FROM evidence_upload_reservations r
+        WHERE r.id = reservation_id
+          AND r.user_id = owner_id
+          AND r.expires_at > NOW()
+        RETURNING r.project_id, r.file_path, r.file_name
+    )
+    INSERT INTO project_evidence (project_id, file_path, file_name, file_size, mime_type, display_order)
+    SELECT c.project_id, c.file_path, c.file_name, object_size, object_mime_type, new_display_order
+    FROM claimed c
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.finalize_evidence_upload(UUID, UUID, INTEGER, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+
+COMMENT ON TABLE evidence_upload_reservations IS 'Storage quota held for evidence uploaded directly to storage, until finalized or expired';
+COMMENT ON FUNCTION public.finalize_evidence_upload IS 'Consume an upload reservation and insert its project_evidence row';
@@ -0,0 +1,82 @@
+-- Migration: Evidence Image Variants
+-- Description: Record the resized WebP/AVIF variants generated for each evidence image
+
+-- ============================================
+-- 1. ADD VARIANTS COLUMN
+-- ============================================
+
+-- Variants stored next to the original object:
+-- [{"file_path": ..., "width": ..., "height": ..., "mime_type": ..., "file_size": ...}, ...]
+-- NULL until the image has been processed; an empty array when no variants can be made.
+-- Evidence rows sharing a storage object (clones) share its variants.
+ALTER TABLE project_evidence ADD COLUMN IF NOT EXISTS variants JSONB;
+
+-- Evidence still waiting for variants, scanned by the backfill job
+CREATE INDEX IF NOT EXISTS idx_project_evidence_variants_pending
+    ON project_evidence(id)
+    WHERE variants IS NULL;
+
+-- ============================================
+-- 2. COPY VARIANTS WHEN CLONING
+-- ============================================
+
+-- Unchanged from 20261018140000_clone_projects apart from copying evidence variants
+CREATE OR REPLACE FUNCTION public.clone_projects(
+    source_project_ids UUID[],
+    owner_id UUID,
+    target_portfolio_id UUID,
+    first_display_order INTEGER,
+    order_gap INTEGER,
+    name_suffix TEXT DEFAULT ''
+)
+RETURNS TABLE (source_id UUID, project_id UUID) AS $$
+BEGIN
+    RETURN QUERY
+    WITH source AS (
+        SELECT
+            p.*,
+            gen_random_uuid() AS new_id,
+            row_number() OVER (ORDER BY p.display_order, p.id) - 1 AS position
+        FROM impact_projects p
+        WHERE p.id = ANY(source_project_ids)
+          AND p.user_id = owner_id
+    ),
+    cloned_projects AS (
+        INSERT INTO impact_projects (
+            id, user_id, portfolio_id, company, project_name, role, team_size,
+            problem, contributions, tech_stack, display_order
+        )
+        SELECT
+            s.new_id, owner_id, target_portfolio_id, s.company, s.project_name || name_suffix,
+            s.role, s.team_size, s.problem, s.contributions, s.tech_stack,
+            first_display_order + (s.position * order_gap)::INTEGER
+        FROM source s
+        RETURNING id
+    ),
+    cloned_metrics AS (
+        INSERT INTO project_metrics (
+            project_id, primary_value, label, detail, metric_type, metric_data, display_order
+        )
+        SELECT s.new_id, m.primary_value, m.label, m.detail, m.metric_type, m.metric_data, m.display_order
+        FROM project_metrics m
+        JOIN source s ON s.id = m.project_id
+    ),
+    cloned_evidence AS (
+        INSERT INTO project_evidence (
+            project_id, file_path, file_name, file_size, mime_type, display_order, variants
+        )
+        SELECT s.new_id, e.file_path, e.file_name, e.file_size, e.mime_type, e.display_order, e.variants
+        FROM project_evidence e
+        JOIN source s ON s.id = e.project_id
+    )
+    SELECT s.id, s.new_id
+    FROM source s
+    ORDER BY s.position;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- ============================================
+-- 3. ADD COMMENTS
+-- ============================================
+
+COMMENT ON COLUMN project_evidence.variants IS 'Resized WebP/AVIF variants of the image; NULL until processed';
@@ -0,0 +1,119 @@
+-- Migration: Evidence Image Dimensions
+-- Description: Record the width and height read from each evidence image's header
+
+-- ============================================
+-- 1. ADD DIMENSION COLUMNS
+-- ============================================
+
+-- Display dimensions (EXIF orientation applied); NULL for evidence uploaded before
+-- headers were checked
+ALTER TABLE project_evidence ADD COLUMN IF NOT EXISTS width INTEGER;
+ALTER TABLE project_evidence ADD COLUMN IF NOT EXISTS height INTEGER;
+
+ALTER TABLE project_evidence ADD CONSTRAINT project_evidence_dimensions_positive
+    CHECK ((width IS NULL AND height IS NULL) OR (width > 0 AND height > 0));
+
+-- ============================================
+-- 2. RECORD DIMENSIONS WHEN FINALIZING DIRECT UPLOADS
+-- ============================================
+
+DROP FUNCTION IF EXISTS public.finalize_evidence_upload(UUID, UUID, INTEGER, TEXT, INTEGER);
+
+-- Consume an unexpired reservation and create its evidence row in one transaction
+-- Deleting the reservation first means a reservation can only be finalized once, even
+-- if two finalize requests race. Returns no row if the reservation is missing, expired
+-- or belongs to another user.
+CREATE OR REPLACE FUNCTION public.finalize_evidence_upload(
+    reservation_id UUID,
+    owner_id UUID,
+    object_size INTEGER,
+    object_mime_type TEXT,
+    new_display_order INTEGER,
+    image_width INTEGER,
+    image_height INTEGER
+)
+RETURNS SETOF project_evidence AS $$
+BEGIN
+    RETURN QUERY
+    WITH claimed AS (
+        DELETE FROM evidence_upload_reservations r
+        WHERE r.id = reservation_id
+          AND r.user_id = owner_id
+          AND r.expires_at > NOW()
+        RETURNING r.project_id, r.file_path, r.file_name
+    )
+    INSERT INTO project_evidence (project_id, file_path, file_name, file_size, mime_type, display_order, width, height)
+    SELECT c.project_id, c.file_path, c.file_name, object_size, object_mime_type, new_display_order, image_width, image_height
+    FROM claimed c
+    RETURNING *;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.finalize_evidence_upload(UUID, UUID, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- ============================================
+-- 3. COPY DIMENSIONS WHEN CLONING
+-- ============================================
+
+-- Unchanged from 20261018160000_evidence_image_variants apart from copying dimensions
+CREATE OR REPLACE FUNCTION public.clone_projects(
+    source_project_ids UUID[],
+    owner_id UUID,
+    target_portfolio_id UUID,
+    first_display_order INTEGER,
+    order_gap INTEGER,
+    name_suffix TEXT DEFAULT ''
+)
+RETURNS TABLE (source_id UUID, project_id UUID) AS $$
+BEGIN
+    RETURN QUERY
+    WITH source AS (
+        SELECT
+            p.*,
+            gen_random_uuid() AS new_id,
+            row_number() OVER (ORDER BY p.display_order, p.id) - 1 AS position
+        FROM impact_projects p
+        WHERE p.id = ANY(source_project_ids)
+          AND p.user_id = owner_id
+    ),
+    cloned_projects AS (
+        INSERT INTO impact_projects (
+            id, user_id, portfolio_id, company, project_name, role, team_size,
+            problem, contributions, tech_stack, display_order
+        )
+        SELECT
+            s.new_id, owner_id, target_portfolio_id, s.company, s.project_name || name_suffix,
+            s.role, s.team_size, s.problem, s.contributions, s.tech_stack,
+            first_display_order + (s.position * order_gap)::INTEGER
+        FROM source s
+        RETURNING id
+    ),
+    cloned_metrics AS (
+        INSERT INTO project_metrics (
+            project_id, primary_value, label, detail, metric_type, metric_data, display_order
+        )
+        SELECT s.new_id, m.primary_value, m.label, m.detail, m.metric_type, m.metric_data, m.display_order
+        FROM project_metrics m
+        JOIN source s ON s.id = m.project_id
+    ),
+    cloned_evidence AS (
+        INSERT INTO project_evidence (
+            project_id, file_path, file_name, file_size, mime_type, display_order, variants, width, height
+        )
+        SELECT s.new_id, e.file_path, e.file_name, e.file_size, e.mime_type, e.display_order, e.variants, e.width, e.height
+        FROM project_evidence e
+        JOIN source s ON s.id = e.project_id
+    )
+    SELECT s.id, s.new_id
+    FROM source s
+    ORDER BY s.position;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- ============================================
+-- 4. ADD COMMENTS
+-- ============================================
+
+COMMENT ON COLUMN project_evidence.width IS 'Display width in pixels read from the image header';
+COMMENT ON COLUMN project_evidence.height IS 'Display height in pixels read from the image header';
+COMMENT ON FUNCTION public.finalize_evidence_upload IS 'Consume an upload reservation and insert its project_evidence row';
@@ -0,0 +1,59 @@
+-- Migration: Deletion Jobs
+-- Description: Pending-delete markers on accounts, portfolios and projects, and the jobs
+-- that tear them down (storage objects, rows, subscription and auth user) in the background
+
+-- ============================================
+-- 1. PENDING-DELETE MARKERS
+-- ============================================
+
+-- Set when a delete is requested; marked rows are hidden from reads and quota counts
+-- until their deletion job removes them
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS delete_requested_at TIMESTAMPTZ;
+ALTER TABLE portfolios ADD COLUMN IF NOT EXISTS delete_requested_at TIMESTAMPTZ;
+ALTER TABLE impact_projects ADD COLUMN IF NOT EXISTS delete_requested_at TIMESTAMPTZ;
+
+-- ============================================
+-- 2. CREATE DELETION_JOBS TABLE
+-- ============================================
+
+-- user_id has no foreign key: the job of an account deletion outlives the profile so its
+-- status can still be read
+CREATE TABLE IF NOT EXISTS deletion_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    entity_type TEXT NOT NULL,
+    entity_id UUID NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    completed_at TIMESTAMPTZ,
+
+    -- Constraints
+    CONSTRAINT deletion_jobs_entity_type_valid CHECK (entity_type IN ('account', 'portfolio', 'project')),
+    CONSTRAINT deletion_jobs_status_valid CHECK (status IN ('pending', 'running', 'failed', 'completed'))
+);
+
+-- At most one unfinished job per entity, so repeated delete requests reuse it
+CREATE UNIQUE INDEX IF NOT EXISTS idx_deletion_jobs_active_entity
+    ON deletion_jobs(entity_type, entity_id)
+    WHERE status <> 'completed';
+
+-- The resume job looks for unfinished jobs, oldest update first
+CREATE INDEX IF NOT EXISTS idx_deletion_jobs_status_updated
+    ON deletion_jobs(status, updated_at)
+    WHERE status <> 'completed';
+
+-- RLS with no policies: only the service role can read or write deletion jobs
+ALTER TABLE deletion_jobs ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- 3. COMMENTS
+-- ============================================
+
+COMMENT ON COLUMN profiles.delete_requested_at IS 'When account deletion was requested; the account is torn down by a deletion job';
+COMMENT ON COLUMN portfolios.delete_requested_at IS 'When deletion was requested; the portfolio is torn down by a deletion job';
+COMMENT ON COLUMN impact_projects.delete_requested_at IS 'When deletion was requested; the project is torn down by a deletion job';
+COMMENT ON TABLE deletion_jobs IS 'Background teardown of deleted accounts, portfolios and projects, with progress checkpoints';
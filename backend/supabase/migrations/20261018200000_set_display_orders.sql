@@ -0,0 +1,37 @@
+-- Migration: Set Display Orders
+-- Description: Respace an ordering scope with one statement instead of one update per row
+
+-- ============================================
+-- 1. BULK DISPLAY ORDER UPDATE
+-- ============================================
+
+-- PostgREST upserts of partial rows trip the NOT NULL constraints on these tables, so the
+-- rebalance writes every new position through this function in a single round trip
+CREATE OR REPLACE FUNCTION public.set_display_orders(
+    target_table TEXT,
+    row_ids UUID[],
+    display_orders INTEGER[]
+)
+RETURNS VOID AS $$
+BEGIN
+    IF target_table NOT IN ('impact_projects', 'portfolios', 'project_evidence') THEN
+        RAISE EXCEPTION 'display order is not managed for table %', target_table;
+    END IF;
+
+    EXECUTE format(
+        'UPDATE public.%I AS t SET display_order = v.display_order
+         FROM unnest($1, $2) AS v(id, display_order)
+         WHERE t.id = v.id',
+        target_table
+    ) USING row_ids, display_orders;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Row IDs are trusted input: service-role access only
+REVOKE EXECUTE ON FUNCTION public.set_display_orders(TEXT, UUID[], INTEGER[]) FROM PUBLIC, anon, authenticated;
+
+-- ============================================
+-- 2. ADD COMMENTS
+-- ============================================
+
+COMMENT ON FUNCTION public.set_display_orders(TEXT, UUID[], INTEGER[]) IS 'Set display_order for many rows of an ordered table in one statement';
@@ -0,0 +1,18 @@
+-- Migration: Deletion Jobs Blocked Status
+-- Description: Terminal status for deletion jobs that keep failing
+
+-- ============================================
+-- 1. ADD BLOCKED STATUS
+-- ============================================
+
+-- A job that failed DELETION_MAX_ATTEMPTS runs (e.g. its subscription can't be cancelled)
+-- stops as 'blocked' with last_error naming the step, instead of staying 'failed'
+ALTER TABLE deletion_jobs DROP CONSTRAINT IF EXISTS deletion_jobs_status_valid;
+ALTER TABLE deletion_jobs ADD CONSTRAINT deletion_jobs_status_valid
+    CHECK (status IN ('pending', 'running', 'failed', 'blocked', 'completed'));
+
+-- ============================================
+-- 2. ADD COMMENTS
+-- ============================================
+
+COMMENT ON COLUMN deletion_jobs.status IS 'pending, running, failed (retried by the resume job), blocked (gave up, see last_error) or completed';
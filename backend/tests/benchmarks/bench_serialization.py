@@ -0,0 +1,113 @@
+"""
+Microbenchmark for project (de)serialization on a 1000-project fixture
+
+Run from the repository root:
+    python -m backend.tests.benchmarks.bench_serialization
+"""
+import timeit
+from typing import List, Union
+from unittest.mock import MagicMock
+from pydantic import TypeAdapter
+from backend.schemas.project import (
+    ProjectMetric,
+    StandardizedProjectMetric,
+    METRIC_LIST_ADAPTER,
+    PROJECT_LIST_ADAPTER,
+)
+from backend.services.project_service import ProjectService
+
+PROJECT_COUNT = 1000
+REPEAT = 5
+
+
+def make_rows(count: int = PROJECT_COUNT):
+    """impact_projects rows with embedded metrics, as returned by PostgREST"""
+    rows = []
+    for i in range(count):
+        rows.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "company": "Acme",
+            "project_name": f"Project {i}",
+            "role": "Lead",
+            "team_size": 4,
+            "problem": "Checkout was slow under load",
+            "contributions": ["Rewrote cart service", "Added caching", "Load tested"],
+            "tech_stack": ["Python", "Postgres", "Redis"],
+            "portfolio_id": None,
+            "display_order": i * 1024,
+            "metrics": [
+                {
+                    "id": f"m-{i}-0",
+                    "metric_type": "performance",
+                    "metric_data": {
+                        "type": "performance",
+                        "primary": {"value": 40, "unit": "%", "label": "faster"},
+                        "comparison": {"before": {"value": 500, "unit": "ms"}, "after": {"value": 300, "unit": "ms"}},
+                        "context": {"frequency": "daily", "scope": "all checkouts"},
+                        "timeframe": "3 months",
+                    },
+                    "primary_value": None,
+                    "label": None,
+                    "detail": None,
+                    "display_order": 0,
+                },
+                {
+                    "id": f"m-{i}-1",
+                    "metric_type": "business",
+                    "metric_data": {"type": "business", "primary": {"value": 12000, "unit": "$", "label": "cost_savings"}},
+                    "primary_value": None,
+                    "label": None,
+                    "detail": None,
+                    "display_order": 1,
+                },
+                {
+                    "id": f"m-{i}-2",
+                    "metric_type": None,
+                    "metric_data": None,
+                    "primary_value": "3x",
+                    "label": "throughput",
+                    "detail": "peak hour",
+                    "display_order": 2,
+                },
+            ],
+        })
+    return rows
+
+
+def validated_read(rows):
+    """Validate every row, then dump and re-validate the response like FastAPI does"""
+    projects = [
+        ProjectService._build_project(row, [ProjectService._deserialize_metric(m) for m in row["metrics"]])
+        for row in rows
+    ]
+    return PROJECT_LIST_ADAPTER.dump_json(
+        PROJECT_LIST_ADAPTER.validate_python([project.model_dump() for project in projects])
+    )
+
+
+def trusted_read(rows):
+    """Validate the page's metrics in one call, construct projects and serialize once"""
+    return PROJECT_LIST_ADAPTER.dump_json(ProjectService._rows_to_projects(MagicMock(), rows))
+
+
+def main():
+    rows = make_rows()
+    assert validated_read(rows) == trusted_read(rows)
+
+    metric_inputs = [ProjectService._metric_from_row(m) for row in rows for m in row["metrics"]]
+    plain_union = TypeAdapter(List[Union[ProjectMetric, StandardizedProjectMetric]])
+
+    cases = {
+        f"metrics: plain union ({len(metric_inputs)} rows)": lambda: plain_union.validate_python(metric_inputs),
+        f"metrics: discriminated union ({len(metric_inputs)} rows)": lambda: METRIC_LIST_ADAPTER.validate_python(metric_inputs),
+        "projects: validate + FastAPI round trip": lambda: validated_read(rows),
+        "projects: trusted read + dump_json": lambda: trusted_read(rows),
+    }
+    print(f"{PROJECT_COUNT} projects, best of {REPEAT}")
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        print(f"  {name:<45} {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
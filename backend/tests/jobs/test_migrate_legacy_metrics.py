@@ -0,0 +1,154 @@
+"""
+Tests for the legacy metric conversion job
+"""
+from unittest.mock import MagicMock
+from backend.jobs import migrate_legacy_metrics
+from backend.jobs.migrate_legacy_metrics import JOB_NAME, CONFLICT_REASON
+
+
+class FakeDatabase:
+    """In-memory project_metrics and job_checkpoints tables behind a mock client"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.checkpoints = {}
+        self.rpc_calls = []
+        self.fail_after_rpc_calls = None
+        self.client = MagicMock()
+        self.client.table.side_effect = self.table
+        self.client.rpc.side_effect = self.rpc
+
+    def table(self, name):
+        state = {"filters": [], "limit": None, "upsert": None, "delete": False}
+        query = MagicMock()
+
+        def chain(fn):
+            def wrapper(*args, **kwargs):
+                fn(*args, **kwargs)
+                return query
+            return wrapper
+
+        query.select.side_effect = chain(lambda *a: None)
+        query.is_.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) is None))
+        query.gt.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r[c] > v))
+        query.eq.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) == v))
+        query.order.side_effect = chain(lambda c: None)
+        query.limit.side_effect = chain(lambda n: state.__setitem__("limit", n))
+        query.upsert.side_effect = chain(lambda data: state.__setitem__("upsert", data))
+        query.delete.side_effect = chain(lambda: state.__setitem__("delete", True))
+
+        def execute():
+            if name == "job_checkpoints":
+                if state["upsert"] is not None:
+                    self.checkpoints[state["upsert"]["job_name"]] = state["upsert"]
+                elif state["delete"]:
+                    self.checkpoints.clear()
+                return MagicMock(data=list(self.checkpoints.values()))
+            rows = sorted(
+                (r for r in self.metrics if all(f(r) for f in state["filters"])),
+                key=lambda r: r["id"],
+            )
+            return MagicMock(data=[dict(r) for r in rows[:state["limit"]]])
+
+        query.execute.side_effect = execute
+        return query
+
+    def rpc(self, name, params):
+        if self.fail_after_rpc_calls is not None and len(self.rpc_calls) >= self.fail_after_rpc_calls:
+            raise RuntimeError("connection lost")
+        self.rpc_calls.append(params["conversions"])
+        converted = 0
+        by_id = {r["id"]: r for r in self.metrics}
+        for conversion in params["conversions"]:
+            row = by_id.get(conversion["id"])
+            if row and row["metric_data"] is None and row["primary_value"] == conversion["primary_value"]:
+                row["metric_type"] = conversion["metric_type"]
+                row["metric_data"] = conversion["metric_data"]
+                converted += 1
+        return MagicMock(execute=MagicMock(return_value=MagicMock(data=converted)))
+
+
+def make_metrics():
+    metrics = []
+    for i in range(10):
+        primary, label = ("40%", "faster builds") if i % 5 else ("Huge", "improvement")
+        metrics.append({
+            "id": f"m-{i:02d}",
+            "primary_value": primary,
+            "label": label,
+            "detail": None,
+            "metric_type": None,
+            "metric_data": None,
+        })
+    return metrics
+
+
+class TestMigrateLegacyMetrics:
+    """Tests for run"""
+
+    def test_converts_in_batches_and_reports_unparsed(self):
+        db = FakeDatabase(make_metrics())
+
+        report = migrate_legacy_metrics.run(db.client, batch_size=4)
+
+        assert report["completed"] is True
+        assert report["scanned"] == 10
+        assert report["converted"] == 8
+        assert report["skipped"] == {"no leading number": 2}
+        assert report["by_type"] == {"performance": 8}
+        assert [s["id"] for s in report["unparsed_samples"]] == ["m-00", "m-05"]
+        assert [len(batch) for batch in db.rpc_calls] == [3, 3, 2]
+        assert db.metrics[1]["metric_data"]["primary"] == {"value": 40, "unit": "%", "label": "faster builds"}
+        assert db.checkpoints[JOB_NAME]["completed_at"] is not None
+
+    def test_dry_run_writes_nothing(self):
+        db = FakeDatabase(make_metrics())
+
+        report = migrate_legacy_metrics.run(db.client, batch_size=4, dry_run=True)
+
+        assert report["converted"] == 8
+        assert len(report["converted_samples"]) == 8
+        assert db.rpc_calls == []
+        assert db.checkpoints == {}
+        assert all(r["metric_data"] is None for r in db.metrics)
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        db = FakeDatabase(make_metrics())
+        db.fail_after_rpc_calls = 1
+
+        try:
+            migrate_legacy_metrics.run(db.client, batch_size=4)
+        except RuntimeError:
+            pass
+        assert db.checkpoints[JOB_NAME]["state"]["last_id"] == "m-03"
+        assert db.checkpoints[JOB_NAME]["completed_at"] is None
+
+        db.fail_after_rpc_calls = None
+        report = migrate_legacy_metrics.run(db.client, batch_size=4)
+
+        assert report["resumed_from"] == "m-03"
+        assert report["scanned"] == 10
+        assert report["converted"] == 8
+        assert all(r["metric_data"] is not None for r in db.metrics if r["primary_value"] == "40%")
+
+    def test_rows_changed_since_read_are_skipped(self, monkeypatch):
+        db = FakeDatabase(make_metrics())
+        original_fetch = migrate_legacy_metrics._fetch_legacy_batch
+
+        def fetch_then_edit(client, after_id, batch_size):
+            rows = original_fetch(client, after_id, batch_size)
+            # A user edits m-01 between the read and the write
+            for row in db.metrics:
+                if row["id"] == "m-01":
+                    row["primary_value"] = "45%"
+            return rows
+
+        monkeypatch.setattr(migrate_legacy_metrics, "_fetch_legacy_batch", fetch_then_edit)
+
+        report = migrate_legacy_metrics.run(db.client, batch_size=20, limit=5)
+
+        assert report["completed"] is False
+        assert report["scanned"] == 5
+        assert report["converted"] == 3
+        assert report["skipped"][CONFLICT_REASON] == 1
+        assert db.metrics[1]["metric_data"] is None
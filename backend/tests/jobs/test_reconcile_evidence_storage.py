@@ -0,0 +1,174 @@
+"""
+Tests for the evidence storage reconciliation job
+"""
+from unittest.mock import MagicMock
+from backend.jobs import reconcile_evidence_storage
+from backend.jobs.reconcile_evidence_storage import JOB_NAME, RequestThrottle
+
+OLD = "2026-01-01T00:00:00Z"
+NEW = "2999-01-01T00:00:00Z"
+
+
+class FakeBucket:
+    """Flat object paths exposed through folder-by-folder paginated listing"""
+
+    def __init__(self, objects):
+        self.objects = dict(objects)  # path -> created_at, or (created_at, updated_at)
+        self.list_calls = 0
+        self.remove_calls = []
+
+    def list(self, path, options):
+        self.list_calls += 1
+        prefix = f"{path}/" if path else ""
+        names = {}
+        for object_path, written in self.objects.items():
+            if not object_path.startswith(prefix):
+                continue
+            created_at, updated_at = written if isinstance(written, tuple) else (written, written)
+            name, _, rest = object_path[len(prefix):].partition("/")
+            names[name] = None if rest else {
+                "id": object_path, "name": name, "created_at": created_at, "updated_at": updated_at, "metadata": {"size": 10}
+            }
+        entries = [entry or {"id": None, "name": name} for name, entry in sorted(names.items())]
+        return entries[options["offset"]:options["offset"] + options["limit"]]
+
+    def remove(self, paths):
+        self.remove_calls.append(list(paths))
+        for path in paths:
+            self.objects.pop(path)
+
+
+def make_client(bucket, evidence, reservations=(), checkpoints=None):
+    """evidence: user_id -> project_evidence rows; reservations: active reservation paths"""
+    checkpoints = {} if checkpoints is None else checkpoints
+    client = MagicMock()
+    client.storage.from_.return_value = bucket
+
+    def table(name):
+        state = {"user_id": None, "upsert": None}
+        query = MagicMock()
+        for method in ("select", "gt", "order", "limit", "delete"):
+            getattr(query, method).return_value = query
+
+        def eq(column, value):
+            if column in ("impact_projects.user_id", "user_id"):
+                state["user_id"] = value
+            return query
+
+        def upsert(data):
+            state["upsert"] = data
+            return query
+
+        def execute():
+            if name == "project_evidence":
+                return MagicMock(data=evidence.get(state["user_id"], []))
+            if name == "evidence_upload_reservations":
+                return MagicMock(data=[{"file_path": p} for p in reservations if p.startswith(f"{state['user_id']}/")])
+            if state["upsert"] is not None:
+                checkpoints[JOB_NAME] = state["upsert"]
+            return MagicMock(data=list(checkpoints.values()))
+
+        query.eq.side_effect = eq
+        query.upsert.side_effect = upsert
+        query.execute.side_effect = execute
+        return query
+
+    client.table.side_effect = table
+    return client, checkpoints
+
+
+def make_bucket():
+    return FakeBucket({
+        "u1/sha256/aaa": OLD,
+        "u1/sha256/aaa.w320.webp": OLD,
+        "u1/p1/kept.png": OLD,
+        "u1/p1/orphan.png": OLD,
+        "u1/p1/pending.png": OLD,
+        "u1/p1/just-uploaded.png": NEW,
+        "u2/p9/deleted-account.png": OLD,
+        "u2/p9/deleted-account-2.png": OLD,
+    })
+
+
+EVIDENCE = {
+    "u1": [
+        {"id": "e1", "file_path": "u1/sha256/aaa", "variants": [{"file_path": "u1/sha256/aaa.w320.webp"}]},
+        {"id": "e2", "file_path": "u1/p1/kept.png", "variants": None},
+        {"id": "e3", "file_path": "u1/p1/gone.png", "variants": None},
+    ],
+}
+
+
+class TestReconcileEvidenceStorage:
+    """Tests for run"""
+
+    def test_deletes_unreferenced_objects_in_batches(self, monkeypatch):
+        monkeypatch.setattr(reconcile_evidence_storage, "LIST_PAGE_SIZE", 2)
+        bucket = make_bucket()
+        client, checkpoints = make_client(bucket, EVIDENCE, reservations=["u1/p1/pending.png"])
+
+        report = reconcile_evidence_storage.run(client, delete_batch_size=1, requests_per_second=0)
+
+        assert sorted(bucket.objects) == [
+            "u1/p1/just-uploaded.png",
+            "u1/p1/kept.png",
+            "u1/p1/pending.png",
+            "u1/sha256/aaa",
+            "u1/sha256/aaa.w320.webp",
+        ]
+        assert bucket.remove_calls == [
+            ["u1/p1/orphan.png"],
+            ["u2/p9/deleted-account-2.png"],
+            ["u2/p9/deleted-account.png"],
+        ]
+        assert (report["folders"], report["objects"], report["deleted"], report["too_recent"]) == (2, 8, 3, 1)
+        assert report["orphaned_bytes"] == 30
+        assert report["missing_samples"] == ["u1/p1/gone.png"]
+        assert checkpoints[JOB_NAME]["completed_at"] is not None
+
+    def test_re_upserted_object_counts_as_recent(self):
+        """Re-uploading keeps created_at, so a rewritten object awaiting its row is judged by updated_at"""
+        bucket = FakeBucket({"u1/sha256/bbb": (OLD, NEW), "u1/p1/orphan.png": OLD})
+        client, _ = make_client(bucket, {})
+
+        report = reconcile_evidence_storage.run(client, requests_per_second=0)
+
+        assert list(bucket.objects) == ["u1/sha256/bbb"]
+        assert (report["deleted"], report["too_recent"]) == (1, 1)
+
+    def test_dry_run_deletes_nothing(self):
+        bucket = make_bucket()
+        client, checkpoints = make_client(bucket, EVIDENCE)
+
+        report = reconcile_evidence_storage.run(client, dry_run=True, requests_per_second=0)
+
+        assert report["orphaned"] == 4
+        assert report["deleted"] == 0
+        assert bucket.remove_calls == []
+        assert checkpoints == {}
+
+    def test_resumes_after_checkpointed_folder(self):
+        bucket = make_bucket()
+        checkpoints = {JOB_NAME: {"job_name": JOB_NAME, "state": {"last_prefix": "u1"}, "completed_at": None}}
+        client, _ = make_client(bucket, EVIDENCE, checkpoints=checkpoints)
+
+        report = reconcile_evidence_storage.run(client, requests_per_second=0)
+
+        assert report["resumed_from"] == "u1"
+        assert report["folders"] == 1
+        assert "u1/p1/orphan.png" in bucket.objects
+
+
+def test_throttle_spaces_requests(monkeypatch):
+    now = [0.0]
+    sleeps = []
+    monkeypatch.setattr(reconcile_evidence_storage.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(reconcile_evidence_storage.time, "sleep", lambda s: sleeps.append(s))
+    throttle = RequestThrottle(requests_per_second=4)
+
+    throttle.wait()
+    throttle.wait()
+    now[0] = 1.0
+    throttle.wait()
+
+    assert sleeps == [0.25]
@@ -0,0 +1,68 @@
+"""
+Tests for AuthService sign-in with MFA
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from backend.services.auth.auth_service import AuthService
+
+
+def factor(factor_id, status="verified"):
+    return SimpleNamespace(id=factor_id, factor_type="totp", status=status, friendly_name="Phone")
+
+
+def make_client(factors):
+    """Client whose password sign-in returns a session for a user with the given factors"""
+    client = MagicMock()
+    client.auth.sign_in_with_password.return_value = SimpleNamespace(
+        user=SimpleNamespace(id="user-1", email="a@example.com", created_at="2026-10-18T00:00:00+00:00", factors=factors),
+        session=SimpleNamespace(access_token="aal1-token", refresh_token="refresh", expires_at=1790000000),
+    )
+    return client
+
+
+def make_http(status_code=200, body=None):
+    http = MagicMock()
+    http.post = AsyncMock(return_value=MagicMock(status_code=status_code, text="error", json=lambda: body or {}))
+    return http
+
+
+@pytest.fixture(autouse=True)
+def supabase_env(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://db.example")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "anon")
+
+
+class TestSignInMfa:
+    """Tests for the MFA branch of sign_in"""
+
+    async def test_verified_totp_factor_returns_challenge(self):
+        http = make_http(body={"id": "challenge-1"})
+
+        result = await AuthService.sign_in(make_client([factor("f-1")]), http, "a@example.com", "pw")
+
+        assert result.requires_mfa is True
+        assert result.session is None
+        assert (result.mfa_challenge_id, result.mfa_factor_id) == ("challenge-1", "f-1")
+        assert [f.id for f in result.mfa_factors] == ["f-1"]
+        assert http.post.await_args.args[0] == "https://db.example/auth/v1/factors/f-1/challenge"
+        assert http.post.await_args.kwargs["headers"]["Authorization"] == "Bearer aal1-token"
+
+    async def test_unverified_factor_signs_in_normally(self):
+        http = make_http()
+
+        result = await AuthService.sign_in(make_client([factor("f-1", status="unverified")]), http, "a@example.com", "pw")
+
+        assert result.requires_mfa is False
+        assert result.session.access_token == "aal1-token"
+        http.post.assert_not_awaited()
+
+    async def test_failed_challenge_does_not_return_session(self):
+        http = make_http(status_code=500)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await AuthService.sign_in(make_client([factor("f-1")]), http, "a@example.com", "pw")
+
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.detail == "Failed to start MFA challenge"
@@ -0,0 +1,213 @@
+"""
+Tests for DeletionService
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from backend.services import deletion_service
+from backend.services.deletion_service import DeletionService
+
+JOB = {
+    "id": "job-1",
+    "user_id": "u",
+    "entity_type": "portfolio",
+    "entity_id": "pf-1",
+    "status": "pending",
+    "progress": {},
+    "attempts": 0,
+    "last_error": None,
+    "created_at": "2026-10-18T00:00:00+00:00",
+    "updated_at": "2026-10-18T00:00:00+00:00",
+    "completed_at": None,
+}
+
+
+def make_query(data):
+    """Build a fluent query mock whose execute() returns the given data"""
+    query = MagicMock()
+    for method in ("select", "eq", "in_", "neq", "lt", "is_", "order", "limit", "update", "delete", "insert"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = MagicMock(data=data)
+    return query
+
+
+def make_client(responses):
+    """responses: table name -> data for successive queries on it (then empty results)"""
+    client = MagicMock()
+    pending = {name: iter(data) for name, data in responses.items()}
+    queries = {}
+
+    def table(name):
+        query = make_query(next(pending.get(name, iter(())), []))
+        queries.setdefault(name, []).append(query)
+        return query
+
+    client.table.side_effect = table
+    return client, queries
+
+
+def final_update(queries):
+    return queries["deletion_jobs"][-1].update.call_args[0][0]
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(deletion_service, "DELETION_RETRY_DELAYS", (0, 0))
+
+
+class TestRequestDeletion:
+    """Tests for request_deletion"""
+
+    async def test_unknown_project_is_not_found(self):
+        client, queries = make_client({"impact_projects": [[]]})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await DeletionService.request_deletion(client, "u", "project", "p-1")
+
+        assert exc_info.value.status_code == 404
+        assert "deletion_jobs" not in queries
+
+    async def test_portfolio_is_marked_unpublished_and_queued(self):
+        client, queries = make_client({
+            "portfolios": [[{"id": "pf-1"}]],
+            "deletion_jobs": [[], [JOB]],
+        })
+
+        job = await DeletionService.request_deletion(client, "u", "portfolio", "pf-1")
+
+        assert job.id == "job-1" and job.status == "pending"
+        assert "delete_requested_at" in queries["impact_projects"][0].update.call_args[0][0]
+        queries["impact_projects"][0].eq.assert_any_call("portfolio_id", "pf-1")
+        queries["published_profiles"][0].delete.assert_called_once()
+        queries["deletion_jobs"][1].insert.assert_called_once_with({
+            "user_id": "u", "entity_type": "portfolio", "entity_id": "pf-1",
+        })
+
+    async def test_account_marks_portfolios_and_projects(self):
+        client, queries = make_client({"deletion_jobs": [[], [{**JOB, "entity_type": "account", "entity_id": "u"}]]})
+
+        await DeletionService.request_deletion(client, "u", "account", "u")
+
+        for table in ("profiles", "portfolios", "impact_projects"):
+            assert "delete_requested_at" in queries[table][0].update.call_args[0][0]
+        queries["impact_projects"][0].eq.assert_called_once_with("user_id", "u")
+        queries["published_profiles"][0].delete.assert_called_once()
+
+    async def test_repeated_request_returns_active_job(self):
+        client, queries = make_client({
+            "impact_projects": [[{"id": "p-1"}]],
+            "deletion_jobs": [[{**JOB, "entity_type": "project", "entity_id": "p-1", "status": "running"}]],
+        })
+
+        job = await DeletionService.request_deletion(client, "u", "project", "p-1")
+
+        assert job.status == "running"
+        assert len(queries["deletion_jobs"]) == 1
+
+
+class TestRunJob:
+    """Tests for run_job"""
+
+    async def test_portfolio_teardown_in_batches(self, monkeypatch):
+        monkeypatch.setattr(deletion_service, "DELETION_BATCH_SIZE", 2)
+        client, queries = make_client({
+            "deletion_jobs": [[JOB]],
+            "impact_projects": [[{"id": "p1"}, {"id": "p2"}], [], [{"id": "p3"}], []],
+            "project_evidence": [
+                [
+                    {"file_path": "u/p1/a.png", "variants": [{"file_path": "u/p1/a.w320.webp"}]},
+                    {"file_path": "u/p2/shared.png", "variants": [{"file_path": "u/p2/shared.w320.webp"}]},
+                    {"file_path": "u/sha256/abc", "variants": [{"file_path": "u/sha256/abc.w320.webp"}]},
+                ],
+                [
+                    {"file_path": "u/p1/a.png", "project_id": "p1"},
+                    {"file_path": "u/p2/shared.png", "project_id": "p2"},
+                    {"file_path": "u/p2/shared.png", "project_id": "p-other"},
+                ],
+                [],
+            ],
+        })
+        bucket = client.storage.from_.return_value
+
+        job = await DeletionService.run_job(client, "job-1")
+
+        # Cloned evidence outside the portfolio keeps its object, and content-addressed
+        # objects are left to the reconcile job
+        bucket.remove.assert_called_once_with(["u/p1/a.png", "u/p1/a.w320.webp"])
+        queries["project_evidence"][1].in_.assert_called_once_with("file_path", ["u/p1/a.png", "u/p2/shared.png"])
+        queries["impact_projects"][1].in_.assert_called_once_with("id", ["p1", "p2"])
+        queries["impact_projects"][3].in_.assert_called_once_with("id", ["p3"])
+        queries["portfolios"][0].eq.assert_any_call("id", "pf-1")
+        assert job.status == "completed"
+        assert final_update(queries)["progress"] == {
+            "completed_steps": ["projects", "portfolio"],
+            "projects_deleted": 3,
+            "objects_deleted": 2,
+        }
+
+    async def test_failed_step_is_recorded_and_resumed(self):
+        stripe_service = MagicMock()
+        stripe_service.cancel_subscription = AsyncMock(side_effect=HTTPException(status_code=500))
+        account_job = {**JOB, "entity_type": "account", "entity_id": "u"}
+        client, queries = make_client({"deletion_jobs": [[account_job]]})
+
+        job = await DeletionService.run_job(client, "job-1", stripe_service)
+
+        assert stripe_service.cancel_subscription.await_count == 3
+        assert job.status == "failed" and job.attempts == 1
+        assert final_update(queries)["status"] == "failed"
+        assert "impact_projects" not in queries
+
+        # The next run skips the steps that finished and sweeps the user's storage folder
+        resumed = {**account_job, "status": "failed", "attempts": 1,
+                   "progress": {"completed_steps": ["subscription", "projects"]}}
+        client, queries = make_client({"deletion_jobs": [[resumed]]})
+        bucket = client.storage.from_.return_value
+        bucket.list.side_effect = lambda path, options: {
+            "u": [{"id": None, "name": "sha256"}, {"id": "1", "name": "a.png"}],
+            "u/sha256": [{"id": "2", "name": "abc"}],
+        }[path]
+
+        job = await DeletionService.run_job(client, "job-1", stripe_service)
+
+        assert job.status == "completed" and job.attempts == 2
+        assert stripe_service.cancel_subscription.await_count == 3
+        bucket.remove.assert_called_once_with(["u/sha256/abc", "u/a.png"])
+        queries["profiles"][0].delete.assert_called_once()
+        client.auth.admin.delete_user.assert_called_once_with("u")
+
+    async def test_missing_subscription_counts_as_cancelled(self):
+        stripe_service = MagicMock()
+        stripe_service.cancel_subscription = AsyncMock(
+            side_effect=HTTPException(status_code=400, detail="No active subscription found")
+        )
+        client, queries = make_client({"deletion_jobs": [[{**JOB, "entity_type": "account", "entity_id": "u"}]]})
+
+        job = await DeletionService.run_job(client, "job-1", stripe_service)
+
+        assert job.status == "completed"
+        stripe_service.cancel_subscription.assert_awaited_once()
+        assert final_update(queries)["progress"]["completed_steps"][0] == "subscription"
+
+    async def test_last_attempt_leaves_job_blocked_with_reason(self):
+        stripe_service = MagicMock()
+        stripe_service.cancel_subscription = AsyncMock(
+            side_effect=HTTPException(status_code=500, detail="Stripe secret key not configured")
+        )
+        account_job = {**JOB, "entity_type": "account", "entity_id": "u", "status": "failed",
+                       "attempts": deletion_service.DELETION_MAX_ATTEMPTS - 1}
+        client, queries = make_client({"deletion_jobs": [[account_job]]})
+
+        job = await DeletionService.run_job(client, "job-1", stripe_service)
+
+        assert job.status == "blocked"
+        assert job.last_error == "subscription: Stripe secret key not configured"
+        assert "profiles" not in queries
+
+    async def test_completed_job_is_not_rerun(self):
+        client, queries = make_client({"deletion_jobs": [[{**JOB, "status": "completed"}]]})
+
+        job = await DeletionService.run_job(client, "job-1")
+
+        assert job.status == "completed"
+        assert list(queries) == ["deletion_jobs"]
@@ -0,0 +1,150 @@
+"""
+Tests for ExportService
+"""
+import io
+import csv
+import json
+import zipfile
+import pytest
+from unittest.mock import MagicMock
+from backend.services import export_service
+from backend.services.export_service import ExportService
+from backend.schemas.user import UserProfile
+from backend.schemas.portfolio import Portfolio
+from backend.schemas.project import Project, ProjectEvidence, ProjectMetric, StandardizedProjectMetric
+
+
+PROFILE = UserProfile(id="user-1", username="dev", created_at="2025-01-01", updated_at="2025-01-01")
+PORTFOLIO = Portfolio(id="pf-1", name="Main", slug="main", display_order=0, created_at="2025-01-01", updated_at="2025-01-01")
+
+
+def make_project(index, evidence=None):
+    return Project(
+        id=f"p-{index}",
+        company="Acme",
+        projectName=f"Project {index}",
+        role="Lead",
+        teamSize=3,
+        problem="Slow checkout",
+        contributions=["Rewrote cart", "Added caching"],
+        techStack=["Python"],
+        metrics=[
+            ProjectMetric(id=f"m-{index}-a", primary="40%", label="faster"),
+            StandardizedProjectMetric(
+                id=f"m-{index}-b",
+                type="performance",
+                primary={"value": 40, "unit": "%", "label": "faster"},
+                comparison={"before": {"value": 500, "unit": "ms"}, "after": {"value": 300, "unit": "ms"}},
+            ),
+        ],
+        portfolio_id="pf-1",
+        evidence=evidence or [],
+    )
+
+
+def make_evidence(evidence_id, project_id):
+    return ProjectEvidence(
+        id=evidence_id,
+        project_id=project_id,
+        file_path=f"user-1/{project_id}/{evidence_id}.png",
+        file_name="../screen.png",
+        file_size=4,
+        mime_type="image/png",
+        display_order=0,
+        created_at="2025-01-01",
+        url=f"https://storage.example/{evidence_id}.png",
+    )
+
+
+async def pages_of(*pages):
+    for page in pages:
+        yield page
+
+
+async def collect(generator):
+    return b"".join([chunk async for chunk in generator])
+
+
+class TestBuildArchive:
+    """Tests for build_archive"""
+
+    @pytest.mark.asyncio
+    async def test_archive_contains_all_sections(self, monkeypatch):
+        """Projects from every page are exported, evidence is downloaded and failures are recorded"""
+        downloaded = []
+
+        async def fake_download(http, url):
+            downloaded.append(url)
+            if "ev-bad" in url:
+                raise RuntimeError("404")
+            spool = io.BytesIO(url.encode())
+            return spool
+        monkeypatch.setattr(ExportService, "_download_to_spool", staticmethod(fake_download))
+
+        pages = pages_of(
+            [make_project(1, [make_evidence("ev-1", "p-1")]), make_project(2)],
+            [make_project(3, [make_evidence("ev-bad", "p-3"), make_evidence("ev-3", "p-3")])],
+        )
+
+        data = await collect(ExportService.build_archive(MagicMock(), "user-1", PROFILE, [PORTFOLIO], pages))
+
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert json.loads(archive.read("profile.json"))["username"] == "dev"
+        assert json.loads(archive.read("portfolios.json"))[0]["slug"] == "main"
+        assert [p["id"] for p in json.loads(archive.read("projects.json"))] == ["p-1", "p-2", "p-3"]
+
+        rows = list(csv.DictReader(io.StringIO(archive.read("projects.csv").decode())))
+        assert len(rows) == 6
+        assert rows[0]["contributions"] == "Rewrote cart; Added caching"
+        assert rows[1]["metric_type"] == "performance"
+        assert rows[1]["before_value"] == "500"
+
+        # File names can't escape the evidence directory
+        assert archive.read("evidence/p-1/ev-1-screen.png") == b"https://storage.example/ev-1.png"
+        assert "evidence/p-3/ev-3-screen.png" in archive.namelist()
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["project_count"] == 3
+        assert manifest["evidence_count"] == 2
+        assert manifest["failed_evidence"] == [{"id": "ev-bad", "file_path": "user-1/p-3/ev-bad.png"}]
+        assert len(downloaded) == 3
+
+
+class TestExportArtifact:
+    """Tests for the cached export artifact"""
+
+    @pytest.mark.asyncio
+    async def test_stream_tails_build_then_serves_cached_archive(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(export_service, "EXPORT_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(export_service, "TAIL_POLL_SECONDS", 0)
+
+        async def archive():
+            for chunk in (b"abc", b"def"):
+                yield chunk
+
+        assert ExportService.needs_build("user-1")
+        ExportService.start_export("user-1", archive())
+        assert ExportService.is_building("user-1")
+        assert not ExportService.needs_build("user-1", fresh=True)
+
+        # Reader starts while the build is running
+        assert await collect(ExportService.stream_export("user-1")) == b"abcdef"
+
+        assert not ExportService.needs_build("user-1")
+        assert ExportService.get_completed_size("user-1") == 6
+        assert await collect(ExportService.stream_export("user-1", start=4)) == b"ef"
+
+    @pytest.mark.asyncio
+    async def test_failed_build_is_not_cached(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(export_service, "EXPORT_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(export_service, "TAIL_POLL_SECONDS", 0)
+
+        async def archive():
+            yield b"abc"
+            raise RuntimeError("storage down")
+
+        ExportService.start_export("user-1", archive())
+
+        with pytest.raises(RuntimeError):
+            await collect(ExportService.stream_export("user-1"))
+        assert ExportService.needs_build("user-1")
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,107 @@
+"""
+Tests for ImpactService
+"""
+import numpy as np
+from unittest.mock import MagicMock
+from backend.services.impact_service import ImpactService
+
+
+def metric_row(i, metric_type, value, unit, frequency=None, ratio=None, comparison_unit=None):
+    return {
+        "id": f"m-{i:03d}",
+        "metric_type": metric_type,
+        "canonical_value": value,
+        "canonical_unit": unit,
+        "improvement_ratio": ratio,
+        "frequency": frequency,
+        "comparison_unit": comparison_unit,
+        "impact_projects": {"user_id": "user-1", "portfolio_id": None},
+    }
+
+
+ROWS = [
+    metric_row(1, "business", 1000, "$", "monthly"),
+    metric_row(2, "business", 5000, "$", "annually"),
+    metric_row(3, "business", 2000, "$"),
+    metric_row(4, "time", 2 * 3_600_000, "ms", "weekly"),
+    metric_row(5, "performance", 200, "ms", ratio=2.0, comparison_unit="ms"),
+    metric_row(6, "performance", 40, "%", ratio=4.0, comparison_unit="s"),
+    metric_row(7, "performance", 30, "%", ratio=3.0, comparison_unit="MB"),
+    metric_row(8, "scale", 10_000, "users"),
+    metric_row(9, "scale", 2_500, "users", "daily"),
+    {**metric_row(10, None, None, None), "metric_type": None},
+]
+
+
+class TestSummarize:
+    """Tests for summarize"""
+
+    def test_headline_numbers(self):
+        summary = ImpactService.summarize(ROWS)
+
+        assert summary.metric_count == 9
+        assert summary.unconverted_metric_count == 1
+        assert summary.headline.dollars_annualized == 1000 * 12 + 5000 + 2000
+        assert summary.headline.hours_saved_annualized == 2 * 52
+        assert summary.headline.users_served == 12_500
+        # Only comparisons measured in time units count as latency
+        assert summary.headline.median_latency_improvement == 3.0
+
+    def test_groups_by_type_and_frequency(self):
+        summary = ImpactService.summarize(ROWS)
+
+        by_type = {(a.type, a.unit): a for a in summary.by_type}
+        dollars = by_type[("business", "$")]
+        assert dollars.count == 3
+        assert dollars.total == 8000
+        assert dollars.annualized_total == 19_000
+        assert dollars.median == 2000
+        assert by_type[("performance", "%")].median_improvement == 3.5
+        assert by_type[("scale", "users")].annualized_total is None
+
+        by_frequency = {(a.type, a.unit, a.frequency) for a in summary.by_frequency}
+        assert ("business", "$", "monthly") in by_frequency
+        assert ("business", "$", None) in by_frequency
+        assert ("scale", "users", "daily") in by_frequency
+
+    def test_group_percentiles_match_numpy(self):
+        rng = np.random.default_rng(7)
+        group = rng.integers(0, 4, size=200)
+        values = rng.random(200) * 100
+
+        result = ImpactService._group_percentiles(group, values, 5, (25, 50, 90))
+
+        for g in range(4):
+            expected = np.percentile(values[group == g], [25, 50, 90])
+            assert np.allclose(result[:, g], expected)
+        assert np.isnan(result[:, 4]).all()
+
+    def test_empty(self):
+        summary = ImpactService.summarize([])
+
+        assert summary.metric_count == 0
+        assert summary.headline.dollars_annualized == 0
+        assert summary.headline.median_latency_improvement is None
+        assert summary.by_type == []
+
+
+class TestImpactSummaryCache:
+    """Tests for get_impact_summary caching"""
+
+    async def test_cached_until_invalidated(self, monkeypatch):
+        fetch = MagicMock(return_value=ROWS)
+        monkeypatch.setattr(ImpactService, "_fetch_metric_rows", fetch)
+        client = MagicMock()
+
+        first = await ImpactService.get_impact_summary(client, "user-cache")
+        second = await ImpactService.get_impact_summary(client, "user-cache")
+        assert first is second
+        assert fetch.call_count == 1
+
+        await ImpactService.get_impact_summary(client, "user-cache", portfolio_id="pf-1")
+        assert fetch.call_count == 2
+
+        ImpactService.invalidate_user("user-cache")
+        await ImpactService.get_impact_summary(client, "user-cache")
+        await ImpactService.get_impact_summary(client, "user-cache", portfolio_id="pf-1")
+        assert fetch.call_count == 4
@@ -0,0 +1,124 @@
+"""
+Tests for ImportService
+"""
+import io
+import csv
+import json
+import zipfile
+from backend.services import import_service
+from backend.services.import_service import ImportService
+from backend.schemas.project import Project, ProjectMetric, StandardizedProjectMetric
+from backend.utils.project_csv import PROJECT_CSV_COLUMNS, project_to_csv_rows
+
+
+def make_project(index, metrics=None):
+    return Project(
+        id=f"p-{index}",
+        company="Acme",
+        projectName=f"Project {index}",
+        role="Lead",
+        teamSize=3,
+        problem="Slow checkout",
+        contributions=["Rewrote cart", "Added caching"],
+        techStack=["Python", "Redis"],
+        metrics=metrics if metrics is not None else [
+            ProjectMetric(id="m-a", primary="40%", label="faster", detail="p95"),
+            StandardizedProjectMetric(
+                id="m-b",
+                type="performance",
+                primary={"value": 40.5, "unit": "%", "label": "faster"},
+                comparison={"before": {"value": 500, "unit": "ms"}, "after": {"value": 300, "unit": "ms"}},
+                context={"frequency": "daily"},
+            ),
+        ],
+        portfolio_id="pf-old",
+    )
+
+
+def parse(content: bytes, import_format="auto"):
+    detected, rows = ImportService.parse_projects(io.BytesIO(content), import_format)
+    return detected, list(rows)
+
+
+class TestParseProjects:
+    """Tests for parse_projects"""
+
+    def test_csv_round_trips_export_layout(self):
+        """Rows exported for a project are grouped back into one project with its metrics"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(PROJECT_CSV_COLUMNS)
+        writer.writerows(project_to_csv_rows(make_project(1)))
+        writer.writerows(project_to_csv_rows(make_project(2, metrics=[])))
+
+        detected, rows = parse(buffer.getvalue().encode())
+
+        assert detected == "csv"
+        assert [(row, error) for row, _, error in rows] == [(2, None), (4, None)]
+        first = rows[0][1]
+        assert first["contributions"] == ["Rewrote cart", "Added caching"]
+        assert first["metrics"][0]["detail"] == "p95"
+        assert first["metrics"][1]["primary"]["value"] == 40.5
+        assert first["metrics"][1]["comparison"]["after"]["value"] == 300
+        assert "portfolio_id" not in first
+        assert rows[1][1]["metrics"] == []
+
+    def test_csv_reports_invalid_metric_per_row(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=PROJECT_CSV_COLUMNS)
+        writer.writeheader()
+        base = {"company": "Acme", "project_name": "Search", "role": "Lead", "team_size": "2", "problem": "Slow"}
+        writer.writerow({**base, "metric_type": "performance", "metric_value": "10", "metric_unit": "parsecs", "metric_label": "x"})
+        writer.writerow({**base, "project_name": "Billing"})
+
+        _, rows = parse(buffer.getvalue().encode(), "csv")
+
+        assert rows[0][0] == 2
+        assert rows[0][2].startswith("Invalid project data: metrics.0.primary.unit")
+        assert rows[1][2] is None
+
+    def test_export_json_is_streamed(self, monkeypatch):
+        """Projects are decoded one at a time even when chunks split values"""
+        monkeypatch.setattr(import_service, "READ_CHUNK_SIZE", 7)
+        projects = [json.loads(make_project(i).model_dump_json()) for i in range(3)]
+        content = json.dumps(projects, indent=2).encode()
+
+        detected, rows = parse(content)
+
+        assert detected == "export"
+        assert [row for row, _, _ in rows] == [1, 2, 3]
+        assert all(error is None for _, _, error in rows)
+        assert rows[2][1]["projectName"] == "Project 2"
+
+    def test_export_zip_and_truncated_json(self):
+        """Export archives are read from projects.json; a broken tail is reported as a failed row"""
+        projects_json = "[" + make_project(1).model_dump_json() + "," + make_project(2).model_dump_json()[:20]
+        archive_bytes = io.BytesIO()
+        with zipfile.ZipFile(archive_bytes, "w") as archive:
+            archive.writestr("projects.json", projects_json)
+
+        detected, rows = parse(archive_bytes.getvalue())
+
+        assert detected == "export"
+        assert rows[0][2] is None
+        assert rows[1][0] == 2
+        assert rows[1][2].startswith("Invalid file")
+
+    def test_json_resume_work_and_projects(self):
+        resume = {
+            "basics": {"name": "Dev"},
+            "work": [{"name": "Acme", "position": "Staff Engineer", "summary": "Payments", "highlights": ["Cut latency"]}],
+            "projects": [
+                {"name": "OSS lib", "description": "A library", "keywords": ["Rust"], "roles": ["Maintainer"]},
+                {"description": "No name"},
+            ],
+        }
+
+        detected, rows = parse(json.dumps(resume).encode())
+
+        assert detected == "json_resume"
+        assert rows[0][1]["company"] == "Acme"
+        assert rows[0][1]["contributions"] == ["Cut latency"]
+        assert rows[1][1]["techStack"] == ["Rust"]
+        assert rows[1][1]["role"] == "Maintainer"
+        assert rows[2][2] == "Invalid project data: company and projectName are required"
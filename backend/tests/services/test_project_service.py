@@ -0,0 +1,853 @@
+"""
+Tests for ProjectService
+"""
+import time
+import struct
+import threading
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from pydantic import ValidationError
+from backend.services import project_service
+from backend.services.project_service import ProjectService
+from backend.schemas.project import ProjectMetric, StandardizedProjectMetric, BulkProjectOperation, CreateProjectRequest
+from backend.schemas.subscription import SubscriptionInfoResponse
+from backend.schemas.user import DeletionJob
+
+
+@pytest.fixture
+def mock_supabase_client():
+    """Mock Supabase client for testing."""
+    return MagicMock()
+
+
+def make_query(data):
+    """Build a fluent query mock whose execute() returns the given data"""
+    query = MagicMock()
+    for method in ("select", "eq", "in_", "order", "limit", "single", "maybe_single", "range", "neq", "gt", "lt", "lte", "or_", "is_"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = MagicMock(data=data)
+    return query
+
+
+def png_header(width=64, height=32):
+    """Start of a PNG file: signature and IHDR chunk"""
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0) + b"\x00" * 4
+
+
+STANDARDIZED_METRIC = {
+    "type": "performance",
+    "primary": {"value": 40, "unit": "%", "label": "faster"},
+}
+
+
+class TestDiffMetrics:
+    """Tests for _diff_metrics"""
+
+    def test_unchanged_metrics_produce_no_writes(self):
+        """Metrics that match their stored rows are not rewritten"""
+        existing = [
+            {
+                "id": "m-1",
+                "project_id": "p-1",
+                "metric_type": "performance",
+                "metric_data": STANDARDIZED_METRIC,
+                "primary_value": None,
+                "label": None,
+                "detail": None,
+                "display_order": 0,
+            },
+            {
+                "id": "m-2",
+                "project_id": "p-1",
+                "metric_type": None,
+                "metric_data": None,
+                "primary_value": "3x",
+                "label": "throughput",
+                "detail": None,
+                "display_order": 1,
+            },
+        ]
+        metrics = [
+            {**STANDARDIZED_METRIC, "id": "m-1"},
+            {"id": "m-2", "primary": "3x", "label": "throughput"},
+        ]
+
+        upserts, delete_ids = ProjectService._diff_metrics("p-1", existing, metrics)
+
+        assert upserts == []
+        assert delete_ids == []
+
+    def test_changed_new_and_removed_metrics(self):
+        """Changed rows keep their ID, new rows get an ID, missing rows are deleted"""
+        existing = [
+            {"id": "m-1", "metric_type": None, "metric_data": None, "primary_value": "40%", "label": "faster", "detail": None, "display_order": 0},
+            {"id": "m-2", "metric_type": None, "metric_data": None, "primary_value": "2x", "label": "scale", "detail": None, "display_order": 1},
+        ]
+        metrics = [
+            ProjectMetric(id="m-1", primary="40%", label="quicker"),
+            StandardizedProjectMetric(**STANDARDIZED_METRIC),
+        ]
+
+        upserts, delete_ids = ProjectService._diff_metrics("p-1", existing, metrics)
+
+        assert delete_ids == ["m-2"]
+        assert len(upserts) == 2
+        assert upserts[0]["id"] == "m-1"
+        assert upserts[0]["label"] == "quicker"
+        assert upserts[1]["id"] not in ("m-1", "m-2")
+        assert upserts[1]["metric_type"] == "performance"
+        assert "id" not in upserts[1]["metric_data"]
+        # All rows share the same keys so they can be written in one upsert
+        assert set(upserts[0].keys()) == set(upserts[1].keys())
+
+    def test_foreign_metric_ids_are_not_reused(self):
+        """IDs that don't belong to the project are treated as new metrics"""
+        metrics = [{"id": "other-project-metric", "primary": "1", "label": "x"}]
+
+        upserts, delete_ids = ProjectService._diff_metrics("p-1", [], metrics)
+
+        assert delete_ids == []
+        assert upserts[0]["id"] != "other-project-metric"
+
+
+class TestUpdateProjectMetrics:
+    """Tests for metric writes in update_project"""
+
+    @pytest.mark.asyncio
+    async def test_update_metrics_only_applies_diff(self, mock_supabase_client, monkeypatch):
+        """Only the changed metric is upserted and nothing is deleted"""
+        projects_query = make_query([{"id": "p-1"}])
+        metrics_query = make_query([
+            {"id": "m-1", "metric_type": None, "metric_data": None, "primary_value": "40%", "label": "faster", "detail": None, "display_order": 0},
+        ])
+        mock_supabase_client.table.side_effect = lambda name: projects_query if name == "impact_projects" else metrics_query
+
+        async def fake_get_project(client, project_id, user_id):
+            return "updated"
+        monkeypatch.setattr(ProjectService, "get_project", fake_get_project)
+
+        result = await ProjectService.update_project(
+            mock_supabase_client,
+            "p-1",
+            "user-1",
+            {"metrics": [{"id": "m-1", "primary": "50%", "label": "faster"}]}
+        )
+
+        assert result == "updated"
+        metrics_query.upsert.assert_called_once()
+        rows = metrics_query.upsert.call_args[0][0]
+        assert [row["id"] for row in rows] == ["m-1"]
+        assert rows[0]["primary_value"] == "50%"
+        metrics_query.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_metrics_requires_ownership(self, mock_supabase_client):
+        """Metric-only updates fail when the project is not owned by the user"""
+        mock_supabase_client.table.return_value = make_query([])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.update_project(mock_supabase_client, "p-1", "user-1", {"metrics": []})
+        assert exc_info.value.status_code == 404
+
+
+def make_subscription_info(project_count=0, max_projects=10, subscription_type="free"):
+    """Build subscription info for project limit checks"""
+    return SubscriptionInfoResponse(
+        subscription_type=subscription_type,
+        portfolio_count=1,
+        max_portfolios=1,
+        can_add_portfolio=False,
+        project_count=project_count,
+        max_projects=max_projects,
+        can_add_project=project_count < max_projects,
+    )
+
+
+PROJECT_DATA = {
+    "company": "Acme",
+    "projectName": "Checkout",
+    "role": "Lead",
+    "teamSize": 3,
+    "problem": "Slow checkout",
+    "contributions": ["Rewrote cart"],
+    "techStack": ["Python"],
+    "metrics": [{"primary": "40%", "label": "faster"}],
+}
+
+
+class TestBulkProjectOperations:
+    """Tests for bulk_project_operations"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_uses_multi_row_inserts(self, mock_supabase_client):
+        """All creates are written with one projects insert and one metrics insert"""
+        projects_query = make_query([])
+        metrics_query = make_query([])
+        projects_query.insert.return_value = projects_query
+        mock_supabase_client.table.side_effect = lambda name: projects_query if name == "impact_projects" else metrics_query
+
+        operations = [
+            BulkProjectOperation(action="create", data=PROJECT_DATA),
+            BulkProjectOperation(action="create", data={**PROJECT_DATA, "projectName": "Search"}),
+        ]
+
+        result = await ProjectService.bulk_project_operations(
+            mock_supabase_client, make_subscription_info(), "user-1", operations
+        )
+
+        assert result.succeeded == 2
+        assert result.failed == 0
+        projects_query.insert.assert_called_once()
+        assert len(projects_query.insert.call_args[0][0]) == 2
+        metrics_query.insert.assert_called_once()
+        metric_rows = metrics_query.insert.call_args[0][0]
+        assert {row["project_id"] for row in metric_rows} == {r.project_id for r in result.results}
+        assert [r.project.projectName for r in result.results] == ["Checkout", "Search"]
+        assert result.results[0].project.metrics[0].id == metric_rows[0]["id"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_reports_partial_failures(self, mock_supabase_client):
+        """Invalid, missing and over-limit operations fail individually"""
+        projects_query = make_query([{"id": "p-1"}])
+        projects_query.delete.return_value = projects_query
+        projects_query.insert.return_value = projects_query
+        mock_supabase_client.table.return_value = projects_query
+
+        operations = [
+            BulkProjectOperation(action="delete", project_id="p-1"),
+            BulkProjectOperation(action="delete", project_id="p-missing"),
+            BulkProjectOperation(action="update"),
+            BulkProjectOperation(action="create", data={"company": "Acme"}),
+            BulkProjectOperation(action="create", data=PROJECT_DATA),
+            BulkProjectOperation(action="create", data=PROJECT_DATA),
+        ]
+
+        request_deletion = AsyncMock(return_value=DeletionJob(
+            id="job-1", entity_type="project", entity_id="p-1", status="pending",
+            created_at="2026-10-18T00:00:00+00:00", updated_at="2026-10-18T00:00:00+00:00",
+        ))
+
+        # One slot left after the delete frees one
+        result = await ProjectService.bulk_project_operations(
+            mock_supabase_client, make_subscription_info(project_count=10, max_projects=10), "user-1", operations,
+            request_deletion=request_deletion
+        )
+
+        outcomes = [(r.index, r.success) for r in result.results]
+        assert outcomes == [(0, True), (1, False), (2, False), (3, False), (4, True), (5, False)]
+        assert result.results[1].error == "Project not found"
+        # Deletes go through deletion jobs, skipping projects already pending delete
+        projects_query.delete.assert_not_called()
+        projects_query.is_.assert_any_call("delete_requested_at", "null")
+        request_deletion.assert_awaited_once_with(mock_supabase_client, "user-1", "project", "p-1")
+        assert result.results[0].job_id == "job-1"
+        assert result.results[2].error == "project_id is required"
+        assert result.results[3].error.startswith("Invalid project data")
+        assert result.results[5].error.startswith("Project limit reached")
+        assert result.succeeded == 2
+        assert result.failed == 4
+
+    @pytest.mark.asyncio
+    async def test_bulk_limit_message_names_the_plan(self, mock_supabase_client):
+        """Pro users over their limit aren't told they're on the free plan"""
+        mock_supabase_client.table.return_value = make_query([])
+        operations = [BulkProjectOperation(action="create", data=PROJECT_DATA)]
+
+        result = await ProjectService.bulk_project_operations(
+            mock_supabase_client, make_subscription_info(project_count=500, max_projects=500, subscription_type="pro"), "user-1", operations
+        )
+
+        assert result.results[0].error == "Project limit reached. Pro users are limited to 500 projects."
+
+
+def make_project_row(index):
+    """Build an impact_projects row with embedded metrics"""
+    return {
+        "id": f"00000000-0000-0000-0000-{index:012d}",
+        "company": "Acme",
+        "project_name": f"Project {index}",
+        "role": "Lead",
+        "team_size": 3,
+        "problem": "Slow checkout",
+        "contributions": [],
+        "tech_stack": [],
+        "portfolio_id": None,
+        "display_order": index * 1024,
+        "metrics": [],
+    }
+
+
+class TestListProjectsPagination:
+    """Tests for list_projects_page and iter_project_pages"""
+
+    @pytest.mark.asyncio
+    async def test_page_returns_cursor_when_more_rows_exist(self, mock_supabase_client):
+        """An extra row is fetched to detect the next page and the cursor points at the last returned row"""
+        query = make_query([make_project_row(i) for i in range(3)])
+        mock_supabase_client.table.return_value = query
+
+        page = await ProjectService.list_projects_page(mock_supabase_client, "user-1", limit=2)
+
+        query.limit.assert_called_once_with(3)
+        assert [p.projectName for p in page.projects] == ["Project 0", "Project 1"]
+        assert ProjectService._decode_cursor(page.next_cursor) == (1024, make_project_row(1)["id"])
+
+    @pytest.mark.asyncio
+    async def test_cursor_continues_after_last_row(self, mock_supabase_client):
+        """The cursor becomes a keyset filter on (display_order, id)"""
+        query = make_query([make_project_row(2)])
+        mock_supabase_client.table.return_value = query
+        cursor = ProjectService._encode_cursor(make_project_row(1))
+
+        page = await ProjectService.list_projects_page(mock_supabase_client, "user-1", limit=2, cursor=cursor)
+
+        last_id = make_project_row(1)["id"]
+        query.or_.assert_called_once_with(f"display_order.gt.1024,and(display_order.eq.1024,id.gt.{last_id})")
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self, mock_supabase_client):
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.list_projects_page(mock_supabase_client, "user-1", limit=2, cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_stops_on_short_page(self, mock_supabase_client):
+        """Pages are read until PostgREST returns fewer rows than requested"""
+        full_page = make_query([make_project_row(0), make_project_row(1)])
+        last_page = make_query([make_project_row(2)])
+        mock_supabase_client.table.side_effect = [full_page, last_page]
+
+        pages = [page async for page in ProjectService.iter_project_pages(mock_supabase_client, "user-1", page_size=2)]
+
+        assert [len(page) for page in pages] == [2, 1]
+        last_page.or_.assert_called_once()
+
+
+class TestImportProjects:
+    """Tests for import_projects"""
+
+    @pytest.mark.asyncio
+    async def test_rows_are_inserted_in_batches(self, mock_supabase_client, monkeypatch):
+        """Each batch is one bulk create and the project limit carries across batches"""
+        monkeypatch.setattr(project_service, "IMPORT_BATCH_SIZE", 2)
+        projects_query = make_query([])
+        metrics_query = make_query([])
+        projects_query.insert.return_value = projects_query
+        mock_supabase_client.table.side_effect = lambda name: projects_query if name == "impact_projects" else metrics_query
+
+        rows = iter([
+            (2, PROJECT_DATA, None),
+            (3, None, "Invalid project data: teamSize: Input should be a valid integer"),
+            (4, {**PROJECT_DATA, "projectName": "Search"}, None),
+            (5, {**PROJECT_DATA, "projectName": "Billing"}, None),
+        ])
+
+        result = await ProjectService.import_projects(
+            mock_supabase_client, make_subscription_info(project_count=7, max_projects=9), "user-1", "csv", rows, portfolio_id="pf-1"
+        )
+
+        assert projects_query.insert.call_count == 1
+        assert all(row["portfolio_id"] == "pf-1" for row in projects_query.insert.call_args[0][0])
+        assert [(r.row, r.success) for r in result.results] == [(2, True), (3, False), (4, True), (5, False)]
+        assert result.results[3].error.startswith("Project limit reached")
+        assert result.results[3].project_name == "Billing"
+        assert result.imported == 2
+        assert result.failed == 2
+
+
+class TestMetricDeserialization:
+    """Tests for the metric union and trusted read path"""
+
+    def test_union_is_discriminated_by_primary_shape(self):
+        """A structured primary is only validated as a standardized metric"""
+        with pytest.raises(ValidationError) as exc_info:
+            CreateProjectRequest(**{**PROJECT_DATA, "metrics": [{"type": "performance", "primary": {"value": 1, "unit": "parsecs", "label": "x"}}]})
+
+        locations = [error["loc"] for error in exc_info.value.errors()]
+        assert locations == [("metrics", 0, "standardized", "primary", "unit")]
+
+    def test_trusted_read_matches_validated_read(self):
+        """Projects built from trusted rows serialize exactly like validated ones"""
+        row = make_project_row(1)
+        row["metrics"] = [
+            {"id": "m-2", "metric_type": None, "metric_data": None, "primary_value": "3x", "label": "throughput", "detail": None, "display_order": 1},
+            {"id": "m-1", "metric_type": "performance", "metric_data": STANDARDIZED_METRIC, "display_order": 0},
+        ]
+
+        trusted = ProjectService._rows_to_projects(MagicMock(), [row])[0]
+        validated = ProjectService._build_project(
+            row, [ProjectService._deserialize_metric(m) for m in sorted(row["metrics"], key=lambda m: m["display_order"])]
+        )
+
+        assert trusted.model_dump_json() == validated.model_dump_json()
+        assert isinstance(trusted.metrics[0], StandardizedProjectMetric)
+        assert trusted.metrics[1].id == "m-2"
+
+    def test_malformed_metric_falls_back_per_project(self):
+        """A bad standardized row only affects its own project"""
+        good = make_project_row(1)
+        good["metrics"] = [{"id": "m-1", "metric_type": "performance", "metric_data": STANDARDIZED_METRIC, "display_order": 0}]
+        bad = make_project_row(2)
+        bad["metrics"] = [{
+            "id": "m-2",
+            "metric_type": "performance",
+            "metric_data": {"type": "performance", "primary": {"value": 1}},
+            "primary_value": "1",
+            "label": "legacy copy",
+            "display_order": 0,
+        }]
+
+        projects = ProjectService._rows_to_projects(MagicMock(), [good, bad])
+
+        assert isinstance(projects[0].metrics[0], StandardizedProjectMetric)
+        assert projects[1].metrics[0] == ProjectMetric(id="m-2", primary="1", label="legacy copy")
+
+
+class TestCloneProjects:
+    """Tests for project cloning and shared evidence"""
+
+    async def test_clone_project_is_one_rpc_call(self, mock_supabase_client, monkeypatch):
+        """The clone is appended to the source portfolio and named as a copy"""
+        projects_query = make_query([{"id": "p-1", "portfolio_id": "pf-1", "display_order": 2048}])
+        mock_supabase_client.table.return_value = projects_query
+        mock_supabase_client.rpc.return_value = make_query([{"source_id": "p-1", "project_id": "p-2"}])
+
+        async def fake_get_project(client, project_id, user_id):
+            return project_id
+
+        monkeypatch.setattr(ProjectService, "get_project", fake_get_project)
+
+        result = await ProjectService.clone_project(mock_supabase_client, make_subscription_info(), "user-1", "p-1")
+
+        assert result == "p-2"
+        name, params = mock_supabase_client.rpc.call_args[0]
+        assert name == "clone_projects"
+        assert params["source_project_ids"] == ["p-1"]
+        assert params["target_portfolio_id"] == "pf-1"
+        assert params["first_display_order"] == 2048 + project_service.ORDER_GAP
+        assert params["name_suffix"] == " (copy)"
+        projects_query.is_.assert_any_call("delete_requested_at", "null")
+
+    async def test_clone_respects_project_limit(self, mock_supabase_client):
+        mock_supabase_client.table.return_value = make_query([{"id": f"p-{i}"} for i in range(3)])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.clone_portfolio_projects(
+                mock_supabase_client, make_subscription_info(project_count=8, max_projects=10), "user-1", "pf-1", "pf-2"
+            )
+
+        assert exc_info.value.status_code == 403
+        mock_supabase_client.rpc.assert_not_called()
+
+    async def test_shared_evidence_object_is_kept(self, mock_supabase_client):
+        """Deleting a cloned evidence row leaves the storage object the original still uses"""
+        evidence_query = make_query({"id": "e-2", "file_path": "user-1/p-1/a.png"})
+        shared_query = make_query([{"id": "e-1"}])
+        delete_query = make_query([{"id": "e-2"}])
+        evidence_query.delete.return_value = delete_query
+        queries = iter([evidence_query, evidence_query, shared_query])
+        mock_supabase_client.table.side_effect = lambda name: next(queries)
+
+        result = await ProjectService.delete_evidence(mock_supabase_client, "e-2", "user-1")
+
+        assert result.success
+        mock_supabase_client.storage.from_.assert_not_called()
+
+    async def test_shared_evidence_counts_once_toward_quota(self, mock_supabase_client):
+        projects_query = make_query([{"id": "p-1"}, {"id": "p-2"}])
+        evidence_query = make_query([
+            {"file_path": "user-1/p-1/a.png", "file_size": 100},
+            {"file_path": "user-1/p-1/a.png", "file_size": 100},
+            {"file_path": "user-1/p-2/b.png", "file_size": 50},
+        ])
+        mock_supabase_client.table.side_effect = lambda name: projects_query if name == "impact_projects" else evidence_query
+
+        assert await ProjectService.get_user_total_evidence_size(mock_supabase_client, "user-1") == 150
+
+
+class TestEvidenceAccessCache:
+    """Tests for cached evidence access decisions"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        project_service._evidence_access_cache.clear()
+        yield
+        project_service._evidence_access_cache.clear()
+
+    async def test_public_reads_reuse_access_decision(self, mock_supabase_client):
+        """After the first read, a published project's evidence is one query"""
+        tables = []
+        queries = {
+            "impact_projects": make_query([{"user_id": "owner", "portfolio_id": "pf-1"}]),
+            "published_profiles": make_query([{"id": "pub-1"}]),
+            "project_evidence": make_query([]),
+        }
+
+        def table(name):
+            tables.append(name)
+            return queries[name]
+
+        mock_supabase_client.table.side_effect = table
+
+        await ProjectService.list_project_evidence(mock_supabase_client, "p-1")
+        assert tables == ["impact_projects", "published_profiles", "project_evidence"]
+
+        tables.clear()
+        await ProjectService.list_project_evidence(mock_supabase_client, "p-1")
+        assert tables == ["project_evidence"]
+
+        ProjectService.invalidate_evidence_access("owner")
+        tables.clear()
+        await ProjectService.list_project_evidence(mock_supabase_client, "p-1")
+        assert tables == ["impact_projects", "published_profiles", "project_evidence"]
+        assert queries["impact_projects"].is_.call_args[0] == ("delete_requested_at", "null")
+
+    async def test_denied_until_invalidated(self, mock_supabase_client):
+        """An unpublished project stays hidden until its owner publishes"""
+        published = make_query([])
+        queries = {
+            "impact_projects": make_query([{"user_id": "owner", "portfolio_id": "pf-1"}]),
+            "published_profiles": published,
+            "project_evidence": make_query([]),
+        }
+        mock_supabase_client.table.side_effect = lambda name: queries[name]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.list_project_evidence(mock_supabase_client, "p-1", "viewer")
+        assert exc_info.value.status_code == 404
+
+        published.execute.return_value = MagicMock(data=[{"id": "pub-1"}])
+        with pytest.raises(HTTPException):
+            await ProjectService.list_project_evidence(mock_supabase_client, "p-1", "viewer")
+
+        ProjectService.invalidate_evidence_access("owner")
+        assert await ProjectService.list_project_evidence(mock_supabase_client, "p-1", "viewer") == []
+
+
+class TestDirectEvidenceUploads:
+    """Tests for signed upload URLs and finalize"""
+
+    RESERVATION = {
+        "id": "3f2b8c1e-8d6a-4f57-9a53-2f4d1c7e6b10",
+        "file_path": "user-1/p-1/abc.png",
+        "reserved_bytes": 1000,
+        "expires_at": "2999-01-01T00:00:00+00:00",
+    }
+
+    async def test_active_reservations_count_toward_quota(self, mock_supabase_client):
+        """Storage reserved by unfinished uploads can't be reserved again"""
+        mb = 1024 * 1024
+        reservations = make_query(None)
+        reservations.execute.side_effect = [
+            MagicMock(data=[]),  # expired reservations to release
+            MagicMock(data=[{"reserved_bytes": 9 * mb}]),  # active reservations
+        ]
+        queries = {
+            "impact_projects": make_query([{"id": "p-1"}]),
+            "profiles": make_query({"subscription_type": "free"}),
+            "project_evidence": make_query([{"file_path": "user-1/p-1/a.png", "file_size": 40 * mb}]),
+            "evidence_upload_reservations": reservations,
+        }
+        mock_supabase_client.table.side_effect = lambda name: queries[name]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.create_evidence_upload_url(
+                mock_supabase_client, "p-1", "user-1", "shot.png", "image/png", 2 * mb
+            )
+
+        assert exc_info.value.status_code == 400
+        assert "storage limit" in exc_info.value.detail
+        mock_supabase_client.storage.from_.return_value.create_signed_upload_url.assert_not_called()
+
+    async def test_quota_uses_tier_from_principal(self, mock_supabase_client):
+        """A tier passed in from the request principal is used without reading the profile"""
+        mb = 1024 * 1024
+        queries = {
+            "impact_projects": make_query([{"id": "p-1"}]),
+            "project_evidence": make_query([{"file_path": "user-1/p-1/a.png", "file_size": 40 * mb}]),
+            "evidence_upload_reservations": make_query([{"reserved_bytes": 9 * mb}]),
+        }
+        mock_supabase_client.table.side_effect = lambda name: queries[name]
+
+        remaining, _ = await ProjectService._evidence_quota(mock_supabase_client, "user-1", "pro")
+
+        assert remaining == (5120 - 49) * mb
+        assert "profiles" not in [c.args[0] for c in mock_supabase_client.table.call_args_list]
+
+    async def test_finalize_inserts_verified_object(self, mock_supabase_client, monkeypatch):
+        """The row is created from the stored object's size and header in one RPC call"""
+        monkeypatch.setattr(ProjectService, "_read_object_head", staticmethod(AsyncMock(return_value=png_header(640, 480))))
+        mock_supabase_client.table.side_effect = lambda name: make_query(
+            [self.RESERVATION] if name == "evidence_upload_reservations" else []
+        )
+        mock_supabase_client.storage.from_.return_value.list.return_value = [
+            {"name": "abc.png", "metadata": {"size": 800, "mimetype": "image/png"}}
+        ]
+        mock_supabase_client.rpc.return_value.execute.return_value = MagicMock(data=[{
+            "id": "ev-1",
+            "project_id": "p-1",
+            "file_path": "user-1/p-1/abc.png",
+            "file_name": "shot.png",
+            "file_size": 800,
+            "mime_type": "image/png",
+            "display_order": 1000,
+            "created_at": "2026-10-18T00:00:00+00:00",
+        }])
+
+        evidence = await ProjectService.finalize_evidence_upload(
+            mock_supabase_client, "p-1", "user-1", self.RESERVATION["id"]
+        )
+
+        assert evidence.file_size == 800
+        name, params = mock_supabase_client.rpc.call_args.args
+        assert name == "finalize_evidence_upload"
+        assert params["object_size"] == 800
+        assert params["object_mime_type"] == "image/png"
+        assert (params["image_width"], params["image_height"]) == (640, 480)
+
+    async def test_finalize_rejects_oversized_object(self, mock_supabase_client):
+        """An object larger than its reservation is removed instead of recorded"""
+        mock_supabase_client.table.side_effect = lambda name: make_query(
+            [self.RESERVATION] if name == "evidence_upload_reservations" else []
+        )
+        bucket = mock_supabase_client.storage.from_.return_value
+        bucket.list.return_value = [{"name": "abc.png", "metadata": {"size": 5000, "mimetype": "image/png"}}]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.finalize_evidence_upload(
+                mock_supabase_client, "p-1", "user-1", self.RESERVATION["id"]
+            )
+
+        assert exc_info.value.status_code == 400
+        bucket.remove.assert_called_once_with(["user-1/p-1/abc.png"])
+        mock_supabase_client.rpc.assert_not_called()
+
+
+class TestEvidenceVariants:
+    """Tests for evidence variants on reads and deletes"""
+
+    ROW = {
+        "id": "ev-1",
+        "project_id": "p-1",
+        "file_path": "u/p/abc.png",
+        "file_name": "shot.png",
+        "file_size": 5000,
+        "mime_type": "image/png",
+        "display_order": 1000,
+        "created_at": "2026-10-18T00:00:00+00:00",
+        "variants": [
+            {"file_path": "u/p/abc.w640.webp", "width": 640, "height": 320, "mime_type": "image/webp", "file_size": 900},
+            {"file_path": "u/p/abc.w320.webp", "width": 320, "height": 160, "mime_type": "image/webp", "file_size": 300},
+            {"file_path": "u/p/abc.w320.avif", "width": 320, "height": 160, "mime_type": "image/avif", "file_size": 200},
+        ],
+    }
+
+    def test_srcset_per_format(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://db.example")
+        base = "https://db.example/storage/v1/object/public/project-evidence"
+
+        evidence = ProjectService._evidence_from_row(self.ROW)
+
+        assert [v.width for v in evidence.variants] == [320, 320, 640]
+        assert evidence.srcset == {
+            "image/webp": f"{base}/u/p/abc.w320.webp 320w, {base}/u/p/abc.w640.webp 640w",
+            "image/avif": f"{base}/u/p/abc.w320.avif 320w",
+        }
+        assert ProjectService._evidence_from_row(self.ROW, trusted=True).srcset == evidence.srcset
+
+    def test_variant_urls_carry_content_hash(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://db.example")
+        monkeypatch.setenv("EVIDENCE_CDN_BASE_URL", "https://cdn.example")
+        variant = {**self.ROW["variants"][1], "sha256": "f" * 64}
+
+        evidence = ProjectService._evidence_from_row({**self.ROW, "variants": [variant]})
+
+        assert evidence.url == "https://cdn.example/storage/v1/object/public/project-evidence/u/p/abc.png"
+        assert evidence.variants[0].url.endswith(f"/u/p/abc.w320.webp?v={'f' * 16}")
+
+    def test_transform_srcset_until_variants_exist(self, monkeypatch):
+        monkeypatch.setenv("SUPABASE_URL", "https://db.example")
+        monkeypatch.setenv("EVIDENCE_IMAGE_TRANSFORMS", "true")
+        base = "https://db.example/storage/v1/render/image/public/project-evidence/u/p/abc.png"
+
+        evidence = ProjectService._evidence_from_row({**self.ROW, "variants": None, "width": 700, "height": 350})
+
+        assert evidence.variants is None
+        assert evidence.srcset == {
+            "image/png": f"{base}?width=320&format=origin 320w, {base}?width=640&format=origin 640w, "
+                         f"{base}?width=700&format=origin 700w",
+        }
+
+    def test_unprocessed_evidence_has_no_variants(self):
+        evidence = ProjectService._evidence_from_row({**self.ROW, "variants": None})
+        assert evidence.variants is None and evidence.srcset is None
+
+    async def test_delete_removes_variants_with_original(self, mock_supabase_client):
+        evidence_query = make_query(self.ROW)
+        evidence_query.delete.return_value = make_query([self.ROW])
+        queries = iter([evidence_query, evidence_query, make_query([])])
+        mock_supabase_client.table.side_effect = lambda name: next(queries)
+
+        await ProjectService.delete_evidence(mock_supabase_client, "ev-1", "u")
+
+        mock_supabase_client.storage.from_.return_value.remove.assert_called_once_with(
+            ["u/p/abc.png", "u/p/abc.w640.webp", "u/p/abc.w320.webp", "u/p/abc.w320.avif"]
+        )
+
+
+class TestContentAddressedEvidence:
+    """Tests for evidence stored under its content hash"""
+
+    HASH = "ab" * 32
+    INSERTED = {
+        "id": "ev-2",
+        "project_id": "p-2",
+        "file_path": f"user-1/sha256/{'ab' * 32}",
+        "file_name": "shot.png",
+        "file_size": 5000,
+        "mime_type": "image/png",
+        "display_order": 1000,
+        "created_at": "2026-10-18T00:00:00+00:00",
+    }
+
+    def setup_client(self, client, existing):
+        evidence_query = make_query(existing)
+        evidence_query.insert.return_value = make_query([{**self.INSERTED, "variants": existing[0]["variants"] if existing else None}])
+        queries = {
+            "impact_projects": make_query([{"id": "p-2"}]),
+            "project_evidence": evidence_query,
+            "profiles": make_query({"subscription_type": "free"}),
+            "evidence_upload_reservations": make_query([]),
+        }
+        client.table.side_effect = lambda name: queries[name]
+        return evidence_query
+
+    async def upload(self, client):
+        return await ProjectService.upload_evidence_file(
+            client, "p-2", "user-1", "shot.png", "image/png", 5000, png_header() + b"x" * 4967, content_hash=self.HASH
+        )
+
+    async def test_duplicate_content_reuses_stored_object(self, mock_supabase_client):
+        """Re-uploading a file the user already has stores nothing and reuses its variants"""
+        variants = [{"file_path": f"user-1/sha256/{self.HASH}.w320.webp", "width": 320, "height": 160, "mime_type": "image/webp", "file_size": 300}]
+        evidence_query = self.setup_client(mock_supabase_client, [{"file_path": f"user-1/sha256/{self.HASH}", "variants": variants}])
+
+        evidence = await self.upload(mock_supabase_client)
+
+        mock_supabase_client.storage.from_.return_value.upload.assert_not_called()
+        inserted = evidence_query.insert.call_args.args[0][0]
+        assert inserted["file_path"] == f"user-1/sha256/{self.HASH}"
+        assert inserted["variants"] == variants
+        assert len(evidence.variants) == 1
+
+    async def test_new_content_is_stored_under_its_hash(self, mock_supabase_client):
+        self.setup_client(mock_supabase_client, [])
+
+        evidence = await self.upload(mock_supabase_client)
+
+        upload = mock_supabase_client.storage.from_.return_value.upload
+        assert upload.call_args.args[0] == f"user-1/sha256/{self.HASH}"
+        assert evidence.variants is None
+
+    async def test_delete_leaves_object_to_reconcile_job(self, mock_supabase_client):
+        """A concurrent upload may reuse the object, so deleting the row doesn't remove it"""
+        evidence_query = make_query(self.INSERTED)
+        evidence_query.delete.return_value = make_query([self.INSERTED])
+        mock_supabase_client.table.return_value = evidence_query
+
+        result = await ProjectService.delete_evidence(mock_supabase_client, "ev-2", "user-1")
+
+        assert result.success
+        evidence_query.delete.assert_called_once()
+        mock_supabase_client.storage.from_.assert_not_called()
+
+
+class TestBatchEvidenceUpload:
+    """Tests for upload_evidence_files"""
+
+    @staticmethod
+    def file(name, content_hash, size=1000):
+        return {"file_name": name, "mime_type": "image/png", "file_size": size, "content": png_header(), "content_hash": content_hash}
+
+    def setup_client(self, client, evidence_size=0):
+        evidence_query = make_query([{"file_path": "user-1/a.png", "file_size": evidence_size}] if evidence_size else [])
+        evidence_query.insert.side_effect = lambda rows: make_query([
+            {**row, "id": f"ev-{i}", "created_at": "2026-10-18T00:00:00+00:00"} for i, row in enumerate(rows)
+        ])
+        queries = {
+            "impact_projects": make_query([{"id": "p-1"}]),
+            "project_evidence": evidence_query,
+            "profiles": make_query({"subscription_type": "free"}),
+            "evidence_upload_reservations": make_query([]),
+        }
+        client.table.side_effect = lambda name: queries[name]
+        return evidence_query
+
+    async def test_one_insert_and_one_upload_per_distinct_file(self, mock_supabase_client):
+        evidence_query = self.setup_client(mock_supabase_client)
+        files = [self.file("a.png", "aa"), self.file("b.png", "bb"), self.file("a-again.png", "aa")]
+
+        evidence = await ProjectService.upload_evidence_files(mock_supabase_client, "p-1", "user-1", files)
+
+        uploaded = [c.args[0] for c in mock_supabase_client.storage.from_.return_value.upload.call_args_list]
+        assert sorted(uploaded) == ["user-1/sha256/aa", "user-1/sha256/bb"]
+        evidence_query.insert.assert_called_once()
+        assert [e.file_name for e in evidence] == ["a.png", "b.png", "a-again.png"]
+        orders = [e.display_order for e in evidence]
+        assert orders == sorted(orders) and len(set(orders)) == 3
+
+    async def test_spoofed_image_is_rejected_before_storage(self, mock_supabase_client):
+        self.setup_client(mock_supabase_client)
+        files = [self.file("a.png", "aa"), {**self.file("b.png", "bb"), "content": b"<html>not an image</html>"}]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.upload_evidence_files(mock_supabase_client, "p-1", "user-1", files)
+
+        assert exc_info.value.status_code == 400
+        mock_supabase_client.table.assert_not_called()
+        mock_supabase_client.storage.from_.assert_not_called()
+
+    async def test_detected_type_and_dimensions_are_recorded(self, mock_supabase_client):
+        self.setup_client(mock_supabase_client)
+        files = [{**self.file("a.jpg", "aa"), "mime_type": "image/jpeg", "content": png_header(800, 600)}]
+
+        evidence = await ProjectService.upload_evidence_files(mock_supabase_client, "p-1", "user-1", files)
+
+        assert (evidence[0].mime_type, evidence[0].width, evidence[0].height) == ("image/png", 800, 600)
+        upload = mock_supabase_client.storage.from_.return_value.upload
+        assert upload.call_args.kwargs["file_options"]["content-type"] == "image/png"
+
+    async def test_quota_applies_to_batch_total(self, mock_supabase_client):
+        mb = 1024 * 1024
+        evidence_query = self.setup_client(mock_supabase_client, evidence_size=45 * mb)
+        files = [self.file("a.png", "aa", 3 * mb), self.file("b.png", "bb", 3 * mb)]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await ProjectService.upload_evidence_files(mock_supabase_client, "p-1", "user-1", files)
+
+        assert exc_info.value.status_code == 400
+        mock_supabase_client.storage.from_.return_value.upload.assert_not_called()
+        evidence_query.insert.assert_not_called()
+
+    async def test_uploads_are_bounded(self, mock_supabase_client, monkeypatch):
+        monkeypatch.setattr(project_service, "EVIDENCE_UPLOAD_CONCURRENCY", 2)
+        self.setup_client(mock_supabase_client)
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def upload(*args, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+
+        mock_supabase_client.storage.from_.return_value.upload.side_effect = upload
+        files = [self.file(f"{i}.png", f"h{i}") for i in range(6)]
+
+        await ProjectService.upload_evidence_files(mock_supabase_client, "p-1", "user-1", files)
+
+        assert active["max"] == 2
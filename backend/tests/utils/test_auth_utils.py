@@ -0,0 +1,71 @@
+"""
+Tests for the request principal dependencies
+"""
+import time
+import jwt
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from backend.utils import auth_utils, jwt_verifier, subscription_tiers
+
+SECRET = "test-secret-that-is-long-enough-for-hs256"
+
+
+def bearer(**overrides):
+    claims = {"sub": "user-1", "email": "a@example.com", "aud": "authenticated",
+              "exp": int(time.time()) + 3600, "aal": "aal2", **overrides}
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=jwt.encode(claims, SECRET, algorithm="HS256"))
+
+
+def make_client(subscription_type="pro"):
+    client = MagicMock()
+    query = client.table.return_value
+    query.select.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(
+        data=[{"subscription_type": subscription_type}]
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def verifier_env(monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", SECRET)
+    jwt_verifier._claims_cache.clear()
+    subscription_tiers._tier_cache.clear()
+
+
+def test_principal_is_resolved_and_stored_on_request():
+    request = SimpleNamespace(state=SimpleNamespace())
+    client = make_client()
+
+    principal = auth_utils.get_principal(request, client, bearer())
+
+    # The tier is only looked up when read
+    client.table.assert_not_called()
+    assert (principal.user_id, principal.email, principal.aal, principal.subscription_tier) == (
+        "user-1", "a@example.com", "aal2", "pro"
+    )
+    assert request.state.principal is principal
+
+    # The tier is cached until a subscription change invalidates it
+    assert auth_utils.get_principal(SimpleNamespace(state=SimpleNamespace()), client, bearer()).subscription_tier == "pro"
+    assert client.table.call_count == 1
+    subscription_tiers.invalidate_subscription_tier("user-1")
+    assert auth_utils.get_principal(SimpleNamespace(state=SimpleNamespace()), client, bearer()).subscription_tier == "pro"
+    assert client.table.call_count == 2
+
+
+def test_invalid_token_is_unauthorized():
+    with pytest.raises(HTTPException) as exc_info:
+        auth_utils.get_principal(SimpleNamespace(state=SimpleNamespace()), make_client(), bearer(exp=int(time.time()) - 60))
+    assert exc_info.value.status_code == 401
+
+
+def test_optional_principal_allows_anonymous_callers():
+    request = SimpleNamespace(state=SimpleNamespace())
+
+    assert auth_utils.get_optional_principal(request, make_client(), None) is None
+    assert auth_utils.get_optional_principal(request, make_client(), bearer(aud="anon")) is None
+    assert auth_utils.get_optional_principal(request, make_client(), bearer()).user_id == "user-1"
@@ -0,0 +1,36 @@
+"""
+Tests for evidence URL building
+"""
+from backend.utils.evidence_urls import evidence_url
+
+ORIGIN = "https://db.example"
+CDN = "https://cdn.example"
+
+
+def test_uses_cdn_base_when_configured(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", f"{ORIGIN}/")
+    monkeypatch.setenv("EVIDENCE_CDN_BASE_URL", f"{CDN}/")
+
+    assert evidence_url("u/sha256/abc") == f"{CDN}/storage/v1/object/public/project-evidence/u/sha256/abc"
+    assert evidence_url("u/sha256/abc", origin=True) == f"{ORIGIN}/storage/v1/object/public/project-evidence/u/sha256/abc"
+
+
+def test_version_and_transform_parameters(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", ORIGIN)
+    monkeypatch.delenv("EVIDENCE_CDN_BASE_URL", raising=False)
+
+    assert evidence_url("u/p/a b.w320.webp", version="0123456789abcdef0123") == (
+        f"{ORIGIN}/storage/v1/object/public/project-evidence/u/p/a%20b.w320.webp?v=0123456789abcdef"
+    )
+    assert evidence_url("u/p/a.png", width=640, format="origin") == (
+        f"{ORIGIN}/storage/v1/render/image/public/project-evidence/u/p/a.png?width=640&format=origin"
+    )
+
+
+def test_no_url_without_base_or_path(monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("EVIDENCE_CDN_BASE_URL", raising=False)
+    assert evidence_url("u/p/a.png") is None
+
+    monkeypatch.setenv("SUPABASE_URL", ORIGIN)
+    assert evidence_url("") is None
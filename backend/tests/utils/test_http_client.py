@@ -0,0 +1,67 @@
+"""
+Tests for the shared HTTP client's transport
+"""
+import httpx
+import pytest
+from backend.utils import http_client
+from backend.utils.http_client import PooledTransport
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_RETRY_BACKOFF_SECONDS", 0)
+
+
+def client_with(responses, retries=2):
+    """Client whose requests get the given responses (or raise the given errors) in order"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return httpx.Response(response)
+
+    transport = PooledTransport(retries=retries, http2=False)
+    mock = httpx.MockTransport(handler)
+    transport._pool = lambda url: mock
+    return httpx.AsyncClient(transport=transport), calls
+
+
+async def test_idempotent_requests_are_retried_on_unavailable_hosts():
+    client, calls = client_with([503, httpx.ReadTimeout("slow"), 200])
+
+    response = await client.get("https://api.github.com/user")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+async def test_posts_are_only_retried_when_not_sent():
+    client, calls = client_with([httpx.ConnectError("refused"), 503])
+
+    response = await client.post("https://db.example/auth/v1/factors/f-1/challenge")
+
+    assert response.status_code == 503
+    assert calls == ["POST", "POST"]
+
+    client, _ = client_with([httpx.ReadTimeout("slow")])
+    with pytest.raises(httpx.ReadTimeout):
+        await client.post("https://db.example/auth/v1/factors/f-1/challenge")
+
+
+async def test_last_response_is_returned_when_retries_run_out():
+    client, calls = client_with([429, 429], retries=1)
+
+    assert (await client.get("https://api.github.com/user")).status_code == 429
+    assert len(calls) == 2
+
+
+def test_each_host_gets_its_own_pool():
+    transport = PooledTransport(http2=False)
+
+    github = transport._pool(httpx.URL("https://api.github.com/user"))
+
+    assert transport._pool(httpx.URL("https://api.github.com/repos")) is github
+    assert transport._pool(httpx.URL("https://db.example/auth/v1/user")) is not github
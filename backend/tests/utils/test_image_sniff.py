@@ -0,0 +1,56 @@
+"""
+Tests for header-only image sniffing
+"""
+import io
+import struct
+import pytest
+from PIL import Image, features
+from backend.utils.image_sniff import SNIFF_BYTES, ImageSniffError, sniff_image
+
+
+def encode(format, size=(300, 200), **options):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (10, 120, 200)).save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("format,options,mime_type", [
+    ("PNG", {}, "image/png"),
+    ("JPEG", {}, "image/jpeg"),
+    ("JPEG", {"progressive": True}, "image/jpeg"),
+    ("GIF", {}, "image/gif"),
+    ("BMP", {}, "image/bmp"),
+    ("WEBP", {"lossless": False}, "image/webp"),
+    ("WEBP", {"lossless": True}, "image/webp"),
+    ("WEBP", {"exif": b"Exif\x00\x00MM\x00*\x00\x00\x00\x08\x00\x00"}, "image/webp"),
+])
+def test_reads_type_and_dimensions(format, options, mime_type):
+    assert sniff_image(encode(format, **options)[:SNIFF_BYTES]) == {"mime_type": mime_type, "width": 300, "height": 200}
+
+
+@pytest.mark.skipif(not features.check("avif"), reason="Pillow built without AVIF")
+def test_reads_avif():
+    assert sniff_image(encode("AVIF")) == {"mime_type": "image/avif", "width": 300, "height": 200}
+
+
+def test_jpeg_exif_rotation_swaps_dimensions():
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    image = sniff_image(encode("JPEG", exif=exif))
+    assert (image["width"], image["height"]) == (200, 300)
+
+
+def test_rejects_non_image_content():
+    with pytest.raises(ImageSniffError):
+        sniff_image(b"<svg xmlns='http://www.w3.org/2000/svg'></svg>")
+
+
+def test_rejects_decompression_bomb():
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", 19_000, 19_000, 8, 2, 0, 0, 0)
+    with pytest.raises(ImageSniffError, match="too large"):
+        sniff_image(header)
+
+
+def test_rejects_truncated_header():
+    with pytest.raises(ImageSniffError):
+        sniff_image(encode("JPEG")[:40])
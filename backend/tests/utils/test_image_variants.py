@@ -0,0 +1,41 @@
+"""
+Tests for evidence image variant rendering
+"""
+import io
+from PIL import Image
+from backend.utils.image_variants import available_formats, render_variants, variant_path
+
+
+def make_png(width, height, exif=None):
+    buffer = io.BytesIO()
+    image = Image.new("RGB", (width, height), (200, 30, 30))
+    image.save(buffer, format="PNG", exif=exif or Image.Exif())
+    return buffer.getvalue()
+
+
+def test_variant_path_sits_next_to_original():
+    assert variant_path("u/p/abc.png", 640, "webp") == "u/p/abc.w640.webp"
+    assert variant_path("u/p/abc", 320, "avif") == "u/p/abc.w320.avif"
+
+
+def test_widths_are_never_upscaled():
+    variants = render_variants(make_png(800, 400), widths=(320, 640, 1280))
+
+    widths = sorted({v["width"] for v in variants})
+    assert widths == [320, 640, 800]
+    assert {(v["width"], v["height"]) for v in variants} == {(320, 160), (640, 320), (800, 400)}
+    assert len(variants) == 3 * len(available_formats())
+
+
+def test_metadata_is_stripped_after_orientation_is_applied():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees on display
+    exif[0x010F] = "Camera Maker"
+
+    variants = render_variants(make_png(400, 200, exif=exif), widths=(400,))
+
+    for variant in variants:
+        with Image.open(io.BytesIO(variant["content"])) as image:
+            assert image.size == (200, 400)
+            assert not image.getexif()
+            assert "icc_profile" not in image.info
@@ -0,0 +1,111 @@
+"""
+Tests for local access token verification
+"""
+import json
+import time
+import threading
+import jwt
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from cryptography.hazmat.primitives.asymmetric import ec
+from backend.utils import jwt_verifier
+from backend.utils.jwt_verifier import TokenVerificationError, verify_access_token
+
+SECRET = "test-secret-that-is-long-enough-for-hs256"
+SUPABASE_URL = "https://db.example"
+
+
+def make_token(key=SECRET, algorithm="HS256", headers=None, **overrides):
+    claims = {
+        "sub": "user-1",
+        "email": "a@example.com",
+        "aud": "authenticated",
+        "iss": f"{SUPABASE_URL}/auth/v1",
+        "exp": int(time.time()) + 3600,
+        "aal": "aal1",
+        **overrides,
+    }
+    return jwt.encode({k: v for k, v in claims.items() if v is not None}, key, algorithm=algorithm, headers=headers)
+
+
+@pytest.fixture(autouse=True)
+def verifier_env(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", SUPABASE_URL)
+    monkeypatch.setenv("SUPABASE_JWT_SECRET", SECRET)
+    monkeypatch.setattr(jwt_verifier, "_jwks", {})
+    monkeypatch.setattr(jwt_verifier, "_jwks_fetched_at", 0.0)
+    monkeypatch.setattr(jwt_verifier, "_jwks_fetch_done", None)
+    jwt_verifier._claims_cache.clear()
+
+
+def test_verifies_secret_signed_token_and_caches_claims(monkeypatch):
+    token = make_token()
+
+    assert verify_access_token(token)["sub"] == "user-1"
+
+    # Cached claims are served without verifying again
+    monkeypatch.delenv("SUPABASE_JWT_SECRET")
+    assert verify_access_token(token)["email"] == "a@example.com"
+
+
+@pytest.mark.parametrize("token", [
+    make_token(exp=int(time.time()) - 60),
+    make_token(aud="anon"),
+    make_token(iss="https://other.example/auth/v1"),
+    make_token(aal=None),
+    make_token(key="wrong-secret-that-is-long-enough-for-hs256"),
+    make_token(sub=None),
+])
+def test_rejects_invalid_tokens(token):
+    with pytest.raises(jwt.InvalidTokenError):
+        verify_access_token(token)
+
+
+def test_required_aal():
+    assert verify_access_token(make_token(aal="aal2"), required_aal="aal2")["aal"] == "aal2"
+    with pytest.raises(TokenVerificationError):
+        verify_access_token(make_token(), required_aal="aal2")
+
+
+def test_jwks_is_fetched_again_after_key_rotation(monkeypatch):
+    monkeypatch.setattr(jwt_verifier, "JWKS_REFRESH_COOLDOWN_SECONDS", 0)
+    old_key, new_key = ec.generate_private_key(ec.SECP256R1()), ec.generate_private_key(ec.SECP256R1())
+
+    def jwk(private_key, kid):
+        return {**json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key())), "kid": kid, "alg": "ES256"}
+
+    published = [[jwk(old_key, "k1")], [jwk(old_key, "k1"), jwk(new_key, "k2")]]
+    get = MagicMock(side_effect=lambda url, timeout: MagicMock(json=lambda: {"keys": published.pop(0)}))
+    monkeypatch.setattr(jwt_verifier.httpx, "get", get)
+
+    assert verify_access_token(make_token(old_key, "ES256", {"kid": "k1"}))["sub"] == "user-1"
+    assert verify_access_token(make_token(new_key, "ES256", {"kid": "k2"}, sub="user-2"))["sub"] == "user-2"
+    assert verify_access_token(make_token(old_key, "ES256", {"kid": "k1"}, sub="user-3"))["sub"] == "user-3"
+    assert get.call_count == 2
+    assert get.call_args[0][0] == f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        verify_access_token(make_token(new_key, "ES256", {"kid": "k1"}))
+    with pytest.raises(TokenVerificationError):
+        verify_access_token(make_token(new_key, "ES256", {"kid": "k3"}))
+
+
+def test_concurrent_verifications_share_one_jwks_fetch(monkeypatch):
+    key = ec.generate_private_key(ec.SECP256R1())
+    published = {**json.loads(jwt.algorithms.ECAlgorithm.to_jwk(key.public_key())), "kid": "k1", "alg": "ES256"}
+    release = threading.Event()
+
+    def get(url, timeout):
+        release.wait(5)
+        return MagicMock(json=lambda: {"keys": [published]})
+    get = MagicMock(side_effect=get)
+    monkeypatch.setattr(jwt_verifier.httpx, "get", get)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = [pool.submit(verify_access_token, make_token(key, "ES256", {"kid": "k1"}, sub=f"user-{i}"))
+                   for i in range(4)]
+        time.sleep(0.1)
+        release.set()
+        assert sorted(r.result()["sub"] for r in results) == ["user-0", "user-1", "user-2", "user-3"]
+    assert get.call_count == 1
@@ -0,0 +1,45 @@
+"""
+Tests for the legacy metric parser
+"""
+import pytest
+from backend.utils.legacy_metrics import parse_legacy_metric
+
+
+@pytest.mark.parametrize("primary, label, expected_type, value, unit, metric_label", [
+    ("40%", "faster page loads", "performance", 40, "%", "faster page loads"),
+    ("3x faster", "page loads", "performance", 3, "x", "faster page loads"),
+    ("$1.2M", "annual cost savings", "business", 1_200_000, "$", "annual cost savings"),
+    ("<200ms", "p95 latency", "performance", 200, "ms", "p95 latency"),
+    ("10k users", "", "scale", 10_000, "users", "users"),
+    ("1,500", "requests per second", "scale", 1500, "requests", "requests per second"),
+    ("99.9%", "uptime", "quality", 99.9, "%", "uptime"),
+    ("20 hours", "saved per week", "time", 20, "hrs", "saved per week"),
+    ("2 TB", "data migrated", "scale", 2048, "GB", "data migrated"),
+])
+def test_parses_common_formats(primary, label, expected_type, value, unit, metric_label):
+    metric, reason = parse_legacy_metric(primary, label)
+
+    assert reason is None
+    assert metric["type"] == expected_type
+    assert metric["primary"] == {"value": value, "unit": unit, "label": metric_label}
+
+
+@pytest.mark.parametrize("primary, label, reason", [
+    ("Significant", "speedup", "no leading number"),
+    ("40-60%", "faster", "range"),
+    ("12", "happy customers", "unknown unit"),
+    ("40%", "", "missing label"),
+    ("", "faster", "no leading number"),
+])
+def test_rejects_ambiguous_values(primary, label, reason):
+    assert parse_legacy_metric(primary, label) == (None, reason)
+
+
+def test_detail_becomes_scope_and_output_is_deterministic():
+    first = parse_legacy_metric("50%", "fewer errors", "after retry rollout")
+    second = parse_legacy_metric("50%", "fewer errors", "after retry rollout")
+
+    assert first == second
+    metric, _ = first
+    assert metric["type"] == "quality"
+    assert metric["context"] == {"scope": "after retry rollout"}
@@ -0,0 +1,20 @@
+"""
+Tests for reading MFA factors from a signed-in user
+"""
+from types import SimpleNamespace
+from backend.utils.mfa_factors import verified_totp_factors
+
+
+def factor(factor_id, factor_type="totp", status="verified"):
+    return SimpleNamespace(id=factor_id, factor_type=factor_type, status=status, friendly_name=None)
+
+
+def test_only_verified_totp_factors_count():
+    user = SimpleNamespace(factors=[factor("f-1"), factor("f-2", status="unverified"), factor("f-3", factor_type="phone")])
+
+    assert [f.id for f in verified_totp_factors(user)] == ["f-1"]
+
+
+def test_users_without_factors_have_no_mfa():
+    assert verified_totp_factors(SimpleNamespace(factors=None)) == []
+    assert verified_totp_factors(None) == []
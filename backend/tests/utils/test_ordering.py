@@ -0,0 +1,146 @@
+"""
+Tests for display order helpers
+"""
+import pytest
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+from backend.utils.ordering import ORDER_GAP, next_display_order, order_between, move_item
+
+
+class FakeTable:
+    """Minimal in-memory stand-in for a PostgREST table with display_order rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    def query(self):
+        table = self
+        state = {"filters": [], "order": [], "limit": None, "update": None}
+        query = MagicMock()
+
+        def chain(fn):
+            def wrapper(*args, **kwargs):
+                fn(*args, **kwargs)
+                return query
+            return wrapper
+
+        query.select.side_effect = chain(lambda *a, **k: None)
+        query.eq.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) == v))
+        query.neq.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) != v))
+        query.is_.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) is None))
+        query.in_.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) in v))
+        query.gte.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) >= v))
+        query.lte.side_effect = chain(lambda c, v: state["filters"].append(lambda r: r.get(c) <= v))
+        query.order.side_effect = chain(lambda c, desc=False: state["order"].append((c, desc)))
+        query.limit.side_effect = chain(lambda n: state.__setitem__("limit", n))
+        query.update.side_effect = chain(lambda data: state.__setitem__("update", data))
+
+        def execute():
+            matched = [r for r in table.rows if all(f(r) for f in state["filters"])]
+            if state["update"] is not None:
+                for r in matched:
+                    r.update(state["update"])
+                    table.updates.append((r["id"], state["update"]["display_order"]))
+                return MagicMock(data=matched)
+            for column, desc in reversed(state["order"]):
+                matched.sort(key=lambda r: r[column], reverse=desc)
+            if state["limit"] is not None:
+                matched = matched[:state["limit"]]
+            return MagicMock(data=[dict(r) for r in matched])
+
+        query.execute.side_effect = execute
+        return query
+
+
+def make_client(rows):
+    table = FakeTable(rows)
+    client = MagicMock()
+    client.table.side_effect = lambda name: table.query()
+
+    def set_display_orders(name, params):
+        orders = dict(zip(params["row_ids"], params["display_orders"]))
+        for r in table.rows:
+            if r["id"] in orders:
+                r["display_order"] = orders[r["id"]]
+        return MagicMock()
+
+    client.rpc.side_effect = set_display_orders
+    return client, table
+
+
+def ordered_ids(table):
+    return [r["id"] for r in sorted(table.rows, key=lambda r: (r["display_order"], r["id"]))]
+
+
+class TestOrderHelpers:
+    """Tests for pure ordering helpers"""
+
+    def test_next_display_order(self):
+        assert next_display_order(None) == 0
+        assert next_display_order(2048) == 2048 + ORDER_GAP
+
+    def test_order_between(self):
+        assert order_between(0, 1024) == 512
+        assert order_between(None, 0) == -ORDER_GAP
+        assert order_between(1024, None) == 1024 + ORDER_GAP
+        assert order_between(3, 4) is None
+        assert order_between(3, 3) is None
+
+
+class TestMoveItem:
+    """Tests for move_item"""
+
+    def test_move_is_single_row_update_when_gap_exists(self):
+        rows = [{"id": i, "display_order": n * ORDER_GAP, "user_id": "u"} for n, i in enumerate("abcd")]
+        client, table = make_client(rows)
+
+        new_order = move_item(client, "portfolios", "d", {"user_id": "u"}, after_id="a")
+
+        assert table.updates == [("d", new_order)]
+        assert ordered_ids(table) == ["a", "d", "b", "c"]
+
+    def test_move_to_start_with_before_id(self):
+        rows = [{"id": i, "display_order": n * ORDER_GAP, "user_id": "u"} for n, i in enumerate("abc")]
+        client, table = make_client(rows)
+
+        move_item(client, "portfolios", "c", {"user_id": "u"}, before_id="a")
+
+        assert len(table.updates) == 1
+        assert ordered_ids(table) == ["c", "a", "b"]
+
+    def test_dense_orders_are_rebalanced(self):
+        """Legacy dense orders (0, 1, 2) have no gap, so the scope gets respaced once"""
+        rows = [{"id": i, "display_order": n, "user_id": "u"} for n, i in enumerate("abc")]
+        client, table = make_client(rows)
+
+        new_order = move_item(client, "portfolios", "c", {"user_id": "u"}, after_id="a")
+
+        # One bulk write for the rows whose position changed, no per-row updates
+        assert table.updates == []
+        client.rpc.assert_called_once_with("set_display_orders", {
+            "target_table": "portfolios",
+            "row_ids": ["c", "b"],
+            "display_orders": [ORDER_GAP, 2 * ORDER_GAP],
+        })
+        assert new_order == ORDER_GAP
+        assert ordered_ids(table) == ["a", "c", "b"]
+        assert [r["display_order"] for r in sorted(table.rows, key=lambda r: r["display_order"])] == [0, ORDER_GAP, 2 * ORDER_GAP]
+
+    def test_reference_outside_scope_is_rejected(self):
+        rows = [
+            {"id": "a", "display_order": 0, "user_id": "u"},
+            {"id": "x", "display_order": 0, "user_id": "other"},
+        ]
+        client, _ = make_client(rows)
+
+        with pytest.raises(HTTPException) as exc_info:
+            move_item(client, "portfolios", "a", {"user_id": "u"}, after_id="x")
+        assert exc_info.value.status_code == 404
+
+    def test_requires_a_reference(self):
+        client, _ = make_client([])
+
+        with pytest.raises(HTTPException) as exc_info:
+            move_item(client, "portfolios", "a", {"user_id": "u"})
+        assert exc_info.value.status_code == 400
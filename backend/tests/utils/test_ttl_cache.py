@@ -0,0 +1,43 @@
+"""
+Tests for TTLCache
+"""
+from backend.utils import ttl_cache
+from backend.utils.ttl_cache import TTLCache
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl_seconds=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=60)
+    now[0] += 11
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_delete_where():
+    cache = TTLCache(ttl_seconds=60)
+    cache.set(("user-1", None), 1)
+    cache.set(("user-1", "pf"), 2)
+    cache.set(("user-2", None), 3)
+    cache.set(("user-3", None), 4)
+
+    cache.delete_where(lambda key, value: key[0] == "user-1" or value == 3)
+
+    assert len(cache) == 1
+    assert cache.get(("user-3", None)) == 4
@@ -0,0 +1,98 @@
+"""
+Tests for streaming multipart uploads
+"""
+import os
+import hashlib
+import pytest
+from fastapi import HTTPException, Request
+from backend.utils.uploads import receive_multipart_files
+
+BOUNDARY = "testboundary"
+
+
+def multipart_body(files, field="file"):
+    body = b""
+    for name, content_type, content in files:
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode() + content + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def make_request(body, chunk_size=1024, content_length=True):
+    """Request whose body arrives in chunks; records how much of it was read"""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    received = []
+
+    async def receive():
+        chunk = chunks[len(received)] if len(received) < len(chunks) else b""
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) < len(chunks)}
+
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    request = Request({"type": "http", "method": "POST", "headers": headers}, receive)
+    return request, received
+
+
+async def test_small_file_stays_in_memory():
+    request, _ = make_request(multipart_body([("a.png", "image/png", b"x" * 100)]))
+
+    uploads = await receive_multipart_files(request, "file", max_bytes=1000, too_large_detail="too large")
+
+    upload = uploads[0]
+    assert (upload.filename, upload.content_type, upload.size, upload.spooled) == ("a.png", "image/png", 100, False)
+    with upload.open() as content:
+        assert content == b"x" * 100
+
+
+async def test_large_file_is_spooled_to_disk():
+    data = os.urandom(50_000)
+    request, _ = make_request(multipart_body([("a.png", "image/png", data)]))
+
+    uploads = await receive_multipart_files(
+        request, "file", max_bytes=100_000, too_large_detail="too large", spool_threshold=10_000
+    )
+
+    upload = uploads[0]
+    assert upload.spooled
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+    with upload.open() as content:
+        assert content.read() == data
+    path = content.name
+    upload.close()
+    assert not os.path.exists(path)
+
+
+async def test_rejected_by_content_length_before_reading():
+    request, received = make_request(multipart_body([("a.png", "image/png", b"x" * 100_000)]))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await receive_multipart_files(request, "file", max_bytes=10_000, too_large_detail="too large")
+
+    assert (exc_info.value.status_code, exc_info.value.detail) == (413, "too large")
+    assert received == []
+
+
+async def test_limit_enforced_while_streaming():
+    """Without Content-Length, reading stops as soon as the limit is passed"""
+    body = multipart_body([("a.png", "image/png", b"x" * 100_000)])
+    request, received = make_request(body, content_length=False)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await receive_multipart_files(request, "file", max_bytes=10_000, too_large_detail="too large")
+
+    assert (exc_info.value.status_code, exc_info.value.detail) == (413, "too large")
+    assert sum(len(chunk) for chunk in received) < 12_000
+
+
+async def test_rejects_non_image_parts():
+    request, _ = make_request(multipart_body([("a.txt", "text/plain", b"hello")]))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await receive_multipart_files(request, "file", 1000, "too large", content_type_prefix="image/")
+
+    assert exc_info.value.detail == "Only image files are allowed"
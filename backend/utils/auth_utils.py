@@ -1,14 +1,18 @@
-from typing import Optional
+import asyncio
+from typing import Annotated, Optional
 import jwt
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
-from backend.schemas.auth import AuthResponse, UserResponse, SessionResponse
+from backend.schemas.auth import AuthResponse, UserResponse, SessionResponse, Principal
 from backend.utils.dependencies import ServiceDBClient
+from backend.utils.jwt_verifier import verify_access_token
+from backend.utils.subscription_tiers import get_subscription_tier
 
 load_dotenv()
 
 bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
 
 def get_access_token(
     authorization: HTTPAuthorizationCredentials = Depends(bearer_scheme)
@@ -21,30 +25,12 @@ def get_access_token(
     """
     return authorization.credentials
 
-async def verify_token(client: ServiceDBClient, access_token: str) -> Optional[str]:
-    """
-    Verify access token and return user ID
-    
-    Args:
-        access_token: User's access token
-        
-    Returns:
-        User ID if valid, None otherwise
-    """
-    try:
-        user = client.auth.get_user(access_token)
-        
-        if user and user.user:
-            return user.user.id
-        return None
-    except Exception as e:
-        print(f"Verify token error: {e}")
-        return None
-
 async def get_session(client: ServiceDBClient, access_token: str) -> AuthResponse:
         """
         Get current session
         
+        Built from the verified token claims, without a request to Supabase Auth.
+        
         Args:
             access_token: User's access token
             
@@ -52,30 +38,19 @@ async def get_session(client: ServiceDBClient, access_token: str) -> AuthRespons
             AuthResponse containing user and session data
         """
         try:
-            # Set the authorization header
-            client.postgrest.auth(access_token)
-            
-            # Get user from token
-            user = client.auth.get_user(access_token)
-            
-            if user is None:
-                raise HTTPException(
-                    status_code=401,
-                    detail="Invalid or expired token"
-                )
+            # Verification may fetch the JWKS with a blocking request
+            claims = await asyncio.to_thread(verify_access_token, access_token)
             
             return AuthResponse(
                 user=UserResponse(
-                    id=user.user.id,
-                    email=user.user.email,
-                    created_at=user.user.created_at
+                    id=claims["sub"],
+                    email=claims.get("email") or "",
                 ),
                 session=SessionResponse(
                     access_token=access_token,
+                    expires_at=claims["exp"],
                 ),
             )
-        except HTTPException:
-            raise
         except Exception as e:
             print(f"Get session error: {e}")
             raise HTTPException(
@@ -123,69 +98,58 @@ async def refresh_session(client: ServiceDBClient, refresh_token: str) -> AuthRe
                 detail="Invalid or expired refresh token"
             )
 
-def get_user_id_from_token(token: str) -> Optional[str]:
-    """Extract user ID from JWT token"""
+def _resolve_principal(request: Request, client: ServiceDBClient, access_token: str) -> Principal:
+    """Verify the token, build the principal and store it on request.state"""
     try:
-        # Decode JWT without verification (we trust Supabase tokens)
-        # In production, you should verify the signature with your Supabase JWT secret
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        user_id = decoded.get('sub')
-        return user_id
-    except Exception as e:
-        print(f"Error decoding token: {e}")
-        return None
-
-def get_user_id_from_authorization(authorization: Optional[str]) -> str:
-    """Extract and validate user ID from authorization header"""
-    if not authorization:
-        raise HTTPException(
-            status_code=401,
-            detail="Authentication required"
-        )
-    
-    # Support both "Bearer <token>" and raw token strings
-    token = authorization
-    if token.startswith("Bearer "):
-        token = token.replace("Bearer ", "")
-
-    user_id = get_user_id_from_token(token)
-
-    if not user_id:
+        claims = verify_access_token(access_token)
+    except jwt.InvalidTokenError as e:
+        print(f"Error verifying token: {e}")
         raise HTTPException(
             status_code=401,
             detail="Invalid authentication token"
         )
 
-    return user_id
+    principal = Principal(
+        user_id=claims["sub"],
+        email=claims.get("email") or None,
+        aal=claims["aal"],
+    )
+    # Most requests never need the tier, so it's only looked up when read
+    principal._tier_loader = lambda: get_subscription_tier(client, principal.user_id)
+    request.state.principal = principal
+    return principal
 
-def get_user_email_from_authorization(authorization: Optional[str]) -> str:
-    """Extract and validate user email from authorization header"""
-    if not authorization:
-        raise HTTPException(
-            status_code=401,
-            detail="Authentication required"
-        )
+def get_principal(
+    request: Request,
+    client: ServiceDBClient,
+    authorization: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> Principal:
+    """
+    Dependency resolving the authenticated caller from the Bearer token.
     
-    # Support both "Bearer <token>" and raw token strings
-    token = authorization
-    if token.startswith("Bearer "):
-        token = token.replace("Bearer ", "")
+    FastAPI runs it once per request however many dependencies use it; the principal
+    is also available as request.state.principal.
+    Raises HTTPException 401 if the token is invalid or expired.
+    """
+    return _resolve_principal(request, client, authorization.credentials)
+
+def get_optional_principal(
+    request: Request,
+    client: ServiceDBClient,
+    authorization: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer_scheme)
+) -> Optional[Principal]:
+    """
+    Dependency for endpoints that also serve anonymous callers.
     
+    Returns None when there is no token or it is invalid.
+    """
+    if authorization is None:
+        return None
     try:
-        # Decode JWT without verification (we trust Supabase tokens)
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        email = decoded.get('email')
-        
-        if not email:
-            raise HTTPException(
-                status_code=401,
-                detail="Email not found in token"
-            )
-        
-        return email
-    except jwt.DecodeError as e:
-        print(f"Error decoding token: {e}")
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid authentication token"
-        )
\ No newline at end of file
+        return _resolve_principal(request, client, authorization.credentials)
+    except HTTPException:
+        return None
+
+# Type aliases for router signatures
+CurrentPrincipal = Annotated[Principal, Depends(get_principal)]
+OptionalPrincipal = Annotated[Optional[Principal], Depends(get_optional_principal)]
@@ -1,11 +1,13 @@
 """
-FastAPI dependency injection functions for database clients.
+FastAPI dependency injection functions for database and HTTP clients.
 Provides clean, declarative dependency injection for routers.
 """
 from typing import Annotated, Type
+import httpx
 from fastapi import Depends
 from backend.db import client as db_client
 from backend.services.stripe_service import StripeService
+from backend.utils.http_client import get_http_client
 from supabase import Client
 
 def get_service_db_client() -> Client:
@@ -34,4 +36,5 @@ def get_stripe_service() -> StripeService:
 # Type aliases for cleaner router signatures
 ServiceDBClient = Annotated[Client, Depends(get_service_db_client)]
 StripeServiceDep = Annotated[StripeService, Depends(get_stripe_service)]
+HttpClient = Annotated[httpx.AsyncClient, Depends(get_http_client)]
 
@@ -0,0 +1,67 @@
+"""
+Public URLs for evidence images
+
+Every evidence URL is built here. Stored objects are never rewritten with different
+bytes (originals live at uuid or SHA-256 paths, and variants carry their SHA-256 as a
+`v` parameter), so the URLs can be cached as immutable. Set EVIDENCE_CDN_BASE_URL to a
+CDN that pulls from the Supabase storage origin to serve them from edge caches.
+"""
+import os
+from typing import Optional
+from urllib.parse import quote, urlencode
+
+EVIDENCE_BUCKET = "project-evidence"
+
+# Cache lifetime for evidence objects, whose bytes never change at a given URL
+EVIDENCE_CACHE_MAX_AGE_SECONDS = 31536000
+
+
+def evidence_base_url(origin: bool = False) -> str:
+    """CDN base for evidence URLs, or the Supabase origin when no CDN is set (or origin is requested)"""
+    supabase_url = os.getenv("SUPABASE_URL", "")
+    base_url = supabase_url if origin else (os.getenv("EVIDENCE_CDN_BASE_URL") or supabase_url)
+    return base_url.rstrip("/")
+
+
+def image_transforms_enabled() -> bool:
+    """Whether the storage image transformation endpoint can be used (EVIDENCE_IMAGE_TRANSFORMS)"""
+    return os.getenv("EVIDENCE_IMAGE_TRANSFORMS", "false").lower() in ("1", "true", "yes")
+
+
+def evidence_url(
+    file_path: Optional[str],
+    version: Optional[str] = None,
+    width: Optional[int] = None,
+    format: Optional[str] = None,
+    origin: bool = False,
+) -> Optional[str]:
+    """
+    Public URL of an evidence object
+
+    Args:
+        file_path: Object path in the evidence bucket
+        version: Content hash of the object, added as `v` so rewritten objects get new URLs
+        width: Resize to this width with the storage image transformation endpoint
+        format: Output format for the transformation endpoint (e.g. "origin" to keep the
+            stored format)
+        origin: Build the URL against the Supabase origin instead of the CDN
+
+    Returns:
+        The URL, or None if no base URL is configured or there is no path
+    """
+    base_url = evidence_base_url(origin)
+    if not base_url or not file_path:
+        return None
+
+    params = {}
+    if width or format:
+        url = f"{base_url}/storage/v1/render/image/public/{EVIDENCE_BUCKET}/{quote(file_path)}"
+        if width:
+            params["width"] = width
+        if format:
+            params["format"] = format
+    else:
+        url = f"{base_url}/storage/v1/object/public/{EVIDENCE_BUCKET}/{quote(file_path)}"
+    if version:
+        params["v"] = version[:16]
+    return f"{url}?{urlencode(params)}" if params else url
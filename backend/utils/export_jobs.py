@@ -0,0 +1,34 @@
+"""
+In-progress export archive builds, keyed by user ID
+
+Builds run as asyncio tasks in the worker that started them, and this registry only
+knows about that worker's tasks. With several workers, a download routed to another
+worker doesn't see the build: it may start a second build or serve the previous
+archive. Run exports on a single worker (or route a user's export requests to the
+same one) until builds are tracked outside the process.
+"""
+import asyncio
+from typing import Dict, Optional
+
+_jobs: Dict[str, asyncio.Task] = {}
+
+
+def get_export_job(user_id: str) -> Optional[asyncio.Task]:
+    """The user's archive build task in this worker, if one is registered"""
+    return _jobs.get(user_id)
+
+
+def is_export_running(user_id: str) -> bool:
+    """Check whether an archive build is running for a user in this worker"""
+    job = _jobs.get(user_id)
+    return job is not None and not job.done()
+
+
+def register_export_job(user_id: str, job: asyncio.Task) -> None:
+    """Record a user's archive build task"""
+    _jobs[user_id] = job
+
+
+def discard_export_job(user_id: str) -> None:
+    """Forget a user's archive build once it has finished"""
+    _jobs.pop(user_id, None)
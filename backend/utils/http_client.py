@@ -0,0 +1,115 @@
+"""
+Shared HTTP client for outbound requests (GitHub, Supabase Auth and Storage)
+
+One httpx.AsyncClient is created when the app starts and closed when it stops, so
+requests to the same host reuse kept-alive HTTP/2 connections instead of paying for a
+DNS lookup and TLS handshake every time. Each host gets its own connection pool, so a
+slow host can't use up the connections meant for the others.
+
+Failed requests are retried with exponential backoff: connection failures for every
+method (the request never reached the server), and timeouts or 429/502/503/504
+responses for idempotent methods only.
+"""
+import os
+import asyncio
+from typing import Dict, Optional
+import httpx
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+
+# Delay before the first retry; doubled for each retry after that
+HTTP_RETRY_BACKOFF_SECONDS = 0.25
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """Transport with a connection pool per host that retries failed requests"""
+
+    def __init__(self, retries: int = HTTP_RETRIES, http2: bool = True):
+        self.retries = retries
+        self.http2 = http2
+        self._pools: Dict[str, httpx.AsyncHTTPTransport] = {}
+
+    def _pool(self, url: httpx.URL) -> httpx.AsyncHTTPTransport:
+        key = f"{url.scheme}://{url.netloc.decode()}"
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            self._pools[key] = pool
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = await self._pool(request.url).handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self.retries:
+                    raise
+            except httpx.TransportError:
+                if not idempotent or attempt >= self.retries:
+                    raise
+            else:
+                if not idempotent or response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(HTTP_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            await pool.aclose()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """A new pooled client with the default timeouts and retries"""
+    return httpx.AsyncClient(
+        transport=PooledTransport(),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (on app startup)"""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its connections (on app shutdown)"""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    The shared HTTP client
+
+    Created on first use when the app's startup hasn't run (scripts, jobs); whoever
+    runs the event loop is then responsible for calling close_http_client.
+    """
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
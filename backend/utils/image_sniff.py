@@ -0,0 +1,177 @@
+"""
+Identify an image and its dimensions from the first bytes of the file
+
+Only headers are parsed; no pixel data is decoded. This catches files whose content
+doesn't match an allowed image type (whatever content type the client sent) and
+images whose declared size would take too much memory to decode (decompression bombs).
+"""
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+# Bytes read from the start of a file; enough for the headers of every supported format,
+# including JPEGs with EXIF and ICC segments before the frame header
+SNIFF_BYTES = 64 * 1024
+
+# Largest image accepted (pixels and longest side)
+MAX_IMAGE_PIXELS = 50_000_000
+MAX_IMAGE_SIDE = 20_000
+
+# JPEG start-of-frame markers (all except DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# JPEG markers without a length field
+_JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xDA)}
+
+
+class ImageSniffError(ValueError):
+    """The header is not a supported image or describes an unacceptable one"""
+
+
+def _png(head: bytes) -> Tuple[int, int]:
+    if head[12:16] != b"IHDR":
+        raise ImageSniffError("PNG is missing its IHDR header")
+    return struct.unpack(">II", head[16:24])
+
+
+def _gif(head: bytes) -> Tuple[int, int]:
+    return struct.unpack("<HH", head[6:10])
+
+
+def _bmp(head: bytes) -> Tuple[int, int]:
+    (header_size,) = struct.unpack("<I", head[14:18])
+    if header_size == 12:
+        return struct.unpack("<HH", head[18:22])
+    width, height = struct.unpack("<ii", head[18:26])
+    # Negative heights mean rows are stored top-down
+    return abs(width), abs(height)
+
+
+def _webp(head: bytes) -> Tuple[int, int]:
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        if head[23:26] != b"\x9d\x01\x2a":
+            raise ImageSniffError("WebP frame header is invalid")
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        if head[20] != 0x2F:
+            raise ImageSniffError("WebP lossless header is invalid")
+        (bits,) = struct.unpack("<I", head[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    raise ImageSniffError("WebP has an unknown chunk type")
+
+
+def _exif_orientation(segment: bytes) -> Optional[int]:
+    """Orientation tag from the TIFF data of an EXIF APP1 segment"""
+    tiff = segment[6:]
+    if tiff[:2] == b"II":
+        order = "<"
+    elif tiff[:2] == b"MM":
+        order = ">"
+    else:
+        return None
+    (ifd_offset,) = struct.unpack(order + "I", tiff[4:8])
+    if ifd_offset + 2 > len(tiff):
+        return None
+    (count,) = struct.unpack(order + "H", tiff[ifd_offset:ifd_offset + 2])
+    for i in range(count):
+        entry = tiff[ifd_offset + 2 + i * 12:ifd_offset + 14 + i * 12]
+        if len(entry) < 12:
+            return None
+        tag, _, _, value = struct.unpack(order + "HHIH", entry[:10])
+        if tag == 0x0112:
+            return value
+    return None
+
+
+def _jpeg(head: bytes) -> Tuple[int, int]:
+    orientation = None
+    i = 2
+    while i + 4 <= len(head):
+        if head[i] != 0xFF:
+            raise ImageSniffError("JPEG marker is invalid")
+        marker = head[i + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            i += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            i += 2
+            continue
+        (length,) = struct.unpack(">H", head[i + 2:i + 4])
+        if marker in _JPEG_SOF_MARKERS:
+            if i + 9 > len(head):
+                break
+            height, width = struct.unpack(">HH", head[i + 5:i + 9])
+            # Browsers apply EXIF orientation; 5-8 rotate the image by 90 degrees
+            if orientation in (5, 6, 7, 8):
+                width, height = height, width
+            return width, height
+        segment = head[i + 4:i + 2 + length]
+        if marker == 0xE1 and segment.startswith(b"Exif\x00\x00"):
+            orientation = _exif_orientation(segment)
+        i += 2 + length
+    raise ImageSniffError("JPEG frame header not found")
+
+
+def _avif(head: bytes) -> Tuple[int, int]:
+    # The image spatial extents ('ispe') property of each image item; the largest one
+    # is the primary image (others are alpha planes or grid tiles)
+    sizes = []
+    start = head.find(b"ispe")
+    while start != -1 and start + 16 <= len(head):
+        sizes.append(struct.unpack(">II", head[start + 8:start + 16]))
+        start = head.find(b"ispe", start + 4)
+    if not sizes:
+        raise ImageSniffError("AVIF image size not found")
+    return max(sizes, key=lambda size: size[0] * size[1])
+
+
+def _identify(head: bytes) -> Optional[Tuple[str, Any]]:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png", _png
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg", _jpeg
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif", _gif
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", _webp
+    if head[:2] == b"BM":
+        return "image/bmp", _bmp
+    if head[4:8] == b"ftyp" and b"avif" in head[8:struct.unpack(">I", head[:4])[0]]:
+        return "image/avif", _avif
+    return None
+
+
+def sniff_image(head: bytes) -> Dict[str, Any]:
+    """
+    Identify an image from the start of its file
+
+    Args:
+        head: The first bytes of the file (SNIFF_BYTES is enough)
+
+    Returns:
+        {"mime_type", "width", "height"}; dimensions are as displayed (JPEG EXIF
+        orientation applied)
+
+    Raises:
+        ImageSniffError: not a supported image, unreadable header, or too large
+    """
+    identified = _identify(head) if len(head) >= 12 else None
+    if identified is None:
+        raise ImageSniffError("File content is not a supported image (PNG, JPEG, GIF, WebP, BMP or AVIF)")
+    mime_type, parse = identified
+    try:
+        width, height = parse(head)
+    except (struct.error, IndexError):
+        raise ImageSniffError("Image header is truncated")
+
+    if width <= 0 or height <= 0:
+        raise ImageSniffError("Image has no dimensions")
+    if width > MAX_IMAGE_SIDE or height > MAX_IMAGE_SIDE or width * height > MAX_IMAGE_PIXELS:
+        raise ImageSniffError(f"Image is too large ({width}x{height}); the limit is {MAX_IMAGE_PIXELS // 1_000_000} megapixels")
+    return {"mime_type": mime_type, "width": width, "height": height}
@@ -0,0 +1,85 @@
+"""
+Resized, re-encoded variants of evidence images
+
+render_variants runs in worker processes (it is CPU bound), so it only takes and
+returns plain, picklable values. Variants are encoded from pixels alone: EXIF, XMP
+and ICC metadata of the original are dropped, after EXIF orientation is applied.
+"""
+import io
+from typing import Any, Dict, List, Sequence, Tuple
+from PIL import Image, ImageOps, features
+
+# Widths of the generated variants; images narrower than a width get one at their own width
+VARIANT_WIDTHS = (320, 640, 1280, 1920)
+
+# Output formats with their encoder options, best compression first
+VARIANT_FORMATS: Tuple[Tuple[str, str, Dict[str, Any]], ...] = (
+    ("avif", "image/avif", {"quality": 60, "speed": 8}),
+    ("webp", "image/webp", {"quality": 80, "method": 4}),
+)
+
+# Mime types the pipeline can decode (SVG and other vector formats are left alone)
+SUPPORTED_MIME_TYPES = frozenset({
+    "image/png",
+    "image/jpeg",
+    "image/jpg",
+    "image/webp",
+    "image/gif",
+    "image/bmp",
+    "image/tiff",
+    "image/avif",
+})
+
+
+def available_formats() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Variant formats this Pillow build can encode"""
+    return [f for f in VARIANT_FORMATS if features.check(f[0])]
+
+
+def variant_path(file_path: str, width: int, extension: str) -> str:
+    """Storage path of a variant, next to the original: a/b/name.png -> a/b/name.w640.webp"""
+    folder, _, name = file_path.rpartition("/")
+    stem = name.rsplit(".", 1)[0] if "." in name else name
+    return f"{folder}/{stem}.w{width}.{extension}" if folder else f"{stem}.w{width}.{extension}"
+
+
+def render_variants(data: bytes, widths: Sequence[int] = VARIANT_WIDTHS) -> List[Dict[str, Any]]:
+    """
+    Encode an image at each width in each available format
+
+    Args:
+        data: Original image bytes
+        widths: Target widths; never upscaled
+
+    Returns:
+        List of {"width", "height", "extension", "mime_type", "content"} dicts, smallest
+        width first
+
+    Raises:
+        PIL.UnidentifiedImageError / OSError: the data is not a decodable image
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        # Animated images use their first frame
+        original.seek(0)
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+    targets = sorted({min(width, image.width) for width in widths})
+    formats = available_formats()
+    variants = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        # Encode from pixels only so no metadata of the original is carried over
+        resized.info = {}
+        for extension, mime_type, options in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=extension.upper(), **options)
+            variants.append({
+                "width": width,
+                "height": height,
+                "extension": extension,
+                "mime_type": mime_type,
+                "content": buffer.getvalue(),
+            })
+    return variants
@@ -0,0 +1,181 @@
+"""
+Local verification of Supabase access tokens
+
+Tokens are checked here instead of with a round trip to Supabase Auth. Tokens signed
+with the project's legacy shared secret (HS256) are verified with SUPABASE_JWT_SECRET;
+tokens signed with asymmetric signing keys (RS256/ES256) are verified with the
+project's JWKS, which is cached and fetched again when a token names a key it doesn't
+contain (after a key rotation). Verified claims are cached per token until the token
+expires, so repeated requests with the same token skip the signature check.
+
+A revoked session stays valid here until its access token expires (an hour by
+default), the same trade-off Supabase makes for its own stateless verification.
+"""
+import os
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+import httpx
+import jwt
+from dotenv import load_dotenv
+from backend.utils.ttl_cache import TTLCache
+
+load_dotenv()
+
+# Audience of user access tokens
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+
+# How long fetched signing keys are used before the JWKS is fetched again
+JWKS_CACHE_TTL_SECONDS = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "600"))
+
+# Minimum time between fetches caused by unknown key IDs, so tokens naming made-up
+# keys can't make every request fetch the JWKS
+JWKS_REFRESH_COOLDOWN_SECONDS = 30
+
+# Timeout of a JWKS fetch, and how long other threads wait for one already in flight
+JWKS_FETCH_TIMEOUT_SECONDS = 5.0
+
+# Clock skew allowed when checking exp and iat
+JWT_LEEWAY_SECONDS = 10
+
+# Algorithm of signing keys published without "alg", by key type
+ASYMMETRIC_ALGORITHMS = {"RSA": "RS256", "EC": "ES256"}
+
+# Authenticator assurance levels, weakest first
+AAL_LEVELS = ("aal1", "aal2")
+
+_claims_cache = TTLCache(ttl_seconds=3600, max_entries=10000)
+
+_jwks_lock = threading.Lock()
+_jwks: Dict[str, Tuple[str, jwt.PyJWK]] = {}
+_jwks_fetched_at = 0.0
+# Set when the JWKS fetch in flight finishes; None while no fetch is running
+_jwks_fetch_done: Optional[threading.Event] = None
+
+
+class TokenVerificationError(jwt.InvalidTokenError):
+    """The token can't be verified (unknown signing key, missing secret, too low an AAL)"""
+
+
+def _jwks_url() -> str:
+    return f"{os.getenv('SUPABASE_URL', '')}/auth/v1/.well-known/jwks.json"
+
+
+def _fetch_jwks() -> Dict[str, Tuple[str, jwt.PyJWK]]:
+    """Signing keys by key ID, with their algorithm"""
+    response = httpx.get(_jwks_url(), timeout=JWKS_FETCH_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    keys = {}
+    for key in response.json().get("keys", []):
+        algorithm = key.get("alg") or ASYMMETRIC_ALGORITHMS.get(key.get("kty"))
+        if algorithm not in ASYMMETRIC_ALGORITHMS.values():
+            continue
+        try:
+            keys[key["kid"]] = (algorithm, jwt.PyJWK(key, algorithm))
+        except (KeyError, jwt.PyJWKError) as e:
+            print(f"Skipping JWKS key {key.get('kid')}: {e}")
+    return keys
+
+
+def _refresh_jwks(done: threading.Event) -> None:
+    """Fetch the JWKS (outside the lock) and publish it to waiting threads"""
+    global _jwks, _jwks_fetched_at, _jwks_fetch_done
+    keys = None
+    try:
+        keys = _fetch_jwks()
+    except Exception as e:
+        # Keep using the keys we have; unknown keys fail in _signing_key
+        print(f"JWKS fetch error: {e}")
+    finally:
+        with _jwks_lock:
+            if keys is not None:
+                _jwks = keys
+            _jwks_fetched_at = time.monotonic()
+            _jwks_fetch_done = None
+        done.set()
+
+
+def _signing_key(kid: Optional[str]) -> Tuple[str, jwt.PyJWK]:
+    """
+    (algorithm, public key) for a key ID, fetching the JWKS when stale or when the key is unknown
+
+    Blocks while the JWKS is fetched; call it from a worker thread, not a coroutine.
+    Only one thread fetches at a time - the others keep using the keys they have, or
+    wait for the fetch in flight when they need a key they don't have yet.
+    """
+    global _jwks_fetch_done
+    with _jwks_lock:
+        age = time.monotonic() - _jwks_fetched_at
+        stale = age >= JWKS_CACHE_TTL_SECONDS or (kid not in _jwks and age >= JWKS_REFRESH_COOLDOWN_SECONDS)
+        done = _jwks_fetch_done
+        fetch = stale and done is None
+        if fetch:
+            done = _jwks_fetch_done = threading.Event()
+
+    if fetch:
+        _refresh_jwks(done)
+    elif done is not None and kid not in _jwks:
+        done.wait(JWKS_FETCH_TIMEOUT_SECONDS)
+
+    key = _jwks.get(kid) if kid else None
+    if key is None:
+        raise TokenVerificationError("Token signing key not found")
+    return key
+
+
+def _decode(token: str) -> Dict[str, Any]:
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        secret = os.getenv("SUPABASE_JWT_SECRET")
+        if not secret:
+            raise TokenVerificationError("SUPABASE_JWT_SECRET is not configured")
+        key: Any = secret
+    elif algorithm in ASYMMETRIC_ALGORITHMS.values():
+        key_algorithm, signing_key = _signing_key(header.get("kid"))
+        if key_algorithm != algorithm:
+            raise TokenVerificationError("Token algorithm does not match its signing key")
+        key = signing_key.key
+    else:
+        raise TokenVerificationError(f"Unsupported token algorithm: {algorithm}")
+
+    supabase_url = os.getenv("SUPABASE_URL")
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=SUPABASE_JWT_AUDIENCE,
+        issuer=f"{supabase_url}/auth/v1" if supabase_url else None,
+        leeway=JWT_LEEWAY_SECONDS,
+        options={"require": ["exp", "sub"]},
+    )
+    if claims.get("aal") not in AAL_LEVELS:
+        raise TokenVerificationError("Token has no valid authenticator assurance level")
+    return claims
+
+
+def verify_access_token(token: str, required_aal: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Verify a Supabase access token and return its claims
+
+    Args:
+        token: The access token (without "Bearer ")
+        required_aal: Reject tokens below this assurance level ("aal2" requires MFA)
+
+    Returns:
+        The token's claims (sub, email, aal, amr, session_id, ...)
+
+    Raises:
+        jwt.InvalidTokenError: bad signature, expired, wrong audience or issuer,
+            unknown signing key, or too low an assurance level
+    """
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    claims = _claims_cache.get(cache_key)
+    if claims is None:
+        claims = _decode(token)
+        _claims_cache.set(cache_key, claims, ttl_seconds=max(0.0, claims["exp"] - time.time()))
+
+    if required_aal and AAL_LEVELS.index(claims["aal"]) < AAL_LEVELS.index(required_aal):
+        raise TokenVerificationError(f"Token must be {required_aal}")
+    return claims
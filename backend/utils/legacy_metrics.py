@@ -0,0 +1,141 @@
+"""
+Deterministic parser for legacy free-text metrics.
+
+Turns legacy `primary`/`label`/`detail` strings such as "40%", "3x faster",
+"$1.2M" or "<200ms" into standardized metric data. The same input always produces
+the same output; anything that can't be read unambiguously is rejected with a reason
+instead of guessed.
+"""
+import re
+from typing import Any, Dict, Optional, Tuple
+from pydantic import ValidationError
+from backend.schemas.project import StandardizedProjectMetric
+
+# "<", "~", "+" etc. before the number, "$" prefix, number with thousands separators,
+# optional k/M/B magnitude, optional "+" ("1M+"), then the rest of the string
+_VALUE_PATTERN = re.compile(
+    r"""^\s*
+    (?:[<>~≈]=?|up\s+to|over|under|about)?\s*
+    (?P<currency>\$)?\s*
+    (?P<sign>[+-])?
+    (?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)
+    \s*(?P<magnitude>[kKmMbB](?![a-zA-Z]))?
+    \+?
+    \s*(?P<rest>.*?)\s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+# Unit word directly after the number
+_UNIT_TOKEN = re.compile(r"\s*(%|×|[a-zA-Z]+)")
+
+_MAGNITUDES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+# Unit words (lower-case) -> (standardized unit, multiplier into that unit)
+_UNIT_WORDS: Dict[str, Tuple[str, float]] = {
+    "%": ("%", 1), "percent": ("%", 1), "pct": ("%", 1),
+    "x": ("x", 1), "×": ("x", 1), "times": ("x", 1),
+    "ms": ("ms", 1), "msec": ("ms", 1), "millisecond": ("ms", 1), "milliseconds": ("ms", 1),
+    "s": ("s", 1), "sec": ("s", 1), "secs": ("s", 1), "second": ("s", 1), "seconds": ("s", 1),
+    "min": ("min", 1), "mins": ("min", 1), "minute": ("min", 1), "minutes": ("min", 1),
+    "h": ("hrs", 1), "hr": ("hrs", 1), "hrs": ("hrs", 1), "hour": ("hrs", 1), "hours": ("hrs", 1),
+    "kb": ("MB", 1 / 1024), "mb": ("MB", 1), "gb": ("GB", 1), "tb": ("GB", 1024),
+    "user": ("users", 1), "users": ("users", 1),
+    "request": ("requests", 1), "requests": ("requests", 1), "req": ("requests", 1), "rps": ("requests", 1),
+    "item": ("items", 1), "items": ("items", 1),
+    "call": ("calls", 1), "calls": ("calls", 1),
+    "usd": ("$", 1), "dollars": ("$", 1),
+}
+
+_TIME_UNITS = {"ms", "s", "min", "hrs"}
+_SCALE_UNITS = {"users", "requests", "items", "calls", "MB", "GB"}
+
+# Keyword -> metric type for units that don't determine the type on their own ("%").
+# Checked in order; the first match wins.
+_TYPE_KEYWORDS = (
+    ("business", ("revenue", "cost", "saving", "sales", "conversion", "profit", "spend", "churn", "retention")),
+    ("quality", ("uptime", "coverage", "error", "bug", "defect", "incident", "crash", "reliab", "availability", "accuracy")),
+    ("time", ("time saved", "hours saved", "saved", "manual")),
+    ("scale", ("users", "traffic", "throughput", "capacity", "adoption")),
+)
+
+
+def _infer_type(unit: str, text: str) -> str:
+    """Pick a metric type from the unit, falling back to keywords for unitless types"""
+    if unit == "$":
+        return "business"
+    if unit in _SCALE_UNITS:
+        return "scale"
+    if unit in _TIME_UNITS:
+        return "time" if "saved" in text or "save" in text else "performance"
+    for metric_type, keywords in _TYPE_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return metric_type
+    return "performance"
+
+
+def parse_legacy_metric(primary: str, label: Optional[str], detail: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Convert a legacy metric into standardized metric data
+
+    Args:
+        primary: Legacy primary value, e.g. "40%", "3x faster", "$1.2M"
+        label: Legacy label, e.g. "faster page loads"
+        detail: Legacy detail, kept as the metric's context scope
+
+    Returns:
+        (metric_data, None) on success, or (None, reason) if the value can't be parsed
+    """
+    match = _VALUE_PATTERN.match(primary or "")
+    if not match:
+        return None, "no leading number"
+
+    rest = match.group("rest")
+    if re.match(r"^(-|–|to)\s*\d", rest):
+        return None, "range"
+
+    number = float(match.group("number").replace(",", ""))
+    if match.group("magnitude"):
+        number *= _MAGNITUDES[match.group("magnitude").lower()]
+    if match.group("sign") == "-":
+        number = -number
+
+    # The unit is the word right after the number, or else the first unit word in the label
+    unit, factor, unit_word = None, 1.0, None
+    unit_match = _UNIT_TOKEN.match(rest)
+    if match.group("currency"):
+        unit = "$"
+    elif unit_match and unit_match.group(1).lower() in _UNIT_WORDS:
+        unit_word = unit_match.group(1)
+        unit, factor = _UNIT_WORDS[unit_word.lower()]
+        rest = rest[unit_match.end():]
+    else:
+        for token in re.findall(r"[a-zA-Z]{2,}", label or ""):
+            if token.lower() in _UNIT_WORDS:
+                unit, factor = _UNIT_WORDS[token.lower()]
+                break
+    if unit is None:
+        return None, "unknown unit"
+
+    value = round(number * factor, 6)
+    value = int(value) if float(value).is_integer() else value
+
+    # Words after the unit ("3x faster") read as part of the label
+    trailing = rest.strip(" -–:,")
+    metric_label = " ".join(part for part in (trailing, (label or "").strip()) if part)
+    if not metric_label and unit_word and len(unit_word) > 1:
+        # "10k users" with no label: the unit word is the best label available
+        metric_label = unit_word
+    if not metric_label:
+        return None, "missing label"
+
+    metric: Dict[str, Any] = {
+        "type": _infer_type(unit, f"{metric_label} {detail or ''}".lower()),
+        "primary": {"value": value, "unit": unit, "label": metric_label},
+    }
+    if detail and detail.strip():
+        metric["context"] = {"scope": detail.strip()}
+
+    try:
+        return StandardizedProjectMetric(**metric).model_dump(exclude_none=True, exclude={"id"}), None
+    except ValidationError as e:
+        return None, f"invalid metric: {e.errors()[0]['msg']}"
@@ -0,0 +1,17 @@
+"""
+MFA factors of a signed-in user
+
+The user returned by a password sign-in lists the user's enrolled factors, so sign-in
+reads them from there instead of asking the Admin API. Nothing is cached: whether a
+user must pass an MFA challenge is decided from what Supabase Auth returned for this
+sign-in, on every worker.
+"""
+from typing import Any, List
+
+
+def verified_totp_factors(user: Any) -> List[Any]:
+    """The verified TOTP factors on a Supabase user (empty if the user has no MFA)"""
+    return [
+        f for f in (getattr(user, "factors", None) or [])
+        if getattr(f, "factor_type", None) == "totp" and getattr(f, "status", None) == "verified"
+    ]
@@ -0,0 +1,172 @@
+"""
+Display order helpers for gapped-integer ordering.
+
+Rows are spaced ORDER_GAP apart so moving one item only needs a single-row update
+(to the midpoint between its new neighbours). When two neighbours end up adjacent,
+the scope is rebalanced once to restore the gaps, in a single set_display_orders call.
+"""
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from backend.utils.dependencies import ServiceDBClient
+
+ORDER_GAP = 1024
+
+
+def next_display_order(max_order: Optional[int]) -> int:
+    """Display order for an item appended after the current last item"""
+    if max_order is None:
+        return 0
+    return max_order + ORDER_GAP
+
+
+def order_between(lower: Optional[int], upper: Optional[int]) -> Optional[int]:
+    """
+    Display order strictly between two neighbours
+
+    Args:
+        lower: Order of the item that will come before (None if moving to the start)
+        upper: Order of the item that will come after (None if moving to the end)
+
+    Returns:
+        New display order, or None if there is no room and the scope must be rebalanced
+    """
+    if lower is None and upper is None:
+        return 0
+    if lower is None:
+        return upper - ORDER_GAP
+    if upper is None:
+        return lower + ORDER_GAP
+    if upper - lower > 1:
+        return (lower + upper) // 2
+    return None
+
+
+def _apply_scope(query, scope: Dict[str, Any]):
+    """Filter a query to the rows sharing an ordering scope"""
+    for column, value in scope.items():
+        query = query.is_(column, "null") if value is None else query.eq(column, value)
+    return query
+
+
+def get_max_display_order(client: ServiceDBClient, table: str, scope: Dict[str, Any]) -> Optional[int]:
+    """Highest display_order in a scope, or None if the scope is empty"""
+    result = _apply_scope(client.table(table).select("display_order"), scope)\
+        .order("display_order", desc=True)\
+        .limit(1)\
+        .execute()
+    if not result.data:
+        return None
+    return result.data[0].get("display_order")
+
+
+def move_item(
+    client: ServiceDBClient,
+    table: str,
+    item_id: str,
+    scope: Dict[str, Any],
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+) -> int:
+    """
+    Move a row to sit between two neighbours within its ordering scope
+
+    The caller is responsible for verifying the item exists and is owned by the user;
+    neighbours are looked up within `scope` so they can't come from another user.
+
+    Args:
+        client: Supabase client (injected from router)
+        table: Table holding the rows
+        item_id: ID of the row being moved
+        scope: Column filters shared by all rows ordered together
+        before_id: ID of the row the item should be placed before
+        after_id: ID of the row the item should be placed after
+
+    Returns:
+        The item's new display_order
+    """
+    if not before_id and not after_id:
+        raise HTTPException(status_code=400, detail="Either before_id or after_id is required")
+    if item_id in (before_id, after_id):
+        raise HTTPException(status_code=400, detail="An item cannot be moved relative to itself")
+
+    neighbour_ids = [i for i in (before_id, after_id) if i]
+    neighbours_result = _apply_scope(
+        client.table(table).select("id, display_order").in_("id", neighbour_ids),
+        scope
+    ).execute()
+    neighbours = {row["id"]: row["display_order"] for row in neighbours_result.data or []}
+    if any(i not in neighbours for i in neighbour_ids):
+        raise HTTPException(status_code=404, detail="Reference item not found")
+
+    lower = neighbours.get(after_id) if after_id else None
+    upper = neighbours.get(before_id) if before_id else None
+
+    if after_id and before_id:
+        if lower >= upper:
+            raise HTTPException(status_code=400, detail="after_id must come before before_id")
+    elif after_id:
+        # Find the row currently following the "after" neighbour
+        following = _apply_scope(client.table(table).select("id, display_order"), scope)\
+            .gte("display_order", lower)\
+            .neq("id", after_id)\
+            .neq("id", item_id)\
+            .order("display_order")\
+            .limit(1)\
+            .execute()
+        upper = following.data[0]["display_order"] if following.data else None
+    else:
+        # Find the row currently preceding the "before" neighbour
+        preceding = _apply_scope(client.table(table).select("id, display_order"), scope)\
+            .lte("display_order", upper)\
+            .neq("id", before_id)\
+            .neq("id", item_id)\
+            .order("display_order", desc=True)\
+            .limit(1)\
+            .execute()
+        lower = preceding.data[0]["display_order"] if preceding.data else None
+
+    new_order = order_between(lower, upper)
+    if new_order is None:
+        return _rebalance(client, table, item_id, scope, before_id, after_id)
+
+    client.table(table)\
+        .update({"display_order": new_order})\
+        .eq("id", item_id)\
+        .execute()
+    return new_order
+
+
+def _rebalance(
+    client: ServiceDBClient,
+    table: str,
+    item_id: str,
+    scope: Dict[str, Any],
+    before_id: Optional[str],
+    after_id: Optional[str],
+) -> int:
+    """Respace every row in a scope ORDER_GAP apart with the moved item in its new position"""
+    rows_result = _apply_scope(client.table(table).select("id, display_order"), scope)\
+        .order("display_order")\
+        .order("id")\
+        .execute()
+    ordered_ids: List[str] = [row["id"] for row in rows_result.data or [] if row["id"] != item_id]
+    current = {row["id"]: row["display_order"] for row in rows_result.data or []}
+
+    if after_id:
+        ordered_ids.insert(ordered_ids.index(after_id) + 1, item_id)
+    else:
+        ordered_ids.insert(ordered_ids.index(before_id), item_id)
+
+    changed = {
+        row_id: position * ORDER_GAP
+        for position, row_id in enumerate(ordered_ids)
+        if current.get(row_id) != position * ORDER_GAP
+    }
+    if changed:
+        # One statement for the whole scope rather than an update per row
+        client.rpc("set_display_orders", {
+            "target_table": table,
+            "row_ids": list(changed),
+            "display_orders": list(changed.values()),
+        }).execute()
+    return ordered_ids.index(item_id) * ORDER_GAP
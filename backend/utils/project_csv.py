@@ -0,0 +1,162 @@
+"""
+CSV layout for projects, shared by account export and project import.
+
+Each row holds one metric; a project with several metrics spans several consecutive
+rows that repeat the project columns. Lists are joined with "; ".
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from backend.schemas.project import Project, StandardizedProjectMetric
+
+PROJECT_CSV_COLUMNS = [
+    "project_id",
+    "portfolio_id",
+    "company",
+    "project_name",
+    "role",
+    "team_size",
+    "problem",
+    "contributions",
+    "tech_stack",
+    "metric_id",
+    "metric_type",
+    "metric_value",
+    "metric_unit",
+    "metric_label",
+    "metric_detail",
+    "before_value",
+    "before_unit",
+    "after_value",
+    "after_unit",
+    "frequency",
+    "scope",
+    "timeframe",
+]
+
+PROJECT_FIELDS = PROJECT_CSV_COLUMNS[:PROJECT_CSV_COLUMNS.index("metric_id")]
+LIST_SEPARATOR = "; "
+
+
+def project_to_csv_rows(project: Project) -> Iterator[List[Any]]:
+    """Flatten a project into CSV rows, one per metric"""
+    base = [
+        project.id,
+        project.portfolio_id,
+        project.company,
+        project.projectName,
+        project.role,
+        project.teamSize,
+        project.problem,
+        LIST_SEPARATOR.join(project.contributions),
+        LIST_SEPARATOR.join(project.techStack),
+    ]
+    metric_width = len(PROJECT_CSV_COLUMNS) - len(base)
+    if not project.metrics:
+        yield base + [None] * metric_width
+        return
+
+    for metric in project.metrics:
+        if isinstance(metric, StandardizedProjectMetric):
+            comparison = metric.comparison
+            context = metric.context
+            yield base + [
+                metric.id,
+                metric.type,
+                metric.primary.value,
+                metric.primary.unit,
+                metric.primary.label,
+                None,
+                comparison.before.value if comparison else None,
+                comparison.before.unit if comparison else None,
+                comparison.after.value if comparison else None,
+                comparison.after.unit if comparison else None,
+                context.frequency if context else None,
+                context.scope if context else None,
+                metric.timeframe,
+            ]
+        else:
+            yield base + [metric.id, None, metric.primary, None, metric.label, metric.detail] + [None] * 7
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(LIST_SEPARATOR.strip()) if item.strip()]
+
+
+def _number(value: str) -> Any:
+    """Parse a numeric CSV cell, leaving non-numbers as-is for validation to reject"""
+    try:
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    except ValueError:
+        return value
+
+
+def csv_row_to_metric(row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Build a metric dict from the metric columns of a CSV row
+
+    Rows with a metric_type are standardized metrics; rows with only a value and
+    label are legacy metrics. Returns None if the row has no metric.
+    """
+    get = lambda column: (row.get(column) or "").strip()
+
+    if get("metric_type"):
+        metric: Dict[str, Any] = {
+            "type": get("metric_type"),
+            "primary": {"value": _number(get("metric_value")), "unit": get("metric_unit"), "label": get("metric_label")},
+        }
+        if get("before_value") or get("after_value"):
+            metric["comparison"] = {
+                "before": {"value": _number(get("before_value")), "unit": get("before_unit")},
+                "after": {"value": _number(get("after_value")), "unit": get("after_unit")},
+            }
+        if get("frequency") or get("scope"):
+            metric["context"] = {"frequency": get("frequency") or None, "scope": get("scope") or None}
+        if get("timeframe"):
+            metric["timeframe"] = get("timeframe")
+        return metric
+
+    if get("metric_value") or get("metric_label"):
+        return {"primary": get("metric_value"), "label": get("metric_label"), "detail": get("metric_detail") or None}
+    return None
+
+
+def group_csv_projects(rows: Iterable[Dict[str, str]]) -> Iterator[Tuple[int, List[Dict[str, str]]]]:
+    """
+    Group consecutive CSV rows that belong to the same project
+
+    Rows belong together when they share a project_id, or (without one) when all
+    project columns are equal.
+
+    Yields:
+        (line number of the project's first row, rows)
+    """
+    current_key = None
+    current_rows: List[Dict[str, str]] = []
+    start_line = 0
+    # Line 1 is the header
+    for line, row in enumerate(rows, start=2):
+        key = row.get("project_id") or tuple((row.get(field) or "").strip() for field in PROJECT_FIELDS)
+        if current_rows and key != current_key:
+            yield start_line, current_rows
+            current_rows = []
+        if not current_rows:
+            current_key, start_line = key, line
+        current_rows.append(row)
+    if current_rows:
+        yield start_line, current_rows
+
+
+def csv_rows_to_project(rows: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Build CreateProjectRequest data (unvalidated) from one project's CSV rows"""
+    first = rows[0]
+    team_size = (first.get("team_size") or "").strip()
+    return {
+        "company": (first.get("company") or "").strip(),
+        "projectName": (first.get("project_name") or "").strip(),
+        "role": (first.get("role") or "").strip(),
+        "teamSize": _number(team_size) if team_size else 1,
+        "problem": (first.get("problem") or "").strip(),
+        "contributions": _split_list(first.get("contributions")),
+        "techStack": _split_list(first.get("tech_stack")),
+        "metrics": [metric for metric in (csv_row_to_metric(row) for row in rows) if metric],
+    }
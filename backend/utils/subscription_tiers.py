@@ -0,0 +1,44 @@
+"""
+Cached subscription tier per user, for the request principal
+
+Tiers change only through Stripe webhooks and checkout, which invalidate the entry in
+this worker; other workers pick the change up when their entry expires. The principal
+looks the tier up on first read, and evidence storage limits use it from there.
+"""
+import os
+from typing import Optional
+from supabase import Client
+from backend.utils.ttl_cache import TTLCache
+
+SUBSCRIPTION_TIER_CACHE_TTL_SECONDS = int(os.getenv("SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", "60"))
+
+_tier_cache = TTLCache(ttl_seconds=SUBSCRIPTION_TIER_CACHE_TTL_SECONDS, max_entries=10000)
+
+
+def get_subscription_tier(client: Client, user_id: str) -> Optional[str]:
+    """
+    Subscription type ("free" or "pro") of a user
+
+    Returns:
+        The tier, "free" for users without a profile yet, or None if the lookup failed
+    """
+    tier = _tier_cache.get(user_id)
+    if tier is not None:
+        return tier
+    try:
+        result = client.table("profiles")\
+            .select("subscription_type")\
+            .eq("id", user_id)\
+            .limit(1)\
+            .execute()
+    except Exception as e:
+        print(f"Subscription tier lookup error: {e}")
+        return None
+    tier = (result.data[0].get("subscription_type") if result.data else None) or "free"
+    _tier_cache.set(user_id, tier)
+    return tier
+
+
+def invalidate_subscription_tier(user_id: str) -> None:
+    """Drop a user's cached tier after their subscription changes"""
+    _tier_cache.delete(user_id)
@@ -0,0 +1,206 @@
+"""
+Streaming multipart uploads with a byte limit
+
+FastAPI's UploadFile reads the whole request body before the endpoint runs. Endpoints
+that take large files read the request stream themselves instead, so a size limit can
+be enforced from Content-Length before anything is read and again as bytes arrive.
+Files are kept in memory up to a threshold and spooled to a named temporary file above
+it, which the storage client can then stream from. Each file's SHA-256 is computed as
+its bytes arrive.
+"""
+import os
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Files larger than this are written to a temporary file instead of kept in memory
+UPLOAD_SPOOL_THRESHOLD = 1024 * 1024
+
+# Allowance for boundaries, part headers and small form fields around the file bytes
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+class SpooledUpload:
+    """One uploaded file, held in memory up to a threshold and on disk above it"""
+
+    def __init__(self, filename: str, content_type: str, spool_threshold: int = UPLOAD_SPOOL_THRESHOLD):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._spool_threshold = spool_threshold
+        self._buffer = bytearray()
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[str] = None
+
+    @property
+    def spooled(self) -> bool:
+        """Whether the file was written to disk"""
+        return self._path is not None
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of the bytes received so far"""
+        return self._hash.hexdigest()
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        self._hash.update(data)
+        if self._file is None and len(self._buffer) + len(data) > self._spool_threshold:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload-", delete=False)
+            self._path = self._file.name
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer.extend(data)
+
+    def finish(self) -> None:
+        """Flush the spooled file; called once the part is complete"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @contextmanager
+    def open(self) -> Iterator[Union[bytes, BinaryIO]]:
+        """The file's content as bytes (small files) or an open binary file to stream from"""
+        if self._path is None:
+            yield bytes(self._buffer)
+            return
+        with open(self._path, "rb") as f:
+            yield f
+
+    def close(self) -> None:
+        """Release the buffer and remove the temporary file"""
+        self.finish()
+        self._buffer = bytearray()
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
+
+
+async def receive_multipart_files(
+    request: Request,
+    field_name: str,
+    max_bytes: int,
+    too_large_detail: str,
+    max_files: int = 1,
+    content_type_prefix: Optional[str] = None,
+    spool_threshold: int = UPLOAD_SPOOL_THRESHOLD,
+) -> List[SpooledUpload]:
+    """
+    Read the files of a multipart/form-data request field as they stream in
+
+    Args:
+        request: Incoming request whose body has not been read yet
+        field_name: Form field holding the files
+        max_bytes: Limit on the combined size of the files
+        too_large_detail: Error detail when the limit is exceeded
+        max_files: Most files accepted in the field
+        content_type_prefix: Reject parts whose content type doesn't start with this
+        spool_threshold: Size above which a file is written to disk
+
+    Returns:
+        The uploaded files; the caller must close() them
+
+    Raises:
+        HTTPException: 400 for malformed or missing uploads, 413 for too-large uploads
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    # Reject before reading anything if the declared body can't fit
+    body_limit = max_bytes + max_files * MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > body_limit:
+        raise HTTPException(status_code=413, detail=too_large_detail)
+
+    uploads: List[SpooledUpload] = []
+    state: Dict[str, Optional[object]] = {"target": None}
+    part_headers: Dict[bytes, bytes] = {}
+    header = {"name": b"", "value": b""}
+
+    def on_part_begin() -> None:
+        part_headers.clear()
+        state["target"] = None
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header["name"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header["value"] += data[start:end]
+
+    def on_header_end() -> None:
+        part_headers[header["name"].lower()] = header["value"]
+        header["name"], header["value"] = b"", b""
+
+    def on_headers_finished() -> None:
+        _, options = parse_options_header(part_headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("utf-8", "replace") != field_name or b"filename" not in options:
+            return
+        if len(uploads) >= max_files:
+            raise HTTPException(status_code=400, detail=f"At most {max_files} files can be uploaded at once")
+        part_type = part_headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+        if content_type_prefix and not part_type.startswith(content_type_prefix):
+            raise HTTPException(status_code=400, detail=f"Only {content_type_prefix.rstrip('/')} files are allowed")
+        upload = SpooledUpload(
+            options[b"filename"].decode("utf-8", "replace"),
+            part_type,
+            spool_threshold=spool_threshold,
+        )
+        uploads.append(upload)
+        state["target"] = upload
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        target = state["target"]
+        if isinstance(target, SpooledUpload):
+            target.write(data[start:end])
+
+    def on_part_end() -> None:
+        target = state["target"]
+        if isinstance(target, SpooledUpload):
+            target.finish()
+        state["target"] = None
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise HTTPException(status_code=413, detail=too_large_detail)
+            parser.write(chunk)
+            if sum(upload.size for upload in uploads) > max_bytes:
+                raise HTTPException(status_code=413, detail=too_large_detail)
+        parser.finalize()
+    except HTTPException:
+        for upload in uploads:
+            upload.close()
+        raise
+    except Exception as e:
+        for upload in uploads:
+            upload.close()
+        print(f"Multipart upload parse error: {e}")
+        raise HTTPException(status_code=400, detail="Invalid multipart upload")
+
+    if not uploads:
+        raise HTTPException(status_code=400, detail=f"No file uploaded in field '{field_name}'")
+    return uploads